@@ -1,17 +1,42 @@
+import os
 from flask import Flask, jsonify
 from flask_migrate import Migrate
 from flask_cors import CORS
 from .models import db
-from .config import Config
+from .config import CONFIGS
+from .database import init_database
+from .events import init_event_broker
+from .search import init_search
+from .draft_state import init_draft_state
+from .autodraft import init_autodraft
+from .simulation import init_simulation
+from .metrics import init_metrics
+from .encoding import init_json
+from .pick_clock import init_pick_clock
 
-def create_app(config_class=Config):
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+def create_app(config_class=None):
     app = Flask(__name__)
+    if config_class is None:
+        profile = os.environ.get('APP_CONFIG', 'development')
+        if profile not in CONFIGS:
+            raise ValueError(f'Unknown APP_CONFIG {profile!r}; expected one of {", ".join(CONFIGS)}')
+        config_class = CONFIGS[profile]
     app.config.from_object(config_class)
     
     # Initialize extensions
-    db.init_app(app)
-    migrate = Migrate(app, db)
+    init_database(app)
+    migrate = Migrate(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
     CORS(app)
+    init_json(app)
+    init_event_broker(app)
+    init_search(app)
+    init_draft_state(app)
+    init_autodraft(app)
+    init_simulation(app)
+    init_metrics(app)
+    init_pick_clock(app)
     
     # Register blueprints
     from .leagues import leagues_bp
@@ -19,12 +44,14 @@ def create_app(config_class=Config):
     from .prospects import prospects_bp
     from .draft import draft_bp
     from .trades import trades_bp
+    from .metrics import metrics_bp
     
     app.register_blueprint(leagues_bp, url_prefix='/api/leagues')
     app.register_blueprint(teams_bp, url_prefix='/api/teams')
     app.register_blueprint(prospects_bp, url_prefix='/api/prospects')
     app.register_blueprint(draft_bp, url_prefix='/api/draft')
     app.register_blueprint(trades_bp, url_prefix='/api/trades')
+    app.register_blueprint(metrics_bp, url_prefix='/api/metrics')
     
     # Error handlers
     @app.errorhandler(404)
@@ -0,0 +1,144 @@
+import heapq
+import threading
+from collections import OrderedDict
+from flask import current_app
+from .serialization import prospect_changes
+from .versioning import get_league_version
+
+UNRANKED = float('inf')
+
+
+class ProspectPool:
+    """The undrafted prospects of one league in a heap per position.
+
+    Heap entries are ``(rank, id)`` pairs, so the head of a heap is the best
+    available prospect at that position and ties go to the earlier entry.
+    Drafting, re-ranking or deleting a prospect only updates ``_available``;
+    entries it makes stale are dropped when they reach the top of a heap.
+    ``version`` is the league version the pool reflects.
+    """
+
+    def __init__(self, created_at):
+        self.created_at = created_at
+        self.version = 0
+        self.lock = threading.Lock()
+        self._heaps = {}
+        # prospect id -> (position, heap entry) of every undrafted prospect
+        self._available = {}
+        # prospect id -> position of every prospect, for counting rosters
+        self.positions = {}
+        self._size = 0
+
+    def __len__(self):
+        return len(self._available)
+
+    def add(self, prospect):
+        prospect_id = prospect['id']
+        self.positions[prospect_id] = prospect['position']
+        if prospect['is_drafted']:
+            self._available.pop(prospect_id, None)
+            return
+
+        rank = prospect.get('rank')
+        entry = (UNRANKED if rank is None else rank, prospect_id)
+        available = (prospect['position'], entry)
+        if self._available.get(prospect_id) == available:
+            return
+        self._available[prospect_id] = available
+        heapq.heappush(self._heaps.setdefault(prospect['position'], []), entry)
+        self._size += 1
+        if self._size > 2 * len(self._available) + 64:
+            self._compact()
+
+    def remove(self, prospect_id):
+        self.positions.pop(prospect_id, None)
+        self._available.pop(prospect_id, None)
+
+    def available(self):
+        """(id, position, rank) of every undrafted prospect, rank ``UNRANKED`` if unset."""
+        return [(prospect_id, position, entry[0]) for prospect_id, (position, entry) in self._available.items()]
+
+    def open_positions(self):
+        return list(self._heaps)
+
+    def best(self, positions=None):
+        """Return the id of the best ranked undrafted prospect at any of ``positions``."""
+        best = None
+        for position in self._heaps if positions is None else positions:
+            heap = self._heaps.get(position)
+            while heap and self._available.get(heap[0][1]) != (position, heap[0]):
+                heapq.heappop(heap)
+                self._size -= 1
+            if heap and (best is None or heap[0] < best):
+                best = heap[0]
+        return None if best is None else best[1]
+
+    def _compact(self):
+        self._heaps = {}
+        for position, entry in self._available.values():
+            self._heaps.setdefault(position, []).append(entry)
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+        self._size = len(self._available)
+
+
+class ProspectPools:
+    """The prospect pools of the most recently auto-drafted leagues.
+
+    Like the search indexes, a pool is built on first use and caught up from
+    prospects stamped with a newer league version plus prospect tombstones,
+    so picks made by any worker are seen before the next auto-pick.
+    """
+
+    def __init__(self, max_leagues):
+        self.max_leagues = max_leagues
+        self._lock = threading.Lock()
+        self._pools = OrderedDict()
+
+    def get(self, league_id):
+        """Return the league's pool at its current version, or None for an unknown league."""
+        league = get_league_version(league_id)
+        with self._lock:
+            if league is None:
+                self._pools.pop(league_id, None)
+                return None
+            pool = self._pools.get(league_id)
+            if pool is None or pool.created_at != league.created_at or pool.version > league.version:
+                pool = self._pools[league_id] = ProspectPool(league.created_at)
+            self._pools.move_to_end(league_id)
+            while len(self._pools) > self.max_leagues:
+                self._pools.popitem(last=False)
+
+        with pool.lock:
+            if pool.version < league.version:
+                prospects, deleted = prospect_changes(league_id, pool.version)
+                for prospect_id in deleted:
+                    pool.remove(prospect_id)
+                for prospect in prospects:
+                    pool.add(prospect)
+                pool.version = league.version
+        return pool
+
+    def update(self, league_id, version, prospects):
+        """Write through prospects committed at ``version`` to a cached pool.
+
+        A pool that missed a write is left behind and catches up on its
+        next ``get``.
+        """
+        with self._lock:
+            pool = self._pools.get(league_id)
+        if pool is None:
+            return
+        with pool.lock:
+            if pool.version == version - 1:
+                for prospect in prospects:
+                    pool.add(prospect)
+                pool.version = version
+
+
+def init_autodraft(app):
+    app.extensions['autodraft'] = ProspectPools(app.config['AUTODRAFT_MAX_LEAGUES'])
+
+
+def prospect_pools():
+    return current_app.extensions['autodraft']
@@ -0,0 +1,85 @@
+"""Auto-pick latency and statement count across many concurrent leagues.
+
+Builds leagues with a draft in progress, then auto-picks for randomly
+chosen leagues through ``POST /api/draft/autopick``, the way pick clocks
+expiring across thousands of drafts would, and reports latency and the
+SQL statements each auto-pick ran. The first auto-pick of a league builds
+its position heaps; later ones only catch up on changed prospects.
+
+    python -m backend.benchmarks.autodraft_benchmark --leagues 1000 --picks 5000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import event
+
+from .. import create_app
+from ..config import Config
+from ..models import db
+from .synthetic import generate_dataset
+
+
+def run(database_url, num_leagues, num_picks, seed=7):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DEBUG = False
+        PICK_CLOCK_ENABLED = False
+        AUTODRAFT_MAX_LEAGUES = num_leagues
+        DRAFT_STATE_MAX_LEAGUES = num_leagues
+        DRAFT_STATE_MAX_PICKS = num_leagues * 180
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        league_ids = generate_dataset(
+            num_leagues=num_leagues, prospects_per_pick=4, drafted_fraction=0.25, trades_per_league=0, seed=seed
+        )
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        db.session.remove()
+
+    client = app.test_client()
+    rng = random.Random(seed)
+    cold, warm = [], []
+    seen = set()
+    for _ in range(num_picks):
+        league_id = rng.choice(league_ids)
+        del statements[:]
+        started = time.perf_counter()
+        response = client.post('/api/draft/autopick', json={'league_id': league_id})
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            continue
+        (warm if league_id in seen else cold).append((elapsed, len(statements)))
+        seen.add(league_id)
+    return cold, warm
+
+
+def report(label, samples):
+    if not samples:
+        return
+    timings = sorted(elapsed for elapsed, _ in samples)
+    print(f'{label}: {len(samples)} auto-picks')
+    print(f'  mean {statistics.fmean(timings):.2f} ms  p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms')
+    print(f'  statements per auto-pick: {statistics.fmean(count for _, count in samples):.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leagues', type=int, default=1000)
+    parser.add_argument('--picks', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cold, warm = run(f'sqlite:///{os.path.join(directory, "autodraft.db")}', args.leagues, args.picks)
+
+    report('First auto-pick in a league', cold)
+    report('Later auto-picks', warm)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""Reads and writes from concurrent worker processes on one SQLite file.
+
+Starts writer processes that auto-pick and undo in their own league, and
+reader processes that page through prospect lists, the way gunicorn
+workers share the database on draft night. Each database profile runs on
+a fresh copy of the same dataset. The report shows the throughput, latency
+and failed requests of each role, first with the development settings
+(rollback journal) and then with the production ones (WAL, busy timeout).
+
+    python -m backend.benchmarks.concurrency_benchmark --writers 4 --readers 4 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from .. import create_app
+from ..config import CONFIGS
+from ..models import db
+from ..pagination import _encode_cursor
+from .synthetic import generate_dataset
+
+# A large write transaction, like a commissioner importing rankings mid-draft
+IMPORT_CSV = 'name,position,college\n' + ''.join(f'Imported Prospect {n},WR,Iowa\n' for n in range(5000))
+IMPORT_PAUSE_SECONDS = 2
+
+
+def benchmark_config(profile, database_url):
+    class BenchmarkConfig(CONFIGS[profile]):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DEBUG = False
+        PICK_CLOCK_ENABLED = False
+        METRICS_ENABLED = False
+        SIMULATION_WORKERS = 1
+
+    return BenchmarkConfig
+
+
+def worker(profile, database_url, role, league_ids, barrier, seconds, results):
+    app = create_app(benchmark_config(profile, database_url))
+    client = app.test_client()
+    timings, errors, first_error = [], 0, None
+    # Every process starts its requests once all of them have started up
+    barrier.wait()
+    end = time.time() + seconds
+    n = 0
+    while time.time() < end:
+        league_id = league_ids[n % len(league_ids)]
+        if role == 'writer':
+            path, kwargs = ('/api/draft/autopick', '/api/draft/undo')[n % 2], {'json': {'league_id': league_id}}
+            method = 'POST'
+        elif role == 'importer':
+            path, method = f'/api/prospects/import?league_id={league_id}', 'POST'
+            kwargs = {'data': IMPORT_CSV, 'content_type': 'text/csv'}
+        else:
+            path, kwargs, method = f'/api/prospects?league_id={league_id}&limit=100&cursor={_cursor(n)}', {}, 'GET'
+        started = time.perf_counter()
+        response = client.open(path, method=method, **kwargs)
+        timings.append((time.perf_counter() - started) * 1000)
+        if response.status_code not in (200, 201):
+            errors += 1
+            if first_error is None:
+                first_error = f'{response.status_code} {response.get_data(as_text=True)[:200]}'
+        if role == 'importer':
+            time.sleep(IMPORT_PAUSE_SECONDS)
+        n += 1
+    results.put((role, timings, errors, first_error))
+
+
+def _cursor(n):
+    # Start each page at a different id so reads are not all served from one page
+    return _encode_cursor([n * 37 % 500])
+
+
+def build_dataset(path, num_leagues):
+    app = create_app(benchmark_config('development', f'sqlite:///{path}'))
+    with app.app_context():
+        db.create_all()
+        league_ids = generate_dataset(
+            num_leagues=num_leagues, prospects_per_pick=4, drafted_fraction=0.25, trades_per_league=0
+        )
+        db.session.remove()
+        db.engine.dispose()
+    return league_ids
+
+
+def run(directory, profile, template, league_ids, num_writers, num_readers, num_importers, seconds):
+    path = os.path.join(directory, f'{profile}.db')
+    shutil.copyfile(template, path)
+    database_url = f'sqlite:///{path}'
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    barrier = context.Barrier(num_writers + num_readers + num_importers)
+    leagues = {
+        'writer': lambda n: league_ids[n:-1:num_writers],
+        'reader': lambda n: league_ids[:-1],
+        # Imports go to a league of their own, which nobody drafts in or reads
+        'importer': lambda n: league_ids[-1:]
+    }
+    processes = [
+        context.Process(target=worker, args=(
+            profile, database_url, role, leagues[role](n), barrier, seconds, results
+        ))
+        for role, count in (('writer', num_writers), ('reader', num_readers), ('importer', num_importers))
+        for n in range(count)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {}
+    for role in ('writer', 'reader', 'importer'):
+        timings = sorted(timing for name, role_timings, _, _ in collected if name == role for timing in role_timings)
+        errors = sum(count for name, _, count, _ in collected if name == role)
+        first_error = next((error for name, _, _, error in collected if name == role and error), None)
+        summary[role] = {
+            'requests': len(timings),
+            'per_second': len(timings) / seconds,
+            'p50_ms': statistics.median(timings) if timings else 0.0,
+            'p99_ms': timings[int(len(timings) * 0.99) - 1] if timings else 0.0,
+            'max_ms': timings[-1] if timings else 0.0,
+            'errors': errors,
+            'first_error': first_error
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--importers', type=int, default=1)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--profiles', nargs='+', default=['development', 'production'], choices=sorted(CONFIGS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        template = os.path.join(directory, 'template.db')
+        league_ids = build_dataset(template, max(args.writers, 1) + 1)
+        print(f'{"profile":<12} {"role":<8} {"req/s":>8} {"p50":>9} {"p99":>9} {"max":>9} {"errors":>7}')
+        for profile in args.profiles:
+            summary = run(
+                directory, profile, template, league_ids, args.writers, args.readers, args.importers, args.seconds
+            )
+            for role, result in summary.items():
+                if not result['requests']:
+                    continue
+                print(
+                    f'{profile:<12} {role:<8} {result["per_second"]:>8.1f} {result["p50_ms"]:>6.1f} ms '
+                    f'{result["p99_ms"]:>6.1f} ms {result["max_ms"]:>6.1f} ms {result["errors"]:>7}'
+                )
+                if result['first_error']:
+                    print(f'{"":<22} first error: {result["first_error"]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Broadcast fan-out of the WebSocket draft room to many connections.
+
+Opens the given number of sockets on one league through the room's ASGI
+interface (no network), makes picks through the REST API and measures how
+long each pick's event takes to reach every socket, plus the process's
+memory per connection.
+
+    python -m backend.benchmarks.draft_room_benchmark --connections 5000 --picks 50
+"""
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import tempfile
+import time
+
+from .. import create_app
+from ..draft_room import ROOM_PATH, DraftRoom
+from ..models import db
+from .concurrency_benchmark import benchmark_config
+from .synthetic import generate_dataset
+
+
+async def open_socket(room, league_id, delivered):
+    incoming = asyncio.Queue()
+
+    async def send(message):
+        if message['type'] == 'websocket.send':
+            frame = json.loads(message['text'])
+            if frame['type'] == 'events':
+                delivered(len(frame['events']))
+
+    scope = {'type': 'websocket', 'path': ROOM_PATH, 'query_string': f'league_id={league_id}'.encode()}
+    task = asyncio.ensure_future(room(scope, incoming.get, send))
+    await incoming.put({'type': 'websocket.connect'})
+    return incoming, task
+
+
+async def run(app, league_id, num_connections, num_picks):
+    room = DraftRoom(app)
+    client = app.test_client()
+    received = [0]
+    done = asyncio.Event()
+
+    def delivered(count):
+        received[0] += count
+        if received[0] >= num_connections:
+            done.set()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    sockets = [await open_socket(room, league_id, delivered) for _ in range(num_connections)]
+    while room.connection_count(league_id) < num_connections:
+        await asyncio.sleep(0.01)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    for _ in range(num_picks):
+        received[0] = 0
+        done.clear()
+        started = time.perf_counter()
+        response = client.post('/api/draft/autopick', json={'league_id': league_id})
+        if response.status_code != 200:
+            raise SystemExit(f'autopick failed: {response.status_code} {response.get_data(as_text=True)}')
+        await done.wait()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    for incoming, task in sockets:
+        await incoming.put({'type': 'websocket.disconnect', 'code': 1000})
+    await asyncio.gather(*(task for _, task in sockets))
+    room.close()
+    return timings, (rss_after - rss_before) * 1024 / num_connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=5000)
+    parser.add_argument('--picks', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile(suffix='.db') as database:
+        app = create_app(benchmark_config('development', f'sqlite:///{database.name}'))
+        # Broadcast as soon as possible, so the timings are the fan-out itself
+        app.config['DRAFT_ROOM_BATCH_MS'] = 0
+        with app.app_context():
+            db.create_all()
+            league_id = generate_dataset(num_leagues=1, prospects_per_pick=4, drafted_fraction=0, trades_per_league=0)[0]
+            db.session.remove()
+
+        timings, bytes_per_connection = asyncio.run(run(app, league_id, args.connections, args.picks))
+
+    timings.sort()
+    print(f'{args.connections} connections, {args.picks} picks')
+    print(f'pick to last socket: p50 {statistics.median(timings):.1f} ms, '
+          f'p99 {timings[int(len(timings) * 0.99) - 1]:.1f} ms, max {timings[-1]:.1f} ms')
+    print(f'memory per connection: {bytes_per_connection / 1024:.1f} KB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,480 @@
+"""Latency and SQL statement counts of every API route on a synthetic dataset.
+
+Builds leagues with ``synthetic.generate_dataset`` and sends each route of
+every blueprint a series of requests through the Flask test client. It
+records p50/p95/p99 latency and the most SQL statements any one request ran.
+Requests that change data are set up and undone around the timed call, so
+every request of a route does the same work.
+
+Results can be saved as a baseline and compared with later runs, per
+database dialect. A draft-night route fails the comparison when it runs
+more statements than its baseline or when its p95 grew by more than the
+tolerance. Other routes only report the regression. Point
+``--database-url`` at a scratch database: the tables are created for the
+run and dropped afterwards.
+
+    python -m backend.benchmarks.endpoint_benchmark --save-baseline backend/benchmarks/baseline.json
+    python -m backend.benchmarks.endpoint_benchmark --baseline backend/benchmarks/baseline.json \\
+        --database-url postgresql://localhost/draft_benchmark
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import event
+
+from .. import create_app
+from ..config import Config
+from ..models import db
+from .synthetic import generate_dataset
+
+DATASET_DEFAULTS = {
+    'num_leagues': 20,
+    'num_teams': 12,
+    'num_rounds': 15,
+    'prospects_per_pick': 4,
+    'trades_per_league': 20
+}
+# p95 may exceed its baseline by this fraction, plus this many milliseconds
+# so that sub-millisecond routes do not fail on timer noise
+DEFAULT_TOLERANCE = 0.5
+LATENCY_SLACK_MS = 1.0
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class Scenario:
+    """How to call one route: an untimed ``setup``, the timed request ``build``
+    makes from its result, and an untimed ``cleanup`` that undoes it."""
+
+    def __init__(self, method, rule, build, status=200, setup=None, cleanup=None,
+                 draft_night=False, requests=None, stream=False):
+        self.method = method
+        self.rule = rule
+        self.build = build
+        self.status = status
+        self.setup = setup
+        self.cleanup = cleanup
+        self.draft_night = draft_night
+        self.requests = requests
+        self.stream = stream
+
+    @property
+    def name(self):
+        return f'{self.method} {self.rule}'
+
+
+class Dataset:
+    """The generated leagues and an untimed way to call the API on them.
+
+    The first league is only read from. Picks, undo and redo happen in the
+    second, and rows are added to and removed from the third. The fourth
+    has a long draft history for past-state reads.
+    """
+
+    def __init__(self, client, league_ids, num_teams, num_rounds):
+        self.client = client
+        self.read_league, self.write_league, self.scratch_league, self.history_league = league_ids[:4]
+        self.num_teams = num_teams
+        self.num_rounds = num_rounds
+        self.counter = 0
+
+        league = self.call('GET', f'/api/leagues/{self.read_league}?include_relations=true')
+        self.team_ids = [team['id'] for team in league['teams']]
+        self.pick_id = league['draft_picks'][0]['id']
+        self.prospect_id = league['prospects'][0]['id']
+        self.trade_id = self.call('GET', f'/api/trades?league_id={self.read_league}&limit=1')[0]['id']
+        self.write_teams = [team['id'] for team in self.call('GET', f'/api/teams?league_id={self.write_league}')]
+        self.scratch_picks = self.call('GET', f'/api/draft/picks?league_id={self.scratch_league}')
+        self.scratch_prospect = self.call('POST', '/api/prospects', json={
+            'name': 'Benchmark Prospect', 'position': 'QB', 'league_id': self.scratch_league
+        })['id']
+
+        history = self.call('GET', f'/api/leagues/{self.history_league}')
+        made = min(history['total_picks'] - history['current_pick_number'], 60)
+        for _ in range(made):
+            self.call('POST', '/api/draft/autopick', json={'league_id': self.history_league})
+        self.history_pick = history['current_pick_number'] + made // 2
+
+    def call(self, method, path, **kwargs):
+        response = self.client.open(path, method=method, **kwargs)
+        if response.status_code >= 300:
+            raise BenchmarkError(f'{method} {path} returned {response.status_code}: {response.get_data(as_text=True)}')
+        return response.get_json()
+
+    def unique(self, prefix):
+        self.counter += 1
+        return f'{prefix} {self.counter}'
+
+    def new_league(self, num_teams=None, num_rounds=None):
+        league_id = self.call('POST', '/api/leagues', json={
+            'name': self.unique('Benchmark League'),
+            'num_rounds': self.num_rounds if num_rounds is None else num_rounds
+        })['id']
+        return league_id, num_teams or self.num_teams
+
+    def initialized_league(self, num_teams=None, num_rounds=None):
+        league_id, num_teams = self.new_league(num_teams, num_rounds)
+        return self.call('POST', f'/api/leagues/{league_id}/initialize', json={'teams': teams_json(num_teams)})
+
+    def available(self, league_id, count):
+        prospects = self.call('GET', f'/api/prospects?league_id={league_id}&is_drafted=false&limit={count}')
+        return [prospect['id'] for prospect in prospects]
+
+    def current_pick(self, league_id):
+        return self.call('GET', f'/api/draft/current?league_id={league_id}')
+
+    def batch(self, league_id, size):
+        league = self.call('GET', f'/api/leagues/{league_id}')
+        size = min(size, league['total_picks'] - league['current_pick_number'] + 1)
+        return league['current_pick_number'], self.available(league_id, size)
+
+    def make_pick(self, league_id):
+        return self.call('POST', '/api/draft/execute', json=pick_json(self, league_id))
+
+    def undo(self, league_id, times=1):
+        for _ in range(times):
+            self.call('POST', '/api/draft/undo', json={'league_id': league_id})
+
+    def last_pick_trade(self, league_id, picks):
+        pick = self.call('GET', f'/api/draft/picks/{picks[-1]["id"]}')
+        teams = {entry['current_team_id'] for entry in picks}
+        to_team = min(teams - {pick['current_team_id']})
+        return {
+            'from_team_id': pick['current_team_id'],
+            'to_team_id': to_team,
+            'pick_ids': [pick['id']],
+            'league_id': league_id
+        }
+
+
+def teams_json(num_teams):
+    return [{'name': f'Team {number}'} for number in range(1, num_teams + 1)]
+
+
+def pick_json(data, league_id):
+    return {
+        'league_id': league_id,
+        'prospect_id': data.available(league_id, 1)[0],
+        'team_id': data.current_pick(league_id)['current_team_id']
+    }
+
+
+def get(path):
+    return lambda data, prepared: {'path': path(data)}
+
+
+def scenarios():
+    """One scenario for every method of every route."""
+    return [
+        # Leagues
+        Scenario('GET', '/api/leagues', get(lambda data: '/api/leagues?limit=100')),
+        Scenario('POST', '/api/leagues', lambda data, prepared: {
+            'json': {'name': data.unique('Benchmark League'), 'num_rounds': data.num_rounds}
+        }, status=201),
+        Scenario('POST', '/api/leagues/batch', lambda data, prepared: {'json': {'leagues': [
+            {'name': data.unique('Batch League'), 'num_rounds': data.num_rounds, 'teams': teams_json(data.num_teams)}
+            for _ in range(10)
+        ]}}, status=201, requests=10),
+        Scenario('GET', '/api/leagues/<int:league_id>', get(lambda data: f'/api/leagues/{data.read_league}')),
+        Scenario('PUT', '/api/leagues/<int:league_id>', lambda data, prepared: {
+            'path': f'/api/leagues/{data.write_league}', 'json': {'description': data.unique('Edited')}
+        }),
+        Scenario('DELETE', '/api/leagues/<int:league_id>', lambda data, prepared: {
+            'path': f'/api/leagues/{prepared["id"]}'
+        }, setup=lambda data: data.initialized_league(), requests=10),
+        Scenario('GET', '/api/leagues/<int:league_id>/snapshot',
+                 get(lambda data: f'/api/leagues/{data.read_league}/snapshot')),
+        Scenario('GET', '/api/leagues/<int:league_id>/changes',
+                 get(lambda data: f'/api/leagues/{data.read_league}/changes?since=1'), draft_night=True),
+        Scenario('POST', '/api/leagues/<int:league_id>/initialize', lambda data, prepared: {
+            'path': f'/api/leagues/{prepared[0]}/initialize', 'json': {'teams': teams_json(prepared[1])}
+        }, status=201, setup=lambda data: data.new_league(), requests=10),
+        Scenario('POST', '/api/leagues/<int:league_id>/simulate', lambda data, prepared: {
+            'path': f'/api/leagues/{data.read_league}/simulate',
+            'json': {'team_id': data.team_ids[-1], 'simulations': 200, 'seed': 1}
+        }, requests=10),
+
+        # Teams
+        Scenario('GET', '/api/teams', get(lambda data: f'/api/teams?league_id={data.read_league}')),
+        Scenario('GET', '/api/teams/<int:team_id>', get(lambda data: f'/api/teams/{data.team_ids[0]}')),
+        Scenario('PUT', '/api/teams/<int:team_id>', lambda data, prepared: {
+            'path': f'/api/teams/{data.write_teams[0]}', 'json': {'name': data.unique('Team')}
+        }),
+        Scenario('DELETE', '/api/teams/<int:team_id>', lambda data, prepared: {
+            'path': f'/api/teams/{prepared["teams"][0]["id"]}'
+        }, setup=lambda data: data.initialized_league(num_teams=2, num_rounds=0), requests=10),
+        Scenario('GET', '/api/teams/<int:team_id>/roster',
+                 get(lambda data: f'/api/teams/{data.team_ids[0]}/roster')),
+
+        # Prospects
+        Scenario('GET', '/api/prospects', get(lambda data: f'/api/prospects?league_id={data.read_league}&limit=100')),
+        Scenario('POST', '/api/prospects', lambda data, prepared: {'json': {
+            'name': data.unique('Prospect'), 'position': 'WR', 'league_id': data.scratch_league
+        }}, status=201),
+        Scenario('POST', '/api/prospects/bulk', lambda data, prepared: {'json': {
+            'league_id': data.scratch_league,
+            'prospects': [{'name': data.unique('Prospect'), 'position': 'RB'} for _ in range(100)]
+        }}, status=201),
+        Scenario('POST', '/api/prospects/import', lambda data, prepared: {
+            'path': f'/api/prospects/import?league_id={data.scratch_league}',
+            'data': 'name,position,college\n' + ''.join(f'{data.unique("Prospect")},TE,Iowa\n' for _ in range(100)),
+            'content_type': 'text/csv'
+        }, status=201),
+        Scenario('GET', '/api/prospects/search',
+                 get(lambda data: f'/api/prospects/search?league_id={data.read_league}&q=jo'), draft_night=True),
+        Scenario('GET', '/api/prospects/<int:prospect_id>',
+                 get(lambda data: f'/api/prospects/{data.prospect_id}')),
+        Scenario('PUT', '/api/prospects/<int:prospect_id>', lambda data, prepared: {
+            'path': f'/api/prospects/{data.scratch_prospect}', 'json': {'college': data.unique('College')}
+        }),
+        Scenario('DELETE', '/api/prospects/<int:prospect_id>', lambda data, prepared: {
+            'path': f'/api/prospects/{prepared["id"]}'
+        }, setup=lambda data: data.call('POST', '/api/prospects', json={
+            'name': data.unique('Prospect'), 'position': 'K', 'league_id': data.scratch_league
+        })),
+
+        # Draft
+        Scenario('GET', '/api/draft/picks',
+                 get(lambda data: f'/api/draft/picks?league_id={data.read_league}'), draft_night=True),
+        Scenario('GET', '/api/draft/picks/<int:pick_id>', get(lambda data: f'/api/draft/picks/{data.pick_id}')),
+        Scenario('GET', '/api/draft/picks/<int:pick_id>/history',
+                 get(lambda data: f'/api/draft/picks/{data.pick_id}/history')),
+        Scenario('GET', '/api/draft/current',
+                 get(lambda data: f'/api/draft/current?league_id={data.read_league}'), draft_night=True),
+        Scenario('POST', '/api/draft/execute', lambda data, prepared: {'json': prepared},
+                 setup=lambda data: pick_json(data, data.write_league),
+                 cleanup=lambda data, prepared: data.undo(data.write_league), draft_night=True),
+        Scenario('POST', '/api/draft/execute-batch', lambda data, prepared: {'json': {
+            'league_id': data.write_league,
+            'picks': [
+                {'pick_number': prepared[0] + offset, 'prospect_id': prospect_id}
+                for offset, prospect_id in enumerate(prepared[1])
+            ]
+        }}, setup=lambda data: data.batch(data.write_league, 10), cleanup=lambda data, prepared: data.undo(data.write_league), draft_night=True),
+        Scenario('POST', '/api/draft/autopick', lambda data, prepared: {'json': {'league_id': data.write_league}},
+                 cleanup=lambda data, prepared: data.undo(data.write_league), draft_night=True),
+        Scenario('POST', '/api/draft/skip', lambda data, prepared: {'json': {'league_id': data.write_league}},
+                 cleanup=lambda data, prepared: data.undo(data.write_league), draft_night=True),
+        Scenario('POST', '/api/draft/undraft', lambda data, prepared: {'json': {
+            'league_id': data.write_league, 'prospect_id': prepared['prospect']['id']
+        }}, setup=lambda data: data.make_pick(data.write_league),
+            cleanup=lambda data, prepared: data.undo(data.write_league, times=2), draft_night=True),
+        Scenario('POST', '/api/draft/undo', lambda data, prepared: {'json': {'league_id': data.write_league}},
+                 setup=lambda data: data.make_pick(data.write_league), draft_night=True),
+        Scenario('POST', '/api/draft/redo', lambda data, prepared: {'json': {'league_id': data.write_league}},
+                 setup=lambda data: (data.make_pick(data.write_league), data.undo(data.write_league)),
+                 cleanup=lambda data, prepared: data.undo(data.write_league), draft_night=True),
+        Scenario('GET', '/api/draft/events', get(lambda data: f'/api/draft/events?league_id={data.history_league}&limit=100')),
+        Scenario('GET', '/api/draft/history',
+                 get(lambda data: f'/api/draft/history?league_id={data.history_league}&pick_number={data.history_pick}')),
+        Scenario('GET', '/api/draft/clock',
+                 get(lambda data: f'/api/draft/clock?league_id={data.read_league}'), draft_night=True),
+        Scenario('GET', '/api/draft/stream', get(lambda data: f'/api/draft/stream?league_id={data.read_league}'),
+                 draft_night=True, stream=True),
+
+        # Trades
+        Scenario('GET', '/api/trades', get(lambda data: f'/api/trades?league_id={data.read_league}')),
+        Scenario('POST', '/api/trades', lambda data, prepared: {'json': prepared},
+                 setup=lambda data: data.last_pick_trade(data.write_league, data.call(
+                     'GET', f'/api/draft/picks?league_id={data.write_league}'
+                 )),
+                 cleanup=lambda data, prepared: data.undo(data.write_league), status=201, draft_night=True),
+        Scenario('GET', '/api/trades/<int:trade_id>', get(lambda data: f'/api/trades/{data.trade_id}')),
+        Scenario('DELETE', '/api/trades/<int:trade_id>', lambda data, prepared: {
+            'path': f'/api/trades/{prepared["trade"]["id"]}'
+        }, setup=lambda data: data.call(
+            'POST', '/api/trades', json=data.last_pick_trade(data.scratch_league, data.scratch_picks)
+        )),
+        Scenario('POST', '/api/trades/evaluate', lambda data, prepared: {'json': {
+            'league_id': data.read_league,
+            'trades': [
+                {'from_team_id': data.team_ids[0], 'to_team_id': data.team_ids[1], 'future_picks': [
+                    {'pick_number': number, 'years_out': 1}
+                ]}
+                for number in range(1, 51)
+            ]
+        }}),
+        Scenario('GET', '/api/trades/value-chart', get(lambda data: f'/api/trades/value-chart?league_id={data.read_league}')),
+
+        # Metrics
+        Scenario('GET', '/api/metrics', get(lambda data: '/api/metrics')),
+    ]
+
+
+def uncovered_routes(app, suite):
+    """(method, rule) pairs of the app that no scenario calls."""
+    covered = {(scenario.method, scenario.rule) for scenario in suite}
+    routes = {
+        (method, rule.rule)
+        for rule in app.url_map.iter_rules() if rule.endpoint != 'static'
+        for method in rule.methods - {'HEAD', 'OPTIONS'}
+    }
+    return sorted(routes - covered)
+
+
+def measure(client, data, scenario, requests, statements):
+    timings, counts = [], []
+    # The first request warms the per-league caches and is not recorded
+    for n in range((scenario.requests or requests) + 1):
+        prepared = scenario.setup(data) if scenario.setup else None
+        kwargs = scenario.build(data, prepared)
+        kwargs.setdefault('path', scenario.rule)
+        del statements[:]
+        started = time.perf_counter()
+        response = client.open(method=scenario.method, **kwargs)
+        if scenario.stream:
+            next(iter(response.response))
+        elapsed = (time.perf_counter() - started) * 1000
+        count = len(statements)
+        if scenario.stream:
+            response.close()
+        if response.status_code != scenario.status:
+            raise BenchmarkError(
+                f'{scenario.name} returned {response.status_code}: {response.get_data(as_text=True)[:500]}'
+            )
+        if scenario.cleanup:
+            scenario.cleanup(data, prepared)
+        if n:
+            timings.append(elapsed)
+            counts.append(count)
+
+    percentiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+    return {
+        'requests': len(timings),
+        'p50_ms': round(percentiles[49], 3),
+        'p95_ms': round(percentiles[94], 3),
+        'p99_ms': round(percentiles[98], 3),
+        'statements': max(counts),
+        'draft_night': scenario.draft_night
+    }
+
+
+def run(database_url, requests=50, dataset=None, only=None):
+    """Benchmark every route and return ``(dialect, dataset, results by route)``."""
+    dataset = dict(DATASET_DEFAULTS, **(dataset or {}))
+    if dataset['num_leagues'] < 4 or dataset['trades_per_league'] < 1 or dataset['num_teams'] < 2:
+        raise BenchmarkError('The suite needs at least 4 leagues of 2 teams with a trade each')
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DEBUG = False
+        PICK_CLOCK_ENABLED = False
+        SIMULATION_WORKERS = 1
+
+    app = create_app(BenchmarkConfig)
+    suite = scenarios()
+    missing = uncovered_routes(app, suite)
+    if missing:
+        raise BenchmarkError(f'No benchmark scenario for {", ".join(" ".join(route) for route in missing)}')
+    if only:
+        suite = [scenario for scenario in suite if any(part in scenario.name for part in only)]
+
+    with app.app_context():
+        db.create_all()
+        try:
+            league_ids = generate_dataset(drafted_fraction=0.5, **dataset)
+            db.session.remove()
+            statements = []
+            event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+            client = app.test_client()
+            data = Dataset(client, league_ids, dataset['num_teams'], dataset['num_rounds'])
+            results = {scenario.name: measure(client, data, scenario, requests, statements) for scenario in suite}
+            return db.engine.dialect.name, dataset, results
+        finally:
+            app.extensions['simulation'].shutdown()
+            db.session.remove()
+            db.drop_all()
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Regressions against a baseline as ``(route, draft_night, description)``."""
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['statements'] > expected['statements']:
+            regressions.append((name, result['draft_night'],
+                                f'statements {expected["statements"]} -> {result["statements"]}'))
+        if result['p95_ms'] > expected['p95_ms'] * (1 + tolerance) + LATENCY_SLACK_MS:
+            regressions.append((name, result['draft_night'],
+                                f'p95 {expected["p95_ms"]:.2f} ms -> {result["p95_ms"]:.2f} ms'))
+    return regressions
+
+
+def report(dialect, results):
+    print(f'{dialect}: {"route":<52} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"stmts":>6}')
+    for name, result in results.items():
+        marker = '*' if result['draft_night'] else ' '
+        print(f'{marker}{" " * len(dialect)} {name:<52} {result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} '
+              f'{result["p99_ms"]:>8.2f} {result["statements"]:>6}')
+    print('* draft-night route')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', action='append', dest='database_urls',
+                        help='Database to run against; repeat for several (default: a temporary SQLite file)')
+    parser.add_argument('--requests', type=int, default=50, help='Timed requests per route')
+    parser.add_argument('--leagues', type=int, default=DATASET_DEFAULTS['num_leagues'])
+    parser.add_argument('--teams', type=int, default=DATASET_DEFAULTS['num_teams'])
+    parser.add_argument('--rounds', type=int, default=DATASET_DEFAULTS['num_rounds'])
+    parser.add_argument('--prospects-per-pick', type=int, default=DATASET_DEFAULTS['prospects_per_pick'])
+    parser.add_argument('--trades', type=int, default=DATASET_DEFAULTS['trades_per_league'])
+    parser.add_argument('--only', nargs='+', help='Only routes whose "METHOD /rule" contains one of these')
+    parser.add_argument('--baseline', help='Compare with the results stored in this file')
+    parser.add_argument('--save-baseline', help='Store the results in this file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Fraction by which p95 may exceed the baseline')
+    args = parser.parse_args()
+
+    dataset = {
+        'num_leagues': args.leagues,
+        'num_teams': args.teams,
+        'num_rounds': args.rounds,
+        'prospects_per_pick': args.prospects_per_pick,
+        'trades_per_league': args.trades
+    }
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    runs = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for database_url in args.database_urls or [f'sqlite:///{os.path.join(directory, "endpoints.db")}']:
+            dialect, dataset, results = run(database_url, args.requests, dataset, args.only)
+            runs[dialect] = {'dataset': dataset, 'results': results}
+            report(dialect, results)
+
+    failed = False
+    for dialect, measured in runs.items():
+        stored = baseline.get(dialect)
+        if stored is None:
+            continue
+        if stored['dataset'] != measured['dataset']:
+            print(f'{dialect}: the baseline was recorded on a different dataset: {stored["dataset"]}')
+            failed = True
+            continue
+        for name, draft_night, description in compare(measured['results'], stored['results'], args.tolerance):
+            print(f'{dialect}: {"REGRESSION" if draft_night else "slower"} {name}: {description}')
+            failed = failed or draft_night
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(dict(baseline, **runs), f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Query plans and latency of the draft hot paths before and after the index migration.
+
+Builds a synthetic dataset on the schema just before the index migration,
+measures the per-league lookups the API makes while drafting, upgrades to
+the index revision and measures them again.
+
+    python -m backend.benchmarks.index_benchmark --leagues 500 --repeat 2000
+
+Pass ``--database`` to run against another database; it must be empty.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from flask_migrate import upgrade
+
+from .. import create_app
+from ..config import Config
+from ..models import db, Team, Prospect, DraftPick, Trade
+from .synthetic import generate_dataset
+
+# The revision just before INDEX_REVISION
+BASELINE_REVISION = '0c5b7e9f3d61'
+INDEX_REVISION = '8102ed9bbf22'
+
+
+def hot_path_queries(num_picks, max_prospect_id):
+    """The lookups made by execute, undraft, current pick and the list endpoints."""
+    return {
+        'current pick': lambda rng, league_id: db.select(DraftPick.id).where(
+            DraftPick.league_id == league_id, DraftPick.pick_number == rng.randint(1, num_picks)
+        ),
+        'pick by prospect': lambda rng, league_id: db.select(DraftPick.id).where(
+            DraftPick.league_id == league_id, DraftPick.prospect_id == rng.randint(1, max_prospect_id)
+        ),
+        'available by position': lambda rng, league_id: db.select(Prospect.id, Prospect.name).where(
+            Prospect.league_id == league_id, Prospect.position == 'WR', Prospect.is_drafted == False  # noqa: E712
+        ).order_by(Prospect.id).limit(50),
+        'teams in order': lambda rng, league_id: db.select(Team.id, Team.name).where(
+            Team.league_id == league_id
+        ).order_by(Team.draft_order, Team.id),
+        'recent trades': lambda rng, league_id: db.select(Trade.id, Trade.executed_at).where(
+            Trade.league_id == league_id
+        ).order_by(Trade.executed_at.desc(), Trade.id.desc()).limit(20),
+    }
+
+
+def query_plan(statement):
+    compiled = statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    prefix = 'EXPLAIN QUERY PLAN ' if db.engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    rows = db.session.execute(db.text(prefix + str(compiled))).all()
+    return [row[-1] for row in rows]
+
+
+def measure(queries, league_ids, repeat, seed):
+    results = {}
+    for name, build in queries.items():
+        rng = random.Random(seed)
+        timings = []
+        for _ in range(repeat):
+            statement = build(rng, rng.choice(league_ids))
+            started = time.perf_counter()
+            db.session.execute(statement).all()
+            timings.append((time.perf_counter() - started) * 1e6)
+        timings.sort()
+        results[name] = {
+            'plan': query_plan(build(random.Random(seed), league_ids[0])),
+            'mean_us': statistics.fmean(timings),
+            'p95_us': timings[int(len(timings) * 0.95) - 1],
+        }
+    return results
+
+
+def run(database_url, num_leagues, repeat, seed=7):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DEBUG = False
+        PICK_CLOCK_ENABLED = False
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        upgrade(revision=BASELINE_REVISION)
+        started = time.perf_counter()
+        league_ids = generate_dataset(num_leagues=num_leagues, seed=seed, baseline=True)
+        print(f'Generated {num_leagues} leagues in {time.perf_counter() - started:.1f}s')
+        queries = hot_path_queries(
+            db.session.execute(db.select(db.func.max(DraftPick.pick_number))).scalar(),
+            db.session.execute(db.select(db.func.max(Prospect.id))).scalar()
+        )
+
+        before = measure(queries, league_ids, repeat, seed)
+        db.session.commit()
+        upgrade(revision=INDEX_REVISION)
+        if db.engine.dialect.name == 'sqlite':
+            db.session.execute(db.text('ANALYZE'))
+            db.session.commit()
+        after = measure(queries, league_ids, repeat, seed)
+        db.session.remove()
+    return before, after
+
+
+def report(before, after):
+    for name in before:
+        print(f'\n{name}')
+        print(f'  before: {before[name]["mean_us"]:9.1f} us mean  {before[name]["p95_us"]:9.1f} us p95')
+        for line in before[name]['plan']:
+            print(f'          {line}')
+        print(f'  after:  {after[name]["mean_us"]:9.1f} us mean  {after[name]["p95_us"]:9.1f} us p95'
+              f'  ({before[name]["mean_us"] / after[name]["mean_us"]:.1f}x)')
+        for line in after[name]['plan']:
+            print(f'          {line}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leagues', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--database', help='SQLAlchemy URL of an empty database (default: temporary SQLite file)')
+    args = parser.parse_args()
+
+    if args.database:
+        report(*run(args.database, args.leagues, args.repeat))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        report(*run(f'sqlite:///{os.path.join(directory, "benchmark.db")}', args.leagues, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
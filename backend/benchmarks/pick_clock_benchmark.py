@@ -0,0 +1,167 @@
+"""Timing accuracy of the pick clock with many drafts running at once.
+
+The scheduler run keeps ``--clocks`` clocks running on one clock thread,
+each re-armed for a random 1 to ``--seconds`` seconds whenever it runs
+out, and reports how late each clock ran out. The database run starts
+``--leagues`` synthetic drafts with ``--pick-seconds`` clocks on a SQLite
+file and lets every pick expire into an auto-pick for ``--duration``
+seconds, starting from deadlines spread over the first clock. It reports
+how late each auto-pick started and finished, and how many expiries per
+second one worker kept up with.
+
+    python -m backend.benchmarks.pick_clock_benchmark --clocks 10000 --leagues 1000 --pick-seconds 30
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from .. import create_app
+from ..config import CONFIGS
+from ..models import db, League
+from ..pick_clock import PickClock
+from .synthetic import generate_dataset
+
+
+class SchedulerClock(PickClock):
+    """A clock whose expiries only re-arm, to time the scheduler on its own."""
+
+    def __init__(self, app, clocks, seconds, expiries, seed):
+        super().__init__(app)
+        self.seconds = seconds
+        self.remaining = expiries
+        self.rng = random.Random(seed)
+        self.deadlines = {}
+        self.lateness = []
+        self.done = threading.Event()
+        now = time.time()
+        for league_id in range(clocks):
+            self.arm(league_id, 1, now)
+
+    def arm(self, league_id, pick_number, now):
+        self.deadlines[league_id] = now + self.rng.uniform(1, self.seconds)
+        self.schedule(league_id, pick_number, self.deadlines[league_id])
+
+    def rearm(self, league_ids=None):
+        pass
+
+    def expire(self, league_id, pick_number):
+        now = time.time()
+        self.lateness.append(now - self.deadlines[league_id])
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.done.set()
+        self.arm(league_id, pick_number + 1, now)
+
+
+class DatabaseClock(PickClock):
+    """A clock that times each expiry it runs against the database."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.deadlines = {}
+        self.started_late = []
+        self.finished_late = []
+
+    def schedule(self, league_id, pick_number, deadline):
+        self.deadlines[league_id] = deadline
+        super().schedule(league_id, pick_number, deadline)
+
+    def expire(self, league_id, pick_number):
+        deadline = self.deadlines[league_id]
+        self.started_late.append(time.time() - deadline)
+        result = super().expire(league_id, pick_number)
+        if result is not None and result[1] == 200:
+            self.finished_late.append(time.time() - deadline)
+        return result
+
+
+def benchmark_config(database_url, profile='production'):
+    class BenchmarkConfig(CONFIGS[profile]):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DEBUG = False
+        PICK_CLOCK_ENABLED = False
+        METRICS_ENABLED = False
+        SIMULATION_WORKERS = 1
+
+    return BenchmarkConfig
+
+
+def run_scheduler(clocks, seconds, expiries, seed=7):
+    app = create_app(benchmark_config('sqlite://'))
+    clock = SchedulerClock(app, clocks, seconds, expiries, seed)
+    cpu = time.process_time()
+    clock.start()
+    clock.done.wait()
+    clock.stop()
+    return clock.lateness, time.process_time() - cpu
+
+
+def run_database(num_leagues, pick_seconds, duration, seed=7):
+    with tempfile.NamedTemporaryFile(suffix='.db') as database:
+        app = create_app(benchmark_config(f'sqlite:///{database.name}'))
+        with app.app_context():
+            db.create_all()
+            league_ids = generate_dataset(
+                num_leagues=num_leagues, prospects_per_pick=2, drafted_fraction=0.1, trades_per_league=0, seed=seed
+            )
+            # Drafts that started at different times, so their clocks do not all run out together
+            rng = random.Random(seed)
+            now = datetime.utcnow()
+            db.session.execute(
+                League.__table__.update().where(League.id == db.bindparam('b_id')).values(
+                    pick_clock_seconds=pick_seconds,
+                    pick_deadline=db.bindparam('b_deadline'),
+                    pick_deadline_pick=League.current_pick_number
+                ),
+                [
+                    {'b_id': league_id, 'b_deadline': now + timedelta(seconds=rng.uniform(1, pick_seconds))}
+                    for league_id in league_ids
+                ]
+            )
+            db.session.commit()
+            db.session.remove()
+
+        clock = app.extensions['pick_clock'] = DatabaseClock(app)
+        clock.start()
+        time.sleep(duration)
+        clock.stop()
+        return clock.started_late, clock.finished_late
+
+
+def describe(label, lateness):
+    lateness = sorted(lateness)
+    if not lateness:
+        print(f'{label}: none')
+        return
+    print(
+        f'{label}: {len(lateness)} expiries, late by p50 {statistics.median(lateness) * 1000:.1f} ms, '
+        f'p99 {lateness[int(len(lateness) * 0.99) - 1] * 1000:.1f} ms, max {lateness[-1] * 1000:.1f} ms'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clocks', type=int, default=10000)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--expiries', type=int, default=50000)
+    parser.add_argument('--leagues', type=int, default=1000)
+    parser.add_argument('--pick-seconds', type=int, default=30)
+    parser.add_argument('--duration', type=float, default=60)
+    args = parser.parse_args()
+
+    lateness, cpu = run_scheduler(args.clocks, args.seconds, args.expiries)
+    describe(f'scheduler, {args.clocks} clocks', lateness)
+    print(f'scheduler CPU time: {cpu / len(lateness) * 1e6:.1f} us per expiry')
+
+    started, finished = run_database(args.leagues, args.pick_seconds, args.duration)
+    describe(f'auto-pick started, {args.leagues} leagues', started)
+    describe(f'auto-pick finished, {args.leagues} leagues', finished)
+    print(f'auto-picks per second: {len(finished) / args.duration:.1f}')
+
+
+if __name__ == '__main__':
+    main()
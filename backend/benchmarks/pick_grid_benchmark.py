@@ -0,0 +1,104 @@
+"""Storage and read cost of stored versus virtual pick grids in dynasty leagues.
+
+Creates the same dynasty leagues twice on SQLite files, once storing every
+pick and once with ``virtual_picks``, trades a share of their future picks
+and makes the first round of picks. Reports the pick rows stored, the
+database size and the time of a cold ``GET /api/draft/picks``, with the
+league's draft state dropped before every request.
+
+    python -m backend.benchmarks.pick_grid_benchmark --leagues 50 --teams 12 --rounds 40
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from .. import create_app
+from ..draft_state import draft_states
+from ..models import db, DraftPick
+from .concurrency_benchmark import benchmark_config
+
+
+def build(client, num_leagues, num_teams, num_rounds, traded_fraction, virtual, seed):
+    rng = random.Random(seed)
+    response = client.post('/api/leagues/batch', json={'leagues': [
+        {
+            'name': f'Dynasty {number}',
+            'num_rounds': num_rounds,
+            'virtual_picks': virtual,
+            'teams': [{'name': f'Team {team}'} for team in range(num_teams)]
+        }
+        for number in range(num_leagues)
+    ]})
+    league_ids = [league['id'] for league in response.get_json()['leagues']]
+
+    for league_id in league_ids:
+        client.post('/api/prospects/bulk', json={
+            'league_id': league_id,
+            'prospects': [{'name': f'Prospect {number}', 'position': 'WR'} for number in range(num_teams)]
+        })
+        picks = client.get(f'/api/draft/picks?league_id={league_id}').get_json()
+        team_ids = sorted({pick['original_team_id'] for pick in picks})
+        for pick in rng.sample(picks[num_teams:], int(len(picks) * traded_fraction)):
+            to_team = rng.choice([team_id for team_id in team_ids if team_id != pick['current_team_id']])
+            response = client.post('/api/trades', json={
+                'league_id': league_id, 'from_team_id': pick['current_team_id'], 'to_team_id': to_team,
+                'pick_numbers': [pick['pick_number']]
+            })
+            assert response.status_code == 201, response.get_data(as_text=True)
+        for _ in range(num_teams):
+            client.post('/api/draft/autopick', json={'league_id': league_id})
+    return league_ids
+
+
+def cold_reads(app, client, league_ids, repeats):
+    timings = []
+    for _ in range(repeats):
+        for league_id in league_ids:
+            with app.app_context():
+                draft_states().evict(league_id)
+            started = time.perf_counter()
+            response = client.get(f'/api/draft/picks?league_id={league_id}')
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200
+    return timings
+
+
+def run(num_leagues, num_teams, num_rounds, traded_fraction, repeats, virtual, seed=7):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'grid.db')
+        app = create_app(benchmark_config('development', f'sqlite:///{path}'))
+        with app.app_context():
+            db.create_all()
+            db.session.remove()
+        client = app.test_client()
+        league_ids = build(client, num_leagues, num_teams, num_rounds, traded_fraction, virtual, seed)
+        with app.app_context():
+            rows = db.session.execute(db.select(db.func.count()).select_from(DraftPick)).scalar()
+            db.session.execute(db.text('VACUUM'))
+            db.session.remove()
+        timings = cold_reads(app, client, league_ids, repeats)
+        return rows, os.path.getsize(path), timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leagues', type=int, default=50)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--rounds', type=int, default=40)
+    parser.add_argument('--traded', type=float, default=0.05, help='fraction of future picks traded')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{args.leagues} leagues, {args.teams} teams, {args.rounds} rounds, {args.traded:.0%} of picks traded')
+    for label, virtual in (('stored', False), ('virtual', True)):
+        rows, size, timings = run(args.leagues, args.teams, args.rounds, args.traded, args.repeats, virtual)
+        timings.sort()
+        print(f'{label:>8}: {rows} pick rows, {size / 1024:.0f} KB database, cold GET /api/draft/picks '
+              f'p50 {statistics.median(timings):.2f} ms, p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
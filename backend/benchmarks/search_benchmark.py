@@ -0,0 +1,94 @@
+"""Typeahead latency of prospect search over a large catalog.
+
+Builds one league with a synthetic prospect catalog, then replays the
+keystrokes of typing prospect names, colleges and misspellings through
+``GET /api/prospects/search`` and reports latency percentiles.
+
+    python -m backend.benchmarks.search_benchmark --prospects 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from .. import create_app
+from ..config import Config
+from ..models import db
+from .synthetic import COLLEGES, FIRST_NAMES, LAST_NAMES, generate_dataset
+
+
+def keystrokes(rng, count):
+    """Every prefix of ``count`` randomly chosen search phrases."""
+    phrases = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            phrase = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+        elif kind < 0.8:
+            phrase = rng.choice(LAST_NAMES)
+        elif kind < 0.9:
+            phrase = rng.choice(COLLEGES)
+        else:
+            # A misspelled last name: one letter dropped
+            name = rng.choice([name for name in LAST_NAMES if len(name) > 5])
+            cut = rng.randrange(1, len(name) - 1)
+            phrase = name[:cut] + name[cut + 1:]
+        phrases.append(phrase.lower())
+    return [phrase[:end] for phrase in phrases for end in range(1, len(phrase) + 1) if phrase[end - 1] != ' ']
+
+
+def run(database_url, num_prospects, num_phrases, seed=7):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DEBUG = False
+        PICK_CLOCK_ENABLED = False
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        num_teams, num_rounds = 12, 15
+        league_id = generate_dataset(
+            num_leagues=1,
+            num_teams=num_teams,
+            num_rounds=num_rounds,
+            prospects_per_pick=max(1, num_prospects // (num_teams * num_rounds)),
+            trades_per_league=0,
+            seed=seed
+        )[0]
+        db.session.remove()
+
+    client = app.test_client()
+    started = time.perf_counter()
+    client.get(f'/api/prospects/search?league_id={league_id}&q=a')
+    print(f'Built index in {time.perf_counter() - started:.2f}s')
+
+    timings = []
+    for query in keystrokes(random.Random(seed), num_phrases):
+        started = time.perf_counter()
+        response = client.get(f'/api/prospects/search?league_id={league_id}&q={query}')
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--prospects', type=int, default=50000)
+    parser.add_argument('--phrases', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        timings = run(f'sqlite:///{os.path.join(directory, "search.db")}', args.prospects, args.phrases)
+
+    timings.sort()
+    print(f'{len(timings)} keystrokes')
+    print(f'  mean {statistics.fmean(timings):.2f} ms')
+    for percentile in (50, 95, 99):
+        print(f'  p{percentile}  {timings[int(len(timings) * percentile / 100) - 1]:.2f} ms')
+    print(f'  max  {timings[-1]:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
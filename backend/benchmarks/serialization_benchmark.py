@@ -0,0 +1,110 @@
+"""Time and peak allocations of listing a large league's prospects.
+
+Builds one league with a synthetic prospect catalog and lists all of its
+prospects three ways: hydrating ORM objects and encoding their ``to_dict``
+with the standard library, as the routes used to, and through
+``GET /api/prospects`` with the standard-library and the orjson encoders.
+Reports the median time to the last byte and the peak memory traced while
+producing one response.
+
+    python -m backend.benchmarks.serialization_benchmark --prospects 20000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from flask import jsonify
+
+from .. import create_app
+from ..config import Config
+from ..encoding import orjson
+from ..models import db, Prospect
+from .synthetic import generate_dataset
+
+
+def orm_response(app, league_id):
+    with app.test_request_context():
+        prospects = Prospect.query.filter(Prospect.league_id == league_id).order_by(Prospect.id).all()
+        body = jsonify([prospect.to_dict() for prospect in prospects]).get_data()
+        db.session.remove()
+        return body
+
+
+def route_response(app, league_id):
+    response = app.test_client().get(f'/api/prospects?league_id={league_id}')
+    assert response.status_code == 200
+    return response.get_data()
+
+
+def measure(produce, repeats):
+    produce()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        produce()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        body = produce()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), peak, len(body)
+
+
+def run(database_url, num_prospects, repeats):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DEBUG = False
+        PICK_CLOCK_ENABLED = False
+        METRICS_ENABLED = False
+        JSON_ENCODER = 'json'
+
+    class OrjsonConfig(BenchmarkConfig):
+        JSON_ENCODER = 'orjson'
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        num_teams, num_rounds = 12, 15
+        league_id = generate_dataset(
+            num_leagues=1,
+            num_teams=num_teams,
+            num_rounds=num_rounds,
+            prospects_per_pick=max(1, num_prospects // (num_teams * num_rounds)),
+            trades_per_league=0
+        )[0]
+        db.session.remove()
+
+    results = {
+        'ORM objects + to_dict + json': measure(lambda: orm_response(app, league_id), repeats),
+        'Core rows + json': measure(lambda: route_response(app, league_id), repeats)
+    }
+    if orjson is not None:
+        fast = create_app(OrjsonConfig)
+        results['Core rows + orjson'] = measure(lambda: route_response(fast, league_id), repeats)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--prospects', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(f'sqlite:///{os.path.join(directory, "serialization.db")}', args.prospects, args.repeats)
+
+    print(f'{"path":<32} {"median":>10} {"peak memory":>12} {"bytes":>10}')
+    for name, (median, peak, size) in results.items():
+        print(f'{name:<32} {median:>7.1f} ms {peak / 2 ** 20:>9.1f} MB {size:>10}')
+    if orjson is None:
+        print('orjson is not installed; only the standard-library encoder was measured')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Wall time of mock-draft simulations from the first pick of a full draft.
+
+Builds one league that has not started drafting and asks
+``POST /api/leagues/<id>/simulate`` for the team with the most distant
+picks, once per worker count, so the process pool speed-up can be read off.
+
+    python -m backend.benchmarks.simulation_benchmark --simulations 10000 --workers 1 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from .. import create_app
+from ..config import Config
+from ..models import db, Team
+from .synthetic import generate_dataset
+
+
+def run(database_url, simulations, workers, num_teams=12, num_rounds=15, prospects_per_pick=4):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DEBUG = False
+        PICK_CLOCK_ENABLED = False
+        SIMULATION_WORKERS = workers
+        SIMULATION_MAX_RUNS = simulations
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        league_id = generate_dataset(
+            num_leagues=1, num_teams=num_teams, num_rounds=num_rounds,
+            prospects_per_pick=prospects_per_pick, drafted_fraction=0, trades_per_league=0
+        )[0]
+        team_id = db.session.execute(
+            db.select(Team.id).where(Team.league_id == league_id).order_by(Team.draft_order.desc())
+        ).scalars().first()
+        db.session.remove()
+
+    client = app.test_client()
+    body = {'team_id': team_id, 'simulations': simulations, 'seed': 1}
+    try:
+        # The first request starts the worker processes
+        client.post(f'/api/leagues/{league_id}/simulate', json=dict(body, simulations=min(simulations, 100)))
+        started = time.perf_counter()
+        response = client.post(f'/api/leagues/{league_id}/simulate', json=body)
+        elapsed = time.perf_counter() - started
+    finally:
+        with app.app_context():
+            app.extensions['simulation'].shutdown()
+    assert response.status_code == 200, response.get_json()
+    return elapsed, len(response.get_json()['picks'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--simulations', type=int, default=10000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    for workers in dict.fromkeys(args.workers):
+        with tempfile.TemporaryDirectory() as directory:
+            elapsed, num_picks = run(f'sqlite:///{os.path.join(directory, "simulation.db")}', args.simulations, workers)
+        print(f'{workers} worker(s): {args.simulations} simulations to {num_picks} picks in {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""Synthetic draft data for benchmarks.
+
+Builds leagues that look like a draft in progress: every league has a full
+snake pick grid, a ranked prospect pool several times larger than the number
+of picks, the first part of the draft already made and a handful of trades.
+Rows are written with executemany inserts inside the current app context.
+"""
+import json
+import random
+from datetime import datetime, timedelta
+
+from ..history import save_snapshots
+from ..pick_grid import build_pick_grid
+from ..models import db, League, Team, Prospect, DraftPick, Trade, TradePick
+
+POSITIONS = ('QB', 'RB', 'WR', 'TE', 'K', 'DEF')
+FIRST_NAMES = (
+    'Aaron', 'Adrian', 'Alex', 'Andre', 'Anthony', 'Austin', 'Bijan', 'Blake', 'Brandon', 'Brock',
+    'Bryce', 'Caleb', 'Cameron', 'Chase', 'Chris', 'Christian', 'Cooper', 'Dalton', 'Dak', 'Damien',
+    'Darius', 'Davante', 'David', 'Deebo', 'DeAndre', 'Derek', 'Derrick', 'Devin', 'Drake', 'Dylan',
+    'Ezekiel', 'Garrett', 'George', 'Isaiah', 'Jahmyr', "Ja'Marr", 'Jalen', 'Jameson', 'Jared', 'Javonte',
+    'Jaxon', 'Jayden', 'Jerry', 'Joe', 'Jonathan', 'Jordan', 'Josh', 'Justin', 'Keenan', 'Kenneth',
+    'Kyle', 'Kyren', 'Lamar', 'Malik', 'Marquise', 'Marvin', 'Matthew', 'Michael', 'Mike', 'Nick',
+    'Patrick', 'Puka', 'Rashee', 'Rhamondre', 'Rome', 'Russell', 'Saquon', 'Sam', 'Stefon', 'Tank',
+    'Terry', 'Tony', 'Travis', 'Trevor', 'Tua', 'Tyler', 'Tyreek', 'Zach', 'Zay', 'Xavier'
+)
+LAST_NAMES = (
+    'Adams', 'Allen', 'Anderson', 'Bailey', 'Barkley', 'Bateman', 'Bowers', 'Brown', 'Burrow', 'Carter',
+    'Chase', 'Chubb', 'Collins', 'Cook', 'Davis', 'Diggs', 'Dobbins', 'Edwards', 'Ekeler', 'Etienne',
+    'Evans', 'Flowers', 'Freeman', 'Gibbs', 'Godwin', 'Hall', 'Harris', 'Henry', 'Herbert', 'Higgins',
+    'Hill', 'Hockenson', 'Hopkins', 'Hurts', 'Jackson', 'Jacobs', 'Jefferson', 'Jeudy', 'Johnson', 'Jones',
+    'Kelce', 'Kincaid', 'Kirk', 'Kittle', 'LaPorta', 'Lamb', 'Lawrence', 'Lockett', 'London', 'Love',
+    'Mahomes', 'Mason', 'McCaffrey', 'McLaurin', 'Metcalf', 'Mixon', 'Montgomery', 'Moore', 'Murray', 'Nacua',
+    "O'Connell", 'Olave', 'Pacheco', 'Pickens', 'Pitts', 'Pollard', 'Prescott', 'Purdy', 'Ridley', 'Robinson',
+    'Rodgers', 'Samuel', 'Smith', 'St. Brown', 'Stroud', 'Swift', 'Taylor', 'Thomas', 'Walker', 'Waddle',
+    'Warren', 'Watson', 'White', 'Williams', 'Wilson', 'Wright', 'Young', 'Zamir', 'Zeitler', 'Núñez'
+)
+COLLEGES = (
+    'Alabama', 'Arizona State', 'Arkansas', 'Auburn', 'Baylor', 'Boise State', 'Boston College', 'BYU',
+    'Cincinnati', 'Clemson', 'Colorado', 'Duke', 'Florida', 'Florida State', 'Georgia', 'Georgia Tech',
+    'Houston', 'Illinois', 'Iowa', 'Iowa State', 'Kansas State', 'Kentucky', 'LSU', 'Louisville',
+    'Miami', 'Michigan', 'Michigan State', 'Minnesota', 'Mississippi State', 'Missouri', 'Nebraska',
+    'North Carolina', 'NC State', 'Northwestern', 'Notre Dame', 'Ohio State', 'Oklahoma', 'Oklahoma State',
+    'Ole Miss', 'Oregon', 'Oregon State', 'Penn State', 'Pittsburgh', 'Purdue', 'Rutgers', 'South Carolina',
+    'Stanford', 'Syracuse', 'TCU', 'Tennessee', 'Texas', 'Texas A&M', 'Texas Tech', 'Toledo', 'Tulane',
+    'UCF', 'UCLA', 'USC', 'Utah', 'Vanderbilt', 'Virginia', 'Virginia Tech', 'Wake Forest', 'Washington',
+    'Washington State', 'West Virginia', 'Wisconsin', 'Wyoming'
+)
+
+
+def prospect_names(rng, count):
+    """``count`` (name, college) pairs drawn from realistic name and college lists."""
+    return [
+        (f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', rng.choice(COLLEGES))
+        for _ in range(count)
+    ]
+
+
+def generate_dataset(num_leagues=200, num_teams=12, num_rounds=15, prospects_per_pick=2,
+                     drafted_fraction=0.5, trades_per_league=20, seed=7, baseline=False):
+    """Insert ``num_leagues`` populated leagues and return their ids.
+
+    Pass ``baseline=True`` to fill the schema just before the index
+    migration, which has no prospect ranks or draft history and keeps each
+    trade's pick ids in a JSON column.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    total_picks = num_teams * num_rounds
+    drafted = int(total_picks * drafted_fraction)
+
+    _insert(League, baseline, [
+        {
+            'name': f'Synthetic League {n}',
+            'num_rounds': num_rounds,
+            'draft_started': drafted > 0,
+            'draft_completed': drafted >= total_picks,
+            'current_pick_number': drafted + 1,
+            'total_picks': total_picks,
+            'version': 1,
+            'created_at': now,
+            'updated_at': now
+        }
+        for n in range(num_leagues)
+    ])
+    league_ids = db.session.execute(
+        db.select(League.id).order_by(League.id.desc()).limit(num_leagues)
+    ).scalars().all()[::-1]
+
+    _insert(Team, baseline, [
+        {
+            'name': f'Team {order}',
+            'draft_order': order,
+            'league_id': league_id,
+            'version': 1,
+            'created_at': now,
+            'updated_at': now
+        }
+        for league_id in league_ids
+        for order in range(1, num_teams + 1)
+    ])
+    team_ids = _ids_by_league(Team, league_ids, Team.draft_order)
+
+    pool_size = total_picks * prospects_per_pick
+    prospect_rows = []
+    for league_id in league_ids:
+        ranks = rng.sample(range(1, pool_size + 1), pool_size)
+        for (name, college), rank in zip(prospect_names(rng, pool_size), ranks):
+            row = {
+                'name': name,
+                'position': rng.choice(POSITIONS),
+                'college': college,
+                'is_drafted': False,
+                'league_id': league_id,
+                'version': 1,
+                'created_at': now,
+                'updated_at': now
+            }
+            if not baseline:
+                row['rank'] = rank
+            prospect_rows.append(row)
+    _insert(Prospect, baseline, prospect_rows)
+    prospect_ids = _ids_by_league(Prospect, league_ids, Prospect.id)
+
+    pick_rows = []
+    prospect_updates = []
+    for league_id in league_ids:
+        rows = build_pick_grid(league_id, team_ids[league_id], num_rounds, 1, now)
+        taken = rng.sample(prospect_ids[league_id], drafted)
+        for row, prospect_id in zip(rows, taken):
+            row.update(prospect_id=prospect_id, is_used=True)
+            prospect_updates.append({
+                'b_id': prospect_id,
+                'b_team': row['current_team_id'],
+                'b_pick': row['pick_number']
+            })
+        pick_rows.extend(rows)
+    _insert(DraftPick, baseline, pick_rows)
+    if prospect_updates:
+        db.session.execute(
+            db.update(Prospect.__table__)
+            .where(Prospect.__table__.c.id == db.bindparam('b_id'))
+            .values(is_drafted=True, drafted_by=db.bindparam('b_team'), draft_pick_number=db.bindparam('b_pick')),
+            prospect_updates
+        )
+
+    pick_ids = _ids_by_league(DraftPick, league_ids, DraftPick.pick_number)
+    trade_rows = []
+    trade_picks = []
+    for league_id in league_ids:
+        teams = team_ids[league_id]
+        for n in range(trades_per_league):
+            from_team, to_team = rng.sample(teams, 2)
+            trade_rows.append({
+                'from_team_id': from_team,
+                'to_team_id': to_team,
+                'league_id': league_id,
+                'version': 1,
+                'executed_at': now - timedelta(minutes=n)
+            })
+            trade_picks.append(rng.choice(pick_ids[league_id]))
+    if trade_rows and baseline:
+        for row, pick_id in zip(trade_rows, trade_picks):
+            row['pick_ids'] = json.dumps([pick_id])
+        _insert(Trade, baseline, trade_rows)
+    elif trade_rows:
+        trade_ids = db.session.execute(
+            Trade.__table__.insert().returning(Trade.id, sort_by_parameter_order=True), trade_rows
+        ).scalars().all()
+        db.session.execute(TradePick.__table__.insert(), [
+            {'trade_id': trade_id, 'pick_id': pick_id} for trade_id, pick_id in zip(trade_ids, trade_picks)
+        ])
+    if not baseline:
+        save_snapshots(league_ids)
+
+    db.session.commit()
+    return league_ids
+
+
+def _insert(model, baseline, rows):
+    # The model's defaults would also fill columns added after the baseline,
+    # so there only the columns in the rows are written
+    table = model.__table__
+    if baseline:
+        table = db.table(model.__tablename__, *[db.column(name) for name in rows[0]])
+    db.session.execute(table.insert(), rows)
+
+
+def _ids_by_league(model, league_ids, order_by):
+    ids = {league_id: [] for league_id in league_ids}
+    rows = db.session.execute(
+        db.select(model.league_id, model.id)
+        .where(model.league_id.in_(league_ids))
+        .order_by(model.league_id, order_by)
+    )
+    for league_id, row_id in rows:
+        ids[league_id].append(row_id)
+    return ids
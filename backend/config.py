@@ -5,7 +5,120 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(os.path.abspath(os.path.dirname(__file__)), 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    # PRAGMA name -> value run on every new SQLite connection, and engine
+    # options for the connection pool of any other database
+    SQLITE_PRAGMAS = {}
+    DB_POOL_OPTIONS = {}
     
     # Application configuration
     DEBUG = os.environ.get('FLASK_DEBUG') or True
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-123'
+    
+    # Live updates
+    # memory:// (single process), unix:///path/to/events.sock (all workers on
+    # one host) or postgresql://... (LISTEN/NOTIFY across hosts)
+    EVENT_BROKER_URL = os.environ.get('EVENT_BROKER_URL') or 'memory://'
+    SSE_HEARTBEAT_SECONDS = int(os.environ.get('SSE_HEARTBEAT_SECONDS', 15))
+    
+    # Per-route request latency, SQL statement counts and connection pool
+    # gauges of this process, served at /api/metrics for Prometheus
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+    
+    # Response encoding: 'auto' uses orjson when it is installed, 'json' the
+    # standard library. List responses longer than JSON_STREAM_MIN_ITEMS are
+    # streamed JSON_STREAM_CHUNK_SIZE items at a time.
+    JSON_ENCODER = os.environ.get('JSON_ENCODER', 'auto')
+    JSON_STREAM_MIN_ITEMS = int(os.environ.get('JSON_STREAM_MIN_ITEMS', 1000))
+    JSON_STREAM_CHUNK_SIZE = int(os.environ.get('JSON_STREAM_CHUNK_SIZE', 1000))
+    
+    # Bulk import
+    PROSPECT_IMPORT_CHUNK_SIZE = int(os.environ.get('PROSPECT_IMPORT_CHUNK_SIZE', 1000))
+    
+    # Keyset pagination for list endpoints
+    DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', 100))
+    MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 1000))
+    
+    # Prospect search keeps an in-memory index per recently searched league
+    SEARCH_INDEX_MAX_LEAGUES = int(os.environ.get('SEARCH_INDEX_MAX_LEAGUES', 32))
+    
+    # In-memory draft state (pick grid and current pick) for active leagues
+    DRAFT_STATE_MAX_LEAGUES = int(os.environ.get('DRAFT_STATE_MAX_LEAGUES', 256))
+    DRAFT_STATE_MAX_PICKS = int(os.environ.get('DRAFT_STATE_MAX_PICKS', 100000))
+    
+    # Draft event log: the league state is snapshotted every this many events,
+    # which bounds the replay behind undo and past-state lookups
+    DRAFT_SNAPSHOT_INTERVAL = int(os.environ.get('DRAFT_SNAPSHOT_INTERVAL', 50))
+    
+    # WebSocket draft room (draft_room.py, served by an ASGI server). Events
+    # are broadcast to a league at most once per DRAFT_ROOM_BATCH_MS; a client
+    # more than DRAFT_ROOM_QUEUE_SIZE frames behind is told to resync.
+    DRAFT_ROOM_BATCH_MS = int(os.environ.get('DRAFT_ROOM_BATCH_MS', 25))
+    DRAFT_ROOM_QUEUE_SIZE = int(os.environ.get('DRAFT_ROOM_QUEUE_SIZE', 256))
+    DRAFT_ROOM_DB_WORKERS = int(os.environ.get('DRAFT_ROOM_DB_WORKERS', 4))
+    DRAFT_ROOM_CHAT_HISTORY = int(os.environ.get('DRAFT_ROOM_CHAT_HISTORY', 50))
+    DRAFT_ROOM_CHAT_MAX_LENGTH = int(os.environ.get('DRAFT_ROOM_CHAT_MAX_LENGTH', 500))
+    
+    # Pick clocks of every league run on one scheduler thread per worker
+    PICK_CLOCK_ENABLED = os.environ.get('PICK_CLOCK_ENABLED', '1') != '0'
+    
+    # Auto-draft keeps per-position heaps of undrafted prospects per league
+    AUTODRAFT_MAX_LEAGUES = int(os.environ.get('AUTODRAFT_MAX_LEAGUES', 1024))
+    # Most prospects of each position a team auto-drafts; unlisted positions are unlimited
+    AUTODRAFT_ROSTER_LIMITS = {'QB': 3, 'RB': 6, 'WR': 6, 'TE': 3, 'K': 1, 'DEF': 1}
+    
+    # Mock-draft simulations; more than one worker runs them in a process pool
+    SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', os.cpu_count() or 1))
+    SIMULATION_CHUNK_SIZE = int(os.environ.get('SIMULATION_CHUNK_SIZE', 500))
+    SIMULATION_DEFAULT_RUNS = int(os.environ.get('SIMULATION_DEFAULT_RUNS', 1000))
+    SIMULATION_MAX_RUNS = int(os.environ.get('SIMULATION_MAX_RUNS', 20000))
+    SIMULATION_TIMEOUT_SECONDS = float(os.environ.get('SIMULATION_TIMEOUT_SECONDS', 55))
+    # Standard deviation of a prospect's draft slot as a fraction of its rank
+    SIMULATION_NOISE = float(os.environ.get('SIMULATION_NOISE', 0.2))
+    
+    # Trade evaluation. TRADE_VALUE_CHART lists pick values from pick 1 on
+    # (None uses the built-in decay chart); future-season picks lose
+    # FUTURE_PICK_DISCOUNT of their value per year out.
+    TRADE_VALUE_CHART = None
+    FUTURE_PICK_DISCOUNT = float(os.environ.get('FUTURE_PICK_DISCOUNT', 0.2))
+    TRADE_FAIRNESS_TOLERANCE = float(os.environ.get('TRADE_FAIRNESS_TOLERANCE', 0.1))
+    TRADE_EVALUATE_MAX_TRADES = int(os.environ.get('TRADE_EVALUATE_MAX_TRADES', 1000))
+
+
+def _flag(name, default):
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes', 'on')
+
+
+class ProductionConfig(Config):
+    """Settings for gunicorn workers sharing one database.
+
+    Select it with ``APP_CONFIG=production``. SQLite runs in WAL mode, so
+    readers no longer wait for a writer, and concurrent writers wait for
+    the lock for up to the busy timeout instead of failing with "database
+    is locked". PostgreSQL connections come from a sized pool that checks
+    and recycles them.
+    """
+    DEBUG = _flag('FLASK_DEBUG', '0')
+
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 2 ** 20)),
+        # Negative sizes are in KiB
+        'cache_size': -int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64000))
+    }
+
+    DB_POOL_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': _flag('DB_POOL_PRE_PING', '1')
+    }
+
+
+CONFIGS = {
+    'development': Config,
+    'production': ProductionConfig
+}
@@ -0,0 +1,40 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from .models import db
+
+
+def engine_options(config):
+    """``SQLALCHEMY_ENGINE_OPTIONS`` with the pool options of the profile.
+
+    Pool options apply to every database but SQLite, whose pool class
+    depends on the file and rejects some of them.
+    """
+    options = config['SQLALCHEMY_ENGINE_OPTIONS']
+    if _is_sqlite(config) or not config['DB_POOL_OPTIONS']:
+        return options
+    return dict(config['DB_POOL_OPTIONS'], **options)
+
+
+def init_database(app):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    db.init_app(app)
+
+    # SQLite settings are per connection, so they are applied as each opens
+    pragmas = app.config['SQLITE_PRAGMAS']
+    if pragmas and _is_sqlite(app.config):
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'connect', lambda dbapi_connection, record: _set_pragmas(dbapi_connection, pragmas))
+
+
+def _is_sqlite(config):
+    return make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name() == 'sqlite'
+
+
+def _set_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
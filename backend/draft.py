@@ -1,24 +1,49 @@
-from flask import Blueprint, request, jsonify
-from .models import db, DraftPick, Prospect, League
+from flask import Blueprint, Response, abort, current_app, request, jsonify
+from .models import db, DraftPick, Prospect, League, Trade, TradePick, DraftEvent
+from .autodraft import prospect_pools
+from .draft_state import draft_states
+from .events import event_bus, format_sse, publish_event
+from .history import league_state_at, league_state_at_pick, record_event, redo, undo
+from .pagination import fetch_page, page_response
+from .pick_grid import materialize_picks
+from .serialization import DRAFT_PICK_COLUMNS, LEAGUE_COLUMNS, PROSPECT_COLUMNS, select_dicts, serialize_rows
+from .versioning import league_conditional, record_changes
 from datetime import datetime
+import queue
 
 draft_bp = Blueprint('draft', __name__)
 
 @draft_bp.route('/picks', methods=['GET'])
+@league_conditional
 def get_draft_picks():
     league_id = request.args.get('league_id', type=int)
     
     if not league_id:
         return jsonify({'error': 'league_id is required'}), 400
     
-    picks = DraftPick.query.filter_by(league_id=league_id).order_by(DraftPick.pick_number).all()
-    return jsonify([pick.to_dict() for pick in picks]), 200
+    state = draft_states().get(league_id)
+    return jsonify(state.pick_list() if state else []), 200
 
 @draft_bp.route('/picks/<int:pick_id>', methods=['GET'])
 def get_draft_pick(pick_id):
     pick = DraftPick.query.get_or_404(pick_id)
     return jsonify(pick.to_dict()), 200
 
+@draft_bp.route('/picks/<int:pick_id>/history', methods=['GET'])
+def get_draft_pick_history(pick_id):
+    pick = DraftPick.query.get_or_404(pick_id)
+    trades = select_dicts(
+        Trade,
+        TradePick.trade_id == Trade.id,
+        TradePick.pick_id == pick_id,
+        order_by=(Trade.executed_at, Trade.id)
+    )
+    return jsonify({
+        'pick': pick.to_dict(),
+        'owners': [pick.original_team_id] + [trade['to_team_id'] for trade in trades],
+        'trades': trades
+    }), 200
+
 @draft_bp.route('/execute', methods=['POST'])
 def execute_draft():
     data = request.get_json()
@@ -26,48 +51,385 @@ def execute_draft():
     if not data or 'prospect_id' not in data or 'team_id' not in data or 'league_id' not in data:
         return jsonify({'error': 'prospect_id, team_id, and league_id are required'}), 400
     
-    prospect_id = data['prospect_id']
-    team_id = data['team_id']
-    league_id = data['league_id']
+    result, status = draft_prospect(
+        data['league_id'],
+        data['prospect_id'],
+        data['team_id'],
+        expected_pick_number=data.get('pick_number')
+    )
+    return jsonify(result), status
+
+def draft_prospect(league_id, prospect_id, team_id, expected_pick_number=None):
+    """Use the league's current pick on a prospect with a fixed number of statements.
     
+    The pick is claimed with a compare-and-set on ``current_pick_number``, so
+    when two submissions race for the same pick exactly one of them wins and
+    the other gets a 409. Returns a (response body, status code) pair.
+    """
     league = League.query.get_or_404(league_id)
-    prospect = Prospect.query.get_or_404(prospect_id)
+    pick_number = league.current_pick_number
     
-    if prospect.is_drafted:
-        return jsonify({'error': 'Prospect already drafted'}), 400
+    if expected_pick_number is not None and expected_pick_number != pick_number:
+        return {'error': f'Pick {expected_pick_number} is no longer on the clock', 'current_pick_number': pick_number}, 409
     
-    current_pick = DraftPick.query.filter_by(
-        league_id=league_id,
-        pick_number=league.current_pick_number
+    if league.draft_completed or pick_number > league.total_picks:
+        return {'error': 'No current pick available'}, 400
+    
+    now = datetime.utcnow()
+    league_row = db.session.execute(
+        League.__table__.update()
+        .where(League.id == league_id, League.current_pick_number == pick_number)
+        .values(
+            current_pick_number=pick_number + 1,
+            draft_completed=pick_number + 1 > league.total_picks,
+            version=League.version + 1,
+            event_sequence=League.event_sequence + 1,
+            updated_at=now
+        )
+        .returning(*_columns(League, LEAGUE_COLUMNS), League.event_sequence)
     ).first()
     
-    if not current_pick:
-        return jsonify({'error': 'No current pick available'}), 400
+    if league_row is None:
+        db.session.rollback()
+        return {'error': f'Pick {pick_number} was just made by another request', 'current_pick_number': pick_number + 1}, 409
     
-    prospect.is_drafted = True
-    prospect.drafted_by = team_id
-    prospect.draft_pick_number = current_pick.pick_number
-    prospect.updated_at = datetime.utcnow()
+    league_data = serialize_rows([league_row[:-1]], LEAGUE_COLUMNS)[0]
+    version = league_data['version']
     
-    current_pick.prospect_id = prospect_id
-    current_pick.is_used = True
-    current_pick.updated_at = datetime.utcnow()
+    prospect_row = db.session.execute(
+        Prospect.__table__.update()
+        .where(Prospect.id == prospect_id, Prospect.league_id == league_id, Prospect.is_drafted.is_(False))
+        .values(is_drafted=True, drafted_by=team_id, draft_pick_number=pick_number, version=version, updated_at=now)
+        .returning(*_columns(Prospect, PROSPECT_COLUMNS))
+    ).first()
+    
+    if prospect_row is None:
+        db.session.rollback()
+        if db.session.get(Prospect, prospect_id) is None:
+            return {'error': 'Not found'}, 404
+        return {'error': 'Prospect already drafted'}, 400
     
-    league.current_pick_number += 1
-    league.updated_at = datetime.utcnow()
+    if league.virtual_picks:
+        materialize_picks(league_id, league.total_picks, [pick_number], version, now)
+    pick_row = db.session.execute(
+        DraftPick.__table__.update()
+        .where(DraftPick.league_id == league_id, DraftPick.pick_number == pick_number, DraftPick.is_used.is_(False))
+        .values(prospect_id=prospect_id, is_used=True, version=version, updated_at=now)
+        .returning(*_columns(DraftPick, DRAFT_PICK_COLUMNS))
+    ).first()
     
-    total_picks = DraftPick.query.filter_by(league_id=league_id).count()
-    if league.current_pick_number > total_picks:
-        league.draft_completed = True
+    if pick_row is None:
+        db.session.rollback()
+        return {'error': 'No current pick available'}, 400
     
+    record_event(league_id, 'pick', {
+        'league': {'current_pick_number': pick_number + 1, 'draft_completed': league_data['draft_completed']},
+        'picks': [[pick_row.id, pick_row.current_team_id, prospect_id]]
+    }, sequence=league_row[-1], pick_numbers=(pick_number, pick_number))
     db.session.commit()
     
-    return jsonify({
+    prospect_data = serialize_rows([prospect_row], PROSPECT_COLUMNS)[0]
+    pick_data = serialize_rows([pick_row], DRAFT_PICK_COLUMNS)[0]
+    draft_states().update(league_id, version, league=league_data, picks=[pick_data])
+    prospect_pools().update(league_id, version, [prospect_data])
+    
+    publish_event(league_id, 'pick', {
+        'pick': pick_data,
+        'prospect': prospect_data,
+        'current_pick_number': league_data['current_pick_number'],
+        'draft_completed': league_data['draft_completed'],
+        'version': version
+    })
+    
+    return {
         'message': 'Draft executed successfully',
-        'prospect': prospect.to_dict(),
-        'pick': current_pick.to_dict(),
-        'league': league.to_dict()
-    }), 200
+        'prospect': prospect_data,
+        'pick': pick_data,
+        'league': league_data
+    }, 200
+
+@draft_bp.route('/execute-batch', methods=['POST'])
+def execute_draft_batch():
+    data = request.get_json()
+    
+    if not data or 'league_id' not in data or 'picks' not in data:
+        return jsonify({'error': 'league_id and picks are required'}), 400
+    
+    entries = data['picks']
+    if not isinstance(entries, list) or not entries:
+        return jsonify({'error': 'picks must be a non-empty array'}), 400
+    
+    for idx, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not all(
+            isinstance(entry.get(key), int) and not isinstance(entry.get(key), bool)
+            for key in ('pick_number', 'prospect_id')
+        ):
+            return jsonify({'error': f'Pick {idx}: pick_number and prospect_id are required'}), 400
+    
+    result, status = draft_prospects(data['league_id'], entries)
+    return jsonify(result), status
+
+def draft_prospects(league_id, entries):
+    """Make the next ``len(entries)`` picks of a league in one transaction.
+    
+    ``entries`` are ``{pick_number, prospect_id}`` dicts numbered on from the
+    current pick; each prospect goes to the team that owns its pick. The
+    league is claimed with the same compare-and-set as ``draft_prospect``,
+    the picks and prospects are checked with one query each and written
+    with one executemany each, so the statement count does not grow with
+    the number of picks. Returns a (response body, status code) pair.
+    """
+    league = League.query.get_or_404(league_id)
+    start = league.current_pick_number
+    end = start + len(entries)
+    
+    if [entry['pick_number'] for entry in entries] != list(range(start, end)):
+        return {'error': f'Picks must be numbered consecutively from the current pick {start}', 'current_pick_number': start}, 409
+    
+    if league.draft_completed or end - 1 > league.total_picks:
+        return {'error': 'Not enough picks left in the draft'}, 400
+    
+    prospect_ids = [entry['prospect_id'] for entry in entries]
+    if len(set(prospect_ids)) != len(prospect_ids):
+        return {'error': 'A prospect is listed more than once'}, 400
+    
+    now = datetime.utcnow()
+    league_row = db.session.execute(
+        League.__table__.update()
+        .where(League.id == league_id, League.current_pick_number == start)
+        .values(
+            current_pick_number=end,
+            draft_completed=end > league.total_picks,
+            version=League.version + 1,
+            event_sequence=League.event_sequence + 1,
+            updated_at=now
+        )
+        .returning(*_columns(League, LEAGUE_COLUMNS), League.event_sequence)
+    ).first()
+    
+    if league_row is None:
+        db.session.rollback()
+        return {'error': f'Pick {start} was just made by another request'}, 409
+    
+    league_data = serialize_rows([league_row[:-1]], LEAGUE_COLUMNS)[0]
+    version = league_data['version']
+    
+    if league.virtual_picks:
+        materialize_picks(league_id, league.total_picks, range(start, end), version, now)
+    picks = select_dicts(
+        DraftPick,
+        DraftPick.league_id == league_id,
+        DraftPick.pick_number >= start,
+        DraftPick.pick_number < end,
+        order_by=(DraftPick.pick_number,)
+    )
+    prospects = {
+        prospect['id']: prospect
+        for prospect in select_dicts(Prospect, Prospect.league_id == league_id, Prospect.id.in_(prospect_ids))
+    }
+    
+    error = _batch_problem(entries, picks, prospects)
+    if error:
+        db.session.rollback()
+        return error
+    
+    picked_prospects = []
+    for pick, prospect_id in zip(picks, prospect_ids):
+        pick.update(prospect_id=prospect_id, is_used=True)
+        prospect = prospects[prospect_id]
+        prospect.update(is_drafted=True, drafted_by=pick['current_team_id'], draft_pick_number=pick['pick_number'])
+        picked_prospects.append(prospect)
+    
+    db.session.execute(
+        db.update(Prospect.__table__)
+        .where(Prospect.__table__.c.id == db.bindparam('b_id'))
+        .values(
+            is_drafted=True,
+            drafted_by=db.bindparam('b_team'),
+            draft_pick_number=db.bindparam('b_pick'),
+            version=version,
+            updated_at=now
+        ),
+        [
+            {'b_id': prospect['id'], 'b_team': prospect['drafted_by'], 'b_pick': prospect['draft_pick_number']}
+            for prospect in picked_prospects
+        ]
+    )
+    db.session.execute(
+        db.update(DraftPick.__table__)
+        .where(DraftPick.__table__.c.id == db.bindparam('b_id'))
+        .values(prospect_id=db.bindparam('b_prospect'), is_used=True, version=version, updated_at=now),
+        [{'b_id': pick['id'], 'b_prospect': pick['prospect_id']} for pick in picks]
+    )
+    record_event(league_id, 'picks', {
+        'league': {'current_pick_number': end, 'draft_completed': league_data['draft_completed']},
+        'picks': [[pick['id'], pick['current_team_id'], pick['prospect_id']] for pick in picks]
+    }, sequence=league_row[-1], pick_numbers=(start, end - 1))
+    db.session.commit()
+    
+    draft_states().update(league_id, version, league=league_data, picks=picks)
+    prospect_pools().update(league_id, version, picked_prospects)
+    
+    publish_event(league_id, 'picks', {
+        'picks': picks,
+        'prospects': picked_prospects,
+        'current_pick_number': league_data['current_pick_number'],
+        'draft_completed': league_data['draft_completed'],
+        'version': version
+    })
+    
+    return {
+        'message': f'{len(picks)} picks executed successfully',
+        'picks': picks,
+        'prospects': picked_prospects,
+        'league': league_data
+    }, 200
+
+@draft_bp.route('/autopick', methods=['POST'])
+def autopick_draft():
+    data = request.get_json()
+    
+    if not data or 'league_id' not in data:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    positions = data.get('positions')
+    if positions is not None and (not isinstance(positions, list) or not all(isinstance(p, str) for p in positions)):
+        return jsonify({'error': 'positions must be a list of positions'}), 400
+    
+    roster_limits = data.get('roster_limits')
+    if roster_limits is not None and (
+        not isinstance(roster_limits, dict) or
+        not all(isinstance(limit, int) and not isinstance(limit, bool) and limit >= 0 for limit in roster_limits.values())
+    ):
+        return jsonify({'error': 'roster_limits must map positions to non-negative integers'}), 400
+    
+    result, status = autopick(
+        data['league_id'],
+        team_id=data.get('team_id'),
+        positions=positions,
+        roster_limits=roster_limits,
+        expected_pick_number=data.get('pick_number')
+    )
+    return jsonify(result), status
+
+def autopick(league_id, team_id=None, positions=None, roster_limits=None, expected_pick_number=None):
+    """Draft the best ranked available prospect the team still has roster room for.
+    
+    ``team_id`` defaults to the owner of the current pick and ``roster_limits``
+    to ``AUTODRAFT_ROSTER_LIMITS``; ``positions`` narrows the choice further.
+    The prospect comes off the league's in-memory position heaps, so no
+    prospect rows are read beyond those changed since the last auto-pick.
+    Returns a (response body, status code) pair like ``draft_prospect``.
+    """
+    state = draft_states().get(league_id)
+    if state is None:
+        return {'error': 'Not found'}, 404
+    
+    current_pick = state.current_pick()
+    if current_pick is None or state.draft_completed:
+        return {'error': 'No current pick available'}, 400
+    if team_id is None:
+        team_id = current_pick['current_team_id']
+    if roster_limits is None:
+        roster_limits = current_app.config['AUTODRAFT_ROSTER_LIMITS']
+    if expected_pick_number is None:
+        expected_pick_number = current_pick['pick_number']
+    
+    pool = prospect_pools().get(league_id)
+    with pool.lock:
+        roster = {}
+        for pick in state.pick_list():
+            if pick['current_team_id'] == team_id and pick['prospect_id'] is not None:
+                position = pool.positions.get(pick['prospect_id'])
+                roster[position] = roster.get(position, 0) + 1
+        open_positions = [
+            position for position in (pool.open_positions() if positions is None else positions)
+            if position not in roster_limits or roster.get(position, 0) < roster_limits[position]
+        ]
+        prospect_id = pool.best(open_positions)
+    
+    if prospect_id is None:
+        return {'error': 'No available prospect fits the roster'}, 400
+    
+    return draft_prospect(league_id, prospect_id, team_id, expected_pick_number=expected_pick_number)
+
+@draft_bp.route('/skip', methods=['POST'])
+def skip_draft_pick():
+    data = request.get_json()
+    
+    if not data or 'league_id' not in data:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    result, status = skip_pick(data['league_id'], expected_pick_number=data.get('pick_number'))
+    return jsonify(result), status
+
+def skip_pick(league_id, expected_pick_number=None):
+    """Pass over the league's current pick and leave it unused.
+    
+    The pick is claimed with the same compare-and-set as ``draft_prospect``,
+    so a pick submitted just before a pick clock runs out wins over the
+    skip. Returns a (response body, status code) pair.
+    """
+    league = League.query.get_or_404(league_id)
+    pick_number = league.current_pick_number
+    
+    if expected_pick_number is not None and expected_pick_number != pick_number:
+        return {'error': f'Pick {expected_pick_number} is no longer on the clock', 'current_pick_number': pick_number}, 409
+    
+    if league.draft_completed or pick_number > league.total_picks:
+        return {'error': 'No current pick available'}, 400
+    
+    league_row = db.session.execute(
+        League.__table__.update()
+        .where(League.id == league_id, League.current_pick_number == pick_number)
+        .values(
+            current_pick_number=pick_number + 1,
+            draft_completed=pick_number + 1 > league.total_picks,
+            version=League.version + 1,
+            event_sequence=League.event_sequence + 1,
+            updated_at=datetime.utcnow()
+        )
+        .returning(*_columns(League, LEAGUE_COLUMNS), League.event_sequence)
+    ).first()
+    
+    if league_row is None:
+        db.session.rollback()
+        return {'error': f'Pick {pick_number} was just made by another request', 'current_pick_number': pick_number + 1}, 409
+    
+    league_data = serialize_rows([league_row[:-1]], LEAGUE_COLUMNS)[0]
+    version = league_data['version']
+    record_event(league_id, 'skip', {
+        'league': {'current_pick_number': pick_number + 1, 'draft_completed': league_data['draft_completed']}
+    }, sequence=league_row[-1])
+    db.session.commit()
+    
+    draft_states().update(league_id, version, league=league_data)
+    
+    publish_event(league_id, 'skip', {
+        'pick_number': pick_number,
+        'current_pick_number': league_data['current_pick_number'],
+        'draft_completed': league_data['draft_completed'],
+        'version': version
+    })
+    
+    return {'message': f'Pick {pick_number} skipped', 'league': league_data}, 200
+
+def _batch_problem(entries, picks, prospects):
+    if len(picks) != len(entries):
+        return {'error': 'No current pick available'}, 400
+    for pick in picks:
+        if pick['is_used']:
+            return {'error': f'Pick {pick["pick_number"]} has already been used'}, 400
+    for entry in entries:
+        prospect = prospects.get(entry['prospect_id'])
+        if prospect is None:
+            return {'error': f'Prospect {entry["prospect_id"]} not found'}, 404
+        if prospect['is_drafted']:
+            return {'error': f'Prospect {entry["prospect_id"]} already drafted'}, 400
+    return None
+
+def _columns(model, names):
+    return [getattr(model, name) for name in names]
 
 @draft_bp.route('/undraft', methods=['POST'])
 def undraft_prospect():
@@ -100,34 +462,165 @@ def undraft_prospect():
     prospect.draft_pick_number = None
     prospect.updated_at = datetime.utcnow()
     
+    changes = {'picks': [[draft_pick.id, draft_pick.current_team_id, None]] if draft_pick else []}
     if draft_pick and draft_pick.pick_number < league.current_pick_number:
         league.current_pick_number = draft_pick.pick_number
         league.draft_completed = False
         league.updated_at = datetime.utcnow()
+        changes['league'] = {'current_pick_number': league.current_pick_number, 'draft_completed': False}
     
+    version = record_changes(league_id, prospect, *([draft_pick] if draft_pick else []))
+    record_event(league_id, 'undraft', changes)
     db.session.commit()
     
+    draft_states().update(
+        league_id,
+        version,
+        league=league.to_dict(),
+        picks=[draft_pick.to_dict()] if draft_pick else []
+    )
+    
+    publish_event(league_id, 'undraft', {
+        'pick': draft_pick.to_dict() if draft_pick else None,
+        'prospect': prospect.to_dict(),
+        'current_pick_number': league.current_pick_number,
+        'draft_completed': league.draft_completed,
+        'version': league.version
+    })
+    
     return jsonify({
         'message': 'Prospect undrafted successfully',
         'prospect': prospect.to_dict(),
         'league': league.to_dict()
     }), 200
 
-@draft_bp.route('/current', methods=['GET'])
-def get_current_pick():
+@draft_bp.route('/undo', methods=['POST'])
+def undo_draft_event():
+    data = request.get_json()
+    
+    if not data or 'league_id' not in data:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    result, status = undo(data['league_id'])
+    return jsonify(result), status
+
+@draft_bp.route('/redo', methods=['POST'])
+def redo_draft_event():
+    data = request.get_json()
+    
+    if not data or 'league_id' not in data:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    result, status = redo(data['league_id'])
+    return jsonify(result), status
+
+@draft_bp.route('/events', methods=['GET'])
+def get_draft_events():
     league_id = request.args.get('league_id', type=int)
     
     if not league_id:
         return jsonify({'error': 'league_id is required'}), 400
     
+    events, next_cursor, error = fetch_page(DraftEvent, [DraftEvent.league_id == league_id], ['sequence'])
+    if error:
+        return jsonify({'error': error}), 400
+    return page_response(events, next_cursor), 200
+
+@draft_bp.route('/history', methods=['GET'])
+def get_draft_history():
+    """The league and its picks as of a past event ``sequence`` or right after ``pick_number``."""
+    league_id = request.args.get('league_id', type=int)
+    sequence = request.args.get('sequence', type=int)
+    pick_number = request.args.get('pick_number', type=int)
+    
+    if not league_id or (sequence is None) == (pick_number is None):
+        return jsonify({'error': 'league_id and one of sequence or pick_number are required'}), 400
+    
     league = League.query.get_or_404(league_id)
+    if sequence is not None:
+        if not 0 <= sequence <= league.event_sequence:
+            return jsonify({'error': f'sequence must be between 0 and {league.event_sequence}'}), 400
+        state = league_state_at(league_id, sequence)
+    else:
+        state = league_state_at_pick(league_id, pick_number)
+        if state is None:
+            return jsonify({'error': f'Pick {pick_number} has not been made'}), 404
     
-    current_pick = DraftPick.query.filter_by(
-        league_id=league_id,
-        pick_number=league.current_pick_number
-    ).first()
+    picks = []
+    for pick in draft_states().get(league_id).pick_list():
+        # Picks stored after this point in a virtual grid were still untouched
+        default = (pick['original_team_id'], None) if league.virtual_picks else (pick['current_team_id'], pick['prospect_id'])
+        team_id, prospect_id = state['picks'].get(pick['id'], default)
+        picks.append(dict(pick, current_team_id=team_id, prospect_id=prospect_id, is_used=prospect_id is not None))
+    
+    return jsonify({
+        'sequence': state['sequence'],
+        'league': dict(league.to_dict(), **state['league']),
+        'draft_picks': picks
+    }), 200
+
+@draft_bp.route('/current', methods=['GET'])
+@league_conditional
+def get_current_pick():
+    league_id = request.args.get('league_id', type=int)
+    
+    if not league_id:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    state = draft_states().get(league_id)
+    if state is None:
+        abort(404)
     
+    current_pick = state.current_pick()
     if not current_pick:
         return jsonify({'error': 'No current pick available'}), 404
     
-    return jsonify(current_pick.to_dict()), 200
+    return jsonify(current_pick), 200
+
+@draft_bp.route('/clock', methods=['GET'])
+def get_pick_clock():
+    league_id = request.args.get('league_id', type=int)
+    
+    if not league_id:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    league = League.query.get_or_404(league_id)
+    # A deadline left over from an earlier pick means the clock is not running
+    running = league.pick_deadline is not None and league.pick_deadline_pick == league.current_pick_number
+    return jsonify({
+        'league_id': league.id,
+        'pick_clock_seconds': league.pick_clock_seconds,
+        'pick_expiry_action': league.pick_expiry_action,
+        'pick_number': league.current_pick_number if running else None,
+        'deadline': league.pick_deadline.isoformat() if running else None,
+        'seconds_remaining': max((league.pick_deadline - datetime.utcnow()).total_seconds(), 0) if running else None
+    }), 200
+
+@draft_bp.route('/stream', methods=['GET'])
+def stream_draft_events():
+    league_id = request.args.get('league_id', type=int)
+    
+    if not league_id:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    League.query.get_or_404(league_id)
+    heartbeat = current_app.config.get('SSE_HEARTBEAT_SECONDS', 15)
+    
+    def generate():
+        subscription = event_bus.subscribe(league_id)
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = subscription.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield format_sse(event)
+        finally:
+            event_bus.unsubscribe(league_id, subscription)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
@@ -0,0 +1,278 @@
+import asyncio
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qs
+from werkzeug.exceptions import HTTPException
+from . import create_app
+from .draft import draft_prospect
+from .events import event_bus, publish_event
+from .models import db, League
+from .trades import trade_picks
+
+ROOM_PATH = '/api/draft/room'
+
+# WebSocket close codes: the 4000 range is free for applications
+CLOSE_BAD_REQUEST = 4400
+CLOSE_NOT_FOUND = 4404
+
+RESYNC_FRAME = json.dumps({'type': 'resync'})
+
+
+class Connection:
+    """One client socket and the bounded queue of frames waiting to be sent."""
+
+    def __init__(self, send, team_id, max_queue):
+        self.team_id = team_id
+        self.queue = asyncio.Queue(max_queue)
+        self._send = send
+
+    def offer(self, frame):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # As on the SSE feed, a client that cannot keep up is told to
+            # refetch the board instead of buffering an ever-growing backlog.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_FRAME)
+
+    async def run_sender(self):
+        while True:
+            frame = await self.queue.get()
+            try:
+                await self._send({'type': 'websocket.send', 'text': frame})
+            except Exception:
+                return
+
+
+class LeagueRoom:
+    """The connections of one league and the events waiting to be broadcast."""
+
+    def __init__(self, chat_history):
+        self.connections = set()
+        self.pending = []
+        self.flush = None
+        self.chat = deque(maxlen=chat_history)
+
+
+class DraftRoom:
+    """ASGI application serving the draft room over WebSockets.
+
+    A manager connects to ``/api/draft/room?league_id=<id>&team_id=<id>``
+    and keeps one socket open to make picks, propose trades and chat. Each
+    message runs the same code as the REST routes on a small thread pool,
+    without an HTTP request around it. Draft events published by any
+    worker reach the room through the event bus and are broadcast to a
+    league at most once every ``DRAFT_ROOM_BATCH_MS``, encoded once for all
+    of its connections.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.batch_interval = app.config['DRAFT_ROOM_BATCH_MS'] / 1000
+        self.max_queue = app.config['DRAFT_ROOM_QUEUE_SIZE']
+        self.chat_history = app.config['DRAFT_ROOM_CHAT_HISTORY']
+        self.chat_max_length = app.config['DRAFT_ROOM_CHAT_MAX_LENGTH']
+        self._executor = ThreadPoolExecutor(app.config['DRAFT_ROOM_DB_WORKERS'], thread_name_prefix='draft-room')
+        self._rooms = {}
+        self._loop = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'websocket':
+            await self._serve(scope, receive, send)
+        else:
+            await send({'type': 'http.response.start', 'status': 404,
+                        'headers': [(b'content-type', b'application/json')]})
+            await send({'type': 'http.response.body', 'body': b'{"error":"Not found"}'})
+
+    def connection_count(self, league_id=None):
+        if league_id is not None:
+            room = self._rooms.get(league_id)
+            return len(room.connections) if room else 0
+        return sum(len(room.connections) for room in self._rooms.values())
+
+    def start(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            event_bus.add_listener(self._on_event)
+
+    def close(self):
+        event_bus.remove_listener(self._on_event)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._loop = None
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _serve(self, scope, receive, send):
+        if (await receive())['type'] != 'websocket.connect':
+            return
+        if scope['path'] != ROOM_PATH:
+            await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+            return
+
+        params = parse_qs(scope.get('query_string', b'').decode())
+        league_id, team_id = _int_param(params, 'league_id'), _int_param(params, 'team_id')
+        if league_id is None:
+            await send({'type': 'websocket.close', 'code': CLOSE_BAD_REQUEST})
+            return
+        self.start()
+        if not await self._run(_league_exists, league_id):
+            await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+            return
+
+        await send({'type': 'websocket.accept'})
+        connection = Connection(send, team_id, self.max_queue)
+        room = self._rooms.get(league_id)
+        if room is None:
+            room = self._rooms[league_id] = LeagueRoom(self.chat_history)
+        room.connections.add(connection)
+        connection.offer(self._encode({
+            'type': 'welcome', 'league_id': league_id, 'team_id': team_id, 'chat': list(room.chat)
+        }))
+        sender = asyncio.create_task(connection.run_sender())
+        try:
+            while True:
+                message = await receive()
+                if message['type'] == 'websocket.disconnect':
+                    break
+                if message['type'] == 'websocket.receive':
+                    text = message.get('text')
+                    if text is None:
+                        text = (message.get('bytes') or b'').decode('utf-8', 'replace')
+                    connection.offer(self._encode(await self._handle(league_id, connection, text)))
+        finally:
+            room.connections.discard(connection)
+            if not room.connections and not room.pending:
+                self._rooms.pop(league_id, None)
+            sender.cancel()
+
+    async def _handle(self, league_id, connection, text):
+        try:
+            message = json.loads(text)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            return {'type': 'reply', 'id': None, 'status': 400, 'body': {'error': 'Messages must be JSON objects'}}
+
+        handler = {
+            'pick': self._pick,
+            'trade': self._trade,
+            'chat': self._chat,
+            'ping': self._ping
+        }.get(message.get('type'))
+        if handler is None:
+            body, status = {'error': 'type must be pick, trade, chat or ping'}, 400
+        else:
+            body, status = await handler(league_id, connection, message)
+        return {'type': 'reply', 'id': message.get('id'), 'status': status, 'body': body}
+
+    async def _pick(self, league_id, connection, message):
+        team_id = message.get('team_id', connection.team_id)
+        if 'prospect_id' not in message or team_id is None:
+            return {'error': 'prospect_id and team_id are required'}, 400
+        return await self._run(
+            draft_prospect, league_id, message['prospect_id'], team_id, message.get('pick_number')
+        )
+
+    async def _trade(self, league_id, connection, message):
+        if 'to_team_id' not in message or ('pick_ids' not in message and 'pick_numbers' not in message):
+            return {'error': 'to_team_id and pick_ids or pick_numbers are required'}, 400
+        from_team_id = message.get('from_team_id', connection.team_id)
+        if from_team_id is None:
+            return {'error': 'from_team_id is required'}, 400
+        return await self._run(
+            trade_picks, league_id, from_team_id, message['to_team_id'],
+            message.get('pick_ids', []), message.get('pick_numbers', [])
+        )
+
+    async def _chat(self, league_id, connection, message):
+        text = message.get('text')
+        if not isinstance(text, str) or not text.strip():
+            return {'error': 'text is required'}, 400
+        if len(text) > self.chat_max_length:
+            return {'error': f'text must be at most {self.chat_max_length} characters'}, 400
+        # Chat goes through the event broker, so rooms in every process see it
+        await self._run(publish_event, league_id, 'chat', {
+            'team_id': connection.team_id,
+            'text': text,
+            'sent_at': datetime.utcnow().isoformat()
+        })
+        return {'message': 'Sent'}, 200
+
+    async def _ping(self, league_id, connection, message):
+        return {'message': 'pong'}, 200
+
+    async def _run(self, func, *args):
+        return await self._loop.run_in_executor(self._executor, self._call, func, args)
+
+    def _call(self, func, args):
+        with self.app.app_context():
+            try:
+                return func(*args)
+            except HTTPException as error:
+                db.session.rollback()
+                return {'error': 'Not found' if error.code == 404 else error.description}, error.code
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception('Draft room action failed')
+                return {'error': 'Internal server error'}, 500
+
+    def _on_event(self, event):
+        # Runs on the publishing thread; the room is only touched on the loop
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._queue_event, event)
+
+    def _queue_event(self, event):
+        room = self._rooms.get(event['league_id'])
+        if room is None:
+            return
+        if event['type'] == 'chat':
+            room.chat.append(event['data'])
+        room.pending.append({'id': event['id'], 'type': event['type'], 'data': event['data']})
+        if room.flush is None:
+            room.flush = self._loop.call_later(self.batch_interval, self._flush, event['league_id'])
+
+    def _flush(self, league_id):
+        room = self._rooms.get(league_id)
+        if room is None:
+            return
+        frame = self._encode({'type': 'events', 'events': room.pending})
+        room.pending = []
+        room.flush = None
+        for connection in room.connections:
+            connection.offer(frame)
+        if not room.connections:
+            del self._rooms[league_id]
+
+    def _encode(self, message):
+        return self.app.json.dumps_bytes(message).decode()
+
+
+def _league_exists(league_id):
+    return db.session.get(League, league_id) is not None
+
+
+def _int_param(params, name):
+    try:
+        return int(params[name][0])
+    except (KeyError, ValueError):
+        return None
+
+
+def create_draft_room(config_class=None):
+    """ASGI entry point: ``uvicorn --factory backend.draft_room:create_draft_room``."""
+    return DraftRoom(create_app(config_class))
@@ -0,0 +1,161 @@
+import threading
+from collections import OrderedDict
+from flask import current_app
+from .models import db, League, DraftPick
+from .pick_grid import grid_team_ids, merge_pick_grid
+from .serialization import select_dicts
+from .versioning import get_league_version
+
+
+class DraftState:
+    """The pick grid and draft position of one league, held in memory.
+
+    ``picks`` holds the serialized picks in pick order. They are replaced,
+    never modified, so a copy of the list taken under ``lock`` can be
+    serialized while writes continue. Picks are matched by pick number,
+    since the unstored picks of a virtual pick grid have no id.
+    """
+
+    def __init__(self, league, picks):
+        self.league_id = league.id
+        self.created_at = league.created_at
+        self.version = league.version
+        self.current_pick_number = league.current_pick_number
+        self.draft_completed = league.draft_completed
+        self.total_picks = league.total_picks
+        self.lock = threading.Lock()
+        self.picks = picks
+        self._by_number = {pick['pick_number']: position for position, pick in enumerate(picks)}
+        self.drafted = {pick['prospect_id'] for pick in picks if pick['prospect_id'] is not None}
+
+    def __len__(self):
+        return len(self.picks)
+
+    def pick_list(self):
+        with self.lock:
+            return list(self.picks)
+
+    def current_pick(self):
+        with self.lock:
+            position = self._by_number.get(self.current_pick_number)
+            return None if position is None else self.picks[position]
+
+    def apply(self, version, league=None, picks=()):
+        """Apply the league fields and picks written at ``version``."""
+        if league is not None:
+            self.current_pick_number = league['current_pick_number']
+            self.draft_completed = league['draft_completed']
+            self.total_picks = league['total_picks']
+        for pick in picks:
+            position = self._by_number.get(pick['pick_number'])
+            if position is None:
+                return False
+            previous = self.picks[position]
+            if previous['prospect_id'] is not None:
+                self.drafted.discard(previous['prospect_id'])
+            if pick['prospect_id'] is not None:
+                self.drafted.add(pick['prospect_id'])
+            self.picks[position] = pick
+        self.version = version
+        return True
+
+
+class DraftStateCache:
+    """Draft states of the most recently used leagues.
+
+    A state is served only while the league's version and creation time
+    match the database, so writes made by other workers cause a reload.
+    Writes made here are applied in place through ``update``. The least
+    recently used leagues are dropped once more than ``max_leagues`` are held
+    or their picks add up to more than ``max_picks``.
+    """
+
+    def __init__(self, max_leagues, max_picks):
+        self.max_leagues = max_leagues
+        self.max_picks = max_picks
+        self._lock = threading.Lock()
+        self._states = OrderedDict()
+        self._num_picks = 0
+
+    def get(self, league_id):
+        """Return the league's current draft state, or None for an unknown league."""
+        stamp = get_league_version(league_id)
+        if stamp is None:
+            self.evict(league_id)
+            return None
+
+        with self._lock:
+            state = self._states.get(league_id)
+            if state is not None and state.created_at == stamp.created_at and state.version == stamp.version:
+                self._states.move_to_end(league_id)
+                return state
+
+        state = _load(league_id)
+        if state is None:
+            self.evict(league_id)
+            return None
+        self._store(state)
+        return state
+
+    def update(self, league_id, version, league=None, picks=()):
+        """Write through a change committed at ``version`` to a cached league.
+
+        The change is applied only on top of the version before it; a state
+        that missed a write is dropped and reloaded on its next read.
+        """
+        with self._lock:
+            state = self._states.get(league_id)
+        if state is None:
+            return
+        with state.lock:
+            if state.version == version - 1 and state.apply(version, league, picks):
+                return
+        self.evict(league_id)
+
+    def evict(self, league_id):
+        with self._lock:
+            state = self._states.pop(league_id, None)
+            if state is not None:
+                self._num_picks -= len(state)
+
+    def __len__(self):
+        return len(self._states)
+
+    def _store(self, state):
+        if len(state) > self.max_picks:
+            return
+        with self._lock:
+            previous = self._states.pop(state.league_id, None)
+            if previous is not None:
+                self._num_picks -= len(previous)
+            self._states[state.league_id] = state
+            self._num_picks += len(state)
+            while len(self._states) > self.max_leagues or self._num_picks > self.max_picks:
+                _, evicted = self._states.popitem(last=False)
+                self._num_picks -= len(evicted)
+
+
+def _load(league_id):
+    league = db.session.execute(
+        db.select(
+            League.id, League.created_at, League.version, League.current_pick_number,
+            League.draft_completed, League.total_picks, League.virtual_picks
+        ).where(League.id == league_id)
+    ).first()
+    if league is None:
+        return None
+    picks = select_dicts(DraftPick, DraftPick.league_id == league_id, order_by=(DraftPick.pick_number,))
+    if league.virtual_picks:
+        picks = merge_pick_grid(league_id, grid_team_ids(league_id), league.total_picks, picks)
+    return DraftState(league, picks)
+
+
+def init_draft_state(app):
+    app.extensions['draft_state'] = DraftStateCache(
+        app.config['DRAFT_STATE_MAX_LEAGUES'],
+        app.config['DRAFT_STATE_MAX_PICKS']
+    )
+
+
+def draft_states():
+    return current_app.extensions['draft_state']
@@ -0,0 +1,392 @@
+import fcntl
+import json
+import os
+import queue
+import select
+import socket
+import threading
+import time
+from itertools import count
+
+
+class EventBus:
+    """In-process publish/subscribe of per-league draft events."""
+
+    def __init__(self, max_queue_size=256):
+        self.max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._listeners = ()
+        self._ids = count(1)
+
+    def subscribe(self, league_id):
+        subscription = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers.setdefault(league_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, league_id, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(league_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[league_id]
+
+    def add_listener(self, listener):
+        """Call ``listener(event)`` for every event of every league.
+
+        Listeners run on the publishing thread and must return quickly.
+        """
+        with self._lock:
+            self._listeners += (listener,)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            self._listeners = tuple(item for item in self._listeners if item is not listener)
+
+    def subscriber_count(self, league_id):
+        with self._lock:
+            return len(self._subscribers.get(league_id, ()))
+
+    def publish(self, league_id, event_type, data):
+        event = {
+            'id': next(self._ids),
+            'type': event_type,
+            'league_id': league_id,
+            'data': data
+        }
+        with self._lock:
+            subscribers = list(self._subscribers.get(league_id, ()))
+            listeners = self._listeners
+
+        for listener in listeners:
+            listener(event)
+
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(event)
+            except queue.Full:
+                # A viewer that cannot keep up gets told to refetch the board
+                # instead of an ever-growing backlog of deltas.
+                _drain(subscription)
+                subscription.put_nowait({
+                    'id': event['id'],
+                    'type': 'resync',
+                    'league_id': league_id,
+                    'data': {}
+                })
+        return event
+
+    def dispatch(self, message):
+        return self.publish(message['league_id'], message['type'], message['data'])
+
+
+def _drain(subscription):
+    while True:
+        try:
+            subscription.get_nowait()
+        except queue.Empty:
+            return
+
+
+def format_sse(event):
+    payload = json.dumps(event['data'], separators=(',', ':'))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+def _encode(league_id, event_type, data):
+    return json.dumps({
+        'league_id': league_id,
+        'type': event_type,
+        'data': data
+    }, separators=(',', ':'))
+
+
+class MemoryBroker:
+    """Delivers events to viewers connected to this process only."""
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    def publish(self, league_id, event_type, data):
+        self.bus.publish(league_id, event_type, data)
+
+    def close(self):
+        pass
+
+
+class UnixSocketBroker:
+    """Fans events out to every worker on a host through a Unix socket hub.
+
+    Each worker connects to the hub at ``path``. Whichever worker first takes
+    the flock on ``path + '.lock'`` runs the hub; when it exits, the lock is
+    released and the next worker to reconnect takes over.
+    """
+
+    reconnect_delay = 0.1
+
+    def __init__(self, path, bus):
+        self.path = path
+        self.bus = bus
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._closed = threading.Event()
+        self._sock = None
+        self._pid = None
+        self._hub = None
+
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Threads do not survive a fork, so a preloaded app restarts the
+            # client in each gunicorn worker.
+            self._pid = os.getpid()
+            self._sock = None
+            self._hub = None
+            self._connected.clear()
+        threading.Thread(target=self._read_loop, daemon=True).start()
+
+    def publish(self, league_id, event_type, data):
+        self.start()
+        message = (_encode(league_id, event_type, data) + '\n').encode()
+        self._connected.wait(timeout=1)
+        with self._lock:
+            sock = self._sock
+            if sock is not None:
+                try:
+                    sock.sendall(message)
+                    return
+                except OSError:
+                    pass
+        # The hub is changing hands; keep this worker's viewers up to date.
+        self.bus.publish(league_id, event_type, data)
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            if self._sock is not None:
+                _shutdown(self._sock)
+                self._sock = None
+        if self._hub is not None:
+            self._hub.close()
+
+    def _read_loop(self):
+        while not self._closed.is_set():
+            sock = self._connect()
+            if sock is None:
+                time.sleep(self.reconnect_delay)
+                continue
+
+            with self._lock:
+                self._sock = sock
+            self._connected.set()
+            try:
+                with sock.makefile('rb') as lines:
+                    for line in lines:
+                        self.bus.dispatch(json.loads(line))
+            except (OSError, ValueError):
+                pass
+            finally:
+                self._connected.clear()
+                with self._lock:
+                    if self._sock is sock:
+                        self._sock = None
+                sock.close()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+            return sock
+        except OSError:
+            sock.close()
+
+        if self._hub is None:
+            self._hub = _SocketHub.claim(self.path)
+        return None
+
+
+def _shutdown(sock):
+    # shutdown() wakes threads blocked reading the socket; close() alone
+    # does not while a makefile() reader holds a reference to it.
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    sock.close()
+
+
+class _SocketHub:
+    def __init__(self, path, lock_file, server):
+        self.path = path
+        self.lock_file = lock_file
+        self.server = server
+        self.clients = set()
+        self.closed = False
+        self.lock = threading.Lock()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    @classmethod
+    def claim(cls, path):
+        lock_file = open(path + '.lock', 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+
+        if os.path.exists(path):
+            os.unlink(path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(128)
+        return cls(path, lock_file, server)
+
+    def close(self):
+        _shutdown(self.server)
+        with self.lock:
+            self.closed = True
+            for client in self.clients:
+                _shutdown(client)
+            self.clients.clear()
+        self.lock_file.close()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return
+            with self.lock:
+                if self.closed:
+                    _shutdown(client)
+                    return
+                self.clients.add(client)
+            threading.Thread(target=self._client_loop, args=(client,), daemon=True).start()
+
+    def _client_loop(self, client):
+        try:
+            with client.makefile('rb') as lines:
+                for line in lines:
+                    self._broadcast(line)
+        except OSError:
+            pass
+        finally:
+            with self.lock:
+                self.clients.discard(client)
+            client.close()
+
+    def _broadcast(self, line):
+        with self.lock:
+            clients = list(self.clients)
+        for client in clients:
+            try:
+                client.sendall(line)
+            except OSError:
+                with self.lock:
+                    self.clients.discard(client)
+
+
+class PostgresBroker:
+    """Fans events out across hosts with PostgreSQL LISTEN/NOTIFY."""
+
+    channel = 'draft_events'
+    # NOTIFY payloads are capped at 8000 bytes by the server.
+    max_payload = 7900
+
+    def __init__(self, dsn, bus):
+        self.dsn = dsn
+        self.bus = bus
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._conn = None
+        self._pid = None
+
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._conn = None
+        threading.Thread(target=self._listen_loop, daemon=True).start()
+
+    def publish(self, league_id, event_type, data):
+        self.start()
+        payload = _encode(league_id, event_type, data)
+        if len(payload.encode()) > self.max_payload:
+            payload = _encode(league_id, 'resync', {})
+
+        with self._lock:
+            try:
+                if self._conn is None or self._conn.closed:
+                    self._conn = self._open()
+                with self._conn.cursor() as cursor:
+                    cursor.execute('SELECT pg_notify(%s, %s)', (self.channel, payload))
+            except Exception:
+                self._conn = None
+                self.bus.publish(league_id, event_type, data)
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _open(self):
+        import psycopg2
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def _listen_loop(self):
+        while not self._closed.is_set():
+            try:
+                conn = self._open()
+            except Exception:
+                time.sleep(1)
+                continue
+
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+                while not self._closed.is_set():
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.bus.dispatch(json.loads(notify.payload))
+            except Exception:
+                time.sleep(1)
+            finally:
+                conn.close()
+
+
+def create_broker(url, bus):
+    if not url or url.startswith('memory://'):
+        return MemoryBroker(bus)
+    if url.startswith('unix://'):
+        return UnixSocketBroker(url[len('unix://'):], bus)
+    if url.startswith(('postgres://', 'postgresql://', 'postgresql+')):
+        scheme, rest = url.split('://', 1)
+        return PostgresBroker('postgresql://' + rest, bus)
+    raise ValueError(f'Unsupported EVENT_BROKER_URL: {url}')
+
+
+event_bus = EventBus()
+broker = MemoryBroker(event_bus)
+
+
+def init_event_broker(app):
+    global broker
+    broker.close()
+    broker = create_broker(app.config.get('EVENT_BROKER_URL'), event_bus)
+
+
+def publish_event(league_id, event_type, data):
+    broker.publish(league_id, event_type, data)
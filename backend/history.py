@@ -0,0 +1,317 @@
+import json
+from datetime import datetime
+from flask import current_app
+from .models import db, League, Prospect, DraftPick, Trade, TradePick, DraftEvent, DraftSnapshot
+from .autodraft import prospect_pools
+from .draft_state import draft_states
+from .events import publish_event
+from .versioning import record_changes
+
+# League fields kept in the event log and snapshots. Picks are kept as
+# [pick id, current team id, prospect id] triples; which prospects are
+# drafted, and by whom, follows from them.
+LEAGUE_FIELDS = ('name', 'description', 'num_rounds', 'draft_started', 'draft_completed', 'current_pick_number')
+
+
+def next_event_sequence(league_id):
+    """Atomically take the league's next event sequence number."""
+    with db.session.no_autoflush:
+        return db.session.execute(
+            db.update(League)
+            .where(League.id == league_id)
+            .values(event_sequence=League.event_sequence + 1)
+            .returning(League.event_sequence)
+        ).scalar()
+
+
+def record_event(league_id, event_type, changes, sequence=None, pick_numbers=(None, None),
+                 target_sequence=None, stack=None):
+    """Append an event to the league's log and return its sequence number.
+
+    Call it once the event's writes are in the session: every
+    ``DRAFT_SNAPSHOT_INTERVAL`` events the league state is snapshotted as it
+    stands. ``changes`` holds the league fields and picks as the event left
+    them. ``sequence`` is taken from the league unless the caller already
+    claimed it. Undo and redo pass their own ``stack`` pointers; any other
+    event goes on top of the undo stack and empties the redo stack.
+    """
+    if sequence is None:
+        sequence = next_event_sequence(league_id)
+    if stack is None:
+        stack = {
+            'undo_sequence': sequence,
+            'redo_sequence': None,
+            'previous_sequence': db.select(DraftEvent.undo_sequence)
+            .where(DraftEvent.league_id == league_id)
+            .order_by(DraftEvent.sequence.desc())
+            .limit(1)
+            .scalar_subquery()
+        }
+    db.session.execute(DraftEvent.__table__.insert().values(
+        league_id=league_id,
+        sequence=sequence,
+        event_type=event_type,
+        changes=_dumps(changes),
+        pick_number=pick_numbers[0],
+        last_pick_number=pick_numbers[1],
+        target_sequence=target_sequence,
+        created_at=datetime.utcnow(),
+        **stack
+    ))
+    if sequence % current_app.config['DRAFT_SNAPSHOT_INTERVAL'] == 0:
+        save_snapshots([league_id])
+    return sequence
+
+
+def save_snapshots(league_ids):
+    """Snapshot the current state of each league at its last event sequence."""
+    leagues = db.session.execute(
+        db.select(League.id, League.event_sequence, *[getattr(League, field) for field in LEAGUE_FIELDS])
+        .where(League.id.in_(league_ids))
+    ).all()
+    picks = {}
+    rows = db.session.execute(
+        db.select(DraftPick.league_id, DraftPick.id, DraftPick.current_team_id, DraftPick.prospect_id)
+        .where(DraftPick.league_id.in_(league_ids))
+        .order_by(DraftPick.league_id, DraftPick.pick_number)
+    )
+    for league_id, pick_id, team_id, prospect_id in rows:
+        picks.setdefault(league_id, []).append([pick_id, team_id, prospect_id])
+    if not leagues:
+        return
+
+    # A league initialized after its last event replaces that event's snapshot
+    db.session.execute(
+        DraftSnapshot.__table__.delete().where(
+            db.tuple_(DraftSnapshot.league_id, DraftSnapshot.sequence).in_([(row[0], row[1]) for row in leagues])
+        )
+    )
+    now = datetime.utcnow()
+    db.session.execute(DraftSnapshot.__table__.insert(), [
+        {
+            'league_id': row[0],
+            'sequence': row[1],
+            'state': _dumps({'league': dict(zip(LEAGUE_FIELDS, row[2:])), 'picks': picks.get(row[0], [])}),
+            'created_at': now
+        }
+        for row in leagues
+    ])
+
+
+def league_state_at(league_id, sequence):
+    """The league fields and picks right after event ``sequence``.
+
+    Returns ``{'sequence', 'league', 'picks'}`` with picks as
+    ``{pick_id: [team_id, prospect_id]}``. The state is rebuilt from the
+    nearest snapshot at or before ``sequence`` plus the events after it, so
+    it costs two queries and at most one snapshot interval of replay however
+    long the league's history is.
+    """
+    snapshot = db.session.execute(
+        db.select(DraftSnapshot.sequence, DraftSnapshot.state)
+        .where(DraftSnapshot.league_id == league_id, DraftSnapshot.sequence <= sequence)
+        .order_by(DraftSnapshot.sequence.desc())
+        .limit(1)
+    ).first()
+    start, state = (snapshot[0], json.loads(snapshot[1])) if snapshot else (0, {'league': {}, 'picks': []})
+
+    league = state['league']
+    picks = {pick_id: [team_id, prospect_id] for pick_id, team_id, prospect_id in state['picks']}
+    events = db.session.execute(
+        db.select(DraftEvent.changes)
+        .where(DraftEvent.league_id == league_id, DraftEvent.sequence > start, DraftEvent.sequence <= sequence)
+        .order_by(DraftEvent.sequence)
+    ).scalars()
+    for changes in events:
+        changes = json.loads(changes)
+        league.update(changes.get('league', {}))
+        for pick_id, team_id, prospect_id in changes.get('picks', []):
+            picks[pick_id] = [team_id, prospect_id]
+    return {'sequence': sequence, 'league': league, 'picks': picks}
+
+
+def league_state_at_pick(league_id, pick_number):
+    """The league state right after pick ``pick_number`` was last made, or None.
+
+    A pick made inside a batch is cut out of the batch: the later picks of
+    the batch are shown unmade and the draft is on the next pick.
+    """
+    event = db.session.execute(
+        db.select(DraftEvent.sequence, DraftEvent.pick_number, DraftEvent.changes)
+        .where(
+            DraftEvent.league_id == league_id,
+            DraftEvent.pick_number <= pick_number,
+            DraftEvent.last_pick_number >= pick_number
+        )
+        .order_by(DraftEvent.sequence.desc())
+        .limit(1)
+    ).first()
+    if event is None:
+        return None
+
+    state = league_state_at(league_id, event.sequence)
+    later = json.loads(event.changes)['picks'][pick_number - event.pick_number + 1:]
+    if later:
+        for pick_id, team_id, _ in later:
+            state['picks'][pick_id] = [team_id, None]
+        state['league'].update(current_pick_number=pick_number + 1, draft_completed=False)
+    return state
+
+
+def undo(league_id):
+    """Revert the last event that has not been undone yet.
+
+    The reverted league fields and picks are read from the state before
+    that event. Undoing a trade executes the reverse trade, so the trade
+    history stays complete. Returns a (response body, status code) pair.
+    """
+    league = League.query.get_or_404(league_id)
+    sequence = next_event_sequence(league_id)
+    latest = _event(league_id, sequence - 1)
+    if latest is None or latest.undo_sequence is None:
+        db.session.rollback()
+        return {'error': 'Nothing to undo'}, 400
+
+    target = _event(league_id, latest.undo_sequence)
+    done = json.loads(target.changes)
+    before = league_state_at(league_id, target.sequence - 1)
+    if league.virtual_picks:
+        # A pick a virtual grid first stored for this event was untouched before it
+        missing = [pick_id for pick_id, _, _ in done.get('picks', []) if pick_id not in before['picks']]
+        if missing:
+            for pick_id, team_id in db.session.execute(
+                db.select(DraftPick.id, DraftPick.original_team_id).where(DraftPick.id.in_(missing))
+            ):
+                before['picks'][pick_id] = [team_id, None]
+    if any(field not in before['league'] for field in done.get('league', {})) or \
+            any(pick_id not in before['picks'] for pick_id, _, _ in done.get('picks', [])):
+        db.session.rollback()
+        return {'error': 'The league history before this event is not recorded'}, 409
+    changes = {
+        'league': {field: before['league'][field] for field in done.get('league', {})},
+        'picks': [[pick_id, *before['picks'][pick_id]] for pick_id, _, _ in done.get('picks', [])]
+    }
+    if 'trade' in done:
+        changes['trade'] = done['trade'][::-1]
+
+    return _write(league, 'undo', changes, sequence, target, {
+        'undo_sequence': target.previous_sequence,
+        'redo_sequence': sequence,
+        'previous_sequence': latest.redo_sequence
+    })
+
+
+def redo(league_id):
+    """Repeat the last undone event, if nothing else happened since.
+
+    Returns a (response body, status code) pair.
+    """
+    league = League.query.get_or_404(league_id)
+    sequence = next_event_sequence(league_id)
+    latest = _event(league_id, sequence - 1)
+    if latest is None or latest.redo_sequence is None:
+        db.session.rollback()
+        return {'error': 'Nothing to redo'}, 400
+
+    undone = _event(league_id, latest.redo_sequence)
+    target = _event(league_id, undone.target_sequence)
+    return _write(league, 'redo', json.loads(target.changes), sequence, target, {
+        'undo_sequence': target.sequence,
+        'redo_sequence': undone.previous_sequence,
+        'previous_sequence': None
+    })
+
+
+def _write(league, event_type, changes, sequence, target, stack):
+    for field, value in changes.get('league', {}).items():
+        setattr(league, field, value)
+
+    entries = changes.get('picks', [])
+    picks = {
+        pick.id: pick for pick in
+        DraftPick.query.filter(DraftPick.id.in_([entry[0] for entry in entries]), DraftPick.league_id == league.id)
+    }
+    leaving = {pick.prospect_id for pick in picks.values() if pick.prospect_id is not None}
+    arriving = {prospect_id for _, _, prospect_id in entries if prospect_id is not None}
+    prospects = {prospect.id: prospect for prospect in Prospect.query.filter(Prospect.id.in_(leaving | arriving))}
+
+    error = None
+    if len(picks) != len(entries):
+        error = 'A pick of this event no longer exists'
+    for prospect_id in arriving:
+        prospect = prospects.get(prospect_id)
+        if prospect is None:
+            error = f'Prospect {prospect_id} no longer exists'
+        elif prospect.is_drafted and prospect_id not in leaving:
+            error = f'Prospect {prospect_id} has been drafted since'
+    if error:
+        db.session.rollback()
+        return {'error': f'Cannot {event_type}: {error}'}, 409
+
+    now = datetime.utcnow()
+    for prospect_id in leaving - arriving:
+        prospect = prospects.get(prospect_id)
+        if prospect is not None:
+            prospect.is_drafted = False
+            prospect.drafted_by = None
+            prospect.draft_pick_number = None
+            prospect.updated_at = now
+    for pick_id, team_id, prospect_id in entries:
+        pick = picks[pick_id]
+        pick.current_team_id = team_id
+        pick.prospect_id = prospect_id
+        pick.is_used = prospect_id is not None
+        pick.updated_at = now
+        if prospect_id is not None:
+            prospect = prospects[prospect_id]
+            prospect.is_drafted = True
+            prospect.drafted_by = team_id
+            prospect.draft_pick_number = pick.pick_number
+            prospect.updated_at = now
+
+    rows = list(picks.values()) + list(prospects.values())
+    trade = None
+    if 'trade' in changes:
+        trade = Trade(
+            from_team_id=changes['trade'][0],
+            to_team_id=changes['trade'][1],
+            league_id=league.id,
+            trade_picks=[TradePick(pick_id=pick_id) for pick_id in picks]
+        )
+        db.session.add(trade)
+        rows.append(trade)
+
+    league.updated_at = now
+    version = record_changes(league.id, *rows)
+    record_event(league.id, event_type, changes, sequence=sequence, target_sequence=target.sequence, stack=stack)
+    db.session.commit()
+
+    league_data = league.to_dict()
+    pick_data = [pick.to_dict() for pick in picks.values()]
+    prospect_data = [prospect.to_dict() for prospect in prospects.values()]
+    draft_states().update(league.id, version, league=league_data, picks=pick_data)
+    prospect_pools().update(league.id, version, prospect_data)
+
+    body = {
+        'sequence': sequence,
+        'target_sequence': target.sequence,
+        'event_type': target.event_type,
+        'league': league_data,
+        'picks': pick_data,
+        'prospects': prospect_data,
+        'trade': trade.to_dict() if trade else None
+    }
+    publish_event(league.id, event_type, dict(body, version=version))
+    return body, 200
+
+
+def _event(league_id, sequence):
+    if sequence is None or sequence < 1:
+        return None
+    return db.session.execute(
+        db.select(DraftEvent).where(DraftEvent.league_id == league_id, DraftEvent.sequence == sequence)
+    ).scalar()
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(',', ':'))
@@ -1,19 +1,60 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from .models import db, League, Team, Prospect, DraftPick
+from .autodraft import UNRANKED, prospect_pools
+from .draft_state import draft_states
+from .events import publish_event
+from .history import LEAGUE_FIELDS, record_event, save_snapshots
+from .pagination import fetch_page, page_response
+from .pick_grid import build_pick_grid, merge_pick_grid
+from .pick_clock import EXPIRY_ACTIONS
+from .serialization import league_changes, league_snapshot
+from .simulation import SimulationTimeout, draft_scores, simulator
+from .versioning import bump_league_version, league_conditional, record_changes
 from datetime import datetime
 
 leagues_bp = Blueprint('leagues', __name__)
 
 @leagues_bp.route('', methods=['GET'])
 def get_leagues():
-    leagues = League.query.all()
-    return jsonify([league.to_dict() for league in leagues]), 200
+    leagues, next_cursor, error = fetch_page(League, [], ['id'])
+    if error:
+        return jsonify({'error': error}), 400
+    return page_response(leagues, next_cursor), 200
 
 @leagues_bp.route('/<int:league_id>', methods=['GET'])
+@league_conditional
 def get_league(league_id):
-    league = League.query.get_or_404(league_id)
     include_relations = request.args.get('include_relations', 'false').lower() == 'true'
-    return jsonify(league.to_dict(include_relations=include_relations)), 200
+    query = League.query
+    if include_relations:
+        query = query.options(
+            db.selectinload(League.teams),
+            db.selectinload(League.prospects),
+            db.selectinload(League.draft_picks)
+        )
+    league = query.get_or_404(league_id)
+    return jsonify(_league_dict(league, include_relations)), 200
+
+@leagues_bp.route('/<int:league_id>/snapshot', methods=['GET'])
+@league_conditional
+def get_league_snapshot(league_id):
+    snapshot = league_snapshot(league_id)
+    if snapshot is None:
+        return jsonify({'error': 'League not found'}), 404
+    return jsonify(snapshot), 200
+
+@leagues_bp.route('/<int:league_id>/changes', methods=['GET'])
+@league_conditional
+def get_league_changes(league_id):
+    since = request.args.get('since', type=int)
+    
+    if since is None or since < 0:
+        return jsonify({'error': 'since must be a non-negative league version'}), 400
+    
+    changes = league_changes(league_id, since)
+    if changes is None:
+        return jsonify({'error': 'League not found'}), 404
+    return jsonify(changes), 200
 
 @leagues_bp.route('', methods=['POST'])
 def create_league():
@@ -22,13 +63,23 @@ def create_league():
     if not data or 'name' not in data:
         return jsonify({'error': 'League name is required'}), 400
     
+    clock, error = _clock_settings(data)
+    if error:
+        return jsonify({'error': error}), 400
+    if not isinstance(data.get('virtual_picks', False), bool):
+        return jsonify({'error': 'virtual_picks must be true or false'}), 400
+    
     league = League(
         name=data['name'],
         description=data.get('description', ''),
-        num_rounds=data.get('num_rounds', 3)
+        num_rounds=data.get('num_rounds', 3),
+        virtual_picks=data.get('virtual_picks', False),
+        **clock
     )
     
     db.session.add(league)
+    db.session.flush()
+    save_snapshots([league.id])
     db.session.commit()
     
     return jsonify(league.to_dict()), 201
@@ -38,6 +89,10 @@ def update_league(league_id):
     league = League.query.get_or_404(league_id)
     data = request.get_json()
     
+    clock, error = _clock_settings(data)
+    if error:
+        return jsonify({'error': error}), 400
+    
     if 'name' in data:
         league.name = data['name']
     if 'description' in data:
@@ -50,10 +105,22 @@ def update_league(league_id):
         league.draft_completed = data['draft_completed']
     if 'current_pick_number' in data:
         league.current_pick_number = data['current_pick_number']
+    for field, value in clock.items():
+        setattr(league, field, value)
+    if clock or 'draft_started' in data:
+        # Starting, pausing or changing the clock gives the pick a fresh deadline
+        league.pick_deadline = None
+        league.pick_deadline_pick = None
     
     league.updated_at = datetime.utcnow()
+    version = record_changes(league.id)
+    record_event(league.id, 'league', {'league': {field: getattr(league, field) for field in LEAGUE_FIELDS if field in data}})
     db.session.commit()
     
+    draft_states().update(league.id, version, league=league.to_dict())
+    
+    publish_event(league.id, 'league_updated', {'league': league.to_dict()})
+    
     return jsonify(league.to_dict()), 200
 
 @leagues_bp.route('/<int:league_id>', methods=['DELETE'])
@@ -61,6 +128,8 @@ def delete_league(league_id):
     league = League.query.get_or_404(league_id)
     db.session.delete(league)
     db.session.commit()
+    draft_states().evict(league_id)
+    publish_event(league_id, 'league_deleted', {'league_id': league_id})
     return jsonify({'message': 'League deleted successfully'}), 200
 
 @leagues_bp.route('/<int:league_id>/initialize', methods=['POST'])
@@ -71,39 +140,245 @@ def initialize_league(league_id):
     if not data or 'teams' not in data:
         return jsonify({'error': 'Teams data is required'}), 400
     
-    teams_data = data['teams']
+    if league.total_picks:
+        return jsonify({'error': 'League is already initialized'}), 400
     
-    for idx, team_data in enumerate(teams_data):
-        team = Team(
-            name=team_data['name'],
-            icon=team_data.get('icon', 'Shield'),
-            color=team_data.get('color', 'text-blue-500'),
-            bg_color=team_data.get('bg_color', 'bg-blue-50'),
-            draft_order=idx + 1,
-            league_id=league.id
-        )
-        db.session.add(team)
+    error = _validate_teams(data['teams'])
+    if error:
+        return jsonify({'error': error}), 400
     
-    db.session.flush()
+    version = bump_league_version(league.id)
+    now = datetime.utcnow()
+    
+    team_ids = _insert_teams([(league.id, data['teams'])], version, now).get(league.id, [])
+    if not league.virtual_picks:
+        _insert_picks(build_pick_grid(league.id, team_ids, league.num_rounds, version, now))
+    league.total_picks = len(team_ids) * league.num_rounds
+    save_snapshots([league.id])
+    
+    db.session.commit()
+    
+    publish_event(league.id, 'league_initialized', {'league_id': league.id})
+    
+    return jsonify(_league_dict(league, True)), 201
+
+@leagues_bp.route('/batch', methods=['POST'])
+def create_leagues_batch():
+    data = request.get_json()
+    
+    if not data or not isinstance(data.get('leagues'), list) or not data['leagues']:
+        return jsonify({'error': 'leagues must be a non-empty array'}), 400
+    
+    for idx, league_data in enumerate(data['leagues']):
+        if not isinstance(league_data, dict) or 'name' not in league_data:
+            return jsonify({'error': f'League {idx} is missing a name'}), 400
+        error = _validate_teams(league_data.get('teams', []))
+        if error:
+            return jsonify({'error': f'League {idx}: {error}'}), 400
+        num_rounds = league_data.get('num_rounds', 3)
+        if not isinstance(num_rounds, int) or isinstance(num_rounds, bool) or num_rounds < 1:
+            return jsonify({'error': f'League {idx}: num_rounds must be a positive integer'}), 400
+        if not isinstance(league_data.get('virtual_picks', False), bool):
+            return jsonify({'error': f'League {idx}: virtual_picks must be true or false'}), 400
+    
+    now = datetime.utcnow()
+    league_rows = [
+        {
+            'name': league_data['name'],
+            'description': league_data.get('description', ''),
+            'num_rounds': league_data.get('num_rounds', 3),
+            'draft_started': False,
+            'draft_completed': False,
+            'current_pick_number': 1,
+            'total_picks': len(league_data.get('teams', [])) * league_data.get('num_rounds', 3),
+            'virtual_picks': league_data.get('virtual_picks', False),
+            'version': 1,
+            'created_at': now,
+            'updated_at': now
+        }
+        for league_data in data['leagues']
+    ]
+    # Batched into multi-row INSERTs whose ids come back in the order of the request's leagues
+    league_ids = db.session.execute(
+        League.__table__.insert().returning(League.id, sort_by_parameter_order=True), league_rows
+    ).scalars().all()
+    
+    team_ids = _insert_teams(
+        [(league_id, league_data.get('teams', [])) for league_id, league_data in zip(league_ids, data['leagues'])],
+        1,
+        now
+    )
     
-    teams = Team.query.filter_by(league_id=league.id).order_by(Team.draft_order).all()
-    pick_number = 1
-    
-    for round_num in range(1, league.num_rounds + 1):
-        team_order = teams if round_num % 2 == 1 else list(reversed(teams))
-        
-        for pick_in_round, team in enumerate(team_order, 1):
-            draft_pick = DraftPick(
-                pick_number=pick_number,
-                round_number=round_num,
-                pick_in_round=pick_in_round,
-                original_team_id=team.id,
-                current_team_id=team.id,
-                league_id=league.id
-            )
-            db.session.add(draft_pick)
-            pick_number += 1
+    pick_rows = []
+    for league_id, league_row in zip(league_ids, league_rows):
+        if league_row['virtual_picks']:
+            continue
+        pick_rows.extend(build_pick_grid(league_id, team_ids.get(league_id, []), league_row['num_rounds'], 1, now))
+    _insert_picks(pick_rows)
+    save_snapshots(league_ids)
     
     db.session.commit()
     
-    return jsonify(league.to_dict(include_relations=True)), 201
+    return jsonify({
+        'message': f'{len(league_ids)} leagues created successfully',
+        'leagues': [
+            {
+                'id': league_id,
+                'name': league_row['name'],
+                'num_teams': len(team_ids.get(league_id, [])),
+                'num_picks': len(team_ids.get(league_id, [])) * league_row['num_rounds']
+            }
+            for league_id, league_row in zip(league_ids, league_rows)
+        ]
+    }), 201
+
+def _league_dict(league, include_relations):
+    data = league.to_dict(include_relations=include_relations)
+    if include_relations and league.virtual_picks:
+        data['draft_picks'] = merge_pick_grid(
+            league.id, [team.id for team in league.teams], league.total_picks, data['draft_picks']
+        )
+    return data
+
+def _clock_settings(data):
+    clock = {}
+    if 'pick_clock_seconds' in data:
+        seconds = data['pick_clock_seconds']
+        if seconds is not None and (not isinstance(seconds, int) or isinstance(seconds, bool) or seconds < 1):
+            return None, 'pick_clock_seconds must be a positive number of seconds or null'
+        clock['pick_clock_seconds'] = seconds
+    if 'pick_expiry_action' in data:
+        if data['pick_expiry_action'] not in EXPIRY_ACTIONS:
+            return None, f'pick_expiry_action must be one of {", ".join(EXPIRY_ACTIONS)}'
+        clock['pick_expiry_action'] = data['pick_expiry_action']
+    return clock, None
+
+@leagues_bp.route('/<int:league_id>/simulate', methods=['POST'])
+def simulate_draft(league_id):
+    """Mock the rest of the draft and report who is likely left at a team's picks.
+    
+    Every simulation fills the remaining picks in order with prospects drawn
+    from their rank plus noise. For each of the team's upcoming picks the
+    response gives, per available prospect, the fraction of simulations in
+    which the prospect was still there.
+    """
+    data = request.get_json(silent=True) or {}
+    options, error = _simulation_options(data)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    state = draft_states().get(league_id)
+    if state is None:
+        return jsonify({'error': 'League not found'}), 404
+    
+    team = db.session.get(Team, options['team_id'])
+    if team is None or team.league_id != league_id:
+        return jsonify({'error': 'Team not found'}), 404
+    
+    remaining = [
+        pick for pick in state.pick_list()
+        if not pick['is_used'] and pick['pick_number'] >= state.current_pick_number
+    ]
+    upcoming = [(offset, pick) for offset, pick in enumerate(remaining) if pick['current_team_id'] == team.id]
+    if not upcoming:
+        return jsonify({'error': 'Team has no upcoming picks'}), 400
+    
+    pool = prospect_pools().get(league_id)
+    with pool.lock:
+        available = sorted(pool.available(), key=lambda prospect: (prospect[2], prospect[0]))
+    
+    ranks, deviations = draft_scores([rank for _, _, rank in available], options['noise'])
+    try:
+        availability = simulator().run(
+            ranks, deviations, [offset for offset, _ in upcoming], options['simulations'],
+            seed=options['seed'], timeout=current_app.config['SIMULATION_TIMEOUT_SECONDS']
+        )
+    except SimulationTimeout:
+        return jsonify({'error': 'Simulation did not finish in time; try fewer simulations'}), 503
+    
+    return jsonify({
+        'team_id': team.id,
+        'simulations': options['simulations'],
+        'version': state.version,
+        'picks': [pick for _, pick in upcoming],
+        'prospects': [
+            {
+                'prospect_id': prospect_id,
+                'position': position,
+                'rank': None if rank == UNRANKED else rank,
+                'availability': [round(float(value), 4) for value in availability[:, column]]
+            }
+            for column, (prospect_id, position, rank) in enumerate(available[:options['limit']])
+        ]
+    }), 200
+
+def _simulation_options(data):
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+    
+    if not is_int(data.get('team_id')):
+        return None, 'team_id is required'
+    
+    max_simulations = current_app.config['SIMULATION_MAX_RUNS']
+    simulations = data.get('simulations', current_app.config['SIMULATION_DEFAULT_RUNS'])
+    if not is_int(simulations) or not 1 <= simulations <= max_simulations:
+        return None, f'simulations must be between 1 and {max_simulations}'
+    
+    noise = data.get('noise', current_app.config['SIMULATION_NOISE'])
+    if not isinstance(noise, (int, float)) or isinstance(noise, bool) or not 0 <= noise <= 10:
+        return None, 'noise must be a number between 0 and 10'
+    
+    seed = data.get('seed')
+    if seed is not None and (not is_int(seed) or seed < 0):
+        return None, 'seed must be a non-negative integer'
+    
+    limit = data.get('limit', 100)
+    if not is_int(limit) or not 1 <= limit <= 1000:
+        return None, 'limit must be between 1 and 1000'
+    
+    return {'team_id': data['team_id'], 'simulations': simulations, 'noise': noise, 'seed': seed, 'limit': limit}, None
+
+def _validate_teams(teams_data):
+    if not isinstance(teams_data, list):
+        return 'teams must be an array'
+    for idx, team_data in enumerate(teams_data):
+        if not isinstance(team_data, dict) or 'name' not in team_data:
+            return f'Team {idx} is missing a name'
+    return None
+
+def _insert_teams(teams_by_league, version, now):
+    """Insert teams for each (league_id, teams_data) pair and return team ids by league in draft order."""
+    rows = [
+        {
+            'name': team_data['name'],
+            'icon': team_data.get('icon', 'Shield'),
+            'color': team_data.get('color', 'text-blue-500'),
+            'bg_color': team_data.get('bg_color', 'bg-blue-50'),
+            'draft_order': idx + 1,
+            'league_id': league_id,
+            'version': version,
+            'created_at': now,
+            'updated_at': now
+        }
+        for league_id, teams_data in teams_by_league
+        for idx, team_data in enumerate(teams_data)
+    ]
+    team_ids = {}
+    if not rows:
+        return team_ids
+    
+    db.session.execute(Team.__table__.insert(), rows)
+    inserted = db.session.execute(
+        db.select(Team.league_id, Team.id)
+        .where(Team.league_id.in_([league_id for league_id, _ in teams_by_league]))
+        .order_by(Team.league_id, Team.draft_order)
+    )
+    for league_id, team_id in inserted:
+        team_ids.setdefault(league_id, []).append(team_id)
+    return team_ids
+
+def _insert_picks(rows):
+    # One prepared INSERT executed for every row; the DBAPI's executemany
+    # avoids compiling a statement with a bind parameter per value.
+    if rows:
+        db.session.execute(DraftPick.__table__.insert(), rows)
@@ -0,0 +1,192 @@
+import threading
+import time
+from bisect import bisect_left
+from flask import Blueprint, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from .models import db
+
+metrics_bp = Blueprint('metrics', __name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """Bucket counts, sum and count of one labelled series."""
+
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size):
+        self.counts = [0] * (size + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, bounds, value):
+        self.counts[bisect_left(bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Request and SQL statistics of this process, per route.
+
+    Recording a request takes one lock and a few dictionary updates, and
+    each statement adds two clock reads, so collection can stay on during a
+    live draft. Routes are labelled by endpoint name, never by path, which
+    keeps the number of series bounded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._latency = {}
+        self._statements = {}
+        self._sql_seconds = {}
+        self._statement_counts = {}
+
+    def record(self, blueprint, endpoint, method, status, seconds, statements, sql_seconds):
+        route = (blueprint, endpoint)
+        with self._lock:
+            key = (blueprint, endpoint, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            latency = self._latency.get(route + (method,))
+            if latency is None:
+                latency = self._latency[route + (method,)] = Histogram(len(LATENCY_BUCKETS))
+            latency.observe(LATENCY_BUCKETS, seconds)
+            counts = self._statement_counts.get(route)
+            if counts is None:
+                counts = self._statement_counts[route] = Histogram(len(STATEMENT_BUCKETS))
+            counts.observe(STATEMENT_BUCKETS, statements)
+            self._statements[route] = self._statements.get(route, 0) + statements
+            self._sql_seconds[route] = self._sql_seconds.get(route, 0.0) + sql_seconds
+
+    def render(self, pool=None):
+        """The metrics in the Prometheus text exposition format."""
+        with self._lock:
+            requests = dict(self._requests)
+            latency = {key: _copy(value) for key, value in self._latency.items()}
+            statements = dict(self._statements)
+            sql_seconds = dict(self._sql_seconds)
+            statement_counts = {key: _copy(value) for key, value in self._statement_counts.items()}
+
+        lines = []
+        _header(lines, 'draft_http_requests_total', 'counter', 'HTTP requests handled.')
+        for (blueprint, endpoint, method, status), value in sorted(requests.items()):
+            lines.append(_sample('draft_http_requests_total', value, blueprint=blueprint, endpoint=endpoint,
+                                 method=method, status=status))
+        _header(lines, 'draft_http_request_duration_seconds', 'histogram', 'Time to produce a response.')
+        for (blueprint, endpoint, method), histogram in sorted(latency.items()):
+            _histogram(lines, 'draft_http_request_duration_seconds', LATENCY_BUCKETS, histogram,
+                       blueprint=blueprint, endpoint=endpoint, method=method)
+        _header(lines, 'draft_sql_statements_total', 'counter', 'SQL statements run while handling requests.')
+        for (blueprint, endpoint), value in sorted(statements.items()):
+            lines.append(_sample('draft_sql_statements_total', value, blueprint=blueprint, endpoint=endpoint))
+        _header(lines, 'draft_sql_duration_seconds_total', 'counter', 'Time spent in SQL statements of requests.')
+        for (blueprint, endpoint), value in sorted(sql_seconds.items()):
+            lines.append(_sample('draft_sql_duration_seconds_total', value, blueprint=blueprint, endpoint=endpoint))
+        _header(lines, 'draft_sql_statements_per_request', 'histogram', 'SQL statements run by one request.')
+        for (blueprint, endpoint), histogram in sorted(statement_counts.items()):
+            _histogram(lines, 'draft_sql_statements_per_request', STATEMENT_BUCKETS, histogram,
+                       blueprint=blueprint, endpoint=endpoint)
+
+        if pool is not None:
+            for name, attribute, help_text in (
+                ('draft_db_pool_size', 'size', 'Connections the pool keeps open.'),
+                ('draft_db_pool_checked_out', 'checkedout', 'Connections in use.'),
+                ('draft_db_pool_checked_in', 'checkedin', 'Idle connections in the pool.'),
+                ('draft_db_pool_overflow', 'overflow', 'Connections open beyond the pool size.')
+            ):
+                # Only queue pools report their usage; SQLite in-memory pools do not
+                if callable(getattr(pool, attribute, None)):
+                    _header(lines, name, 'gauge', help_text)
+                    lines.append(_sample(name, getattr(pool, attribute)()))
+        return '\n'.join(lines) + '\n'
+
+
+def init_metrics(app):
+    if not app.config['METRICS_ENABLED']:
+        return
+    app.extensions['metrics'] = metrics = Metrics()
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_timer():
+        g.metrics_sql = [0, 0.0]
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            statements, sql_seconds = g.pop('metrics_sql')
+            metrics.record(
+                request.blueprint or '', request.endpoint or '', request.method, response.status_code,
+                time.perf_counter() - started, statements, sql_seconds
+            )
+        return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None or not has_request_context():
+        return
+    totals = g.get('metrics_sql')
+    if totals is not None:
+        totals[0] += 1
+        totals[1] += time.perf_counter() - context.metrics_started
+
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    metrics = current_app.extensions.get('metrics')
+    if metrics is None:
+        return Response('Metrics are disabled\n', status=404, content_type=CONTENT_TYPE)
+    return Response(metrics.render(db.engine.pool), content_type=CONTENT_TYPE)
+
+
+def _copy(histogram):
+    copy = Histogram(len(histogram.counts) - 1)
+    copy.counts = list(histogram.counts)
+    copy.sum = histogram.sum
+    copy.count = histogram.count
+    return copy
+
+
+def _header(lines, name, kind, help_text):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {kind}')
+
+
+def _histogram(lines, name, bounds, histogram, **labels):
+    cumulative = 0
+    for bound, count in zip(bounds, histogram.counts):
+        cumulative += count
+        lines.append(_sample(f'{name}_bucket', cumulative, le=_format(bound), **labels))
+    lines.append(_sample(f'{name}_bucket', histogram.count, le='+Inf', **labels))
+    lines.append(_sample(f'{name}_sum', histogram.sum, **labels))
+    lines.append(_sample(f'{name}_count', histogram.count, **labels))
+
+
+def _sample(name, value, **labels):
+    if labels:
+        label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+        return f'{name}{{{label_text}}} {_format(value)}'
+    return f'{name} {_format(value)}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value):
+    if isinstance(value, float):
+        return repr(value) if not value.is_integer() else f'{value:.1f}'
+    return str(value)
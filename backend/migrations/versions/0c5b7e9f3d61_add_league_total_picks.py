@@ -0,0 +1,48 @@
+"""Add league total picks
+
+The size of each league's pick grid, kept on league so a pick can tell
+whether it completes the draft without counting rows. Existing leagues
+are backfilled from their draft picks.
+
+Revision ID: 0c5b7e9f3d61
+Revises: b6e0c8d41a27
+Create Date: 2026-10-18 01:35:29.118640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c5b7e9f3d61'
+down_revision = 'b6e0c8d41a27'
+branch_labels = None
+depends_on = None
+
+league = sa.table(
+    'league',
+    sa.column('id', sa.Integer),
+    sa.column('total_picks', sa.Integer)
+)
+draft_pick = sa.table(
+    'draft_pick',
+    sa.column('id', sa.Integer),
+    sa.column('league_id', sa.Integer)
+)
+
+
+def upgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_picks', sa.Integer(), server_default='0', nullable=False))
+
+    pick_count = (
+        sa.select(sa.func.count(draft_pick.c.id))
+        .where(draft_pick.c.league_id == league.c.id)
+        .scalar_subquery()
+    )
+    op.execute(league.update().values(total_picks=pick_count))
+
+
+def downgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.drop_column('total_picks')
@@ -0,0 +1,38 @@
+"""Add pick clock
+
+The time allowed per pick and what happens when it runs out, plus the
+deadline of the pick on the clock, indexed so a restarted worker can
+reload every running clock.
+
+Revision ID: 3b9a4c1d7e52
+Revises: 8efb9318cf48
+Create Date: 2026-10-18 09:12:41.508337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9a4c1d7e52'
+down_revision = '8efb9318cf48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('pick_clock_seconds', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('pick_expiry_action', sa.String(length=10), server_default='autopick', nullable=False))
+        batch_op.add_column(sa.Column('pick_deadline', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('pick_deadline_pick', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_league_pick_deadline', ['pick_deadline'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.drop_index('ix_league_pick_deadline')
+        batch_op.drop_column('pick_deadline_pick')
+        batch_op.drop_column('pick_deadline')
+        batch_op.drop_column('pick_expiry_action')
+        batch_op.drop_column('pick_clock_seconds')
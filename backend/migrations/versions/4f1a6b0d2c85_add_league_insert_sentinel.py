@@ -0,0 +1,30 @@
+"""Add league insert sentinel
+
+A client-side sentinel that lets batch league creation insert many
+leagues per statement and still match the returned ids to them in
+request order on SQLite, which has no server-side way to do so.
+
+Revision ID: 4f1a6b0d2c85
+Revises: c7d2e8a41f93
+Create Date: 2026-10-18 16:02:48.113907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f1a6b0d2c85'
+down_revision = 'c7d2e8a41f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('_sentinel', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.drop_column('_sentinel')
@@ -0,0 +1,85 @@
+"""Move trade picks into trade_pick
+
+Replaces the JSON pick_ids column of trade with a trade_pick association
+table indexed from both sides, so the trades a pick was part of are an
+indexed join. Existing trades are backfilled from the JSON; ids of picks
+that no longer exist are dropped.
+
+Revision ID: 589fbce46571
+Revises: 5cd66ead27e0
+Create Date: 2026-10-18 01:59:01.471351
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '589fbce46571'
+down_revision = '5cd66ead27e0'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+trade = sa.table('trade', sa.column('id', sa.Integer), sa.column('pick_ids', sa.Text))
+trade_pick = sa.table('trade_pick', sa.column('trade_id', sa.Integer), sa.column('pick_id', sa.Integer))
+draft_pick = sa.table('draft_pick', sa.column('id', sa.Integer))
+
+
+def upgrade():
+    op.create_table('trade_pick',
+    sa.Column('trade_id', sa.Integer(), nullable=False),
+    sa.Column('pick_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['pick_id'], ['draft_pick.id'], ),
+    sa.ForeignKeyConstraint(['trade_id'], ['trade.id'], ),
+    sa.PrimaryKeyConstraint('trade_id', 'pick_id')
+    )
+    with op.batch_alter_table('trade_pick', schema=None) as batch_op:
+        batch_op.create_index('ix_trade_pick_pick_trade', ['pick_id', 'trade_id'], unique=False)
+
+    connection = op.get_bind()
+    pick_ids = set(connection.execute(sa.select(draft_pick.c.id)).scalars())
+    rows = []
+    for trade_id, encoded in connection.execute(sa.select(trade.c.id, trade.c.pick_ids)):
+        for pick_id in sorted(set(json.loads(encoded or '[]'))):
+            if pick_id in pick_ids:
+                rows.append({'trade_id': trade_id, 'pick_id': pick_id})
+        if len(rows) >= BATCH_SIZE:
+            op.bulk_insert(trade_pick, rows)
+            rows = []
+    if rows:
+        op.bulk_insert(trade_pick, rows)
+
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.drop_column('pick_ids')
+
+
+def downgrade():
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('pick_ids', sa.TEXT(), nullable=True))
+
+    connection = op.get_bind()
+    picks_by_trade = {}
+    for trade_id, pick_id in connection.execute(
+        sa.select(trade_pick.c.trade_id, trade_pick.c.pick_id).order_by(trade_pick.c.trade_id, trade_pick.c.pick_id)
+    ):
+        picks_by_trade.setdefault(trade_id, []).append(pick_id)
+    connection.execute(
+        trade.update().values(pick_ids=sa.literal('[]'))
+    )
+    if picks_by_trade:
+        connection.execute(
+            trade.update().where(trade.c.id == sa.bindparam('b_id')).values(pick_ids=sa.bindparam('b_pick_ids')),
+            [{'b_id': trade_id, 'b_pick_ids': json.dumps(ids)} for trade_id, ids in picks_by_trade.items()]
+        )
+
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.alter_column('pick_ids', existing_type=sa.TEXT(), nullable=False)
+
+    with op.batch_alter_table('trade_pick', schema=None) as batch_op:
+        batch_op.drop_index('ix_trade_pick_pick_trade')
+
+    op.drop_table('trade_pick')
@@ -0,0 +1,40 @@
+"""Add prospect rank
+
+A nullable draft rank (lower is better) and a partial index listing each
+league's undrafted prospects by position in rank order, which replaces
+the unranked one.
+
+Revision ID: 5cd66ead27e0
+Revises: e2a9c229fadf
+Create Date: 2026-10-18 01:47:03.890266
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5cd66ead27e0'
+down_revision = 'e2a9c229fadf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    undrafted = sa.column('is_drafted') == sa.false()
+
+    with op.batch_alter_table('prospect', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rank', sa.Integer(), nullable=True))
+        batch_op.drop_index('ix_prospect_league_undrafted')
+        batch_op.create_index('ix_prospect_undrafted_rank', ['league_id', 'position', 'rank'], unique=False,
+                              sqlite_where=undrafted, postgresql_where=undrafted)
+
+
+def downgrade():
+    undrafted = sa.column('is_drafted') == sa.false()
+
+    with op.batch_alter_table('prospect', schema=None) as batch_op:
+        batch_op.drop_index('ix_prospect_undrafted_rank')
+        batch_op.create_index('ix_prospect_league_undrafted', ['league_id', 'position'], unique=False,
+                              sqlite_where=undrafted, postgresql_where=undrafted)
+        batch_op.drop_column('rank')
@@ -0,0 +1,97 @@
+"""Baseline schema
+
+Revision ID: 5e7836334d8c
+Revises: 
+Create Date: 2026-10-18 01:35:16.655603
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e7836334d8c'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('league',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('num_rounds', sa.Integer(), nullable=True),
+    sa.Column('draft_started', sa.Boolean(), nullable=True),
+    sa.Column('draft_completed', sa.Boolean(), nullable=True),
+    sa.Column('current_pick_number', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('team',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('icon', sa.String(length=50), nullable=True),
+    sa.Column('color', sa.String(length=50), nullable=True),
+    sa.Column('bg_color', sa.String(length=50), nullable=True),
+    sa.Column('draft_order', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['league_id'], ['league.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('prospect',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('position', sa.String(length=20), nullable=False),
+    sa.Column('college', sa.String(length=100), nullable=True),
+    sa.Column('is_drafted', sa.Boolean(), nullable=True),
+    sa.Column('drafted_by', sa.Integer(), nullable=True),
+    sa.Column('draft_pick_number', sa.Integer(), nullable=True),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['drafted_by'], ['team.id'], ),
+    sa.ForeignKeyConstraint(['league_id'], ['league.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('trade',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('from_team_id', sa.Integer(), nullable=False),
+    sa.Column('to_team_id', sa.Integer(), nullable=False),
+    sa.Column('pick_ids', sa.Text(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('executed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['from_team_id'], ['team.id'], ),
+    sa.ForeignKeyConstraint(['league_id'], ['league.id'], ),
+    sa.ForeignKeyConstraint(['to_team_id'], ['team.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('draft_pick',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('pick_number', sa.Integer(), nullable=False),
+    sa.Column('round_number', sa.Integer(), nullable=False),
+    sa.Column('pick_in_round', sa.Integer(), nullable=False),
+    sa.Column('original_team_id', sa.Integer(), nullable=False),
+    sa.Column('current_team_id', sa.Integer(), nullable=False),
+    sa.Column('prospect_id', sa.Integer(), nullable=True),
+    sa.Column('is_used', sa.Boolean(), nullable=True),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['current_team_id'], ['team.id'], ),
+    sa.ForeignKeyConstraint(['league_id'], ['league.id'], ),
+    sa.ForeignKeyConstraint(['original_team_id'], ['team.id'], ),
+    sa.ForeignKeyConstraint(['prospect_id'], ['prospect.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('draft_pick')
+    op.drop_table('trade')
+    op.drop_table('prospect')
+    op.drop_table('team')
+    op.drop_table('league')
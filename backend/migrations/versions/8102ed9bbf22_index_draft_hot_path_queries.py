@@ -0,0 +1,55 @@
+"""Index draft hot path queries
+
+Composite indexes for the per-league lookups made while drafting, a unique
+index on (league_id, pick_number) and a partial index over undrafted
+prospects.
+
+Revision ID: 8102ed9bbf22
+Revises: 0c5b7e9f3d61
+Create Date: 2026-10-18 01:35:33.281077
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8102ed9bbf22'
+down_revision = '0c5b7e9f3d61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    undrafted = sa.column('is_drafted') == sa.false()
+
+    with op.batch_alter_table('draft_pick', schema=None) as batch_op:
+        batch_op.create_index('ix_draft_pick_league_prospect', ['league_id', 'prospect_id'], unique=False)
+        batch_op.create_index('uq_draft_pick_league_pick_number', ['league_id', 'pick_number'], unique=True)
+
+    with op.batch_alter_table('prospect', schema=None) as batch_op:
+        batch_op.create_index('ix_prospect_league_position_drafted', ['league_id', 'position', 'is_drafted'], unique=False)
+        batch_op.create_index('ix_prospect_league_undrafted', ['league_id', 'position'], unique=False,
+                              sqlite_where=undrafted, postgresql_where=undrafted)
+
+    with op.batch_alter_table('team', schema=None) as batch_op:
+        batch_op.create_index('ix_team_league_draft_order', ['league_id', 'draft_order'], unique=False)
+
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.create_index('ix_trade_league_executed_at', ['league_id', 'executed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.drop_index('ix_trade_league_executed_at')
+
+    with op.batch_alter_table('team', schema=None) as batch_op:
+        batch_op.drop_index('ix_team_league_draft_order')
+
+    with op.batch_alter_table('prospect', schema=None) as batch_op:
+        batch_op.drop_index('ix_prospect_league_undrafted')
+        batch_op.drop_index('ix_prospect_league_position_drafted')
+
+    with op.batch_alter_table('draft_pick', schema=None) as batch_op:
+        batch_op.drop_index('uq_draft_pick_league_pick_number')
+        batch_op.drop_index('ix_draft_pick_league_prospect')
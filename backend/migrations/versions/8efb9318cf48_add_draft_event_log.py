@@ -0,0 +1,120 @@
+"""Add draft event log
+
+Adds the append-only draft_event log with its per-league sequence counter
+on league, and draft_snapshot for the league state every few events.
+Existing leagues get a snapshot of their current state at sequence 0, the
+point their history starts from.
+
+Revision ID: 8efb9318cf48
+Revises: 589fbce46571
+Create Date: 2026-10-18 02:07:52.776428
+
+"""
+import json
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8efb9318cf48'
+down_revision = '589fbce46571'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+LEAGUE_FIELDS = ('name', 'description', 'num_rounds', 'draft_started', 'draft_completed', 'current_pick_number')
+
+league = sa.table(
+    'league',
+    sa.column('id', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('description', sa.Text),
+    sa.column('num_rounds', sa.Integer),
+    sa.column('draft_started', sa.Boolean),
+    sa.column('draft_completed', sa.Boolean),
+    sa.column('current_pick_number', sa.Integer)
+)
+draft_pick = sa.table(
+    'draft_pick',
+    sa.column('id', sa.Integer),
+    sa.column('league_id', sa.Integer),
+    sa.column('pick_number', sa.Integer),
+    sa.column('current_team_id', sa.Integer),
+    sa.column('prospect_id', sa.Integer)
+)
+draft_snapshot = sa.table(
+    'draft_snapshot',
+    sa.column('league_id', sa.Integer),
+    sa.column('sequence', sa.Integer),
+    sa.column('state', sa.Text),
+    sa.column('created_at', sa.DateTime)
+)
+
+
+def upgrade():
+    op.create_table('draft_event',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('sequence', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=20), nullable=False),
+    sa.Column('changes', sa.Text(), nullable=False),
+    sa.Column('pick_number', sa.Integer(), nullable=True),
+    sa.Column('last_pick_number', sa.Integer(), nullable=True),
+    sa.Column('target_sequence', sa.Integer(), nullable=True),
+    sa.Column('undo_sequence', sa.Integer(), nullable=True),
+    sa.Column('redo_sequence', sa.Integer(), nullable=True),
+    sa.Column('previous_sequence', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['league_id'], ['league.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('draft_event', schema=None) as batch_op:
+        batch_op.create_index('ix_draft_event_league_pick_number', ['league_id', 'pick_number'], unique=False)
+        batch_op.create_index('uq_draft_event_league_sequence', ['league_id', 'sequence'], unique=True)
+
+    op.create_table('draft_snapshot',
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('sequence', sa.Integer(), nullable=False),
+    sa.Column('state', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['league_id'], ['league.id'], ),
+    sa.PrimaryKeyConstraint('league_id', 'sequence')
+    )
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('event_sequence', sa.Integer(), server_default='0', nullable=False))
+
+    connection = op.get_bind()
+    picks = {}
+    rows = connection.execute(
+        sa.select(draft_pick.c.league_id, draft_pick.c.id, draft_pick.c.current_team_id, draft_pick.c.prospect_id)
+        .order_by(draft_pick.c.league_id, draft_pick.c.pick_number)
+    )
+    for league_id, pick_id, team_id, prospect_id in rows:
+        picks.setdefault(league_id, []).append([pick_id, team_id, prospect_id])
+
+    now = datetime.utcnow()
+    snapshots = []
+    for row in connection.execute(sa.select(league.c.id, *[league.c[field] for field in LEAGUE_FIELDS])):
+        state = {'league': dict(zip(LEAGUE_FIELDS, row[1:])), 'picks': picks.get(row[0], [])}
+        snapshots.append({
+            'league_id': row[0], 'sequence': 0, 'state': json.dumps(state, separators=(',', ':')), 'created_at': now
+        })
+        if len(snapshots) >= BATCH_SIZE:
+            op.bulk_insert(draft_snapshot, snapshots)
+            snapshots = []
+    if snapshots:
+        op.bulk_insert(draft_snapshot, snapshots)
+
+
+def downgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.drop_column('event_sequence')
+
+    op.drop_table('draft_snapshot')
+    with op.batch_alter_table('draft_event', schema=None) as batch_op:
+        batch_op.drop_index('uq_draft_event_league_sequence')
+        batch_op.drop_index('ix_draft_event_league_pick_number')
+
+    op.drop_table('draft_event')
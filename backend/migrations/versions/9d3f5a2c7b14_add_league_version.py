@@ -0,0 +1,28 @@
+"""Add league version
+
+A counter bumped on every change to a league, used as its ETag.
+
+Revision ID: 9d3f5a2c7b14
+Revises: 5e7836334d8c
+Create Date: 2026-10-18 01:35:20.412387
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3f5a2c7b14'
+down_revision = '5e7836334d8c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.drop_column('version')
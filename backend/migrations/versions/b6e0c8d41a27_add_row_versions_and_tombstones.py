@@ -0,0 +1,47 @@
+"""Add row versions and tombstones
+
+The league version each team, prospect, pick and trade was last changed
+at, and a tombstone for every deleted row, for the changes feed. Existing
+rows start at version 0, so a client syncing from 0 receives them all.
+
+Revision ID: b6e0c8d41a27
+Revises: 9d3f5a2c7b14
+Create Date: 2026-10-18 01:35:24.906152
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e0c8d41a27'
+down_revision = '9d3f5a2c7b14'
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ('team', 'prospect', 'trade', 'draft_pick')
+
+
+def upgrade():
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+    op.create_table('tombstone',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['league_id'], ['league.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('tombstone')
+
+    for table in reversed(VERSIONED_TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('version')
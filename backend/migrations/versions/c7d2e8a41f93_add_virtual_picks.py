@@ -0,0 +1,29 @@
+"""Add virtual picks
+
+Leagues that store only their used and traded picks and compute the
+rest of the snake draft from the team order.
+
+Revision ID: c7d2e8a41f93
+Revises: 3b9a4c1d7e52
+Create Date: 2026-10-18 14:37:05.220914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e8a41f93'
+down_revision = '3b9a4c1d7e52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('virtual_picks', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.drop_column('virtual_picks')
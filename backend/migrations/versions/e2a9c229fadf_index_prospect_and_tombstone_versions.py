@@ -0,0 +1,35 @@
+"""Index prospect and tombstone versions
+
+Lets prospect search and the changes feed find rows newer than a league
+version without scanning the whole league.
+
+Revision ID: e2a9c229fadf
+Revises: 8102ed9bbf22
+Create Date: 2026-10-18 01:39:27.833750
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a9c229fadf'
+down_revision = '8102ed9bbf22'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('prospect', schema=None) as batch_op:
+        batch_op.create_index('ix_prospect_league_version', ['league_id', 'version'], unique=False)
+
+    with op.batch_alter_table('tombstone', schema=None) as batch_op:
+        batch_op.create_index('ix_tombstone_league_version', ['league_id', 'version'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tombstone', schema=None) as batch_op:
+        batch_op.drop_index('ix_tombstone_league_version')
+
+    with op.batch_alter_table('prospect', schema=None) as batch_op:
+        batch_op.drop_index('ix_prospect_league_version')
@@ -14,15 +14,31 @@ class League(db.Model):
     draft_started = db.Column(db.Boolean, default=False)
     draft_completed = db.Column(db.Boolean, default=False)
     current_pick_number = db.Column(db.Integer, default=1)
+    total_picks = db.Column(db.Integer, nullable=False, default=0)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    event_sequence = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Last DraftEvent.sequence
+    pick_clock_seconds = db.Column(db.Integer)  # Time allowed per pick; None runs no clock
+    pick_expiry_action = db.Column(db.String(10), nullable=False, default='autopick', server_default='autopick')
+    pick_deadline = db.Column(db.DateTime)  # When pick number pick_deadline_pick runs out
+    pick_deadline_pick = db.Column(db.Integer)
+    # Store only the picks used or traded; the rest follow from the snake order
+    virtual_picks = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    # Numbers the rows of a batched INSERT so RETURNING ids can be matched
+    # to them on SQLite too; NULL outside of batch league creation
+    _sentinel = db.insert_sentinel('_sentinel')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    teams = db.relationship('Team', backref='league', lazy=True, cascade='all, delete-orphan')
-    prospects = db.relationship('Prospect', backref='league', lazy=True, cascade='all, delete-orphan')
-    draft_picks = db.relationship('DraftPick', backref='league', lazy=True, cascade='all, delete-orphan')
+    teams = db.relationship('Team', backref='league', lazy=True, cascade='all, delete-orphan', order_by='Team.draft_order')
+    prospects = db.relationship('Prospect', backref='league', lazy=True, cascade='all, delete-orphan', order_by='Prospect.id')
+    draft_picks = db.relationship('DraftPick', backref='league', lazy=True, cascade='all, delete-orphan', order_by='DraftPick.pick_number')
     trades = db.relationship('Trade', backref='league', lazy=True, cascade='all, delete-orphan')
     
+    __table_args__ = (
+        db.Index('ix_league_pick_deadline', 'pick_deadline'),
+    )
+    
     def to_dict(self, include_relations=False):
         data = {
             'id': self.id,
@@ -32,6 +48,11 @@ class League(db.Model):
             'draft_started': self.draft_started,
             'draft_completed': self.draft_completed,
             'current_pick_number': self.current_pick_number,
+            'total_picks': self.total_picks,
+            'pick_clock_seconds': self.pick_clock_seconds,
+            'pick_expiry_action': self.pick_expiry_action,
+            'virtual_picks': self.virtual_picks,
+            'version': self.version,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
@@ -51,6 +72,7 @@ class Team(db.Model):
     bg_color = db.Column(db.String(50), default='bg-blue-50')
     draft_order = db.Column(db.Integer, nullable=False)
     league_id = db.Column(db.Integer, db.ForeignKey('league.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -58,6 +80,10 @@ class Team(db.Model):
     draft_picks = db.relationship('DraftPick', backref='current_team', lazy=True, foreign_keys='DraftPick.current_team_id')
     drafted_prospects = db.relationship('Prospect', backref='drafted_by_team', lazy=True)
     
+    __table_args__ = (
+        db.Index('ix_team_league_draft_order', 'league_id', 'draft_order'),
+    )
+    
     def to_dict(self, include_roster=False):
         data = {
             'id': self.id,
@@ -79,19 +105,30 @@ class Prospect(db.Model):
     name = db.Column(db.String(100), nullable=False)
     position = db.Column(db.String(20), nullable=False)
     college = db.Column(db.String(100))
+    rank = db.Column(db.Integer, nullable=True)  # Lower is better; unranked prospects come last
     is_drafted = db.Column(db.Boolean, default=False)
     drafted_by = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=True)
     draft_pick_number = db.Column(db.Integer, nullable=True)
     league_id = db.Column(db.Integer, db.ForeignKey('league.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_prospect_league_position_drafted', 'league_id', 'position', 'is_drafted'),
+        db.Index('ix_prospect_league_version', 'league_id', 'version'),
+        # Partial index over the available players a draft board lists, best first
+        db.Index('ix_prospect_undrafted_rank', 'league_id', 'position', 'rank',
+                 sqlite_where=is_drafted == db.false(), postgresql_where=is_drafted == db.false()),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
             'name': self.name,
             'position': self.position,
             'college': self.college,
+            'rank': self.rank,
             'is_drafted': self.is_drafted,
             'drafted_by': self.drafted_by,
             'draft_pick_number': self.draft_pick_number,
@@ -110,6 +147,7 @@ class DraftPick(db.Model):
     prospect_id = db.Column(db.Integer, db.ForeignKey('prospect.id'), nullable=True)
     is_used = db.Column(db.Boolean, default=False)
     league_id = db.Column(db.Integer, db.ForeignKey('league.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -117,6 +155,11 @@ class DraftPick(db.Model):
     original_team = db.relationship('Team', foreign_keys=[original_team_id], backref='original_picks')
     prospect = db.relationship('Prospect', backref='draft_pick')
     
+    __table_args__ = (
+        db.Index('uq_draft_pick_league_pick_number', 'league_id', 'pick_number', unique=True),
+        db.Index('ix_draft_pick_league_prospect', 'league_id', 'prospect_id'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -136,21 +179,109 @@ class Trade(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     from_team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=False)
     to_team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=False)
-    pick_ids = db.Column(db.Text, nullable=False)  # JSON array of pick IDs
     league_id = db.Column(db.Integer, db.ForeignKey('league.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
     executed_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
     from_team = db.relationship('Team', foreign_keys=[from_team_id], backref='trades_from')
     to_team = db.relationship('Team', foreign_keys=[to_team_id], backref='trades_to')
+    trade_picks = db.relationship('TradePick', backref='trade', lazy=True, cascade='all, delete-orphan')
+    
+    __table_args__ = (
+        db.Index('ix_trade_league_executed_at', 'league_id', 'executed_at'),
+    )
     
     def to_dict(self):
-        import json
         return {
             'id': self.id,
             'from_team_id': self.from_team_id,
             'to_team_id': self.to_team_id,
-            'pick_ids': json.loads(self.pick_ids),
+            'pick_ids': parse_pick_ids(self.pick_ids),
             'league_id': self.league_id,
             'executed_at': self.executed_at.isoformat()
         }
+
+class TradePick(db.Model):
+    __tablename__ = 'trade_pick'
+    
+    trade_id = db.Column(db.Integer, db.ForeignKey('trade.id'), primary_key=True)
+    pick_id = db.Column(db.Integer, db.ForeignKey('draft_pick.id'), primary_key=True)
+    
+    __table_args__ = (
+        # The primary key serves lookups by trade; this one a pick's trade history
+        db.Index('ix_trade_pick_pick_trade', 'pick_id', 'trade_id'),
+    )
+
+# The traded pick ids, aggregated from trade_pick so that queries selecting
+# serialized trade columns get them without a second query.
+Trade.pick_ids = db.column_property(
+    db.select(db.func.aggregate_strings(db.cast(TradePick.pick_id, db.String), ','))
+    .where(TradePick.trade_id == Trade.id)
+    .correlate_except(TradePick)
+    .scalar_subquery()
+)
+
+def parse_pick_ids(value):
+    return sorted(int(pick_id) for pick_id in value.split(',')) if value else []
+
+class Tombstone(db.Model):
+    __tablename__ = 'tombstone'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    league_id = db.Column(db.Integer, db.ForeignKey('league.id'), nullable=False)
+    entity_type = db.Column(db.String(20), nullable=False)  # teams, prospects, draft_picks or trades
+    entity_id = db.Column(db.Integer, nullable=False)
+    version = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    league = db.relationship('League', backref=db.backref('tombstones', cascade='all, delete-orphan'))
+    
+    __table_args__ = (
+        db.Index('ix_tombstone_league_version', 'league_id', 'version'),
+    )
+    
+    def to_dict(self):
+        return {
+            'entity_type': self.entity_type,
+            'entity_id': self.entity_id,
+            'version': self.version,
+            'deleted_at': self.deleted_at.isoformat()
+        }
+
+class DraftEvent(db.Model):
+    __tablename__ = 'draft_event'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    league_id = db.Column(db.Integer, db.ForeignKey('league.id'), nullable=False)
+    sequence = db.Column(db.Integer, nullable=False)
+    event_type = db.Column(db.String(20), nullable=False)  # pick, picks, undraft, trade, league, undo or redo
+    changes = db.Column(db.Text, nullable=False)  # JSON of the league fields and [id, team, prospect] picks written
+    pick_number = db.Column(db.Integer, nullable=True)  # First and last pick made by a pick or picks event
+    last_pick_number = db.Column(db.Integer, nullable=True)
+    target_sequence = db.Column(db.Integer, nullable=True)  # The event an undo reverts or a redo repeats
+    # Undo and redo stacks as linked lists through the log: after this event
+    # undo reverts undo_sequence and redo repeats the undo event at
+    # redo_sequence. previous_sequence links the entry this event pushed to
+    # the one below it.
+    undo_sequence = db.Column(db.Integer, nullable=True)
+    redo_sequence = db.Column(db.Integer, nullable=True)
+    previous_sequence = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    league = db.relationship('League', backref=db.backref('draft_events', cascade='all, delete-orphan'))
+    
+    __table_args__ = (
+        db.Index('uq_draft_event_league_sequence', 'league_id', 'sequence', unique=True),
+        db.Index('ix_draft_event_league_pick_number', 'league_id', 'pick_number'),
+    )
+
+class DraftSnapshot(db.Model):
+    __tablename__ = 'draft_snapshot'
+    
+    league_id = db.Column(db.Integer, db.ForeignKey('league.id'), primary_key=True)
+    sequence = db.Column(db.Integer, primary_key=True)  # State after the event with this sequence
+    state = db.Column(db.Text, nullable=False)  # JSON of the league fields and [id, team, prospect] picks
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    league = db.relationship('League', backref=db.backref('draft_snapshots', cascade='all, delete-orphan'))
@@ -0,0 +1,117 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from urllib.parse import urlencode
+from flask import current_app, jsonify, request
+from .models import db
+from .encoding import stream_array
+from .serialization import SERIALIZED_COLUMNS, SerializedRows
+
+
+def fetch_page(model, criteria, keys):
+    """Fetch one keyset page of ``model`` rows for the current request.
+
+    ``keys`` is a sequence of column names that uniquely orders the rows and
+    is backed by an index; prefix every name with ``-`` to walk them in
+    descending order. Honours the ``fields``, ``limit`` and ``cursor`` query
+    parameters.
+
+    Returns ``(items, next_cursor, error)`` with ``items`` as
+    ``SerializedRows``. Without ``limit`` or ``cursor``
+    every matching row is returned, as before pagination existed.
+    """
+    descending = keys[0].startswith('-')
+    keys = [key.lstrip('-') for key in keys]
+
+    fields, error = _requested_fields(model)
+    if error:
+        return None, None, error
+
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    if cursor is not None and limit is None:
+        limit = current_app.config['DEFAULT_PAGE_SIZE']
+    if limit is not None and not 1 <= limit <= current_app.config['MAX_PAGE_SIZE']:
+        return None, None, f'limit must be between 1 and {current_app.config["MAX_PAGE_SIZE"]}'
+
+    selected = list(fields) + [key for key in keys if key not in fields]
+    key_columns = [getattr(model, key) for key in keys]
+    statement = db.select(*[getattr(model, name) for name in selected])
+    if criteria:
+        statement = statement.where(*criteria)
+
+    if cursor is not None:
+        values, error = _decode_cursor(cursor, key_columns)
+        if error:
+            return None, None, error
+        position = db.tuple_(*key_columns)
+        statement = statement.where(position < db.tuple_(*values) if descending else position > db.tuple_(*values))
+
+    statement = statement.order_by(*[column.desc() if descending else column for column in key_columns])
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+
+    # Only columns are selected, so the rows skip the ORM loading layer
+    rows = db.session.connection().execute(statement).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor([last[selected.index(key)] for key in keys])
+
+    return SerializedRows(rows, fields), next_cursor, None
+
+
+def page_response(items, next_cursor):
+    """JSON response for a page of items.
+
+    ``SerializedRows`` pages longer than ``JSON_STREAM_MIN_ITEMS`` are encoded and sent
+    ``JSON_STREAM_CHUNK_SIZE`` items at a time.
+    """
+    if isinstance(items, SerializedRows) and len(items) > current_app.config['JSON_STREAM_MIN_ITEMS']:
+        response = current_app.response_class(
+            stream_array(current_app.json, items.chunks(current_app.config['JSON_STREAM_CHUNK_SIZE'])),
+            mimetype=current_app.json.mimetype
+        )
+    else:
+        response = jsonify(list(items))
+    if next_cursor is not None:
+        args = request.args.to_dict()
+        args['cursor'] = next_cursor
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.path}?{urlencode(args)}>; rel="next"'
+    return response
+
+
+def _requested_fields(model):
+    columns = SERIALIZED_COLUMNS[model]
+    fields = request.args.get('fields')
+    if not fields:
+        return columns, None
+
+    requested = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in requested if name not in columns]
+    if unknown or not requested:
+        return None, f'Unknown fields: {", ".join(unknown)}' if unknown else 'fields must not be empty'
+    return tuple(dict.fromkeys(requested)), None
+
+
+def _encode_cursor(values):
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    payload = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def _decode_cursor(cursor, key_columns):
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(payload)
+        if not isinstance(values, list) or len(values) != len(key_columns):
+            raise ValueError
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, db.DateTime) else value
+            for value, column in zip(values, key_columns)
+        ], None
+    except (binascii.Error, ValueError, TypeError):
+        return None, 'Invalid cursor'
@@ -0,0 +1,266 @@
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from .models import db, League
+from .draft import autopick, skip_pick
+from .events import event_bus, publish_event
+
+EXPIRY_ACTIONS = ('autopick', 'skip')
+
+# Events that can move a league's current pick or change its clock
+CLOCK_EVENTS = frozenset({
+    'pick', 'picks', 'skip', 'undraft', 'undo', 'redo', 'league_updated', 'league_initialized', 'league_deleted'
+})
+
+REARM_BATCH_SIZE = 500
+
+
+class PickClock:
+    """Deadlines of every running pick clock, kept in one heap on one thread.
+
+    Heap entries are ``(deadline, league id, pick number)`` with the
+    deadline in epoch seconds. Re-arming a league only replaces its entry in
+    ``_armed``; entries that makes stale are dropped when they reach the top
+    of the heap. The thread sleeps until the earliest deadline or until an
+    event marks a league to re-arm, so thousands of clocks cost one thread
+    and no polling.
+
+    Deadlines are stored on ``League`` (``pick_deadline`` for pick number
+    ``pick_deadline_pick``) before they are scheduled, so a restarted worker
+    picks them up again, and every worker schedules the same deadline. When
+    several workers run clocks, each one expires the pick with the same
+    compare-and-set on the pick number and only the first one takes effect.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._condition = threading.Condition()
+        self._heap = []
+        # league id -> (deadline, pick number) of every scheduled clock
+        self._armed = {}
+        self._dirty = set()
+        self._thread = None
+        self._stopped = False
+        self.started = False
+
+    def __len__(self):
+        return len(self._armed)
+
+    def start(self):
+        """Reload the stored deadlines and start the clock thread."""
+        with self._condition:
+            if self.started:
+                return
+            self.started = True
+            self._thread = threading.Thread(target=self._run, name='pick-clock', daemon=True)
+        event_bus.add_listener(self._on_event)
+        self._thread.start()
+
+    def stop(self):
+        event_bus.remove_listener(self._on_event)
+        with self._condition:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._condition.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def touch(self, league_id):
+        """Have the clock thread re-read the league's clock."""
+        with self._condition:
+            self._dirty.add(league_id)
+            self._condition.notify()
+
+    def schedule(self, league_id, pick_number, deadline):
+        entry = (deadline, league_id, pick_number)
+        with self._condition:
+            if self._armed.get(league_id) == (deadline, pick_number):
+                return
+            self._armed[league_id] = (deadline, pick_number)
+            heapq.heappush(self._heap, entry)
+            if len(self._heap) > 2 * len(self._armed) + 64:
+                self._compact()
+            if self._heap[0] is entry:
+                self._condition.notify()
+
+    def cancel(self, league_id):
+        with self._condition:
+            self._armed.pop(league_id, None)
+
+    def deadline(self, league_id):
+        """The scheduled (deadline, pick number) of a league, or None."""
+        with self._condition:
+            return self._armed.get(league_id)
+
+    def due(self, now):
+        """Unschedule and return the (league id, pick number) of every clock that has run out."""
+        expired = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, league_id, pick_number = heapq.heappop(self._heap)
+                if self._armed.get(league_id) == (deadline, pick_number):
+                    del self._armed[league_id]
+                    expired.append((league_id, pick_number))
+        return expired
+
+    def rearm(self, league_ids=None):
+        """Bring the scheduled clocks of ``league_ids`` in line with the database.
+
+        A league whose pick has no stored deadline yet gets one
+        ``pick_clock_seconds`` from now; a league without a running clock
+        is unscheduled and its stale deadline cleared. ``None`` reloads every
+        league with a clock. Needs an app context.
+        """
+        if league_ids is None:
+            ids = db.session.execute(db.select(League.id).where(League.pick_clock_seconds.isnot(None))).scalars().all()
+        else:
+            ids = list(league_ids)
+        for start in range(0, len(ids), REARM_BATCH_SIZE):
+            self._rearm_batch(ids[start:start + REARM_BATCH_SIZE])
+
+    def expire(self, league_id, pick_number):
+        """Auto-pick or skip a pick whose clock has run out. Needs an app context."""
+        league = db.session.execute(
+            db.select(
+                League.current_pick_number, League.pick_deadline, League.pick_deadline_pick,
+                League.pick_expiry_action, *_running_columns()
+            ).where(League.id == league_id)
+        ).first()
+        if league is None or league.current_pick_number != pick_number or not _is_running(league) or \
+                league.pick_deadline_pick != pick_number or _timestamp(league.pick_deadline) > time.time():
+            # Another worker expired it first, or the clock moved since it was scheduled
+            self.touch(league_id)
+            return None
+
+        if league.pick_expiry_action == 'skip':
+            return skip_pick(league_id, expected_pick_number=pick_number)
+        result, status = autopick(league_id, expected_pick_number=pick_number)
+        if status == 400 and result.get('error') != 'No current pick available':
+            # Nobody left that fits the roster; skip so the draft does not stall
+            return skip_pick(league_id, expected_pick_number=pick_number)
+        return result, status
+
+    def _rearm_batch(self, league_ids):
+        leagues = db.session.execute(
+            db.select(
+                League.id, League.current_pick_number, League.pick_deadline, League.pick_deadline_pick,
+                *_running_columns()
+            ).where(League.id.in_(league_ids))
+        ).all()
+        for league_id in set(league_ids) - {league.id for league in leagues}:
+            self.cancel(league_id)
+
+        now = datetime.utcnow()
+        changed = []
+        for league in leagues:
+            if not _is_running(league):
+                self.cancel(league.id)
+                if league.pick_deadline is not None:
+                    db.session.execute(
+                        League.__table__.update()
+                        .where(League.id == league.id)
+                        .values(pick_deadline=None, pick_deadline_pick=None)
+                    )
+                    changed.append((league.id, None, None))
+            elif league.pick_deadline is not None and league.pick_deadline_pick == league.current_pick_number:
+                self.schedule(league.id, league.current_pick_number, _timestamp(league.pick_deadline))
+            else:
+                deadline = now + timedelta(seconds=league.pick_clock_seconds)
+                claimed = db.session.execute(
+                    League.__table__.update()
+                    .where(
+                        League.id == league.id,
+                        League.current_pick_number == league.current_pick_number,
+                        db.or_(League.pick_deadline_pick.is_(None), League.pick_deadline_pick != league.current_pick_number)
+                    )
+                    .values(pick_deadline=deadline, pick_deadline_pick=league.current_pick_number)
+                ).rowcount
+                if claimed:
+                    changed.append((league.id, league.current_pick_number, deadline))
+                else:
+                    # Another worker armed it or the pick moved on; read it again
+                    self.touch(league.id)
+        db.session.commit()
+
+        for league_id, pick_number, deadline in changed:
+            if deadline is not None:
+                self.schedule(league_id, pick_number, _timestamp(deadline))
+            publish_event(league_id, 'clock', {
+                'pick_number': pick_number,
+                'deadline': deadline.isoformat() if deadline else None
+            })
+
+    def _on_event(self, event):
+        if event['type'] in CLOCK_EVENTS:
+            self.touch(event['league_id'])
+
+    def _run(self):
+        with self.app.app_context():
+            self._guard(self.rearm)
+        while True:
+            with self._condition:
+                while not self._stopped and not self._dirty:
+                    timeout = self._heap[0][0] - time.time() if self._heap else None
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+            with self.app.app_context():
+                self._guard(self.rearm, self._take_dirty())
+                for league_id, pick_number in self.due(time.time()):
+                    self._guard(self.expire, league_id, pick_number)
+                    # Start the next pick's clock now, not after the rest of the batch
+                    self._guard(self.rearm, self._take_dirty())
+
+    def _take_dirty(self):
+        with self._condition:
+            dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def _guard(self, func, *args):
+        try:
+            func(*args)
+        except Exception:
+            db.session.rollback()
+            self.app.logger.exception('Pick clock failed')
+
+    def _compact(self):
+        self._heap = [(deadline, league_id, pick_number) for league_id, (deadline, pick_number) in self._armed.items()]
+        heapq.heapify(self._heap)
+
+
+def _running_columns():
+    return League.pick_clock_seconds, League.draft_started, League.draft_completed, League.total_picks
+
+
+def _is_running(league):
+    return (
+        league.pick_clock_seconds is not None and league.draft_started and not league.draft_completed
+        and league.current_pick_number <= league.total_picks
+    )
+
+
+def _timestamp(deadline):
+    # Deadlines are stored as naive UTC, like every other timestamp
+    return deadline.replace(tzinfo=timezone.utc).timestamp()
+
+
+def init_pick_clock(app):
+    clock = app.extensions['pick_clock'] = PickClock(app)
+    # Tests drive the clock by hand instead of through its thread
+    if not app.config['PICK_CLOCK_ENABLED'] or app.testing:
+        return
+
+    # Started by the first request, so commands such as ``flask db upgrade``
+    # do not run clocks against a schema they are about to change
+    @app.before_request
+    def start_pick_clock():
+        if not clock.started:
+            clock.start()
+
+
+def pick_clock():
+    return current_app.extensions['pick_clock']
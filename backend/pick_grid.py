@@ -0,0 +1,75 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from .models import db, Team, DraftPick
+
+
+def grid_pick(league_id, team_ids, pick_number):
+    """Pick ``pick_number`` of a snake draft of ``team_ids``, unused, as ``DraftPick.to_dict`` gives it."""
+    num_teams = len(team_ids)
+    round_index, offset = divmod(pick_number - 1, num_teams)
+    # Odd rounds follow draft order, even rounds reverse it
+    team_id = team_ids[offset if round_index % 2 == 0 else num_teams - 1 - offset]
+    return {
+        'id': None,
+        'pick_number': pick_number,
+        'round_number': round_index + 1,
+        'pick_in_round': offset + 1,
+        'original_team_id': team_id,
+        'current_team_id': team_id,
+        'prospect_id': None,
+        'is_used': False,
+        'league_id': league_id
+    }
+
+
+def build_pick_grid(league_id, team_ids, num_rounds, version, now):
+    """Rows for a snake draft: odd rounds follow draft order, even rounds reverse it."""
+    return [
+        _row(grid_pick(league_id, team_ids, pick_number), version, now)
+        for pick_number in range(1, len(team_ids) * num_rounds + 1)
+    ]
+
+
+def merge_pick_grid(league_id, team_ids, total_picks, picks):
+    """Every pick of a league that stores only the picks used or traded.
+
+    ``picks`` are the stored picks, serialized; the rest are filled in from
+    the snake order of ``team_ids`` with ``id`` None. Returned in pick order.
+    """
+    if not team_ids:
+        return sorted(picks, key=lambda pick: pick['pick_number'])
+    stored = {pick['pick_number']: pick for pick in picks}
+    return [
+        stored.get(pick_number) or grid_pick(league_id, team_ids, pick_number)
+        for pick_number in range(1, max(total_picks, max(stored, default=0)) + 1)
+    ]
+
+
+def grid_team_ids(league_id):
+    """Team ids of a league in draft order, which a virtual pick grid follows."""
+    return db.session.execute(
+        db.select(Team.id).where(Team.league_id == league_id).order_by(Team.draft_order, Team.id)
+    ).scalars().all()
+
+
+def materialize_picks(league_id, total_picks, pick_numbers, version, now):
+    """Store the rows of virtual picks that are about to be used or traded.
+
+    Picks already stored, including any another request stores at the same
+    time, are left as they are, so the caller can update the picks by pick
+    number afterwards. Numbers outside the draft are ignored.
+    """
+    pick_numbers = sorted({number for number in pick_numbers if 1 <= number <= total_picks})
+    team_ids = grid_team_ids(league_id) if pick_numbers else []
+    if not team_ids:
+        return
+    insert = postgresql.insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite.insert
+    db.session.execute(
+        insert(DraftPick.__table__).on_conflict_do_nothing(index_elements=['league_id', 'pick_number']),
+        [_row(grid_pick(league_id, team_ids, number), version, now) for number in pick_numbers]
+    )
+
+
+def _row(pick, version, now):
+    row = dict(pick, version=version, created_at=now, updated_at=now)
+    del row['id']
+    return row
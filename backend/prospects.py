@@ -1,29 +1,65 @@
-from flask import Blueprint, request, jsonify
-from .models import db, Prospect
+from flask import Blueprint, current_app, request, jsonify
+from .models import db, League, Prospect
+from .events import publish_event
+from .pagination import fetch_page, page_response
+from .search import find_prospects
+from .versioning import bump_league_version, league_conditional, record_changes, record_deletion
 from datetime import datetime
+import csv
+import io
+import json
 
 prospects_bp = Blueprint('prospects', __name__)
 
+# Largest rank that fits a 32-bit integer column
+MAX_RANK = 2 ** 31 - 1
+
 @prospects_bp.route('', methods=['GET'])
+@league_conditional
 def get_prospects():
     league_id = request.args.get('league_id', type=int)
     position = request.args.get('position')
     is_drafted = request.args.get('is_drafted')
     
-    query = Prospect.query
+    criteria = []
     
     if league_id:
-        query = query.filter_by(league_id=league_id)
+        criteria.append(Prospect.league_id == league_id)
     
     if position:
-        query = query.filter_by(position=position)
+        criteria.append(Prospect.position == position)
     
     if is_drafted is not None:
         drafted_bool = is_drafted.lower() == 'true'
-        query = query.filter_by(is_drafted=drafted_bool)
+        criteria.append(Prospect.is_drafted == drafted_bool)
+    
+    prospects, next_cursor, error = fetch_page(Prospect, criteria, ['id'])
+    if error:
+        return jsonify({'error': error}), 400
+    return page_response(prospects, next_cursor), 200
+
+@prospects_bp.route('/search', methods=['GET'])
+@league_conditional
+def search_prospects():
+    league_id = request.args.get('league_id', type=int)
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+    position = request.args.get('position')
+    is_drafted = request.args.get('is_drafted')
+    
+    if not league_id:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    if not 1 <= limit <= 100:
+        return jsonify({'error': 'limit must be between 1 and 100'}), 400
+    
+    if is_drafted is not None:
+        is_drafted = is_drafted.lower() == 'true'
     
-    prospects = query.all()
-    return jsonify([prospect.to_dict() for prospect in prospects]), 200
+    results = find_prospects(league_id, query, limit, position=position, is_drafted=is_drafted)
+    if results is None:
+        return jsonify({'error': 'League not found'}), 404
+    return jsonify(results), 200
 
 @prospects_bp.route('/<int:prospect_id>', methods=['GET'])
 def get_prospect(prospect_id):
@@ -37,14 +73,20 @@ def create_prospect():
     if not data or 'name' not in data or 'position' not in data or 'league_id' not in data:
         return jsonify({'error': 'Name, position, and league_id are required'}), 400
     
+    rank, error = _parse_rank(data.get('rank'))
+    if error:
+        return jsonify({'error': error}), 400
+    
     prospect = Prospect(
         name=data['name'],
         position=data['position'],
         college=data.get('college', ''),
+        rank=rank,
         league_id=data['league_id']
     )
     
     db.session.add(prospect)
+    record_changes(prospect.league_id, prospect)
     db.session.commit()
     
     return jsonify(prospect.to_dict()), 201
@@ -60,19 +102,26 @@ def create_prospects_bulk():
     prospects_data = data['prospects']
     
     prospects = []
-    for prospect_data in prospects_data:
+    for idx, prospect_data in enumerate(prospects_data):
         if 'name' not in prospect_data or 'position' not in prospect_data:
             continue
         
+        rank, error = _parse_rank(prospect_data.get('rank'))
+        if error:
+            db.session.rollback()
+            return jsonify({'error': f'Prospect {idx}: {error}'}), 400
+        
         prospect = Prospect(
             name=prospect_data['name'],
             position=prospect_data['position'],
             college=prospect_data.get('college', ''),
+            rank=rank,
             league_id=league_id
         )
         prospects.append(prospect)
         db.session.add(prospect)
     
+    record_changes(league_id, *prospects)
     db.session.commit()
     
     return jsonify({
@@ -80,6 +129,131 @@ def create_prospects_bulk():
         'prospects': [p.to_dict() for p in prospects]
     }), 201
 
+@prospects_bp.route('/import', methods=['POST'])
+def import_prospects():
+    league_id = request.args.get('league_id', type=int)
+    
+    if not league_id:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    import_format = request.args.get('format') or _import_format(request.mimetype)
+    if import_format not in ('csv', 'ndjson'):
+        return jsonify({'error': 'format must be csv or ndjson'}), 400
+    
+    chunk_size = request.args.get('chunk_size', type=int) or current_app.config['PROSPECT_IMPORT_CHUNK_SIZE']
+    if chunk_size < 1:
+        return jsonify({'error': 'chunk_size must be positive'}), 400
+    
+    if db.session.get(League, league_id) is None:
+        return jsonify({'error': 'League not found'}), 404
+    
+    lines = io.TextIOWrapper(io.BufferedReader(request.stream), encoding='utf-8-sig', newline='')
+    records = _csv_records(lines) if import_format == 'csv' else _ndjson_records(lines)
+    
+    # The whole body is read and checked before anything is written, so the
+    # write lock is held for the inserts only, not while a slow client uploads
+    now = datetime.utcnow()
+    summary = {'inserted': 0, 'skipped': 0, 'errors': 0, 'error_samples': []}
+    rows = []
+    
+    try:
+        for line_number, record, error in records:
+            if error is None:
+                row, error = _import_row(record)
+            if error is not None:
+                summary['errors'] += 1
+                if len(summary['error_samples']) < 10:
+                    summary['error_samples'].append({'line': line_number, 'error': error})
+                continue
+            if row is None:
+                summary['skipped'] += 1
+                continue
+            
+            row.update(league_id=league_id, created_at=now, updated_at=now)
+            rows.append(row)
+    except UnicodeDecodeError:
+        return jsonify({'error': 'The file must be UTF-8 encoded; nothing was imported'}), 400
+    
+    version = bump_league_version(league_id)
+    if version is None:
+        db.session.rollback()
+        return jsonify({'error': 'League not found'}), 404
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        for row in chunk:
+            row['version'] = version
+        db.session.execute(Prospect.__table__.insert(), chunk)
+    db.session.commit()
+    
+    summary['inserted'] = len(rows)
+    summary['version'] = version
+    publish_event(league_id, 'prospects_imported', {'inserted': summary['inserted'], 'version': version})
+    
+    return jsonify(summary), 201
+
+def _import_format(mimetype):
+    if mimetype in ('text/csv', 'application/csv'):
+        return 'csv'
+    if mimetype in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+        return 'ndjson'
+    return None
+
+def _csv_records(lines):
+    reader = csv.DictReader(lines)
+    try:
+        for record in reader:
+            yield reader.line_num, {key.strip().lower(): value for key, value in record.items() if key}, None
+    except csv.Error as e:
+        yield reader.line_num, None, str(e)
+
+def _ndjson_records(lines):
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, 'Invalid JSON'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, 'Expected a JSON object'
+            continue
+        yield line_number, record, None
+
+def _import_row(record):
+    name = record.get('name')
+    position = record.get('position')
+    college = record.get('college') or ''
+    
+    # Rows without the required fields are skipped, as in the bulk endpoint.
+    if not name or not position:
+        return None, None
+    if not all(isinstance(value, str) for value in (name, position, college)):
+        return None, 'name, position and college must be strings'
+    
+    name, position, college = name.strip(), position.strip(), college.strip()
+    if len(name) > 100 or len(position) > 20 or len(college) > 100:
+        return None, 'Value too long'
+    
+    rank, error = _parse_rank(record.get('rank'))
+    if error:
+        return None, error
+    
+    return {'name': name, 'position': position, 'college': college, 'rank': rank, 'is_drafted': False}, None
+
+def _parse_rank(value):
+    if value is None or value == '':
+        return None, None
+    if isinstance(value, bool):
+        return None, 'rank must be a positive integer'
+    try:
+        rank = int(value)
+        if not 1 <= rank <= MAX_RANK or rank != float(value):
+            return None, 'rank must be a positive integer'
+    except (TypeError, ValueError, OverflowError):
+        return None, 'rank must be a positive integer'
+    return rank, None
+
 @prospects_bp.route('/<int:prospect_id>', methods=['PUT'])
 def update_prospect(prospect_id):
     prospect = Prospect.query.get_or_404(prospect_id)
@@ -91,8 +265,14 @@ def update_prospect(prospect_id):
         prospect.position = data['position']
     if 'college' in data:
         prospect.college = data['college']
+    if 'rank' in data:
+        rank, error = _parse_rank(data['rank'])
+        if error:
+            return jsonify({'error': error}), 400
+        prospect.rank = rank
     
     prospect.updated_at = datetime.utcnow()
+    record_changes(prospect.league_id, prospect)
     db.session.commit()
     
     return jsonify(prospect.to_dict()), 200
@@ -101,5 +281,6 @@ def update_prospect(prospect_id):
 def delete_prospect(prospect_id):
     prospect = Prospect.query.get_or_404(prospect_id)
     db.session.delete(prospect)
+    record_deletion(prospect.league_id, 'prospects', prospect.id)
     db.session.commit()
     return jsonify({'message': 'Prospect deleted successfully'}), 200
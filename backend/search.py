@@ -0,0 +1,314 @@
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from flask import current_app
+from .serialization import prospect_changes
+from .versioning import get_league_version
+
+# Weight of the best match for each query token. A name match always beats a
+# college match, and a typo-tolerant match ranks below any exact or prefix one.
+NAME_EXACT = 10
+NAME_PREFIX = 8
+COLLEGE_EXACT = 5
+COLLEGE_PREFIX = 4
+NAME_FUZZY = 3
+COLLEGE_FUZZY = 1.5
+PHRASE_PREFIX_BONUS = 2
+
+# Smallest trigram similarity for a typo-tolerant match (pg_trgm's default)
+FUZZY_THRESHOLD = 0.3
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return text.lower().replace("'", '').replace('’', '')
+
+
+def tokenize(text):
+    return _WORD.findall(normalize(text))
+
+
+def trigrams(token):
+    padded = f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ProspectIndex:
+    """Token index over one league's prospects for ranked typeahead search.
+
+    Every distinct name and college token has a posting set of prospect ids
+    and a place in a sorted vocabulary, so a prefix is a bisect over the
+    vocabulary. Trigrams of the vocabulary back typo-tolerant matching.
+
+    Single-word queries, which is what typeahead sends until the first
+    space, are answered without scoring every match: each token also keeps
+    its postings sorted in result order, split by where the token occurs,
+    and the best ``limit`` are merged from those lists a field at a time.
+    Equally good matches list available prospects first, then by rank.
+    ``version`` is the league version the index reflects.
+    """
+
+    def __init__(self, created_at):
+        self.created_at = created_at
+        self.version = 0
+        self.lock = threading.Lock()
+        self._docs = {}
+        self._postings = {}
+        self._vocabulary = []
+        self._trigrams = {}
+        # token -> sorted result-order keys, for the first name token, the
+        # other name tokens and the college tokens of each prospect
+        self._first = {}
+        self._name = {}
+        self._college = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, prospect):
+        self.remove(prospect['id'])
+        name_tokens = tokenize(prospect['name'])
+        college_tokens = tokenize(prospect['college'])
+        order = (bool(prospect['is_drafted']), _rank_key(prospect), prospect['name'].lower(), prospect['id'])
+        self._docs[prospect['id']] = (prospect, name_tokens, college_tokens, ' '.join(name_tokens), order)
+
+        for token in set(name_tokens + college_tokens):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._vocabulary.insert(bisect_left(self._vocabulary, token), token)
+                for trigram in trigrams(token):
+                    self._trigrams.setdefault(trigram, set()).add(token)
+            postings.add(prospect['id'])
+        for field, token in _placements(name_tokens, college_tokens, self._first, self._name, self._college):
+            insort(field.setdefault(token, []), order)
+
+    def remove(self, prospect_id):
+        doc = self._docs.pop(prospect_id, None)
+        if doc is None:
+            return
+        _, name_tokens, college_tokens, _, order = doc
+
+        for field, token in _placements(name_tokens, college_tokens, self._first, self._name, self._college):
+            keys = field[token]
+            del keys[bisect_left(keys, order)]
+            if not keys:
+                del field[token]
+        for token in set(name_tokens + college_tokens):
+            postings = self._postings[token]
+            postings.discard(prospect_id)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+                for trigram in trigrams(token):
+                    tokens = self._trigrams[trigram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigrams[trigram]
+
+    def search(self, query, limit, position=None, is_drafted=None):
+        """Return up to ``limit`` (score, prospect) pairs, best first."""
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+
+        def wanted(prospect):
+            return ((position is None or prospect['position'] == position) and
+                    (is_drafted is None or bool(prospect['is_drafted']) == is_drafted))
+
+        if len(query_tokens) == 1:
+            results = self._search_word(query_tokens[0], limit, wanted)
+            if len(results) == limit or len(query_tokens[0]) < 3:
+                return results
+            # Too few prefix matches: fall back to typo-tolerant scoring
+            seen = {prospect['id'] for _, prospect in results}
+            return results + self._search_scored(query_tokens, limit - len(results), wanted, seen, fuzzy=True)
+
+        return self._search_scored(query_tokens, limit, wanted)
+
+    def _search_word(self, word, limit, wanted):
+        # With one query word a prospect scores the weight of its best field,
+        # so walking the fields from the highest weight down and each field's
+        # postings in result order yields results already ranked.
+        prefixed = [token for token in self._prefixed(word) if token != word]
+        tiers = (
+            (NAME_EXACT + PHRASE_PREFIX_BONUS, [self._first.get(word)]),
+            (NAME_PREFIX + PHRASE_PREFIX_BONUS, [self._first.get(token) for token in prefixed] +
+             [self._name.get(word)]),
+            (NAME_PREFIX, [self._name.get(token) for token in prefixed]),
+            (COLLEGE_EXACT, [self._college.get(word)]),
+            (COLLEGE_PREFIX, [self._college.get(token) for token in prefixed]),
+        )
+        results = []
+        seen = set()
+        for score, postings in tiers:
+            for order in heapq.merge(*[keys for keys in postings if keys]):
+                prospect_id = order[-1]
+                if prospect_id in seen:
+                    continue
+                seen.add(prospect_id)
+                prospect = self._docs[prospect_id][0]
+                if wanted(prospect):
+                    results.append((score, prospect))
+                    if len(results) == limit:
+                        return results
+        return results
+
+    def _search_scored(self, query_tokens, limit, wanted, seen=(), fuzzy=False):
+        expansions = []
+        for query_token in query_tokens:
+            prefixed = self._prefixed(query_token)
+            similar = {}
+            if len(query_token) >= 3 and (fuzzy or sum(len(self._postings[token]) for token in prefixed) < limit):
+                similar = self._similar(query_token)
+            expansions.append((query_token, prefixed, similar))
+
+        # Every query token has to match, so the candidates are the
+        # intersection of each token's matches, smallest first.
+        matches = sorted(
+            ([self._postings[token] for token in (*prefixed, *similar)] for _, prefixed, similar in expansions),
+            key=lambda postings: sum(map(len, postings))
+        )
+        candidates = set().union(*matches[0])
+        for postings in matches[1:]:
+            if not candidates:
+                break
+            candidates &= set().union(*postings)
+
+        phrase = ' '.join(query_tokens)
+        ranked = []
+        for prospect_id in candidates.difference(seen):
+            prospect, name_tokens, college_tokens, name_phrase, order = self._docs[prospect_id]
+            if not wanted(prospect):
+                continue
+            score = _score(expansions, name_tokens, college_tokens)
+            if score is None:
+                continue
+            if name_phrase.startswith(phrase):
+                score += PHRASE_PREFIX_BONUS
+            ranked.append((-score, order, prospect))
+
+        return [(-score, prospect) for score, _, prospect in heapq.nsmallest(limit, ranked)]
+
+    def _prefixed(self, prefix):
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + '\uffff', start)
+        return self._vocabulary[start:end]
+
+    def _similar(self, token):
+        query_trigrams = trigrams(token)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+        similar = {}
+        for candidate, count in shared.items():
+            similarity = count / (len(query_trigrams) + len(trigrams(candidate)) - count)
+            if similarity >= FUZZY_THRESHOLD:
+                similar[candidate] = similarity
+        return similar
+
+
+def _rank_key(prospect):
+    rank = prospect.get('rank')
+    return float('inf') if rank is None else rank
+
+
+def _placements(name_tokens, college_tokens, first, name, college):
+    """(field, token) for every distinct place a prospect's tokens are indexed."""
+    placements = set()
+    if name_tokens:
+        placements.add((0, name_tokens[0]))
+    placements.update((1, token) for token in name_tokens[1:])
+    placements.update((2, token) for token in college_tokens)
+    fields = (first, name, college)
+    return [(fields[field], token) for field, token in placements]
+
+
+def _score(expansions, name_tokens, college_tokens):
+    """Sum of the best match weight of each query token, or None if one misses."""
+    total = 0
+    for query_token, _, fuzzy in expansions:
+        best = 0
+        for token in name_tokens:
+            if token == query_token:
+                best = NAME_EXACT
+                break
+            if token.startswith(query_token):
+                best = NAME_PREFIX
+            elif token in fuzzy:
+                best = max(best, NAME_FUZZY * fuzzy[token])
+        if best < NAME_PREFIX:
+            for token in college_tokens:
+                if token == query_token:
+                    best = max(best, COLLEGE_EXACT)
+                elif token.startswith(query_token):
+                    best = max(best, COLLEGE_PREFIX)
+                elif token in fuzzy:
+                    best = max(best, COLLEGE_FUZZY * fuzzy[token])
+        if not best:
+            return None
+        total += best
+    return total
+
+
+class SearchIndexes:
+    """The prospect indexes of the most recently searched leagues.
+
+    Indexes are built on first use and caught up from rows stamped with a
+    newer league version plus prospect tombstones, so writes made by any
+    worker are picked up. A league is identified by its id and creation
+    time, so a reused id never inherits another league's index.
+    """
+
+    def __init__(self, max_leagues):
+        self.max_leagues = max_leagues
+        self._lock = threading.Lock()
+        self._indexes = OrderedDict()
+
+    def get(self, league_id):
+        """Return the league's index at its current version, or None for an unknown league."""
+        league = get_league_version(league_id)
+        with self._lock:
+            if league is None:
+                self._indexes.pop(league_id, None)
+                return None
+            index = self._indexes.get(league_id)
+            if index is None or index.created_at != league.created_at or index.version > league.version:
+                index = self._indexes[league_id] = ProspectIndex(league.created_at)
+            self._indexes.move_to_end(league_id)
+            while len(self._indexes) > self.max_leagues:
+                self._indexes.popitem(last=False)
+
+        with index.lock:
+            if index.version < league.version:
+                _catch_up(index, league_id, league.version)
+        return index
+
+
+def _catch_up(index, league_id, version):
+    prospects, deleted = prospect_changes(league_id, index.version)
+    for prospect_id in deleted:
+        index.remove(prospect_id)
+    for prospect in prospects:
+        index.add(prospect)
+    index.version = version
+
+
+def init_search(app):
+    app.extensions['prospect_search'] = SearchIndexes(app.config['SEARCH_INDEX_MAX_LEAGUES'])
+
+
+def find_prospects(league_id, query, limit, position=None, is_drafted=None):
+    """Ranked prospects of a league matching ``query``, or None for an unknown league."""
+    index = current_app.extensions['prospect_search'].get(league_id)
+    if index is None:
+        return None
+    with index.lock:
+        results = index.search(query, limit, position=position, is_drafted=is_drafted)
+    return [dict(prospect, score=round(score, 3)) for score, prospect in results]
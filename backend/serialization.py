@@ -0,0 +1,168 @@
+import json
+from .models import db, League, Team, Prospect, DraftPick, Trade, Tombstone, DraftEvent, parse_pick_ids
+from .pick_grid import merge_pick_grid
+
+# Columns serialized for each model, in the same shape as the model's to_dict.
+LEAGUE_COLUMNS = (
+    'id', 'name', 'description', 'num_rounds', 'draft_started',
+    'draft_completed', 'current_pick_number', 'total_picks', 'pick_clock_seconds', 'pick_expiry_action',
+    'virtual_picks', 'version', 'created_at', 'updated_at'
+)
+TEAM_COLUMNS = ('id', 'name', 'icon', 'color', 'bg_color', 'draft_order', 'league_id')
+PROSPECT_COLUMNS = (
+    'id', 'name', 'position', 'college', 'rank', 'is_drafted', 'drafted_by',
+    'draft_pick_number', 'league_id'
+)
+DRAFT_PICK_COLUMNS = (
+    'id', 'pick_number', 'round_number', 'pick_in_round', 'original_team_id',
+    'current_team_id', 'prospect_id', 'is_used', 'league_id'
+)
+TRADE_COLUMNS = ('id', 'from_team_id', 'to_team_id', 'pick_ids', 'league_id', 'executed_at')
+DRAFT_EVENT_COLUMNS = (
+    'sequence', 'event_type', 'changes', 'pick_number', 'last_pick_number', 'target_sequence', 'created_at'
+)
+
+SERIALIZED_COLUMNS = {
+    League: LEAGUE_COLUMNS,
+    Team: TEAM_COLUMNS,
+    Prospect: PROSPECT_COLUMNS,
+    DraftPick: DRAFT_PICK_COLUMNS,
+    Trade: TRADE_COLUMNS,
+    DraftEvent: DRAFT_EVENT_COLUMNS
+}
+
+CONVERTERS = {
+    'created_at': lambda value: value.isoformat(),
+    'updated_at': lambda value: value.isoformat(),
+    'executed_at': lambda value: value.isoformat(),
+    'pick_ids': parse_pick_ids,
+    'changes': json.loads
+}
+
+
+def serialize_rows(rows, columns):
+    converters = [(index, CONVERTERS[name]) for index, name in enumerate(columns) if name in CONVERTERS]
+    if not converters:
+        return [dict(zip(columns, row)) for row in rows]
+    result = []
+    for row in rows:
+        values = list(row)
+        for index, convert in converters:
+            if values[index] is not None:
+                values[index] = convert(values[index])
+        result.append(dict(zip(columns, values)))
+    return result
+
+
+class SerializedRows:
+    """Selected rows that become dicts only as they are iterated.
+
+    ``columns`` names the leading values of each row; any values after them
+    are left out. A large list is streamed ``chunks`` at a time, so its dicts
+    never all exist at once.
+    """
+
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for chunk in self.chunks(1000):
+            yield from chunk
+
+    def chunks(self, size):
+        for start in range(0, len(self.rows), size):
+            yield serialize_rows(self.rows[start:start + size], self.columns)
+
+
+def select_dicts(model, *criteria, order_by=(), columns=None):
+    """Select only the serialized columns of ``model`` and return plain dicts."""
+    columns = columns or SERIALIZED_COLUMNS[model]
+    statement = db.select(*[getattr(model, name) for name in columns])
+    if criteria:
+        statement = statement.where(*criteria)
+    if order_by:
+        statement = statement.order_by(*order_by)
+    return serialize_rows(db.session.execute(statement), columns)
+
+
+def league_snapshot(league_id):
+    """Serialize a whole league with one query per table."""
+    leagues = select_dicts(League, League.id == league_id)
+    if not leagues:
+        return None
+
+    snapshot = leagues[0]
+    snapshot['teams'] = select_dicts(Team, Team.league_id == league_id, order_by=(Team.draft_order,))
+    snapshot['prospects'] = select_dicts(Prospect, Prospect.league_id == league_id, order_by=(Prospect.id,))
+    snapshot['draft_picks'] = select_dicts(
+        DraftPick, DraftPick.league_id == league_id, order_by=(DraftPick.pick_number,)
+    )
+    if snapshot['virtual_picks']:
+        snapshot['draft_picks'] = merge_pick_grid(
+            league_id, [team['id'] for team in snapshot['teams']], snapshot['total_picks'], snapshot['draft_picks']
+        )
+    snapshot['trades'] = select_dicts(
+        Trade, Trade.league_id == league_id, order_by=(Trade.executed_at.desc(),)
+    )
+    return snapshot
+
+
+def prospect_changes(league_id, since):
+    """Prospects of a league written after ``since`` and the ids of those deleted since."""
+    criteria = [Prospect.league_id == league_id]
+    deleted = []
+    if since:
+        deleted = db.session.execute(
+            db.select(Tombstone.entity_id).where(
+                Tombstone.league_id == league_id,
+                Tombstone.entity_type == 'prospects',
+                Tombstone.version > since
+            )
+        ).scalars().all()
+        criteria.append(Prospect.version > since)
+    return select_dicts(Prospect, *criteria), deleted
+
+
+def league_changes(league_id, since):
+    """Serialize the rows of a league created, modified or deleted after ``since``."""
+    leagues = select_dicts(League, League.id == league_id)
+    if not leagues:
+        return None
+
+    changes = {
+        'league': leagues[0],
+        'since': since,
+        'version': leagues[0]['version'],
+        'teams': select_dicts(Team, Team.league_id == league_id, Team.version > since, order_by=(Team.draft_order,)),
+        'prospects': select_dicts(
+            Prospect, Prospect.league_id == league_id, Prospect.version > since, order_by=(Prospect.id,)
+        ),
+        'draft_picks': select_dicts(
+            DraftPick, DraftPick.league_id == league_id, DraftPick.version > since, order_by=(DraftPick.pick_number,)
+        ),
+        'trades': select_dicts(
+            Trade, Trade.league_id == league_id, Trade.version > since, order_by=(Trade.executed_at.desc(),)
+        ),
+        'deleted': {'teams': [], 'prospects': [], 'draft_picks': [], 'trades': []}
+    }
+    if leagues[0]['virtual_picks'] and changes['teams']:
+        # The unstored picks follow the teams, so any team change resends them all
+        changes['draft_picks'] = merge_pick_grid(
+            league_id,
+            [team['id'] for team in select_dicts(Team, Team.league_id == league_id, order_by=(Team.draft_order, Team.id))],
+            leagues[0]['total_picks'],
+            select_dicts(DraftPick, DraftPick.league_id == league_id, order_by=(DraftPick.pick_number,))
+        )
+
+    tombstones = db.session.execute(
+        db.select(Tombstone.entity_type, Tombstone.entity_id)
+        .where(Tombstone.league_id == league_id, Tombstone.version > since)
+        .order_by(Tombstone.version)
+    )
+    for entity_type, entity_id in tombstones:
+        changes['deleted'][entity_type].append(entity_id)
+    return changes
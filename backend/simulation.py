@@ -0,0 +1,136 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+import numpy as np
+from flask import current_app
+
+# Spread of a prospect's draft slot around its rank: a normal draw with a
+# standard deviation of ``noise`` times the rank plus NOISE_RANK_OFFSET, so
+# late ranks move around more than early ones and noise 0 drafts by rank.
+NOISE_RANK_OFFSET = 5
+
+
+class SimulationTimeout(Exception):
+    pass
+
+
+def draft_scores(ranks, noise):
+    """Effective ranks and noise deviations for an array of prospect ranks.
+
+    Unranked prospects (``inf``) are placed after every ranked one, in the
+    order given.
+    """
+    ranks = np.asarray(ranks, dtype=np.float64)
+    unranked = ~np.isfinite(ranks)
+    if unranked.any():
+        last = ranks[~unranked].max(initial=0)
+        ranks = ranks.copy()
+        ranks[unranked] = last + 1 + np.arange(unranked.sum())
+    return ranks.astype(np.float32), (noise * (ranks + NOISE_RANK_OFFSET)).astype(np.float32)
+
+
+def simulate_chunk(ranks, deviations, offsets, count, seed):
+    """Run ``count`` mock drafts and count how often each prospect is gone by each offset.
+
+    Each draft draws one noisy score per prospect and fills picks best score
+    first, so the prospects taken in the first ``k`` picks are the ``k``
+    lowest scores. Returns an array of shape ``(len(offsets), len(ranks))``.
+    """
+    num_prospects = len(ranks)
+    taken = np.zeros((len(offsets), num_prospects), dtype=np.int64)
+    horizon = min(max(offsets, default=0), num_prospects)
+    if horizon == 0 or count == 0:
+        return taken
+
+    rng = np.random.default_rng(seed)
+    scores = rng.standard_normal((count, num_prospects), dtype=np.float32)
+    scores *= deviations
+    scores += ranks
+    first = np.argpartition(scores, horizon - 1, axis=1)[:, :horizon]
+    order = np.argsort(np.take_along_axis(scores, first, axis=1), axis=1)
+    picked = np.take_along_axis(first, order, axis=1)
+    for row, offset in enumerate(offsets):
+        if offset:
+            taken[row] = np.bincount(picked[:, :min(offset, horizon)].ravel(), minlength=num_prospects)
+    return taken
+
+
+class Simulator:
+    """Runs mock drafts in chunks, across a process pool when ``max_workers`` > 1.
+
+    The pool is started on first use, so each web worker that simulates
+    gets its own, and kept for later requests. Chunks get seeds spawned from
+    the request's seed, so results do not depend on the number of workers.
+    """
+
+    def __init__(self, max_workers, chunk_size):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def run(self, ranks, deviations, offsets, simulations, seed=None, timeout=None):
+        """Return the fraction of simulations each prospect is still available at each offset."""
+        counts = [self.chunk_size] * (simulations // self.chunk_size)
+        if simulations % self.chunk_size:
+            counts.append(simulations % self.chunk_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(counts))
+
+        if self.max_workers <= 1:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            taken = np.zeros((len(offsets), len(ranks)), dtype=np.int64)
+            for count, chunk_seed in zip(counts, seeds):
+                if deadline is not None and time.monotonic() > deadline:
+                    raise SimulationTimeout
+                taken += simulate_chunk(ranks, deviations, offsets, count, chunk_seed)
+        else:
+            taken = self._run_in_pool(ranks, deviations, offsets, counts, seeds, timeout)
+        return 1 - taken / simulations
+
+    def _run_in_pool(self, ranks, deviations, offsets, counts, seeds, timeout):
+        executor = self._get_executor()
+        futures = [
+            executor.submit(simulate_chunk, ranks, deviations, offsets, count, chunk_seed)
+            for count, chunk_seed in zip(counts, seeds)
+        ]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        taken = np.zeros((len(offsets), len(ranks)), dtype=np.int64)
+        try:
+            for future in futures:
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                taken += future.result(timeout=remaining)
+        except TimeoutError:
+            raise SimulationTimeout
+        finally:
+            for future in futures:
+                future.cancel()
+        return taken
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Workers only need numpy, and spawning them keeps them clear of
+                # the web worker's threads and open database connections.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+def init_simulation(app):
+    app.extensions['simulation'] = Simulator(
+        app.config['SIMULATION_WORKERS'],
+        app.config['SIMULATION_CHUNK_SIZE']
+    )
+
+
+def simulator():
+    return current_app.extensions['simulation']
@@ -1,20 +1,38 @@
 from flask import Blueprint, request, jsonify
-from .models import db, Team
+from .models import db, Prospect, Team
+from .pagination import fetch_page, page_response
+from .serialization import select_dicts
+from .versioning import league_conditional, record_changes, record_deletion
 from datetime import datetime
 
 teams_bp = Blueprint('teams', __name__)
 
 @teams_bp.route('', methods=['GET'])
+@league_conditional
 def get_teams():
     league_id = request.args.get('league_id', type=int)
+    include_roster = request.args.get('include_roster', 'false').lower() == 'true'
     
     if league_id:
-        teams = Team.query.filter_by(league_id=league_id).order_by(Team.draft_order).all()
+        teams, next_cursor, error = fetch_page(Team, [Team.league_id == league_id], ['draft_order', 'id'])
     else:
-        teams = Team.query.all()
+        teams, next_cursor, error = fetch_page(Team, [], ['id'])
     
-    include_roster = request.args.get('include_roster', 'false').lower() == 'true'
-    return jsonify([team.to_dict(include_roster=include_roster) for team in teams]), 200
+    if error:
+        return jsonify({'error': error}), 400
+    
+    if include_roster and teams:
+        # id is a page key, so every row carries it even when fields= leaves it out
+        team_ids = [row.id for row in teams.rows]
+        teams = list(teams)
+        # Rosters for the whole page come from one query, not one per team.
+        rosters = {team_id: [] for team_id in team_ids}
+        for prospect in select_dicts(Prospect, Prospect.drafted_by.in_(team_ids), order_by=(Prospect.id,)):
+            rosters[prospect['drafted_by']].append(prospect)
+        for team_id, team in zip(team_ids, teams):
+            team['roster'] = rosters[team_id]
+    
+    return page_response(teams, next_cursor), 200
 
 @teams_bp.route('/<int:team_id>', methods=['GET'])
 def get_team(team_id):
@@ -39,6 +57,7 @@ def update_team(team_id):
         team.draft_order = data['draft_order']
     
     team.updated_at = datetime.utcnow()
+    record_changes(team.league_id, team)
     db.session.commit()
     
     return jsonify(team.to_dict()), 200
@@ -47,11 +66,12 @@ def update_team(team_id):
 def delete_team(team_id):
     team = Team.query.get_or_404(team_id)
     db.session.delete(team)
+    record_deletion(team.league_id, 'teams', team.id)
     db.session.commit()
     return jsonify({'message': 'Team deleted successfully'}), 200
 
 @teams_bp.route('/<int:team_id>/roster', methods=['GET'])
 def get_team_roster(team_id):
-    team = Team.query.get_or_404(team_id)
-    roster = [prospect.to_dict() for prospect in team.drafted_prospects]
+    Team.query.get_or_404(team_id)
+    roster = select_dicts(Prospect, Prospect.drafted_by == team_id, order_by=(Prospect.id,))
     return jsonify(roster), 200
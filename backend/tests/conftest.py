@@ -1,20 +1,21 @@
 import pytest
 import sys
 import os
+from contextlib import contextmanager
 
-# Add the backend directory to the path so imports work correctly
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import event
 
-# Import using the package structure (backend as the root)
-from __init__ import create_app
-from models import db, User, Group, Expense, ExpenseSplit
-from config import Config
+# Add the repository root to the path so the backend package can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend import create_app
+from backend.models import db
+from backend.config import Config
 
 
 class TestConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
-    JWT_SECRET_KEY = 'test-jwt-secret-key'
     SECRET_KEY = 'test-secret-key'
 
 
@@ -30,6 +31,25 @@ def app():
         db.drop_all()
 
 
+@pytest.fixture
+def count_statements(app):
+    """Record the (statement, parameters) pairs executed inside a ``with`` block."""
+    @contextmanager
+    def count():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    return count
+
+
 @pytest.fixture
 def client(app):
     """Create test client."""
@@ -43,68 +63,34 @@ def runner(app):
 
 
 @pytest.fixture
-def sample_user(app):
-    """Create a sample user for testing."""
-    with app.app_context():
-        user = User(username='testuser', email='test@example.com')
-        user.set_password('password123')
-        db.session.add(user)
-        db.session.commit()
-        
-        user_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email
-        }
-        return user_data
-
-
-@pytest.fixture
-def auth_headers(client, sample_user):
-    """Get authentication headers for a sample user."""
-    response = client.post('/api/auth/login', json={
-        'email': sample_user['email'],
-        'password': 'password123'
+def sample_league(client):
+    """Create a league with four teams and a three-round snake draft."""
+    response = client.post('/api/leagues', json={
+        'name': 'Test League',
+        'description': 'A test league',
+        'num_rounds': 3
     })
-    token = response.get_json()['access_token']
-    return {'Authorization': f'Bearer {token}'}
-
-
-@pytest.fixture
-def second_user(app):
-    """Create a second user for testing."""
-    with app.app_context():
-        user = User(username='seconduser', email='second@example.com')
-        user.set_password('password456')
-        db.session.add(user)
-        db.session.commit()
-        
-        user_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email
-        }
-        return user_data
+    league_id = response.get_json()['id']
+    
+    response = client.post(f'/api/leagues/{league_id}/initialize', json={
+        'teams': [{'name': f'Team {number}'} for number in range(1, 5)]
+    })
+    return response.get_json()
 
 
 @pytest.fixture
-def sample_group(app, sample_user):
-    """Create a sample group for testing."""
-    with app.app_context():
-        user = User.query.get(sample_user['id'])
-        group = Group(
-            name='Test Group',
-            description='A test group',
-            created_by=user.id
-        )
-        group.members.append(user)
-        db.session.add(group)
-        db.session.commit()
-        
-        group_data = {
-            'id': group.id,
-            'name': group.name,
-            'description': group.description,
-            'created_by': group.created_by
-        }
-        return group_data
+def sample_prospects(client, sample_league):
+    """Create a pool of prospects for the sample league."""
+    positions = ['QB', 'RB', 'WR', 'TE']
+    response = client.post('/api/prospects/bulk', json={
+        'league_id': sample_league['id'],
+        'prospects': [
+            {
+                'name': f'Prospect {number}',
+                'position': positions[number % len(positions)],
+                'college': f'College {number}'
+            }
+            for number in range(1, 21)
+        ]
+    })
+    return response.get_json()['prospects']
@@ -0,0 +1,160 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models import db, Prospect
+from backend.autodraft import ProspectPool
+from backend.encoding import StandardJSONProvider
+from backend.versioning import bump_league_version
+
+
+BOARD = [
+    {'name': 'Bijan Robinson', 'position': 'RB', 'rank': 1},
+    {'name': "Ja'Marr Chase", 'position': 'WR', 'rank': 2},
+    {'name': 'Christian McCaffrey', 'position': 'RB', 'rank': 3},
+    {'name': 'Josh Allen', 'position': 'QB', 'rank': 4},
+    {'name': 'Travis Kelce', 'position': 'TE', 'rank': 5},
+    {'name': 'Jalen Hurts', 'position': 'QB', 'rank': 6},
+    {'name': 'Justin Tucker', 'position': 'K'},
+]
+
+
+@pytest.fixture
+def board(client, sample_league):
+    """Create a ranked draft board and return prospect ids by name."""
+    response = client.post('/api/prospects/bulk', json={
+        'league_id': sample_league['id'],
+        'prospects': BOARD
+    })
+    return {prospect['name']: prospect['id'] for prospect in response.get_json()['prospects']}
+
+
+def autopick(client, league, **fields):
+    return client.post('/api/draft/autopick', json=dict(fields, league_id=league['id']))
+
+
+def drafted_name(response):
+    assert response.status_code == 200
+    return response.get_json()['prospect']['name']
+
+
+class TestAutopick:
+    """Tests for drafting the best available prospect."""
+
+    def test_best_available_for_current_pick(self, client, sample_league, board):
+        """Test the current pick takes the best ranked prospect for the team on the clock."""
+        response = autopick(client, sample_league)
+
+        data = response.get_json()
+        assert drafted_name(response) == 'Bijan Robinson'
+        assert data['pick']['pick_number'] == 1
+        assert data['prospect']['drafted_by'] == sample_league['draft_picks'][0]['current_team_id']
+        assert drafted_name(autopick(client, sample_league)) == "Ja'Marr Chase"
+
+    def test_skips_prospects_drafted_by_hand(self, client, sample_league, board):
+        """Test prospects drafted through execute are not picked again."""
+        client.post('/api/draft/execute', json={
+            'prospect_id': board['Bijan Robinson'],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': sample_league['id']
+        })
+
+        assert drafted_name(autopick(client, sample_league)) == "Ja'Marr Chase"
+
+    def test_rank_changes(self, client, sample_league, board):
+        """Test re-ranked and deleted prospects are followed."""
+        client.put(f'/api/prospects/{board["Josh Allen"]}', json={'rank': 1})
+        client.delete(f'/api/prospects/{board["Bijan Robinson"]}')
+        assert drafted_name(autopick(client, sample_league)) == 'Josh Allen'
+
+        client.put(f'/api/prospects/{board["Travis Kelce"]}', json={'position': 'WR', 'rank': 1})
+        assert drafted_name(autopick(client, sample_league, positions=['WR'])) == 'Travis Kelce'
+
+    def test_positions(self, client, sample_league, board):
+        """Test the choice can be limited to some positions."""
+        assert drafted_name(autopick(client, sample_league, positions=['QB', 'TE'])) == 'Josh Allen'
+
+    def test_roster_limits(self, client, sample_league, board):
+        """Test positions the team has filled are passed over."""
+        team_id = sample_league['teams'][0]['id']
+        drafted_name(autopick(client, sample_league, team_id=team_id))
+
+        response = autopick(client, sample_league, team_id=team_id, roster_limits={'RB': 1, 'WR': 0})
+
+        assert drafted_name(response) == 'Josh Allen'
+
+    def test_unranked_last(self, client, sample_league, board):
+        """Test unranked prospects are only picked once every ranked one is gone."""
+        names = [drafted_name(autopick(client, sample_league, roster_limits={})) for _ in BOARD]
+
+        assert names[-1] == 'Justin Tucker'
+        assert autopick(client, sample_league).status_code == 400
+
+    def test_writes_from_other_workers(self, app, client, sample_league, board):
+        """Test prospects written outside this process are picked up by version."""
+        autopick(client, sample_league, positions=['K'])
+        version = bump_league_version(sample_league['id'])
+        db.session.execute(Prospect.__table__.insert(), [{
+            'name': 'Puka Nacua', 'position': 'WR', 'rank': 0, 'is_drafted': False,
+            'league_id': sample_league['id'], 'version': version
+        }])
+        db.session.commit()
+
+        assert drafted_name(autopick(client, sample_league)) == 'Puka Nacua'
+
+    def test_stale_pick_number(self, client, sample_league, board):
+        """Test an auto-pick for a pick that was already made conflicts."""
+        autopick(client, sample_league)
+
+        assert autopick(client, sample_league, pick_number=1).status_code == 409
+
+    def test_validation(self, client, sample_league, board):
+        """Test bad requests and missing leagues are rejected."""
+        assert client.post('/api/draft/autopick', json={}).status_code == 400
+        assert client.post('/api/draft/autopick', json={'league_id': 9999}).status_code == 404
+        assert autopick(client, sample_league, positions='QB').status_code == 400
+        assert autopick(client, sample_league, roster_limits={'QB': -1}).status_code == 400
+
+    def test_rank_validation(self, client, sample_league):
+        """Test ranks must be positive integers."""
+        response = client.post('/api/prospects', json={
+            'name': 'Rookie', 'position': 'QB', 'rank': 'first', 'league_id': sample_league['id']
+        })
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize('provider', [None, StandardJSONProvider], ids=['default', 'json'])
+    @pytest.mark.parametrize('rank', ['Infinity', '1e300', str(2 ** 31), str(10 ** 400)],
+                             ids=['infinity', 'float', 'int32', 'huge'])
+    def test_rank_out_of_range(self, app, client, sample_league, monkeypatch, provider, rank):
+        """Test ranks too large for the column are rejected, with either JSON encoder."""
+        if provider is not None:
+            monkeypatch.setattr(app, 'json', provider(app))
+        response = client.post(
+            '/api/prospects',
+            data=f'{{"name": "Rookie", "position": "QB", "rank": {rank}, "league_id": {sample_league["id"]}}}',
+            content_type='application/json'
+        )
+
+        assert response.status_code == 400
+        assert client.get(f'/api/prospects?league_id={sample_league["id"]}').get_json() == []
+
+
+class TestProspectPool:
+    """Tests for the per-position heaps."""
+
+    def test_lazy_removal_and_compaction(self):
+        """Test stale heap entries are skipped and eventually compacted away."""
+        pool = ProspectPool(None)
+        for prospect_id in range(1, 201):
+            pool.add({'id': prospect_id, 'position': 'WR', 'rank': prospect_id, 'is_drafted': False})
+        for prospect_id in range(1, 200):
+            pool.add({'id': prospect_id, 'position': 'WR', 'rank': prospect_id, 'is_drafted': True})
+        pool.add({'id': 200, 'position': 'RB', 'rank': 200, 'is_drafted': False})
+
+        assert pool.best() == 200
+        assert pool.best(['WR']) is None
+        assert len(pool) == 1
+        assert pool._size <= 2 * len(pool) + 64
@@ -0,0 +1,116 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def changes_since(client, league_id, since):
+    response = client.get(f'/api/leagues/{league_id}/changes?since={since}')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+class TestChangesFeed:
+    """Tests for the league delta-sync changes feed."""
+
+    def test_since_zero_returns_everything(self, client, sample_league, sample_prospects):
+        """Test a client with no state receives every row."""
+        data = changes_since(client, sample_league['id'], 0)
+
+        assert len(data['teams']) == 4
+        assert len(data['draft_picks']) == 12
+        assert len(data['prospects']) == 20
+        assert data['version'] == data['league']['version']
+
+    def test_current_version_returns_nothing(self, client, sample_league, sample_prospects):
+        """Test an up-to-date client receives an empty delta."""
+        version = changes_since(client, sample_league['id'], 0)['version']
+
+        data = changes_since(client, sample_league['id'], version)
+
+        assert data['teams'] == []
+        assert data['prospects'] == []
+        assert data['draft_picks'] == []
+        assert data['trades'] == []
+        assert data['deleted'] == {'teams': [], 'prospects': [], 'draft_picks': [], 'trades': []}
+
+    def test_pick_returns_only_touched_rows(self, client, sample_league, sample_prospects):
+        """Test a pick shows up as one prospect and one draft pick."""
+        league_id = sample_league['id']
+        version = changes_since(client, league_id, 0)['version']
+
+        client.post('/api/draft/execute', json={
+            'prospect_id': sample_prospects[0]['id'],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': league_id
+        })
+        data = changes_since(client, league_id, version)
+
+        assert data['version'] == version + 1
+        assert [p['id'] for p in data['prospects']] == [sample_prospects[0]['id']]
+        assert [p['pick_number'] for p in data['draft_picks']] == [1]
+        assert data['league']['current_pick_number'] == 2
+
+    def test_trade_returns_trade_and_picks(self, client, sample_league):
+        """Test a trade shows up with the picks it moved."""
+        league_id = sample_league['id']
+        pick = sample_league['draft_picks'][0]
+        version = changes_since(client, league_id, 0)['version']
+
+        client.post('/api/trades', json={
+            'from_team_id': pick['current_team_id'],
+            'to_team_id': sample_league['teams'][1]['id'],
+            'pick_ids': [pick['id']],
+            'league_id': league_id
+        })
+        data = changes_since(client, league_id, version)
+
+        assert len(data['trades']) == 1
+        assert [p['id'] for p in data['draft_picks']] == [pick['id']]
+
+    def test_deletes_leave_tombstones(self, client, sample_league, sample_prospects):
+        """Test deleted prospects and trades are reported by id."""
+        league_id = sample_league['id']
+        pick = sample_league['draft_picks'][0]
+        trade = client.post('/api/trades', json={
+            'from_team_id': pick['current_team_id'],
+            'to_team_id': sample_league['teams'][1]['id'],
+            'pick_ids': [pick['id']],
+            'league_id': league_id
+        }).get_json()['trade']
+        version = changes_since(client, league_id, 0)['version']
+
+        client.delete(f'/api/prospects/{sample_prospects[0]["id"]}')
+        client.delete(f'/api/trades/{trade["id"]}')
+        data = changes_since(client, league_id, version)
+
+        assert data['deleted']['prospects'] == [sample_prospects[0]['id']]
+        assert data['deleted']['trades'] == [trade['id']]
+        assert data['version'] == version + 2
+
+    def test_deleted_team_leaves_tombstone(self, client):
+        """Test a deleted team is reported by id."""
+        league_id = client.post('/api/leagues', json={'name': 'No Picks', 'num_rounds': 0}).get_json()['id']
+        teams = client.post(f'/api/leagues/{league_id}/initialize', json={
+            'teams': [{'name': 'Stays'}, {'name': 'Goes'}]
+        }).get_json()['teams']
+        version = changes_since(client, league_id, 0)['version']
+
+        client.delete(f'/api/teams/{teams[1]["id"]}')
+        data = changes_since(client, league_id, version)
+
+        assert data['deleted']['teams'] == [teams[1]['id']]
+        assert data['teams'] == []
+
+    def test_missing_since(self, client, sample_league):
+        """Test the feed requires a since version."""
+        response = client.get(f'/api/leagues/{sample_league["id"]}/changes')
+
+        assert response.status_code == 400
+
+    def test_league_not_found(self, client):
+        """Test the feed for a non-existent league."""
+        response = client.get('/api/leagues/9999/changes?since=0')
+
+        assert response.status_code == 404
@@ -0,0 +1,123 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def league_version(client, league_id):
+    return client.get(f'/api/leagues/{league_id}').get_json()['version']
+
+
+class TestLeagueVersion:
+    """Tests for the league version counter."""
+
+    def test_new_league_starts_at_one(self, client):
+        """Test a newly created league has version 1."""
+        response = client.post('/api/leagues', json={'name': 'Fresh League'})
+
+        assert response.get_json()['version'] == 1
+
+    def test_mutations_bump_version(self, client, sample_league, sample_prospects):
+        """Test every mutating route increments the league version."""
+        league_id = sample_league['id']
+        teams = sample_league['teams']
+        version = league_version(client, league_id)
+
+        mutations = [
+            lambda: client.put(f'/api/leagues/{league_id}', json={'name': 'Renamed'}),
+            lambda: client.put(f'/api/teams/{teams[0]["id"]}', json={'name': 'Renamed Team'}),
+            lambda: client.post('/api/prospects', json={
+                'name': 'New Prospect', 'position': 'QB', 'league_id': league_id
+            }),
+            lambda: client.put(f'/api/prospects/{sample_prospects[0]["id"]}', json={'college': 'Elsewhere'}),
+            lambda: client.post('/api/draft/execute', json={
+                'prospect_id': sample_prospects[1]['id'], 'team_id': teams[0]['id'], 'league_id': league_id
+            }),
+            lambda: client.post('/api/draft/undraft', json={
+                'prospect_id': sample_prospects[1]['id'], 'league_id': league_id
+            }),
+            lambda: client.delete(f'/api/prospects/{sample_prospects[2]["id"]}'),
+        ]
+
+        for mutate in mutations:
+            mutate()
+            new_version = league_version(client, league_id)
+            assert new_version == version + 1
+            version = new_version
+
+    def test_trade_bumps_version(self, client, sample_league):
+        """Test executing and deleting a trade increments the version."""
+        league_id = sample_league['id']
+        pick = sample_league['draft_picks'][0]
+        version = league_version(client, league_id)
+
+        trade = client.post('/api/trades', json={
+            'from_team_id': pick['current_team_id'],
+            'to_team_id': sample_league['teams'][1]['id'],
+            'pick_ids': [pick['id']],
+            'league_id': league_id
+        }).get_json()['trade']
+        assert league_version(client, league_id) == version + 1
+
+        client.delete(f'/api/trades/{trade["id"]}')
+        assert league_version(client, league_id) == version + 2
+
+
+class TestConditionalGet:
+    """Tests for ETag and If-None-Match handling on read endpoints."""
+
+    @pytest.mark.parametrize('path', [
+        '/api/leagues/{league_id}',
+        '/api/leagues/{league_id}/snapshot',
+        '/api/teams?league_id={league_id}',
+        '/api/prospects?league_id={league_id}',
+        '/api/draft/picks?league_id={league_id}',
+        '/api/draft/current?league_id={league_id}',
+        '/api/trades?league_id={league_id}',
+    ])
+    def test_not_modified(self, client, sample_league, path):
+        """Test a matching If-None-Match is answered with 304."""
+        url = path.format(league_id=sample_league['id'])
+        response = client.get(url)
+        etag = response.headers['ETag']
+
+        assert response.status_code == 200
+        assert not etag.startswith('W/')
+
+        response = client.get(url, headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+
+    def test_etag_changes_after_mutation(self, client, sample_league, sample_prospects):
+        """Test a write invalidates previously issued ETags."""
+        url = f'/api/draft/picks?league_id={sample_league["id"]}'
+        etag = client.get(url).headers['ETag']
+
+        client.post('/api/draft/execute', json={
+            'prospect_id': sample_prospects[0]['id'],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': sample_league['id']
+        })
+        response = client.get(url, headers={'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert response.get_json()[0]['is_used'] is True
+
+    def test_etag_differs_per_query(self, client, sample_league):
+        """Test different filters on the same league get different ETags."""
+        league_id = sample_league['id']
+        all_prospects = client.get(f'/api/prospects?league_id={league_id}')
+        quarterbacks = client.get(f'/api/prospects?league_id={league_id}&position=QB')
+
+        assert all_prospects.headers['ETag'] != quarterbacks.headers['ETag']
+
+    def test_unknown_league_is_not_cached(self, client):
+        """Test requests for a missing league still reach the view."""
+        response = client.get('/api/leagues/9999')
+
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
@@ -0,0 +1,108 @@
+import pytest
+import sys
+import os
+import sqlite3
+
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend import create_app
+from backend.config import Config, ProductionConfig
+from backend.database import engine_options
+from backend.models import db
+
+
+def file_app(config_class, path, **settings):
+    class FileConfig(config_class):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SIMULATION_WORKERS = 1
+
+    for name, value in settings.items():
+        setattr(FileConfig, name, value)
+    return create_app(FileConfig)
+
+
+class TestProductionProfile:
+    """Tests for the production database settings."""
+
+    def test_sqlite_pragmas(self, tmp_path):
+        """Test every SQLite connection runs in WAL mode with the configured pragmas."""
+        app = file_app(ProductionConfig, tmp_path / 'prod.db')
+        with app.app_context():
+            pragmas = {
+                name: db.session.execute(db.text(f'PRAGMA {name}')).scalar()
+                for name in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size')
+            }
+            db.session.remove()
+
+        assert pragmas == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'cache_size': -64000,
+            'mmap_size': 256 * 2 ** 20
+        }
+
+    def test_development_profile_is_untouched(self, tmp_path):
+        """Test the default profile keeps SQLite's own settings."""
+        app = file_app(Config, tmp_path / 'dev.db')
+        with app.app_context():
+            assert db.session.execute(db.text('PRAGMA journal_mode')).scalar() == 'delete'
+            db.session.remove()
+
+    def test_reads_continue_during_a_write(self, tmp_path):
+        """Test a reader is not blocked by another worker's open write transaction, unlike without WAL."""
+        for name, config_class in (('production', ProductionConfig), ('development', Config)):
+            path = tmp_path / f'{name}.db'
+            app = file_app(config_class, path, SQLALCHEMY_ENGINE_OPTIONS={'connect_args': {'timeout': 0.2}})
+            with app.app_context():
+                db.create_all()
+                db.session.remove()
+            client = app.test_client()
+            client.post('/api/leagues', json={'name': 'Before'})
+
+            writer = sqlite3.connect(path, isolation_level=None)
+            try:
+                writer.execute('BEGIN EXCLUSIVE')
+                writer.execute("UPDATE league SET name = 'During'")
+
+                if name == 'production':
+                    response = client.get('/api/leagues')
+                    assert response.status_code == 200
+                    assert [league['name'] for league in response.get_json()] == ['Before']
+                else:
+                    with pytest.raises(OperationalError, match='locked'):
+                        client.get('/api/leagues')
+            finally:
+                writer.execute('ROLLBACK')
+                writer.close()
+
+    def test_pool_options_for_server_databases(self):
+        """Test pool sizing, pre-ping and recycle apply to PostgreSQL but not SQLite."""
+        config = {
+            'SQLALCHEMY_ENGINE_OPTIONS': {'pool_size': 3},
+            'DB_POOL_OPTIONS': ProductionConfig.DB_POOL_OPTIONS
+        }
+
+        postgres = engine_options(dict(config, SQLALCHEMY_DATABASE_URI='postgresql://localhost/draft'))
+        sqlite = engine_options(dict(config, SQLALCHEMY_DATABASE_URI='sqlite:///draft.db'))
+
+        assert postgres == {
+            'pool_size': 3,
+            'max_overflow': 20,
+            'pool_timeout': 30,
+            'pool_recycle': 1800,
+            'pool_pre_ping': True
+        }
+        assert sqlite == {'pool_size': 3}
+
+    def test_profile_from_environment(self, monkeypatch):
+        """Test APP_CONFIG selects the profile and rejects unknown names."""
+        monkeypatch.setenv('APP_CONFIG', 'production')
+        assert create_app().config['SQLITE_PRAGMAS']['journal_mode'] == 'WAL'
+
+        monkeypatch.setenv('APP_CONFIG', 'staging')
+        with pytest.raises(ValueError):
+            create_app()
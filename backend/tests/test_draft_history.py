@@ -0,0 +1,231 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models import db, DraftSnapshot
+
+
+def execute(client, league, prospect):
+    response = client.post('/api/draft/execute', json={
+        'prospect_id': prospect['id'],
+        'team_id': current_owner(client, league),
+        'league_id': league['id']
+    })
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def current_owner(client, league):
+    return client.get(f'/api/draft/current?league_id={league["id"]}').get_json()['current_team_id']
+
+
+def undo(client, league):
+    return client.post('/api/draft/undo', json={'league_id': league['id']})
+
+
+def redo(client, league):
+    return client.post('/api/draft/redo', json={'league_id': league['id']})
+
+
+def league_of(client, league):
+    return client.get(f'/api/leagues/{league["id"]}').get_json()
+
+
+def prospect_of(client, prospect):
+    return client.get(f'/api/prospects/{prospect["id"]}').get_json()
+
+
+class TestEventLog:
+    """Tests for the append-only draft event log."""
+
+    def test_every_change_is_logged_in_order(self, client, sample_league, sample_prospects):
+        """Test picks, trades, undrafts and league edits get consecutive sequence numbers."""
+        team_a, team_b = sample_league['teams'][:2]
+        execute(client, sample_league, sample_prospects[0])
+        client.post('/api/draft/execute-batch', json={
+            'league_id': sample_league['id'],
+            'picks': [{'pick_number': 2, 'prospect_id': sample_prospects[1]['id']}]
+        })
+        pick = next(pick for pick in sample_league['draft_picks'] if pick['pick_number'] == 8)
+        client.post('/api/trades', json={
+            'from_team_id': pick['current_team_id'],
+            'to_team_id': team_a['id'] if pick['current_team_id'] != team_a['id'] else team_b['id'],
+            'pick_ids': [pick['id']],
+            'league_id': sample_league['id']
+        })
+        client.post('/api/draft/undraft', json={'prospect_id': sample_prospects[1]['id'], 'league_id': sample_league['id']})
+        client.put(f'/api/leagues/{sample_league["id"]}', json={'name': 'Renamed'})
+
+        events = client.get(f'/api/draft/events?league_id={sample_league["id"]}').get_json()
+
+        assert [event['sequence'] for event in events] == [1, 2, 3, 4, 5]
+        assert [event['event_type'] for event in events] == ['pick', 'picks', 'trade', 'undraft', 'league']
+        assert events[0]['pick_number'] == events[0]['last_pick_number'] == 1
+        assert events[3]['changes']['league'] == {'current_pick_number': 2, 'draft_completed': False}
+        assert events[4]['changes'] == {'league': {'name': 'Renamed'}}
+
+        page = client.get(f'/api/draft/events?league_id={sample_league["id"]}&limit=2').get_json()
+        assert [event['sequence'] for event in page] == [1, 2]
+
+    def test_snapshots_are_taken_periodically(self, app, client, sample_league, sample_prospects):
+        """Test a snapshot is stored at creation and every interval of events after it."""
+        app.config['DRAFT_SNAPSHOT_INTERVAL'] = 3
+        for prospect in sample_prospects[:7]:
+            execute(client, sample_league, prospect)
+
+        sequences = db.session.execute(
+            db.select(DraftSnapshot.sequence)
+            .where(DraftSnapshot.league_id == sample_league['id'])
+            .order_by(DraftSnapshot.sequence)
+        ).scalars().all()
+        assert sequences == [0, 3, 6]
+
+
+class TestUndoRedo:
+    """Tests for undoing and redoing draft events."""
+
+    def test_undo_and_redo_a_pick(self, client, sample_league, sample_prospects):
+        """Test undoing a pick frees the prospect and puts the pick back on the clock."""
+        made = execute(client, sample_league, sample_prospects[0])
+
+        response = undo(client, sample_league)
+
+        assert response.status_code == 200
+        assert response.get_json()['event_type'] == 'pick'
+        assert league_of(client, sample_league)['current_pick_number'] == 1
+        assert prospect_of(client, sample_prospects[0])['is_drafted'] is False
+        current = client.get(f'/api/draft/current?league_id={sample_league["id"]}').get_json()
+        assert current['prospect_id'] is None
+
+        assert redo(client, sample_league).status_code == 200
+        assert league_of(client, sample_league)['current_pick_number'] == 2
+        prospect = prospect_of(client, sample_prospects[0])
+        assert prospect['drafted_by'] == made['pick']['current_team_id']
+        assert prospect['draft_pick_number'] == 1
+
+    def test_several_levels(self, client, sample_league, sample_prospects):
+        """Test undo walks back through the history and redo forward again."""
+        for prospect in sample_prospects[:3]:
+            execute(client, sample_league, prospect)
+        client.put(f'/api/leagues/{sample_league["id"]}', json={'name': 'Renamed'})
+
+        for _ in range(3):
+            assert undo(client, sample_league).status_code == 200
+        assert league_of(client, sample_league)['name'] == 'Test League'
+        assert league_of(client, sample_league)['current_pick_number'] == 2
+
+        assert redo(client, sample_league).status_code == 200
+        assert redo(client, sample_league).status_code == 200
+        assert redo(client, sample_league).status_code == 200
+        assert redo(client, sample_league).status_code == 400
+        league = league_of(client, sample_league)
+        assert league['name'] == 'Renamed'
+        assert league['current_pick_number'] == 4
+
+    def test_new_event_clears_redo(self, client, sample_league, sample_prospects):
+        """Test nothing can be redone once something new happened after an undo."""
+        execute(client, sample_league, sample_prospects[0])
+        execute(client, sample_league, sample_prospects[1])
+        undo(client, sample_league)
+        execute(client, sample_league, sample_prospects[2])
+
+        assert redo(client, sample_league).status_code == 400
+        assert undo(client, sample_league).status_code == 200
+        assert undo(client, sample_league).status_code == 200
+        assert undo(client, sample_league).status_code == 400
+        assert all(not prospect_of(client, prospect)['is_drafted'] for prospect in sample_prospects[:3])
+
+    def test_undo_a_trade(self, client, sample_league):
+        """Test undoing a trade returns the picks through a reverse trade."""
+        team_a, team_b = sample_league['teams'][:2]
+        pick = next(pick for pick in sample_league['draft_picks'] if pick['current_team_id'] == team_a['id'])
+        client.post('/api/trades', json={
+            'from_team_id': team_a['id'], 'to_team_id': team_b['id'],
+            'pick_ids': [pick['id']], 'league_id': sample_league['id']
+        })
+
+        body = undo(client, sample_league).get_json()
+
+        assert body['trade']['from_team_id'] == team_b['id']
+        assert body['trade']['to_team_id'] == team_a['id']
+        history = client.get(f'/api/draft/picks/{pick["id"]}/history').get_json()
+        assert history['owners'] == [team_a['id'], team_b['id'], team_a['id']]
+        assert history['pick']['current_team_id'] == team_a['id']
+
+    def test_redo_conflict(self, client, sample_league, sample_prospects):
+        """Test a redo that would draft a deleted prospect is refused."""
+        execute(client, sample_league, sample_prospects[0])
+        undo(client, sample_league)
+        client.delete(f'/api/prospects/{sample_prospects[0]["id"]}')
+
+        response = redo(client, sample_league)
+
+        assert response.status_code == 409
+        assert league_of(client, sample_league)['current_pick_number'] == 1
+
+    def test_nothing_to_undo(self, client, sample_league):
+        """Test a league without history has nothing to undo or redo."""
+        assert undo(client, sample_league).status_code == 400
+        assert redo(client, sample_league).status_code == 400
+        assert client.post('/api/draft/undo', json={'league_id': 9999}).status_code == 404
+        assert client.post('/api/draft/undo', json={}).status_code == 400
+
+    def test_undo_replays_from_the_nearest_snapshot(self, app, client, sample_league, sample_prospects,
+                                                     count_statements):
+        """Test undo reads one snapshot and a short tail of events."""
+        app.config['DRAFT_SNAPSHOT_INTERVAL'] = 4
+        for prospect in sample_prospects[:10]:
+            execute(client, sample_league, prospect)
+
+        with count_statements() as statements:
+            assert undo(client, sample_league).status_code == 200
+
+        snapshot_reads = [s for s in statements if s[0].startswith('SELECT draft_snapshot.sequence')]
+        replays = [s for s in statements if s[0].startswith('SELECT draft_event.changes')]
+        assert len(snapshot_reads) == len(replays) == 1
+        assert prospect_of(client, sample_prospects[9])['is_drafted'] is False
+        assert prospect_of(client, sample_prospects[8])['is_drafted'] is True
+
+
+class TestPastState:
+    """Tests for reading the league as it was."""
+
+    def test_state_as_of_pick(self, app, client, sample_league, sample_prospects):
+        """Test the picks after pick N are shown unmade, including inside a batch."""
+        app.config['DRAFT_SNAPSHOT_INTERVAL'] = 2
+        for prospect in sample_prospects[:3]:
+            execute(client, sample_league, prospect)
+        client.post('/api/draft/execute-batch', json={
+            'league_id': sample_league['id'],
+            'picks': [{'pick_number': n, 'prospect_id': sample_prospects[n - 1]['id']} for n in range(4, 9)]
+        })
+
+        for pick_number in (2, 5):
+            state = client.get(
+                f'/api/draft/history?league_id={sample_league["id"]}&pick_number={pick_number}'
+            ).get_json()
+            assert state['league']['current_pick_number'] == pick_number + 1
+            made = [pick['prospect_id'] for pick in state['draft_picks'] if pick['is_used']]
+            assert made == [prospect['id'] for prospect in sample_prospects[:pick_number]]
+
+        assert client.get(
+            f'/api/draft/history?league_id={sample_league["id"]}&pick_number=9'
+        ).status_code == 404
+
+    def test_state_at_sequence(self, client, sample_league, sample_prospects):
+        """Test the state after any event, including after an undo."""
+        execute(client, sample_league, sample_prospects[0])
+        client.put(f'/api/leagues/{sample_league["id"]}', json={'name': 'Renamed'})
+        undo(client, sample_league)
+
+        base = f'/api/draft/history?league_id={sample_league["id"]}'
+        assert client.get(f'{base}&sequence=0').get_json()['league']['current_pick_number'] == 1
+        assert client.get(f'{base}&sequence=2').get_json()['league']['name'] == 'Renamed'
+        state = client.get(f'{base}&sequence=3').get_json()
+        assert state['league']['name'] == 'Test League'
+        assert state['draft_picks'][0]['prospect_id'] == sample_prospects[0]['id']
+
+        assert client.get(f'{base}&sequence=4').status_code == 400
+        assert client.get(base).status_code == 400
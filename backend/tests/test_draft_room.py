@@ -0,0 +1,263 @@
+import pytest
+import sys
+import os
+import asyncio
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.draft_room import CLOSE_BAD_REQUEST, CLOSE_NOT_FOUND, ROOM_PATH, DraftRoom
+
+
+class Socket:
+    """Drives one WebSocket connection through the room's ASGI interface."""
+
+    def __init__(self, room, query, path=ROOM_PATH, send=None):
+        self.incoming = asyncio.Queue()
+        self.outgoing = asyncio.Queue()
+        scope = {'type': 'websocket', 'path': path, 'query_string': query.encode()}
+        self.task = asyncio.ensure_future(room(scope, self.incoming.get, send or self.outgoing.put))
+
+    async def connect(self):
+        await self.incoming.put({'type': 'websocket.connect'})
+        return await self.next()
+
+    async def next(self):
+        return await asyncio.wait_for(self.outgoing.get(), 5)
+
+    async def receive(self):
+        return json.loads((await self.next())['text'])
+
+    async def receive_type(self, kind):
+        while True:
+            message = await self.receive()
+            if message['type'] == kind:
+                return message
+
+    async def send(self, message):
+        await self.incoming.put({'type': 'websocket.receive', 'text': json.dumps(message)})
+
+    async def request(self, message):
+        await self.send(message)
+        return await self.receive_type('reply')
+
+    async def close(self):
+        await self.incoming.put({'type': 'websocket.disconnect', 'code': 1000})
+        await asyncio.wait_for(self.task, 5)
+
+
+@pytest.fixture
+def room(app):
+    """A draft room on the test app, serving database work on one thread."""
+    app.config.update(DRAFT_ROOM_DB_WORKERS=1, DRAFT_ROOM_BATCH_MS=20)
+    room = DraftRoom(app)
+    yield room
+    room.close()
+
+
+def owner_of_current_pick(client, league):
+    return client.get(f'/api/draft/current?league_id={league["id"]}').get_json()['current_team_id']
+
+
+class TestDraftRoom:
+    """Tests for the WebSocket draft room."""
+
+    def test_pick_is_replied_to_and_broadcast(self, room, client, sample_league, sample_prospects):
+        """Test a pick over the socket gets a reply and reaches every connection in the league."""
+        team_id = owner_of_current_pick(client, sample_league)
+
+        async def scenario():
+            manager = Socket(room, f'league_id={sample_league["id"]}&team_id={team_id}')
+            viewer = Socket(room, f'league_id={sample_league["id"]}')
+            assert await manager.connect() == {'type': 'websocket.accept'}
+            assert await viewer.connect() == {'type': 'websocket.accept'}
+            welcome = await manager.receive()
+            assert welcome == {'type': 'welcome', 'league_id': sample_league['id'], 'team_id': team_id, 'chat': []}
+            assert room.connection_count(sample_league['id']) == 2
+
+            reply = await manager.request({'type': 'pick', 'id': 'a1', 'prospect_id': sample_prospects[0]['id']})
+            assert reply['id'] == 'a1'
+            assert reply['status'] == 200
+            assert reply['body']['pick']['current_team_id'] == team_id
+
+            for socket in (manager, viewer):
+                events = (await socket.receive_type('events'))['events']
+                assert [event['type'] for event in events] == ['pick']
+                assert events[0]['data']['prospect']['id'] == sample_prospects[0]['id']
+
+            await manager.close()
+            await viewer.close()
+            assert room.connection_count() == 0
+
+        asyncio.run(scenario())
+        assert client.get(f'/api/leagues/{sample_league["id"]}').get_json()['current_pick_number'] == 2
+
+    def test_broadcasts_are_batched(self, room, client, sample_league, sample_prospects):
+        """Test events published close together reach a connection as one frame."""
+        async def scenario():
+            viewer = Socket(room, f'league_id={sample_league["id"]}')
+            await viewer.connect()
+            await viewer.receive_type('welcome')
+
+            # REST picks made by another worker, within one batch interval
+            for prospect in sample_prospects[:3]:
+                client.post('/api/draft/execute', json={
+                    'prospect_id': prospect['id'],
+                    'team_id': owner_of_current_pick(client, sample_league),
+                    'league_id': sample_league['id']
+                })
+
+            events = (await viewer.receive_type('events'))['events']
+            assert [event['data']['pick']['pick_number'] for event in events] == [1, 2, 3]
+            await viewer.close()
+
+        asyncio.run(scenario())
+
+    def test_trade(self, room, client, sample_league):
+        """Test a trade proposed over the socket moves the picks and is broadcast."""
+        team_a, team_b = sample_league['teams'][:2]
+        pick = next(pick for pick in sample_league['draft_picks'] if pick['current_team_id'] == team_a['id'])
+
+        async def scenario():
+            manager = Socket(room, f'league_id={sample_league["id"]}&team_id={team_a["id"]}')
+            await manager.connect()
+
+            reply = await manager.request({'type': 'trade', 'to_team_id': team_b['id'], 'pick_ids': [pick['id']]})
+            assert reply['status'] == 201
+            assert reply['body']['trade']['from_team_id'] == team_a['id']
+            events = (await manager.receive_type('events'))['events']
+            assert events[0]['type'] == 'trade'
+
+            reply = await manager.request({'type': 'trade', 'to_team_id': team_b['id'], 'pick_ids': [pick['id']]})
+            assert reply['status'] == 400
+            assert 'does not belong' in reply['body']['error']
+            await manager.close()
+
+        asyncio.run(scenario())
+        assert client.get(f'/api/draft/picks/{pick["id"]}').get_json()['current_team_id'] == team_b['id']
+
+    def test_chat(self, room, sample_league):
+        """Test chat reaches the league and is replayed to managers who join later."""
+        team_id = sample_league['teams'][0]['id']
+
+        async def scenario():
+            first = Socket(room, f'league_id={sample_league["id"]}&team_id={team_id}')
+            await first.connect()
+
+            assert (await first.request({'type': 'chat', 'text': 'On the clock!'}))['status'] == 200
+            events = (await first.receive_type('events'))['events']
+            assert events[0]['type'] == 'chat'
+            assert events[0]['data']['text'] == 'On the clock!'
+            assert events[0]['data']['team_id'] == team_id
+
+            second = Socket(room, f'league_id={sample_league["id"]}')
+            await second.connect()
+            welcome = await second.receive_type('welcome')
+            assert [message['text'] for message in welcome['chat']] == ['On the clock!']
+
+            assert (await first.request({'type': 'chat', 'text': 'x' * 501}))['status'] == 400
+            assert (await first.request({'type': 'chat', 'text': '  '}))['status'] == 400
+            await first.close()
+            await second.close()
+
+        asyncio.run(scenario())
+
+    def test_invalid_messages(self, room, sample_league, sample_prospects):
+        """Test malformed or failing messages get an error reply and keep the socket open."""
+        async def scenario():
+            socket = Socket(room, f'league_id={sample_league["id"]}')
+            await socket.connect()
+
+            await socket.incoming.put({'type': 'websocket.receive', 'text': 'not json'})
+            assert (await socket.receive_type('reply'))['status'] == 400
+            assert (await socket.request({'type': 'draft'}))['status'] == 400
+            reply = await socket.request({'type': 'pick', 'prospect_id': sample_prospects[0]['id']})
+            assert reply['body'] == {'error': 'prospect_id and team_id are required'}
+            reply = await socket.request({'type': 'pick', 'prospect_id': 9999, 'team_id': 1})
+            assert reply['status'] == 404
+            assert (await socket.request({'type': 'ping', 'id': 3})) == {
+                'type': 'reply', 'id': 3, 'status': 200, 'body': {'message': 'pong'}
+            }
+            await socket.close()
+
+        asyncio.run(scenario())
+
+    def test_rejected_connections(self, room):
+        """Test sockets without a known league are closed."""
+        async def scenario():
+            for query, path, code in (
+                ('', ROOM_PATH, CLOSE_BAD_REQUEST),
+                ('league_id=9999', ROOM_PATH, CLOSE_NOT_FOUND),
+                ('league_id=1', '/api/draft/other', CLOSE_NOT_FOUND)
+            ):
+                socket = Socket(room, query, path=path)
+                assert await socket.connect() == {'type': 'websocket.close', 'code': code}
+                await asyncio.wait_for(socket.task, 5)
+
+        asyncio.run(scenario())
+
+    def test_slow_client_gets_resync(self, app, room, client, sample_league, sample_prospects):
+        """Test a client that stops reading is told to resync instead of queueing without bound."""
+        room.max_queue = 2
+        sent = []
+
+        async def scenario():
+            blocked = asyncio.Event()
+
+            async def send(message):
+                sent.append(message)
+                if message['type'] == 'websocket.send':
+                    await blocked.wait()
+
+            socket = Socket(room, f'league_id={sample_league["id"]}', send=send)
+            await socket.incoming.put({'type': 'websocket.connect'})
+            await asyncio.sleep(0.05)
+            for prospect in sample_prospects[:4]:
+                client.post('/api/draft/execute', json={
+                    'prospect_id': prospect['id'],
+                    'team_id': owner_of_current_pick(client, sample_league),
+                    'league_id': sample_league['id']
+                })
+                await asyncio.sleep(0.05)
+
+            blocked.set()
+            await asyncio.sleep(0.05)
+            await socket.close()
+
+        asyncio.run(scenario())
+        frames = [json.loads(message['text']) for message in sent if message['type'] == 'websocket.send']
+        assert frames[0]['type'] == 'welcome'
+        assert {'type': 'resync'} in frames
+        assert len(frames) <= 4
+
+    def test_many_connections(self, room, client, sample_league, sample_prospects):
+        """Test one broadcast reaches hundreds of connections of a league."""
+        async def scenario():
+            sockets = [Socket(room, f'league_id={sample_league["id"]}') for _ in range(300)]
+            for socket in sockets:
+                await socket.connect()
+            assert room.connection_count(sample_league['id']) == 300
+
+            client.post('/api/draft/execute', json={
+                'prospect_id': sample_prospects[0]['id'],
+                'team_id': owner_of_current_pick(client, sample_league),
+                'league_id': sample_league['id']
+            })
+
+            frames = {(await socket.receive_type('events'))['events'][0]['id'] for socket in sockets}
+            assert len(frames) == 1
+            for socket in sockets:
+                await socket.close()
+
+        asyncio.run(scenario())
+
+    def test_http_is_not_served(self, room):
+        """Test plain HTTP requests to the room get a 404."""
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(room({'type': 'http', 'path': '/'}, None, send))
+
+        assert sent[0]['status'] == 404
@@ -0,0 +1,192 @@
+import pytest
+import sys
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models import db, DraftPick
+from backend.draft_state import DraftState, DraftStateCache
+from backend.versioning import bump_league_version
+
+
+def current_pick(client, league):
+    return client.get(f'/api/draft/current?league_id={league["id"]}').get_json()
+
+
+def draft_picks(client, league):
+    return client.get(f'/api/draft/picks?league_id={league["id"]}').get_json()
+
+
+class TestDraftStateReads:
+    """Tests for serving draft reads from memory."""
+
+    def test_reads_match_database(self, client, sample_league):
+        """Test cached picks and current pick match what the league was initialized with."""
+        picks = sorted(sample_league['draft_picks'], key=lambda pick: pick['pick_number'])
+
+        assert draft_picks(client, sample_league) == picks
+        assert current_pick(client, sample_league) == picks[0]
+
+    def test_warm_reads_only_check_version(self, client, sample_league, count_statements):
+        """Test a cached league is served with a single version lookup."""
+        draft_picks(client, sample_league)
+
+        with count_statements() as statements:
+            current_pick(client, sample_league)
+            draft_picks(client, sample_league)
+
+        assert len(statements) == 2
+
+    def test_unknown_league(self, client):
+        """Test reads for a missing league."""
+        assert client.get('/api/draft/current?league_id=9999').status_code == 404
+        assert client.get('/api/draft/picks?league_id=9999').get_json() == []
+
+    def test_draft_complete(self, client, sample_league, sample_prospects):
+        """Test there is no current pick once every pick is made."""
+        for prospect in sample_prospects[:12]:
+            client.post('/api/draft/execute', json={
+                'prospect_id': prospect['id'],
+                'team_id': sample_league['teams'][0]['id'],
+                'league_id': sample_league['id']
+            })
+
+        response = client.get(f'/api/draft/current?league_id={sample_league["id"]}')
+
+        assert response.status_code == 404
+
+
+class TestDraftStateWriteThrough:
+    """Tests for keeping cached draft state current without reloading."""
+
+    def assert_served_from_memory(self, client, league, count_statements):
+        with count_statements() as statements:
+            picks = draft_picks(client, league)
+            current = current_pick(client, league)
+        assert len(statements) == 2
+        return picks, current
+
+    def test_execute_and_undraft(self, client, sample_league, sample_prospects, count_statements):
+        """Test picks and undrafts update the cached grid and current pick."""
+        draft_picks(client, sample_league)
+        client.post('/api/draft/execute', json={
+            'prospect_id': sample_prospects[0]['id'],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': sample_league['id']
+        })
+
+        picks, current = self.assert_served_from_memory(client, sample_league, count_statements)
+        assert picks[0]['prospect_id'] == sample_prospects[0]['id']
+        assert picks[0]['is_used'] is True
+        assert current['pick_number'] == 2
+
+        client.post('/api/draft/undraft', json={
+            'prospect_id': sample_prospects[0]['id'],
+            'league_id': sample_league['id']
+        })
+
+        picks, current = self.assert_served_from_memory(client, sample_league, count_statements)
+        assert picks[0]['prospect_id'] is None
+        assert current['pick_number'] == 1
+
+    def test_trade(self, client, sample_league, count_statements):
+        """Test traded picks change owner in the cache."""
+        pick = sample_league['draft_picks'][0]
+        new_owner = sample_league['teams'][3]['id']
+        draft_picks(client, sample_league)
+        client.post('/api/trades', json={
+            'from_team_id': pick['current_team_id'],
+            'to_team_id': new_owner,
+            'pick_ids': [pick['id']],
+            'league_id': sample_league['id']
+        })
+
+        picks, current = self.assert_served_from_memory(client, sample_league, count_statements)
+        assert current['current_team_id'] == new_owner
+        assert picks[0]['current_team_id'] == new_owner
+
+    def test_update_league(self, client, sample_league, count_statements):
+        """Test moving the current pick through the league is reflected."""
+        draft_picks(client, sample_league)
+        client.put(f'/api/leagues/{sample_league["id"]}', json={'current_pick_number': 5})
+
+        _, current = self.assert_served_from_memory(client, sample_league, count_statements)
+        assert current['pick_number'] == 5
+
+    def test_write_from_another_worker(self, app, client, sample_league):
+        """Test a write this process did not see causes a reload."""
+        draft_picks(client, sample_league)
+        version = bump_league_version(sample_league['id'])
+        db.session.execute(
+            db.update(DraftPick)
+            .where(DraftPick.league_id == sample_league['id'], DraftPick.pick_number == 1)
+            .values(current_team_id=sample_league['teams'][2]['id'], version=version)
+        )
+        db.session.commit()
+
+        assert current_pick(client, sample_league)['current_team_id'] == sample_league['teams'][2]['id']
+
+    def test_recreated_league(self, client, sample_league):
+        """Test a deleted league's state is not served for a new league."""
+        draft_picks(client, sample_league)
+        client.delete(f'/api/leagues/{sample_league["id"]}')
+
+        assert draft_picks(client, sample_league) == []
+
+
+def make_state(league_id, num_picks, version=1):
+    league = SimpleNamespace(
+        id=league_id, created_at=datetime(2024, 1, 1), version=version,
+        current_pick_number=1, draft_completed=False, total_picks=num_picks
+    )
+    picks = [
+        {'id': league_id * 1000 + n, 'pick_number': n, 'current_team_id': 1, 'prospect_id': None, 'is_used': False}
+        for n in range(1, num_picks + 1)
+    ]
+    return DraftState(league, picks)
+
+
+class TestDraftStateCache:
+    """Tests for the cache bookkeeping."""
+
+    def test_evicts_least_recently_used_league(self):
+        """Test the league count bound drops the idlest league."""
+        cache = DraftStateCache(max_leagues=2, max_picks=1000)
+        for league_id in (1, 2, 3):
+            cache._store(make_state(league_id, 10))
+
+        assert list(cache._states) == [2, 3]
+
+    def test_pick_budget(self):
+        """Test the total pick bound evicts until the cache fits."""
+        cache = DraftStateCache(max_leagues=10, max_picks=25)
+        for league_id in (1, 2, 3):
+            cache._store(make_state(league_id, 10))
+        cache._store(make_state(4, 100))
+
+        assert list(cache._states) == [2, 3]
+        assert cache._num_picks == 20
+
+    def test_apply_tracks_drafted_prospects(self):
+        """Test applied picks keep the drafted set in step."""
+        state = make_state(1, 3)
+        pick = dict(state.picks[0], prospect_id=42, is_used=True)
+
+        assert state.apply(2, league={'current_pick_number': 2, 'draft_completed': False, 'total_picks': 3},
+                           picks=[pick])
+        assert state.drafted == {42}
+        assert state.current_pick()['pick_number'] == 2
+
+        state.apply(3, picks=[dict(pick, prospect_id=None, is_used=False)])
+        assert state.drafted == set()
+
+    def test_update_skipping_a_version_evicts(self):
+        """Test a write-through that does not follow the cached version drops the league."""
+        cache = DraftStateCache(max_leagues=10, max_picks=100)
+        cache._store(make_state(1, 3, version=4))
+
+        cache.update(1, 6, picks=[])
+
+        assert len(cache) == 0
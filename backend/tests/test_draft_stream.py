@@ -0,0 +1,124 @@
+import pytest
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.events import EventBus, event_bus, format_sse
+
+
+def read_event(chunks):
+    """Read chunks from an SSE stream until a full event is available."""
+    for chunk in chunks:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if text.startswith('id:'):
+            fields = dict(line.split(': ', 1) for line in text.strip().split('\n'))
+            return fields['event'], json.loads(fields['data'])
+    return None
+
+
+class TestEventBus:
+    """Tests for the in-process event bus."""
+
+    def test_publish_reaches_league_subscribers_only(self):
+        """Test events are delivered to subscribers of the same league."""
+        bus = EventBus()
+        first = bus.subscribe(1)
+        other = bus.subscribe(2)
+
+        bus.publish(1, 'pick', {'pick_number': 1})
+
+        assert first.get_nowait()['data'] == {'pick_number': 1}
+        assert other.empty()
+
+    def test_unsubscribe(self):
+        """Test unsubscribed queues stop receiving events."""
+        bus = EventBus()
+        subscription = bus.subscribe(1)
+        bus.unsubscribe(1, subscription)
+
+        bus.publish(1, 'pick', {})
+
+        assert subscription.empty()
+        assert bus.subscriber_count(1) == 0
+
+    def test_slow_subscriber_gets_resync(self):
+        """Test a full subscriber queue is replaced by a resync event."""
+        bus = EventBus(max_queue_size=2)
+        subscription = bus.subscribe(1)
+
+        for number in range(3):
+            bus.publish(1, 'pick', {'pick_number': number})
+
+        assert subscription.get_nowait()['type'] == 'resync'
+        assert subscription.empty()
+
+    def test_format_sse(self):
+        """Test event framing follows the SSE wire format."""
+        text = format_sse({'id': 7, 'type': 'pick', 'data': {'a': 1}})
+
+        assert text == 'id: 7\nevent: pick\ndata: {"a":1}\n\n'
+
+
+class TestDraftStream:
+    """Tests for the draft event stream endpoint."""
+
+    def test_stream_missing_league_id(self, client):
+        """Test stream requires a league_id."""
+        response = client.get('/api/draft/stream')
+
+        assert response.status_code == 400
+
+    def test_stream_league_not_found(self, client):
+        """Test stream for a non-existent league."""
+        response = client.get('/api/draft/stream?league_id=9999')
+
+        assert response.status_code == 404
+
+    def test_stream_pushes_pick_event(self, client, sample_league, sample_prospects):
+        """Test executing a pick pushes a delta to stream viewers."""
+        league_id = sample_league['id']
+        response = client.get(f'/api/draft/stream?league_id={league_id}', buffered=False)
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+
+        chunks = iter(response.response)
+        assert next(chunks).startswith(b'retry:')
+
+        client.post('/api/draft/execute', json={
+            'prospect_id': sample_prospects[0]['id'],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': league_id
+        })
+
+        event_type, data = read_event(chunks)
+        response.close()
+
+        assert event_type == 'pick'
+        assert data['prospect']['id'] == sample_prospects[0]['id']
+        assert data['current_pick_number'] == 2
+        assert event_bus.subscriber_count(league_id) == 0
+
+    def test_stream_pushes_trade_event(self, client, sample_league):
+        """Test executing a trade pushes a delta to stream viewers."""
+        league_id = sample_league['id']
+        teams = sample_league['teams']
+        pick = sample_league['draft_picks'][0]
+        response = client.get(f'/api/draft/stream?league_id={league_id}', buffered=False)
+        chunks = iter(response.response)
+        next(chunks)
+
+        client.post('/api/trades', json={
+            'from_team_id': pick['current_team_id'],
+            'to_team_id': teams[1]['id'],
+            'pick_ids': [pick['id']],
+            'league_id': league_id
+        })
+
+        event_type, data = read_event(chunks)
+        response.close()
+
+        assert event_type == 'trade'
+        assert data['picks'][0]['current_team_id'] == teams[1]['id']
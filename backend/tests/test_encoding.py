@@ -0,0 +1,87 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend import create_app
+from backend.encoding import OrjsonProvider, StandardJSONProvider, orjson
+from backend.tests.conftest import TestConfig
+
+needs_orjson = pytest.mark.skipif(orjson is None, reason='orjson is not installed')
+
+
+class TestStreaming:
+    """Tests for streaming long list responses."""
+
+    def test_streamed_list_matches_buffered(self, app, client, sample_league, sample_prospects):
+        """Test a list streamed in chunks decodes to the same items as one encoded at once."""
+        url = f'/api/prospects?league_id={sample_league["id"]}'
+        buffered = client.get(url)
+
+        app.config.update(JSON_STREAM_MIN_ITEMS=5, JSON_STREAM_CHUNK_SIZE=3)
+        streamed = client.get(url)
+
+        assert 'Content-Length' in buffered.headers
+        assert 'Content-Length' not in streamed.headers
+        assert streamed.content_type == 'application/json'
+        assert streamed.get_json() == buffered.get_json()
+        assert len(streamed.get_json()) == 20
+
+    def test_streamed_page_with_fields(self, app, client, sample_league, sample_prospects):
+        """Test streamed pages keep the requested fields and the next cursor."""
+        app.config.update(JSON_STREAM_MIN_ITEMS=5, JSON_STREAM_CHUNK_SIZE=4)
+
+        response = client.get(f'/api/prospects?league_id={sample_league["id"]}&fields=name&limit=10')
+
+        assert 'Content-Length' not in response.headers
+        assert response.get_json() == [{'name': f'Prospect {number}'} for number in range(1, 11)]
+        assert 'X-Next-Cursor' in response.headers
+
+    def test_streamed_list_keeps_etag(self, app, client, sample_league, sample_prospects):
+        """Test conditional requests still work on streamed lists."""
+        app.config.update(JSON_STREAM_MIN_ITEMS=5)
+        url = f'/api/prospects?league_id={sample_league["id"]}'
+        etag = client.get(url).headers['ETag']
+
+        assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+
+class TestEncoders:
+    """Tests for choosing the JSON encoder."""
+
+    @needs_orjson
+    def test_encoders_agree(self, client, sample_league, sample_prospects):
+        """Test orjson and the standard library produce the same documents."""
+        class StandardConfig(TestConfig):
+            JSON_ENCODER = 'json'
+
+        fast = client.application
+        standard = create_app(StandardConfig)
+        assert isinstance(fast.json, OrjsonProvider)
+        assert type(standard.json) is StandardJSONProvider
+
+        document = client.get(f'/api/leagues/{sample_league["id"]}/snapshot').get_json()
+        with standard.app_context():
+            for provider in (fast.json, standard.json):
+                assert provider.loads(provider.dumps(document)) == document
+                assert provider.loads(provider.dumps_bytes(document)) == document
+        assert fast.json.dumps_bytes({2: 'b', 1: 'a'}) == standard.json.dumps_bytes({2: 'b', 1: 'a'})
+
+    @needs_orjson
+    def test_debug_responses_are_indented(self, app):
+        """Test orjson still pretty-prints responses in debug mode."""
+        app.debug = True
+        with app.test_request_context():
+            assert app.json.response({'a': [1]}).get_data(as_text=True) == '{\n  "a": [\n    1\n  ]\n}\n'
+        app.debug = False
+        with app.test_request_context():
+            assert app.json.response({'a': [1]}).get_data(as_text=True) == '{"a":[1]}\n'
+
+    def test_unknown_encoder(self):
+        """Test a misspelled encoder name is refused at startup."""
+        class BadConfig(TestConfig):
+            JSON_ENCODER = 'ujson'
+
+        with pytest.raises(ValueError):
+            create_app(BadConfig)
@@ -0,0 +1,64 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.benchmarks.endpoint_benchmark import compare, run, scenarios, uncovered_routes
+
+
+class TestEndpointBenchmark:
+    """Tests for the per-route benchmark suite."""
+
+    def test_every_route_has_a_scenario(self, app):
+        """Test a new route cannot be added without a benchmark scenario."""
+        assert uncovered_routes(app, scenarios()) == []
+
+    def test_suite_runs_on_a_small_dataset(self, tmp_path):
+        """Test every scenario gets its expected status and reports percentiles and statements."""
+        dialect, dataset, results = run(
+            f'sqlite:///{tmp_path / "endpoints.db"}',
+            requests=2,
+            dataset={'num_leagues': 4, 'num_teams': 4, 'num_rounds': 6, 'prospects_per_pick': 2, 'trades_per_league': 2}
+        )
+
+        assert dialect == 'sqlite'
+        assert dataset['num_teams'] == 4
+        assert set(results) == {scenario.name for scenario in scenarios()}
+        execute = results['POST /api/draft/execute']
+        assert execute['draft_night'] is True
+        assert execute['requests'] == 2
+        assert execute['p50_ms'] <= execute['p95_ms'] <= execute['p99_ms']
+        assert execute['statements'] == 5
+
+    def test_batch_fits_a_short_draft(self, tmp_path):
+        """Test the batch pick scenario makes no more picks than the draft has left."""
+        _, _, results = run(
+            f'sqlite:///{tmp_path / "short.db"}',
+            requests=2,
+            dataset={'num_leagues': 4, 'num_teams': 4, 'num_rounds': 3, 'prospects_per_pick': 2, 'trades_per_league': 2},
+            only=['execute-batch']
+        )
+
+        assert results['POST /api/draft/execute-batch']['requests'] == 2
+
+    def test_compare_flags_regressions(self):
+        """Test more statements or a much slower p95 are regressions, noise is not."""
+        baseline = {
+            'POST /api/draft/execute': {'p95_ms': 5.0, 'statements': 5},
+            'GET /api/leagues': {'p95_ms': 2.0, 'statements': 1},
+            'GET /api/teams': {'p95_ms': 2.0, 'statements': 2}
+        }
+        results = {
+            'POST /api/draft/execute': {'p95_ms': 5.5, 'statements': 6, 'draft_night': True},
+            'GET /api/leagues': {'p95_ms': 9.0, 'statements': 1, 'draft_night': False},
+            'GET /api/teams': {'p95_ms': 3.3, 'statements': 2, 'draft_night': False},
+            'GET /api/trades': {'p95_ms': 50.0, 'statements': 9, 'draft_night': False}
+        }
+
+        regressions = compare(results, baseline, tolerance=0.2)
+
+        assert regressions == [
+            ('POST /api/draft/execute', True, 'statements 5 -> 6'),
+            ('GET /api/leagues', False, 'p95 2.00 ms -> 9.00 ms')
+        ]
@@ -0,0 +1,144 @@
+import pytest
+import sys
+import os
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.events import (
+    EventBus, MemoryBroker, PostgresBroker, UnixSocketBroker, create_broker
+)
+
+
+@pytest.fixture
+def socket_path():
+    """Provide a short socket path that is cleaned up afterwards."""
+    directory = tempfile.mkdtemp(prefix='draft-events-')
+    path = os.path.join(directory, 'events.sock')
+    yield path
+    for name in (path, path + '.lock'):
+        if os.path.exists(name):
+            os.unlink(name)
+    os.rmdir(directory)
+
+
+def wait_for(condition, timeout=5):
+    """Poll until a condition holds, failing after the timeout."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+class TestCreateBroker:
+    """Tests for broker selection from EVENT_BROKER_URL."""
+
+    def test_memory_is_default(self):
+        """Test an empty URL selects the in-process broker."""
+        assert isinstance(create_broker(None, EventBus()), MemoryBroker)
+        assert isinstance(create_broker('memory://', EventBus()), MemoryBroker)
+
+    def test_unix_socket(self):
+        """Test unix:// URLs select the local socket broker."""
+        broker = create_broker('unix:///tmp/draft.sock', EventBus())
+
+        assert isinstance(broker, UnixSocketBroker)
+        assert broker.path == '/tmp/draft.sock'
+
+    def test_postgres_strips_driver(self):
+        """Test SQLAlchemy-style URLs are turned into libpq DSNs."""
+        broker = create_broker('postgresql+psycopg2://u:p@db/draft', EventBus())
+
+        assert isinstance(broker, PostgresBroker)
+        assert broker.dsn == 'postgresql://u:p@db/draft'
+
+    def test_unsupported(self):
+        """Test unknown schemes are rejected."""
+        with pytest.raises(ValueError):
+            create_broker('redis://localhost', EventBus())
+
+
+class TestMemoryBroker:
+    """Tests for the in-process broker."""
+
+    def test_publish(self):
+        """Test events reach subscribers on the same bus."""
+        bus = EventBus()
+        subscription = bus.subscribe(1)
+
+        MemoryBroker(bus).publish(1, 'pick', {'pick_number': 1})
+
+        assert subscription.get_nowait()['type'] == 'pick'
+
+
+class TestUnixSocketBroker:
+    """Tests for the Unix socket broker shared by several workers."""
+
+    def test_fan_out_between_workers(self, socket_path):
+        """Test an event published by one worker reaches another worker."""
+        first_bus, second_bus = EventBus(), EventBus()
+        first = UnixSocketBroker(socket_path, first_bus)
+        second = UnixSocketBroker(socket_path, second_bus)
+        first.start()
+        second.start()
+        assert first._connected.wait(timeout=5)
+        assert second._connected.wait(timeout=5)
+        wait_for(lambda: len((first._hub or second._hub).clients) == 2)
+
+        first_subscription = first_bus.subscribe(1)
+        second_subscription = second_bus.subscribe(1)
+        first.publish(1, 'pick', {'pick_number': 3})
+
+        try:
+            assert second_subscription.get(timeout=5)['data'] == {'pick_number': 3}
+            assert first_subscription.get(timeout=5)['data'] == {'pick_number': 3}
+        finally:
+            second.close()
+            first.close()
+
+    def test_hub_failover(self, socket_path):
+        """Test a worker takes over the hub when the hub owner exits."""
+        first_bus, second_bus = EventBus(), EventBus()
+        first = UnixSocketBroker(socket_path, first_bus)
+        first.start()
+        assert first._connected.wait(timeout=5)
+
+        second = UnixSocketBroker(socket_path, second_bus)
+        second.start()
+        assert second._connected.wait(timeout=5)
+        assert first._hub is not None
+        first.close()
+
+        wait_for(lambda: second._hub is not None and second._connected.is_set())
+
+        third_bus = EventBus()
+        third = UnixSocketBroker(socket_path, third_bus)
+        third.start()
+        assert third._connected.wait(timeout=5)
+        wait_for(lambda: len(second._hub.clients) == 2)
+        subscription = third_bus.subscribe(1)
+        try:
+            second.publish(1, 'trade', {'trade_id': 1})
+            assert subscription.get(timeout=5)['type'] == 'trade'
+        finally:
+            third.close()
+            second.close()
+
+
+class TestBlueprintEvents:
+    """Tests for events published by the league blueprint."""
+
+    def test_update_league_publishes(self, client, sample_league):
+        """Test league edits are pushed to stream viewers."""
+        from backend.events import event_bus
+
+        subscription = event_bus.subscribe(sample_league['id'])
+        try:
+            client.put(f'/api/leagues/{sample_league["id"]}', json={'name': 'Renamed'})
+            event = subscription.get(timeout=1)
+        finally:
+            event_bus.unsubscribe(sample_league['id'], subscription)
+
+        assert event['type'] == 'league_updated'
+        assert event['data']['league']['name'] == 'Renamed'
@@ -0,0 +1,116 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def execute_batch(client, league, prospects, start=1, **extra):
+    return client.post('/api/draft/execute-batch', json={
+        'league_id': league['id'],
+        'picks': [
+            {'pick_number': number, 'prospect_id': prospect['id']}
+            for number, prospect in enumerate(prospects, start)
+        ],
+        **extra
+    })
+
+
+def current_pick_number(client, league):
+    return client.get(f'/api/leagues/{league["id"]}').get_json()['current_pick_number']
+
+
+class TestExecuteBatch:
+    """Tests for entering many picks in one request."""
+
+    def test_batch_advances_league_once(self, client, sample_league, sample_prospects):
+        """Test every pick is made for its owner and the league moves past them."""
+        response = execute_batch(client, sample_league, sample_prospects[:5])
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['league']['current_pick_number'] == 6
+        assert data['league']['draft_completed'] is False
+        owners = {pick['pick_number']: pick['current_team_id'] for pick in sample_league['draft_picks']}
+        for number, (pick, prospect) in enumerate(zip(data['picks'], data['prospects']), 1):
+            assert pick['pick_number'] == number
+            assert pick['prospect_id'] == prospect['id'] == sample_prospects[number - 1]['id']
+            assert pick['is_used'] is True
+            assert prospect['drafted_by'] == owners[number]
+            assert prospect['draft_pick_number'] == number
+
+        current = client.get(f'/api/draft/current?league_id={sample_league["id"]}').get_json()
+        assert current['pick_number'] == 6
+        roster = client.get(f'/api/teams/{owners[1]}/roster').get_json()
+        assert sample_prospects[0]['id'] in [prospect['id'] for prospect in roster]
+
+    def test_batch_after_single_picks(self, client, sample_league, sample_prospects):
+        """Test a batch continues from picks made one at a time and can finish the draft."""
+        client.post('/api/draft/execute', json={
+            'prospect_id': sample_prospects[0]['id'],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': sample_league['id']
+        })
+
+        response = execute_batch(client, sample_league, sample_prospects[1:12], start=2)
+
+        assert response.status_code == 200
+        assert response.get_json()['league']['draft_completed'] is True
+
+    def test_constant_statement_count(self, client, sample_league, sample_prospects, count_statements):
+        """Test a batch costs the same number of statements however many picks it holds."""
+        counts = []
+        for prospects, start in ((sample_prospects[:2], 1), (sample_prospects[2:12], 3)):
+            with count_statements() as statements:
+                assert execute_batch(client, sample_league, prospects, start=start).status_code == 200
+            counts.append(len(statements))
+
+        assert counts[0] == counts[1]
+
+    def test_out_of_order(self, client, sample_league, sample_prospects):
+        """Test picks must continue from the current pick without gaps."""
+        assert execute_batch(client, sample_league, sample_prospects[:3], start=2).status_code == 409
+
+        response = client.post('/api/draft/execute-batch', json={
+            'league_id': sample_league['id'],
+            'picks': [
+                {'pick_number': 1, 'prospect_id': sample_prospects[0]['id']},
+                {'pick_number': 3, 'prospect_id': sample_prospects[1]['id']}
+            ]
+        })
+        assert response.status_code == 409
+        assert current_pick_number(client, sample_league) == 1
+
+    def test_invalid_prospects_roll_back(self, client, sample_league, sample_prospects):
+        """Test one bad entry leaves the whole draft untouched."""
+        client.post('/api/draft/execute', json={
+            'prospect_id': sample_prospects[5]['id'],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': sample_league['id']
+        })
+
+        response = execute_batch(client, sample_league, sample_prospects[:6], start=2)
+        assert response.status_code == 400
+        assert response.get_json()['error'] == f'Prospect {sample_prospects[5]["id"]} already drafted'
+
+        response = execute_batch(client, sample_league, sample_prospects[:2] + [{'id': 9999}], start=2)
+        assert response.status_code == 404
+
+        assert current_pick_number(client, sample_league) == 2
+        prospect = client.get(f'/api/prospects/{sample_prospects[0]["id"]}').get_json()
+        assert prospect['is_drafted'] is False
+
+    def test_too_many_picks(self, client, sample_league, sample_prospects):
+        """Test a batch cannot run past the last pick."""
+        assert execute_batch(client, sample_league, sample_prospects[:13]).status_code == 400
+
+    def test_validation(self, client, sample_league, sample_prospects):
+        """Test malformed batches are rejected."""
+        assert client.post('/api/draft/execute-batch', json={'league_id': sample_league['id']}).status_code == 400
+        assert execute_batch(client, sample_league, []).status_code == 400
+        assert execute_batch(client, sample_league, [sample_prospects[0]] * 2).status_code == 400
+        response = client.post('/api/draft/execute-batch', json={
+            'league_id': sample_league['id'], 'picks': [{'pick_number': 1}]
+        })
+        assert response.status_code == 400
+        assert execute_batch(client, {'id': 9999}, sample_prospects[:1]).status_code == 404
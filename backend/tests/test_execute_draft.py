@@ -0,0 +1,100 @@
+import pytest
+import sys
+import os
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models import db
+
+
+def execute(client, league, prospect, **extra):
+    return client.post('/api/draft/execute', json={
+        'prospect_id': prospect['id'],
+        'team_id': league['teams'][0]['id'],
+        'league_id': league['id'],
+        **extra
+    })
+
+
+class TestExecuteDraft:
+    """Tests for the atomic draft pick path."""
+
+    def test_execute_advances_pick(self, client, sample_league, sample_prospects):
+        """Test a pick marks the prospect and pick and advances the league."""
+        response = execute(client, sample_league, sample_prospects[0])
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['prospect']['is_drafted'] is True
+        assert data['prospect']['draft_pick_number'] == 1
+        assert data['pick']['prospect_id'] == sample_prospects[0]['id']
+        assert data['pick']['is_used'] is True
+        assert data['league']['current_pick_number'] == 2
+        assert data['league']['total_picks'] == 12
+
+    def test_execute_uses_fixed_statement_count(self, client, sample_league, sample_prospects, count_statements):
+        """Test a pick costs the same number of statements at any league size."""
+        with count_statements() as statements:
+            execute(client, sample_league, sample_prospects[0])
+
+        assert len(statements) == 5
+        assert not any('count(' in statement for statement, _ in statements)
+
+    def test_already_drafted(self, client, sample_league, sample_prospects):
+        """Test a drafted prospect cannot be picked again."""
+        execute(client, sample_league, sample_prospects[0])
+
+        response = execute(client, sample_league, sample_prospects[0])
+
+        assert response.status_code == 400
+        assert 'already drafted' in response.get_json()['error']
+        league = client.get(f'/api/leagues/{sample_league["id"]}').get_json()
+        assert league['current_pick_number'] == 2
+
+    def test_prospect_not_found(self, client, sample_league):
+        """Test drafting a non-existent prospect."""
+        response = execute(client, sample_league, {'id': 9999})
+
+        assert response.status_code == 404
+
+    def test_stale_pick_number(self, client, sample_league, sample_prospects):
+        """Test a submission for a pick that already happened gets a 409."""
+        execute(client, sample_league, sample_prospects[0], pick_number=1)
+
+        response = execute(client, sample_league, sample_prospects[1], pick_number=1)
+
+        assert response.status_code == 409
+        assert response.get_json()['current_pick_number'] == 2
+
+    def test_lost_race_returns_conflict(self, app, client, sample_league, sample_prospects):
+        """Test losing the compare-and-set on the pick leaves the league untouched."""
+        def competing_pick(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('UPDATE league'):
+                # Another worker takes the pick between our read and our update.
+                cursor.execute('UPDATE league SET current_pick_number = current_pick_number + 1')
+
+        event.listen(db.engine, 'before_cursor_execute', competing_pick)
+        try:
+            response = execute(client, sample_league, sample_prospects[0])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', competing_pick)
+
+        assert response.status_code == 409
+        prospect = client.get(f'/api/prospects/{sample_prospects[0]["id"]}').get_json()
+        assert prospect['is_drafted'] is False
+        picks = client.get(f'/api/draft/picks?league_id={sample_league["id"]}').get_json()
+        assert not any(pick['is_used'] for pick in picks)
+
+    def test_draft_completes(self, client, sample_league, sample_prospects):
+        """Test the last pick completes the draft and no further picks are taken."""
+        for prospect in sample_prospects[:12]:
+            response = execute(client, sample_league, prospect)
+
+        assert response.get_json()['league']['draft_completed'] is True
+
+        response = execute(client, sample_league, sample_prospects[12])
+
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'No current pick available'
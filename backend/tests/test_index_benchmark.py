@@ -0,0 +1,19 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.benchmarks.index_benchmark import run
+
+
+class TestIndexBenchmark:
+    """Tests for the before/after index benchmark."""
+
+    def test_runs_on_a_small_dataset(self, tmp_path):
+        """Test the benchmark migrates, fills and measures a temporary database."""
+        before, after = run(f'sqlite:///{tmp_path / "index.db"}', num_leagues=2, repeat=3)
+
+        assert set(before) == set(after)
+        assert any('ix_draft_pick_league_prospect' in line for line in after['pick by prospect']['plan'])
+        assert not any('ix_draft_pick_league_prospect' in line for line in before['pick by prospect']['plan'])
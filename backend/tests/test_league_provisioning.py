@@ -0,0 +1,116 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.pick_grid import build_pick_grid
+
+
+class TestPickGrid:
+    """Tests for snake draft pick grid generation."""
+
+    def test_snake_order(self):
+        """Test even rounds reverse the draft order."""
+        rows = build_pick_grid(1, [10, 20, 30], 3, 1, None)
+
+        assert [row['pick_number'] for row in rows] == list(range(1, 10))
+        assert [row['original_team_id'] for row in rows] == [10, 20, 30, 30, 20, 10, 10, 20, 30]
+        assert [row['pick_in_round'] for row in rows] == [1, 2, 3] * 3
+        assert [row['round_number'] for row in rows] == [1, 1, 1, 2, 2, 2, 3, 3, 3]
+
+    def test_no_teams(self):
+        """Test a league without teams has no picks."""
+        assert build_pick_grid(1, [], 5, 1, None) == []
+
+
+class TestInitializeLeague:
+    """Tests for league initialization."""
+
+    def test_initialize_creates_snake_grid(self, client, sample_league):
+        """Test the initialized league owns a full snake draft."""
+        teams = [team['id'] for team in sample_league['teams']]
+        picks = sorted(sample_league['draft_picks'], key=lambda pick: pick['pick_number'])
+
+        assert [team['draft_order'] for team in sample_league['teams']] == [1, 2, 3, 4]
+        assert [pick['current_team_id'] for pick in picks] == teams + teams[::-1] + teams
+
+    def test_initialize_uses_constant_inserts(self, client, count_statements):
+        """Test a large league is written with one insert per table."""
+        league_id = client.post('/api/leagues', json={'name': 'Big', 'num_rounds': 25}).get_json()['id']
+
+        with count_statements() as statements:
+            response = client.post(f'/api/leagues/{league_id}/initialize', json={
+                'teams': [{'name': f'Team {n}'} for n in range(16)]
+            })
+
+        inserts = [statement for statement, _ in statements if statement.startswith('INSERT')]
+
+        assert response.status_code == 201
+        assert len(response.get_json()['draft_picks']) == 400
+        assert len(inserts) == 3
+
+    def test_initialize_requires_team_names(self, client):
+        """Test initialization rejects teams without names."""
+        league_id = client.post('/api/leagues', json={'name': 'Bad'}).get_json()['id']
+
+        response = client.post(f'/api/leagues/{league_id}/initialize', json={'teams': [{'icon': 'Star'}]})
+
+        assert response.status_code == 400
+
+
+class TestCreateLeaguesBatch:
+    """Tests for creating many leagues in one call."""
+
+    def test_batch_creates_leagues_teams_and_picks(self, client, count_statements):
+        """Test each league in the batch is fully provisioned."""
+        with count_statements() as statements:
+            response = client.post('/api/leagues/batch', json={
+                'leagues': [
+                    {
+                        'name': f'League {n}',
+                        'num_rounds': 2,
+                        'teams': [{'name': f'L{n} Team {t}'} for t in range(3)]
+                    }
+                    for n in range(50)
+                ]
+            })
+
+        inserts = [statement for statement, _ in statements if statement.startswith('INSERT')]
+
+        assert response.status_code == 201
+        data = response.get_json()
+        assert len(data['leagues']) == 50
+        assert all(league['num_picks'] == 6 for league in data['leagues'])
+        assert len(inserts) == 4
+
+        league = data['leagues'][7]
+        picks = client.get(f'/api/draft/picks?league_id={league["id"]}').get_json()
+        teams = client.get(f'/api/teams?league_id={league["id"]}').get_json()
+        team_ids = [team['id'] for team in teams]
+        assert [team['name'] for team in teams] == ['L7 Team 0', 'L7 Team 1', 'L7 Team 2']
+        assert [pick['current_team_id'] for pick in picks] == team_ids + team_ids[::-1]
+
+    def test_batch_league_without_teams(self, client):
+        """Test leagues can be created without teams in a batch."""
+        response = client.post('/api/leagues/batch', json={'leagues': [{'name': 'Empty'}]})
+
+        assert response.status_code == 201
+        assert response.get_json()['leagues'][0]['num_picks'] == 0
+
+    def test_batch_validation(self, client):
+        """Test invalid batches are rejected before anything is written."""
+        response = client.post('/api/leagues/batch', json={
+            'leagues': [{'name': 'Fine'}, {'description': 'No name'}]
+        })
+
+        assert response.status_code == 400
+        assert client.get('/api/leagues').get_json() == []
+
+        for num_rounds in ('3', 0, True):
+            response = client.post('/api/leagues/batch', json={
+                'leagues': [{'name': 'Fine'}, {'name': 'Rounds', 'num_rounds': num_rounds, 'teams': [{'name': 'A'}]}]
+            })
+            assert response.status_code == 400
+            assert response.get_json()['error'].startswith('League 1:')
+        assert client.get('/api/leagues').get_json() == []
@@ -0,0 +1,81 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class TestLeagueSnapshot:
+    """Tests for the league snapshot endpoint."""
+
+    def test_snapshot_matches_league_relations(self, client, sample_league, sample_prospects):
+        """Test the snapshot carries the same rows as include_relations."""
+        league_id = sample_league['id']
+        full = client.get(f'/api/leagues/{league_id}?include_relations=true').get_json()
+
+        response = client.get(f'/api/leagues/{league_id}/snapshot')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['name'] == full['name']
+        assert data['teams'] == full['teams']
+        assert data['prospects'] == full['prospects']
+        assert data['draft_picks'] == full['draft_picks']
+        assert data['trades'] == []
+
+    def test_snapshot_includes_trades(self, client, sample_league):
+        """Test executed trades are part of the snapshot."""
+        pick = sample_league['draft_picks'][0]
+        client.post('/api/trades', json={
+            'from_team_id': pick['current_team_id'],
+            'to_team_id': sample_league['teams'][1]['id'],
+            'pick_ids': [pick['id']],
+            'league_id': sample_league['id']
+        })
+
+        data = client.get(f'/api/leagues/{sample_league["id"]}/snapshot').get_json()
+
+        assert len(data['trades']) == 1
+        assert data['trades'][0]['pick_ids'] == [pick['id']]
+
+    def test_snapshot_statement_count_is_fixed(self, client, sample_league, sample_prospects, count_statements):
+        """Test the snapshot uses one query per table regardless of size."""
+        with count_statements() as statements:
+            client.get(f'/api/leagues/{sample_league["id"]}/snapshot')
+
+        # One version lookup for the ETag, then one query per table.
+        assert len(statements) == 6
+
+    def test_snapshot_not_found(self, client):
+        """Test snapshot of a non-existent league."""
+        response = client.get('/api/leagues/9999/snapshot')
+
+        assert response.status_code == 404
+
+
+class TestEagerLoading:
+    """Tests for eager loading on relation-heavy read endpoints."""
+
+    def test_team_rosters_do_not_query_per_team(self, client, sample_league, sample_prospects, count_statements):
+        """Test include_roster loads every roster in one extra query."""
+        league_id = sample_league['id']
+        for index, team in enumerate(sample_league['teams']):
+            client.post('/api/draft/execute', json={
+                'prospect_id': sample_prospects[index]['id'],
+                'team_id': team['id'],
+                'league_id': league_id
+            })
+
+        with count_statements() as statements:
+            response = client.get(f'/api/teams?league_id={league_id}&include_roster=true')
+
+        data = response.get_json()
+        assert all(len(team['roster']) == 1 for team in data)
+        assert len(statements) == 3
+
+    def test_league_relations_statement_count_is_fixed(self, client, sample_league, sample_prospects, count_statements):
+        """Test include_relations does not lazy-load per relationship row."""
+        with count_statements() as statements:
+            client.get(f'/api/leagues/{sample_league["id"]}?include_relations=true')
+
+        assert len(statements) == 5
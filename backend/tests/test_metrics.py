@@ -0,0 +1,103 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend import create_app
+from backend.metrics import Metrics
+from backend.models import db
+from backend.tests.conftest import TestConfig
+
+
+def scrape(client):
+    response = client.get('/api/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    samples = {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestMetrics:
+    """Tests for the Prometheus metrics endpoint."""
+
+    def test_requests_are_counted_per_endpoint(self, client, sample_league):
+        """Test requests, latency and SQL statements are labelled by blueprint and endpoint."""
+        for _ in range(3):
+            client.get(f'/api/draft/current?league_id={sample_league["id"]}')
+        client.get('/api/draft/current')
+
+        samples = scrape(client)
+
+        labels = 'blueprint="draft",endpoint="draft.get_current_pick"'
+        assert samples[f'draft_http_requests_total{{{labels},method="GET",status="200"}}'] == 3
+        assert samples[f'draft_http_requests_total{{{labels},method="GET",status="400"}}'] == 1
+        assert samples[f'draft_http_request_duration_seconds_count{{{labels},method="GET"}}'] == 4
+        assert samples[f'draft_http_request_duration_seconds_bucket{{le="+Inf",{labels},method="GET"}}'] == 4
+        assert samples[f'draft_http_request_duration_seconds_sum{{{labels},method="GET"}}'] > 0
+        assert samples[f'draft_sql_statements_total{{{labels}}}'] > 0
+        assert samples[f'draft_sql_duration_seconds_total{{{labels}}}'] > 0
+        assert samples[f'draft_sql_statements_per_request_count{{{labels}}}'] == 4
+
+    def test_statement_counts(self, client):
+        """Test the SQL statements of one request land in their buckets."""
+        client.get('/api/leagues')
+
+        samples = scrape(client)
+
+        labels = 'blueprint="leagues",endpoint="leagues.get_leagues"'
+        assert samples[f'draft_sql_statements_total{{{labels}}}'] == 1
+        assert samples[f'draft_sql_statements_per_request_bucket{{le="0",{labels}}}'] == 0
+        assert samples[f'draft_sql_statements_per_request_bucket{{le="1",{labels}}}'] == 1
+
+    def test_unknown_paths_share_one_series(self, client):
+        """Test unmatched paths are not labelled by path."""
+        client.get('/api/nothing/1')
+        client.get('/api/nothing/2')
+
+        samples = scrape(client)
+
+        assert samples['draft_http_requests_total{blueprint="",endpoint="",method="GET",status="404"}'] == 2
+
+    def test_pool_gauges(self, tmp_path):
+        """Test the connection pool is reported for a database with a queue pool."""
+        class FileConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "metrics.db"}'
+
+        app = create_app(FileConfig)
+        with app.app_context():
+            db.create_all()
+            client = app.test_client()
+            client.get('/api/leagues')
+
+            samples = scrape(client)
+
+            assert samples['draft_db_pool_size'] == 5
+            assert samples['draft_db_pool_checked_out'] >= 0
+            assert 'draft_db_pool_overflow' in samples
+            db.session.remove()
+            db.drop_all()
+
+    def test_disabled(self):
+        """Test metrics can be switched off."""
+        class DisabledConfig(TestConfig):
+            METRICS_ENABLED = False
+
+        app = create_app(DisabledConfig)
+
+        assert 'metrics' not in app.extensions
+        assert app.test_client().get('/api/metrics').status_code == 404
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and backslashes cannot break the exposition format."""
+        metrics = Metrics()
+        metrics.record('bp', 'say "hi"\\', 'GET', 200, 0.002, 0, 0.0)
+
+        text = metrics.render()
+
+        assert 'endpoint="say \\"hi\\"\\\\"' in text
+        assert 'le="0.0025"' in text
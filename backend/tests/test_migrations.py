@@ -0,0 +1,155 @@
+import pytest
+import sys
+import os
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend import create_app
+from backend.config import Config
+from backend.models import db
+
+
+@pytest.fixture
+def migrated_app(tmp_path):
+    """Create an application whose database is built by the migrations."""
+    class MigrationConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "migrations.db"}'
+
+    app = create_app(MigrationConfig)
+    with app.app_context():
+        upgrade()
+        yield app
+        db.session.remove()
+
+
+class TestMigrations:
+    """Tests for the Alembic migration history."""
+
+    def test_migrations_match_models(self, migrated_app):
+        """Test upgrading to head produces exactly the schema the models declare."""
+        with db.engine.connect() as connection:
+            diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+
+        assert diff == []
+
+    def test_hot_path_indexes(self, migrated_app):
+        """Test the draft lookups are backed by indexes."""
+        inspector = inspect(db.engine)
+        indexes = {
+            index['name']: (index['column_names'], bool(index['unique']))
+            for table in ('team', 'prospect', 'draft_pick', 'trade')
+            for index in inspector.get_indexes(table)
+        }
+
+        assert indexes['uq_draft_pick_league_pick_number'] == (['league_id', 'pick_number'], True)
+        assert indexes['ix_draft_pick_league_prospect'] == (['league_id', 'prospect_id'], False)
+        assert indexes['ix_prospect_league_position_drafted'] == (['league_id', 'position', 'is_drafted'], False)
+        assert indexes['ix_prospect_undrafted_rank'] == (['league_id', 'position', 'rank'], False)
+        assert indexes['ix_team_league_draft_order'] == (['league_id', 'draft_order'], False)
+        assert indexes['ix_trade_league_executed_at'] == (['league_id', 'executed_at'], False)
+
+    def test_downgrade_removes_indexes(self, migrated_app):
+        """Test the index revisions can be rolled back to the baseline."""
+        downgrade(revision='5e7836334d8c')
+
+        names = {index['name'] for index in inspect(db.engine).get_indexes('draft_pick')}
+        assert 'uq_draft_pick_league_pick_number' not in names
+
+    def test_duplicate_pick_number_rejected(self, migrated_app):
+        """Test a league cannot hold two picks with the same number."""
+        client = migrated_app.test_client()
+        league_id = client.post('/api/leagues', json={'name': 'Unique', 'num_rounds': 1}).get_json()['id']
+        picks = client.post(f'/api/leagues/{league_id}/initialize', json={
+            'teams': [{'name': 'A'}, {'name': 'B'}]
+        }).get_json()['draft_picks']
+
+        pick = dict(picks[0], id=None, version=0)
+        with pytest.raises(IntegrityError):
+            db.session.execute(db.text(
+                'INSERT INTO draft_pick (pick_number, round_number, pick_in_round, original_team_id, '
+                'current_team_id, is_used, league_id, version) VALUES (:pick_number, :round_number, '
+                ':pick_in_round, :original_team_id, :current_team_id, 0, :league_id, 0)'
+            ), pick)
+        db.session.rollback()
+
+    def test_trade_picks_backfilled(self, migrated_app):
+        """Test trades recorded as JSON are moved into trade_pick and back."""
+        client = migrated_app.test_client()
+        league_id = client.post('/api/leagues', json={'name': 'Legacy', 'num_rounds': 1}).get_json()['id']
+        league = client.post(f'/api/leagues/{league_id}/initialize', json={
+            'teams': [{'name': 'A'}, {'name': 'B'}]
+        }).get_json()
+        first, second = league['draft_picks']
+        downgrade(revision='5cd66ead27e0')
+        db.session.execute(db.text(
+            'INSERT INTO trade (from_team_id, to_team_id, pick_ids, league_id, version, executed_at) '
+            'VALUES (:from_team, :to_team, :pick_ids, :league_id, 1, CURRENT_TIMESTAMP)'
+        ), {
+            'from_team': first['current_team_id'],
+            'to_team': second['current_team_id'],
+            'pick_ids': f'[{second["id"]}, {first["id"]}, {first["id"]}, 9999]',
+            'league_id': league_id
+        })
+        db.session.commit()
+
+        upgrade()
+        history = client.get(f'/api/draft/picks/{first["id"]}/history').get_json()
+        assert history['trades'][0]['pick_ids'] == [first['id'], second['id']]
+        assert history['owners'] == [first['original_team_id'], second['current_team_id']]
+
+        downgrade(revision='5cd66ead27e0')
+        encoded = db.session.execute(db.text('SELECT pick_ids FROM trade')).scalar()
+        assert encoded == f'[{first["id"]}, {second["id"]}]'
+
+    def test_existing_leagues_get_a_snapshot(self, migrated_app):
+        """Test leagues created before the event log start their history from a snapshot."""
+        client = migrated_app.test_client()
+        league_id = client.post('/api/leagues', json={'name': 'Legacy', 'num_rounds': 1}).get_json()['id']
+        picks = client.post(f'/api/leagues/{league_id}/initialize', json={
+            'teams': [{'name': 'A'}, {'name': 'B'}]
+        }).get_json()['draft_picks']
+        downgrade(revision='589fbce46571')
+        db.session.execute(db.text("UPDATE league SET name = 'Renamed'"))
+        db.session.commit()
+
+        upgrade()
+        client.put(f'/api/leagues/{league_id}', json={'name': 'Current'})
+        assert client.post('/api/draft/undo', json={'league_id': league_id}).status_code == 200
+
+        league = client.get(f'/api/leagues/{league_id}').get_json()
+        assert league['name'] == 'Renamed'
+        state = client.get(f'/api/draft/history?league_id={league_id}&sequence=0').get_json()
+        assert [pick['id'] for pick in state['draft_picks']] == [pick['id'] for pick in picks]
+
+
+    def test_existing_leagues_get_total_picks(self, migrated_app):
+        """Test leagues created before total_picks are backfilled from their picks."""
+        client = migrated_app.test_client()
+        league_id = client.post('/api/leagues', json={'name': 'Legacy', 'num_rounds': 2}).get_json()['id']
+        client.post(f'/api/leagues/{league_id}/initialize', json={
+            'teams': [{'name': 'A'}, {'name': 'B'}, {'name': 'C'}]
+        })
+        downgrade(revision='b6e0c8d41a27')
+
+        upgrade()
+        assert client.get(f'/api/leagues/{league_id}').get_json()['total_picks'] == 6
+
+
+class TestInitializeOnce:
+    """Tests for repeated league initialization."""
+
+    def test_initialize_twice(self, client, sample_league):
+        """Test an initialized league cannot be initialized again."""
+        response = client.post(f'/api/leagues/{sample_league["id"]}/initialize', json={
+            'teams': [{'name': 'Late Team'}]
+        })
+
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'League is already initialized'
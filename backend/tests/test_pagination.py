@@ -0,0 +1,152 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def walk_pages(client, url):
+    """Follow X-Next-Cursor headers and collect every page."""
+    pages = []
+    cursor = None
+    while True:
+        page_url = url if cursor is None else f'{url}&cursor={cursor}'
+        response = client.get(page_url)
+        assert response.status_code == 200
+        pages.append(response.get_json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            return pages
+
+
+class TestKeysetPagination:
+    """Tests for cursor pagination on list endpoints."""
+
+    def test_unpaginated_by_default(self, client, sample_league, sample_prospects):
+        """Test omitting limit still returns the whole list."""
+        response = client.get(f'/api/prospects?league_id={sample_league["id"]}')
+
+        assert len(response.get_json()) == 20
+        assert 'X-Next-Cursor' not in response.headers
+
+    def test_prospect_pages_cover_everything_once(self, client, sample_league, sample_prospects):
+        """Test walking the cursor visits each prospect exactly once in id order."""
+        pages = walk_pages(client, f'/api/prospects?league_id={sample_league["id"]}&limit=6')
+
+        assert [len(page) for page in pages] == [6, 6, 6, 2]
+        ids = [prospect['id'] for page in pages for prospect in page]
+        assert ids == sorted(prospect['id'] for prospect in sample_prospects)
+
+    def test_pagination_respects_filters(self, client, sample_league, sample_prospects):
+        """Test filters apply to every page."""
+        pages = walk_pages(client, f'/api/prospects?league_id={sample_league["id"]}&position=QB&limit=2')
+
+        prospects = [prospect for page in pages for prospect in page]
+        assert len(prospects) == 5
+        assert all(prospect['position'] == 'QB' for prospect in prospects)
+
+    def test_link_header(self, client, sample_league, sample_prospects):
+        """Test the next page is advertised in a Link header."""
+        response = client.get(f'/api/prospects?league_id={sample_league["id"]}&limit=5')
+
+        assert response.headers['Link'].startswith('</api/prospects?')
+        assert 'rel="next"' in response.headers['Link']
+
+    def test_trades_newest_first(self, client, sample_league):
+        """Test trade pages walk from the newest trade backwards."""
+        league_id = sample_league['id']
+        teams = sample_league['teams']
+        for pick in sample_league['draft_picks'][:5]:
+            client.post('/api/trades', json={
+                'from_team_id': pick['current_team_id'],
+                'to_team_id': teams[0]['id'] if pick['current_team_id'] != teams[0]['id'] else teams[1]['id'],
+                'pick_ids': [pick['id']],
+                'league_id': league_id
+            })
+
+        pages = walk_pages(client, f'/api/trades?league_id={league_id}&limit=2')
+        trades = [trade for page in pages for trade in page]
+
+        assert len(trades) == 5
+        assert trades == client.get(f'/api/trades?league_id={league_id}').get_json()
+
+    def test_teams_and_leagues(self, client, sample_league):
+        """Test teams and leagues paginate too."""
+        teams = [team for page in walk_pages(client, f'/api/teams?league_id={sample_league["id"]}&limit=3')
+                 for team in page]
+        client.post('/api/leagues', json={'name': 'Second'})
+        leagues = [league for page in walk_pages(client, '/api/leagues?limit=1') for league in page]
+
+        assert [team['draft_order'] for team in teams] == [1, 2, 3, 4]
+        assert [league['name'] for league in leagues] == ['Test League', 'Second']
+
+    def test_invalid_cursor(self, client, sample_league):
+        """Test a tampered cursor is rejected."""
+        response = client.get(f'/api/prospects?league_id={sample_league["id"]}&cursor=not-a-cursor')
+
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Invalid cursor'
+
+    def test_limit_bounds(self, client, sample_league):
+        """Test page sizes outside the configured range are rejected."""
+        response = client.get(f'/api/prospects?league_id={sample_league["id"]}&limit=0')
+
+        assert response.status_code == 400
+
+
+class TestSparseFieldsets:
+    """Tests for the fields parameter on list endpoints."""
+
+    def test_fields_limit_columns(self, client, sample_league, sample_prospects):
+        """Test only the requested fields are returned."""
+        response = client.get(f'/api/prospects?league_id={sample_league["id"]}&fields=name,position')
+
+        data = response.get_json()
+        assert len(data) == 20
+        assert all(set(prospect) == {'name', 'position'} for prospect in data)
+
+    def test_fields_with_pagination(self, client, sample_league, sample_prospects):
+        """Test cursors still work when the key column is not requested."""
+        pages = walk_pages(client, f'/api/prospects?league_id={sample_league["id"]}&fields=name&limit=7')
+
+        names = [prospect['name'] for page in pages for prospect in page]
+        assert len(names) == 20
+        assert len(set(names)) == 20
+
+    def test_unknown_field(self, client, sample_league):
+        """Test unknown fields are rejected."""
+        response = client.get(f'/api/teams?league_id={sample_league["id"]}&fields=name,password')
+
+        assert response.status_code == 400
+        assert 'password' in response.get_json()['error']
+
+    def test_team_roster_with_fields(self, client, sample_league, sample_prospects):
+        """Test rosters can be combined with sparse team fields."""
+        client.post('/api/draft/execute', json={
+            'prospect_id': sample_prospects[0]['id'],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': sample_league['id']
+        })
+
+        data = client.get(
+            f'/api/teams?league_id={sample_league["id"]}&fields=id,name&include_roster=true'
+        ).get_json()
+
+        assert set(data[0]) == {'id', 'name', 'roster'}
+        assert [prospect['id'] for prospect in data[0]['roster']] == [sample_prospects[0]['id']]
+
+    def test_team_roster_without_id_field(self, client, sample_league, sample_prospects):
+        """Test rosters are still attached when fields leaves out the team id."""
+        client.post('/api/draft/execute', json={
+            'prospect_id': sample_prospects[0]['id'],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': sample_league['id']
+        })
+
+        data = client.get(
+            f'/api/teams?league_id={sample_league["id"]}&fields=name&include_roster=true&limit=2'
+        ).get_json()
+
+        assert [set(team) for team in data] == [{'name', 'roster'}] * 2
+        assert [prospect['id'] for prospect in data[0]['roster']] == [sample_prospects[0]['id']]
+        assert data[1]['roster'] == []
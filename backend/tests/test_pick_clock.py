@@ -0,0 +1,223 @@
+import pytest
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend import create_app
+from backend.events import event_bus
+from backend.models import db, League
+from backend.pick_clock import PickClock, pick_clock
+from backend.tests.conftest import TestConfig
+
+
+def start_clock(client, league, seconds=60, action='autopick'):
+    response = client.put(f'/api/leagues/{league["id"]}', json={
+        'pick_clock_seconds': seconds, 'pick_expiry_action': action, 'draft_started': True
+    })
+    assert response.status_code == 200
+    pick_clock().rearm([league['id']])
+
+
+def run_out(league_id):
+    """Move the stored deadline of the pick on the clock into the past."""
+    db.session.execute(
+        League.__table__.update().where(League.id == league_id)
+        .values(pick_deadline=datetime.utcnow() - timedelta(seconds=1))
+    )
+    db.session.commit()
+    clock = pick_clock()
+    clock.rearm([league_id])
+    return clock.due(time.time())
+
+
+class TestScheduler:
+    """Tests for the deadline heap."""
+
+    def test_due_in_deadline_order(self, app):
+        """Test clocks run out in deadline order and only once."""
+        clock = PickClock(app)
+        clock.schedule(1, 1, 30.0)
+        clock.schedule(2, 5, 10.0)
+        clock.schedule(3, 2, 20.0)
+
+        assert clock.due(5.0) == []
+        assert clock.due(20.0) == [(2, 5), (3, 2)]
+        assert clock.due(100.0) == [(1, 1)]
+        assert clock.due(100.0) == []
+        assert len(clock) == 0
+
+    def test_rescheduling_replaces_the_deadline(self, app):
+        """Test a league has one deadline, and cancelled clocks never run out."""
+        clock = PickClock(app)
+        clock.schedule(1, 1, 10.0)
+        clock.schedule(1, 2, 50.0)
+        clock.schedule(2, 1, 20.0)
+        clock.cancel(2)
+
+        assert clock.due(40.0) == []
+        assert clock.deadline(1) == (50.0, 2)
+        assert clock.due(50.0) == [(1, 2)]
+
+    def test_many_clocks(self, app):
+        """Test ten thousand clocks re-armed over and over keep the heap bounded."""
+        clock = PickClock(app)
+        for round_number in range(5):
+            for league_id in range(10000):
+                clock.schedule(league_id, round_number, 1000.0 + league_id + round_number)
+
+        assert len(clock) == 10000
+        assert len(clock._heap) <= 2 * 10000 + 64
+        expired = clock.due(1000.0 + 4 + 99)
+        assert expired == [(league_id, 4) for league_id in range(100)]
+
+
+class TestPickClock:
+    """Tests for running pick clocks against the database."""
+
+    def test_settings_are_validated(self, client, sample_league):
+        """Test the clock length and expiry action are checked."""
+        url = f'/api/leagues/{sample_league["id"]}'
+
+        assert client.put(url, json={'pick_clock_seconds': 0}).status_code == 400
+        assert client.put(url, json={'pick_clock_seconds': '90'}).status_code == 400
+        assert client.put(url, json={'pick_expiry_action': 'trade'}).status_code == 400
+        assert client.post('/api/leagues', json={'name': 'Clocked', 'pick_clock_seconds': -5}).status_code == 400
+
+        league = client.put(url, json={'pick_clock_seconds': 90, 'pick_expiry_action': 'skip'}).get_json()
+        assert (league['pick_clock_seconds'], league['pick_expiry_action']) == (90, 'skip')
+        league = client.post('/api/leagues', json={'name': 'Clocked', 'pick_clock_seconds': 30}).get_json()
+        assert (league['pick_clock_seconds'], league['pick_expiry_action']) == (30, 'autopick')
+
+    def test_deadline_is_stored_and_scheduled(self, client, sample_league):
+        """Test a running draft's pick gets a stored deadline that the clock endpoint reports."""
+        before = datetime.utcnow()
+        start_clock(client, sample_league, seconds=90)
+
+        league = db.session.get(League, sample_league['id'])
+        assert league.pick_deadline_pick == 1
+        assert before + timedelta(seconds=90) <= league.pick_deadline <= datetime.utcnow() + timedelta(seconds=90)
+        assert pick_clock().deadline(sample_league['id'])[1] == 1
+
+        clock = client.get(f'/api/draft/clock?league_id={sample_league["id"]}').get_json()
+        assert clock['pick_number'] == 1
+        assert clock['deadline'] == league.pick_deadline.isoformat()
+        assert 85 < clock['seconds_remaining'] <= 90
+        assert client.get('/api/draft/clock').status_code == 400
+
+    def test_no_clock_until_the_draft_starts(self, client, sample_league):
+        """Test a clock is only scheduled while the draft is running."""
+        client.put(f'/api/leagues/{sample_league["id"]}', json={'pick_clock_seconds': 60})
+        pick_clock().rearm([sample_league['id']])
+
+        assert pick_clock().deadline(sample_league['id']) is None
+        assert client.get(f'/api/draft/clock?league_id={sample_league["id"]}').get_json()['deadline'] is None
+
+    def test_expired_pick_is_auto_drafted(self, client, sample_league, sample_prospects):
+        """Test the best ranked prospect is drafted when the clock runs out, and the next pick gets a clock."""
+        start_clock(client, sample_league)
+        events = event_bus.subscribe(sample_league['id'])
+        try:
+            expired = run_out(sample_league['id'])
+            assert expired == [(sample_league['id'], 1)]
+
+            result, status = pick_clock().expire(*expired[0])
+            assert status == 200
+            assert result['pick']['pick_number'] == 1
+            assert result['prospect']['id'] == sample_prospects[0]['id']
+
+            pick_clock().rearm([sample_league['id']])
+            assert pick_clock().deadline(sample_league['id'])[1] == 2
+            types = [events.get_nowait()['type'] for _ in range(events.qsize())]
+            assert types == ['pick', 'clock']
+        finally:
+            event_bus.unsubscribe(sample_league['id'], events)
+
+    def test_expired_pick_is_skipped(self, client, sample_league, sample_prospects):
+        """Test a league set to skip passes over the pick, which undo gives back."""
+        start_clock(client, sample_league, action='skip')
+
+        result, status = pick_clock().expire(*run_out(sample_league['id'])[0])
+
+        assert status == 200
+        assert result['league']['current_pick_number'] == 2
+        assert client.get(f'/api/draft/picks/{sample_league["draft_picks"][0]["id"]}').get_json()['is_used'] is False
+
+        undone = client.post('/api/draft/undo', json={'league_id': sample_league['id']}).get_json()
+        assert undone['event_type'] == 'skip'
+        assert undone['league']['current_pick_number'] == 1
+
+    def test_pick_made_in_time_wins(self, client, sample_league, sample_prospects):
+        """Test a clock that runs out after its pick was made does nothing."""
+        start_clock(client, sample_league)
+        client.post('/api/draft/autopick', json={'league_id': sample_league['id']})
+
+        assert pick_clock().expire(sample_league['id'], 1) is None
+        assert client.get(f'/api/leagues/{sample_league["id"]}').get_json()['current_pick_number'] == 2
+
+    def test_pausing_clears_the_deadline(self, client, sample_league):
+        """Test pausing the draft stops the clock and resuming gives the pick a fresh one."""
+        start_clock(client, sample_league)
+        client.put(f'/api/leagues/{sample_league["id"]}', json={'draft_started': False})
+        pick_clock().rearm([sample_league['id']])
+
+        assert pick_clock().deadline(sample_league['id']) is None
+        assert db.session.get(League, sample_league['id']).pick_deadline is None
+
+    def test_deadlines_survive_a_restart(self, app, client, sample_league):
+        """Test a new clock reloads the stored deadline instead of starting the pick over."""
+        start_clock(client, sample_league)
+        stored = db.session.get(League, sample_league['id']).pick_deadline
+
+        restarted = PickClock(app)
+        restarted.rearm()
+
+        deadline, pick_number = restarted.deadline(sample_league['id'])
+        assert pick_number == 1
+        assert datetime.utcfromtimestamp(deadline) == stored
+
+    def test_skip_route(self, client, sample_league):
+        """Test the commissioner can skip the pick on the clock."""
+        url = '/api/draft/skip'
+
+        assert client.post(url, json={}).status_code == 400
+        assert client.post(url, json={'league_id': sample_league['id'], 'pick_number': 2}).status_code == 409
+        response = client.post(url, json={'league_id': sample_league['id'], 'pick_number': 1})
+        assert response.status_code == 200
+        assert response.get_json()['league']['current_pick_number'] == 2
+
+
+class TestClockThread:
+    """Tests for the clock thread."""
+
+    def test_pick_is_made_on_time(self, tmp_path):
+        """Test the thread auto-drafts when a pick's clock runs out, then arms the next pick."""
+        class ClockConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "clock.db"}'
+            SIMULATION_WORKERS = 1
+
+        app = create_app(ClockConfig)
+        with app.app_context():
+            db.create_all()
+            db.session.remove()
+        client = app.test_client()
+        league_id = client.post('/api/leagues', json={'name': 'Clocked', 'num_rounds': 2}).get_json()['id']
+        client.post(f'/api/leagues/{league_id}/initialize', json={'teams': [{'name': 'A'}, {'name': 'B'}]})
+        for number in range(1, 5):
+            client.post('/api/prospects', json={'name': f'Prospect {number}', 'position': 'WR', 'league_id': league_id})
+
+        clock = app.extensions['pick_clock']
+        clock.start()
+        try:
+            started = time.time()
+            client.put(f'/api/leagues/{league_id}', json={'pick_clock_seconds': 1, 'draft_started': True})
+            while client.get(f'/api/leagues/{league_id}').get_json()['current_pick_number'] < 2:
+                assert time.time() - started < 5
+                time.sleep(0.05)
+
+            assert 1 <= time.time() - started < 2
+            assert client.get(f'/api/draft/clock?league_id={league_id}').get_json()['pick_number'] == 2
+        finally:
+            clock.stop()
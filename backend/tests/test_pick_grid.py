@@ -0,0 +1,269 @@
+import pytest
+import sys
+import os
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models import db, DraftPick
+from backend.pick_grid import build_pick_grid, materialize_picks, merge_pick_grid
+
+
+@pytest.fixture
+def virtual_league(client):
+    """Create a league with four teams whose three-round snake draft is not stored."""
+    league_id = client.post('/api/leagues', json={
+        'name': 'Virtual League', 'num_rounds': 3, 'virtual_picks': True
+    }).get_json()['id']
+    response = client.post(f'/api/leagues/{league_id}/initialize', json={
+        'teams': [{'name': f'Team {number}'} for number in range(1, 5)]
+    })
+    assert response.status_code == 201
+    return response.get_json()
+
+
+@pytest.fixture
+def virtual_prospects(client, virtual_league):
+    """Create a pool of prospects for the virtual league."""
+    response = client.post('/api/prospects/bulk', json={
+        'league_id': virtual_league['id'],
+        'prospects': [{'name': f'Prospect {number}', 'position': 'WR'} for number in range(1, 13)]
+    })
+    return response.get_json()['prospects']
+
+
+def stored_picks(league_id):
+    return db.session.execute(
+        db.select(DraftPick.pick_number).where(DraftPick.league_id == league_id).order_by(DraftPick.pick_number)
+    ).scalars().all()
+
+
+def picks_of(client, league):
+    return client.get(f'/api/draft/picks?league_id={league["id"]}').get_json()
+
+
+def without_ids(picks):
+    return [{key: value for key, value in pick.items() if key not in ('id', 'league_id')} for pick in picks]
+
+
+class TestMergePickGrid:
+    """Tests for filling in the unstored picks of a grid."""
+
+    def test_grid_matches_stored_rows(self):
+        """Test the computed picks are the picks a stored grid would hold."""
+        rows = build_pick_grid(7, [10, 20, 30], 4, 1, None)
+
+        merged = merge_pick_grid(7, [10, 20, 30], 12, [])
+
+        keys = [key for key in merged[0] if key != 'id']
+        assert [pick['id'] for pick in merged] == [None] * 12
+        assert [[pick[key] for key in keys] for pick in merged] == [[row[key] for key in keys] for row in rows]
+
+    def test_stored_picks_win(self):
+        """Test a stored pick replaces the computed one with the same number."""
+        traded = dict(merge_pick_grid(7, [10, 20], 4, [])[2], id=99, current_team_id=10)
+
+        merged = merge_pick_grid(7, [10, 20], 4, [traded])
+
+        assert merged[2] is traded
+        assert [pick['current_team_id'] for pick in merged] == [10, 20, 10, 10]
+
+
+class TestVirtualLeague:
+    """Tests for leagues that store only their used and traded picks."""
+
+    def test_initialize_stores_no_picks(self, client, virtual_league, sample_league):
+        """Test the virtual league lists the same snake draft a stored league does."""
+        assert virtual_league['virtual_picks'] is True
+        assert virtual_league['total_picks'] == 12
+        assert stored_picks(virtual_league['id']) == []
+
+        def relative(league):
+            order = {team['id']: idx for idx, team in enumerate(league['teams'])}
+            return [(pick['pick_number'], order[pick['current_team_id']]) for pick in league['draft_picks']]
+
+        assert relative(virtual_league) == relative(sample_league)
+        assert picks_of(client, virtual_league) == virtual_league['draft_picks']
+
+    def test_draft_stores_only_used_picks(self, client, virtual_league, virtual_prospects):
+        """Test single and batch picks store their rows and the grid shows them."""
+        current = client.get(f'/api/draft/current?league_id={virtual_league["id"]}').get_json()
+        assert (current['id'], current['pick_number']) == (None, 1)
+
+        response = client.post('/api/draft/execute', json={
+            'league_id': virtual_league['id'], 'prospect_id': virtual_prospects[0]['id'],
+            'team_id': current['current_team_id'], 'pick_number': 1
+        })
+        assert response.status_code == 200
+        assert response.get_json()['pick']['id'] is not None
+
+        response = client.post('/api/draft/execute-batch', json={
+            'league_id': virtual_league['id'],
+            'picks': [{'pick_number': 2, 'prospect_id': virtual_prospects[1]['id']},
+                      {'pick_number': 3, 'prospect_id': virtual_prospects[2]['id']}]
+        })
+        assert response.status_code == 200
+
+        assert stored_picks(virtual_league['id']) == [1, 2, 3]
+        picks = picks_of(client, virtual_league)
+        assert [pick['prospect_id'] for pick in picks[:4]] == [prospect['id'] for prospect in virtual_prospects[:3]] + [None]
+        assert client.get(f'/api/draft/current?league_id={virtual_league["id"]}').get_json()['pick_number'] == 4
+
+    def test_autopick(self, client, virtual_league, virtual_prospects):
+        """Test auto-picks use the computed owner of the pick."""
+        owner = virtual_league['draft_picks'][0]['current_team_id']
+
+        result = client.post('/api/draft/autopick', json={'league_id': virtual_league['id']}).get_json()
+
+        assert result['pick']['current_team_id'] == owner
+        assert result['prospect']['drafted_by'] == owner
+
+    def test_trade_by_pick_number(self, client, virtual_league):
+        """Test a virtual pick is traded by number, stored, and keeps its new owner."""
+        pick = virtual_league['draft_picks'][9]
+        to_team = virtual_league['teams'][0]['id']
+        assert pick['current_team_id'] != to_team
+
+        response = client.post('/api/trades', json={
+            'league_id': virtual_league['id'], 'from_team_id': pick['current_team_id'], 'to_team_id': to_team,
+            'pick_numbers': [pick['pick_number']]
+        })
+
+        assert response.status_code == 201
+        stored = response.get_json()['picks'][0]
+        assert response.get_json()['trade']['pick_ids'] == [stored['id']]
+        assert stored_picks(virtual_league['id']) == [10]
+        assert picks_of(client, virtual_league)[9] == stored
+        assert stored['current_team_id'] == to_team
+
+    def test_trade_validation(self, client, virtual_league, sample_league):
+        """Test picks must be named, belong to the team and exist."""
+        teams = virtual_league['teams']
+        url = '/api/trades'
+
+        assert client.post(url, json={
+            'league_id': virtual_league['id'], 'from_team_id': teams[0]['id'], 'to_team_id': teams[1]['id']
+        }).status_code == 400
+        assert client.post(url, json={
+            'league_id': virtual_league['id'], 'from_team_id': teams[0]['id'], 'to_team_id': teams[1]['id'],
+            'pick_numbers': [2]
+        }).status_code == 400
+        assert client.post(url, json={
+            'league_id': virtual_league['id'], 'from_team_id': teams[0]['id'], 'to_team_id': teams[1]['id'],
+            'pick_numbers': [13]
+        }).status_code == 404
+
+        # Stored grids can be traded by number too
+        pick = sample_league['draft_picks'][1]
+        response = client.post(url, json={
+            'league_id': sample_league['id'], 'from_team_id': pick['current_team_id'],
+            'to_team_id': sample_league['teams'][0]['id'], 'pick_numbers': [2]
+        })
+        assert response.get_json()['trade']['pick_ids'] == [pick['id']]
+
+        # A pick named twice, by id and by number or twice by either, is rejected
+        pick = sample_league['draft_picks'][2]
+        for named in ({'pick_ids': [pick['id']], 'pick_numbers': [3]}, {'pick_ids': [pick['id']] * 2},
+                      {'pick_numbers': [3, 3]}):
+            response = client.post(url, json=dict(
+                named, league_id=sample_league['id'], from_team_id=pick['current_team_id'],
+                to_team_id=sample_league['teams'][0]['id']
+            ))
+            assert response.status_code == 400
+            assert response.get_json()['error'] == 'A pick is listed more than once'
+
+    def test_evaluate_by_pick_number(self, client, virtual_league, virtual_prospects):
+        """Test candidate trades value and check unstored picks named by number."""
+        client.post('/api/draft/autopick', json={'league_id': virtual_league['id']})
+        team_a, team_b = virtual_league['teams'][:2]
+        trade = {'from_team_id': team_a['id'], 'to_team_id': team_b['id']}
+
+        results = client.post('/api/trades/evaluate', json={'league_id': virtual_league['id'], 'trades': [
+            dict(trade, pick_numbers=[8], return_pick_numbers=[2, 7]),
+            dict(trade, pick_numbers=[1]),
+            dict(trade, pick_numbers=[2]),
+            dict(trade, return_pick_numbers=[13])
+        ]}).get_json()
+
+        assert results[0]['feasible'] is True
+        assert results[0]['from_value'] < results[0]['to_value']
+        assert [result['error'] for result in results[1:]] == [
+            'Pick number 1 has already been used',
+            f'Pick number 2 does not belong to team {team_a["id"]}',
+            'Pick number 13 not found'
+        ]
+
+    def test_undo_restores_the_computed_pick(self, client, virtual_league, virtual_prospects):
+        """Test undoing a pick that stored its row leaves the pick as it was."""
+        client.post('/api/draft/autopick', json={'league_id': virtual_league['id']})
+        before = virtual_league['draft_picks'][0]
+
+        response = client.post('/api/draft/undo', json={'league_id': virtual_league['id']})
+
+        assert response.status_code == 200
+        assert without_ids(picks_of(client, virtual_league)) == without_ids(virtual_league['draft_picks'])
+        assert picks_of(client, virtual_league)[0]['current_team_id'] == before['current_team_id']
+        assert client.post('/api/draft/redo', json={'league_id': virtual_league['id']}).status_code == 200
+        assert picks_of(client, virtual_league)[0]['is_used'] is True
+
+    def test_history_before_a_pick(self, client, virtual_league, virtual_prospects):
+        """Test the league as of an earlier event shows later stored picks untouched."""
+        pick = virtual_league['draft_picks'][5]
+        client.post('/api/trades', json={
+            'league_id': virtual_league['id'], 'from_team_id': pick['current_team_id'],
+            'to_team_id': virtual_league['teams'][0]['id'], 'pick_numbers': [6]
+        })
+        client.post('/api/draft/autopick', json={'league_id': virtual_league['id']})
+
+        history = client.get(f'/api/draft/history?league_id={virtual_league["id"]}&sequence=1').get_json()
+
+        assert history['draft_picks'][0]['is_used'] is False
+        assert history['draft_picks'][5]['current_team_id'] == virtual_league['teams'][0]['id']
+        original = client.get(f'/api/draft/history?league_id={virtual_league["id"]}&sequence=0').get_json()
+        assert without_ids(original['draft_picks']) == without_ids(virtual_league['draft_picks'])
+
+    def test_serialized_leagues_list_every_pick(self, client, virtual_league, virtual_prospects):
+        """Test the snapshot, changes feed and full league all merge the grid."""
+        client.post('/api/draft/autopick', json={'league_id': virtual_league['id']})
+        picks = picks_of(client, virtual_league)
+        league_id = virtual_league['id']
+
+        snapshot = client.get(f'/api/leagues/{league_id}/snapshot').get_json()
+        full = client.get(f'/api/leagues/{league_id}?include_relations=true').get_json()
+        changes = client.get(f'/api/leagues/{league_id}/changes?since=0').get_json()
+        latest = client.get(f'/api/leagues/{league_id}/changes?since={full["version"] - 1}').get_json()
+
+        assert snapshot['draft_picks'] == picks
+        assert full['draft_picks'] == picks
+        assert changes['draft_picks'] == picks
+        assert [pick['pick_number'] for pick in latest['draft_picks']] == [1]
+
+    def test_materialize_is_idempotent(self, app, virtual_league):
+        """Test storing a stored pick again leaves it alone."""
+        league_id = virtual_league['id']
+        now = datetime.utcnow()
+        materialize_picks(league_id, 12, [3, 0, 13], 5, now)
+        db.session.execute(
+            DraftPick.__table__.update().where(DraftPick.league_id == league_id).values(is_used=True)
+        )
+        materialize_picks(league_id, 12, [3, 4], 6, now)
+
+        rows = db.session.execute(
+            db.select(DraftPick.pick_number, DraftPick.is_used, DraftPick.version)
+            .where(DraftPick.league_id == league_id).order_by(DraftPick.pick_number)
+        ).all()
+        assert [tuple(row) for row in rows] == [(3, True, 5), (4, False, 6)]
+
+    def test_dynasty_league(self, client):
+        """Test a league with many future rounds stores nothing until picks are made."""
+        league_id = client.post('/api/leagues/batch', json={'leagues': [{
+            'name': 'Dynasty', 'num_rounds': 100, 'virtual_picks': True,
+            'teams': [{'name': f'Team {number}'} for number in range(12)]
+        }]}).get_json()['leagues'][0]['id']
+
+        picks = client.get(f'/api/draft/picks?league_id={league_id}').get_json()
+
+        assert len(picks) == 1200
+        assert picks[-1]['round_number'] == 100
+        assert stored_picks(league_id) == []
+        assert client.post('/api/leagues', json={'name': 'Bad', 'virtual_picks': 'yes'}).status_code == 400
@@ -0,0 +1,73 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models import db, TradePick
+
+
+def trade(client, league, from_team, to_team, picks):
+    response = client.post('/api/trades', json={
+        'from_team_id': from_team['id'],
+        'to_team_id': to_team['id'],
+        'pick_ids': [pick['id'] for pick in picks],
+        'league_id': league['id']
+    })
+    assert response.status_code == 201
+    return response.get_json()['trade']
+
+
+class TestPickHistory:
+    """Tests for the trade history of a pick."""
+
+    def test_trade_chain(self, client, sample_league):
+        """Test a pick traded twice lists both trades in order and its owners."""
+        team_a, team_b, team_c = sample_league['teams'][:3]
+        pick = sample_league['draft_picks'][0]
+        other = sample_league['draft_picks'][1]
+        first = trade(client, sample_league, team_a, team_b, [pick])
+        trade(client, sample_league, team_b, team_c, [other])
+        second = trade(client, sample_league, team_b, team_c, [pick])
+
+        history = client.get(f'/api/draft/picks/{pick["id"]}/history').get_json()
+
+        assert history['pick']['current_team_id'] == team_c['id']
+        assert [entry['id'] for entry in history['trades']] == [first['id'], second['id']]
+        assert history['owners'] == [team_a['id'], team_b['id'], team_c['id']]
+
+    def test_untraded_pick(self, client, sample_league):
+        """Test a pick that never moved has an empty history."""
+        pick = sample_league['draft_picks'][3]
+
+        history = client.get(f'/api/draft/picks/{pick["id"]}/history').get_json()
+
+        assert history['trades'] == []
+        assert history['owners'] == [pick['original_team_id']]
+        assert client.get('/api/draft/picks/9999/history').status_code == 404
+
+    def test_trade_rows(self, client, sample_league):
+        """Test a trade stores one association row per pick and reports them sorted."""
+        team_a, team_b = sample_league['teams'][:2]
+        picks = [pick for pick in sample_league['draft_picks'] if pick['current_team_id'] == team_a['id']]
+
+        created = trade(client, sample_league, team_a, team_b, picks[::-1])
+
+        assert created['pick_ids'] == sorted(pick['id'] for pick in picks)
+        rows = db.session.execute(db.select(TradePick.pick_id).where(TradePick.trade_id == created['id']))
+        assert sorted(rows.scalars()) == created['pick_ids']
+
+        client.delete(f'/api/trades/{created["id"]}')
+        assert db.session.execute(db.select(db.func.count()).select_from(TradePick)).scalar() == 0
+
+    def test_history_is_an_indexed_lookup(self, client, sample_league, count_statements):
+        """Test the history query reads trades through the pick index."""
+        pick = sample_league['draft_picks'][0]
+        trade(client, sample_league, sample_league['teams'][0], sample_league['teams'][1], [pick])
+
+        with count_statements() as statements:
+            client.get(f'/api/draft/picks/{pick["id"]}/history')
+
+        statement, parameters = statements[-1]
+        plan = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+        assert any('ix_trade_pick_pick_trade' in row[-1] for row in plan)
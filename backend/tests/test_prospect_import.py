@@ -0,0 +1,171 @@
+import pytest
+import sys
+import os
+import io
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+CSV_BODY = (
+    'name,position,college\n'
+    'Alpha Back,RB,State\n'
+    'Bravo Catcher,WR,\n'
+    ',QB,Missing Name\n'
+    'Charlie Thrower,QB,Tech\n'
+)
+
+
+class TestProspectImport:
+    """Tests for the streaming prospect import endpoint."""
+
+    def test_import_csv(self, client, sample_league):
+        """Test CSV rows are inserted and incomplete rows skipped."""
+        league_id = sample_league['id']
+        response = client.post(
+            f'/api/prospects/import?league_id={league_id}',
+            data=CSV_BODY,
+            content_type='text/csv'
+        )
+
+        assert response.status_code == 201
+        data = response.get_json()
+        assert data['inserted'] == 3
+        assert data['skipped'] == 1
+        assert data['errors'] == 0
+
+        prospects = client.get(f'/api/prospects?league_id={league_id}').get_json()
+        assert sorted(p['name'] for p in prospects) == ['Alpha Back', 'Bravo Catcher', 'Charlie Thrower']
+        assert all(p['is_drafted'] is False for p in prospects)
+
+    def test_import_ndjson_reports_errors(self, client, sample_league):
+        """Test malformed NDJSON lines are counted without aborting the import."""
+        body = '\n'.join([
+            json.dumps({'name': 'Delta End', 'position': 'TE', 'college': 'North'}),
+            '{not json',
+            json.dumps(['a', 'list']),
+            '',
+            json.dumps({'name': 'Echo Kicker', 'position': 'K'}),
+            json.dumps({'name': 'X' * 101, 'position': 'QB'}),
+        ])
+        response = client.post(
+            f'/api/prospects/import?league_id={sample_league["id"]}',
+            data=body,
+            content_type='application/x-ndjson'
+        )
+
+        data = response.get_json()
+        assert data['inserted'] == 2
+        assert data['errors'] == 3
+        assert [sample['line'] for sample in data['error_samples']] == [2, 3, 6]
+
+    def test_import_rejects_out_of_range_ranks(self, client, sample_league):
+        """Test ranks too large for the column are reported per line."""
+        body = '\n'.join([
+            '{"name": "Foxtrot Back", "position": "RB", "rank": Infinity}',
+            '{"name": "Golf Back", "position": "RB", "rank": 1e300}',
+            f'{{"name": "Hotel Back", "position": "RB", "rank": {10 ** 400}}}',
+            json.dumps({'name': 'India Back', 'position': 'RB', 'rank': 2 ** 31}),
+            json.dumps({'name': 'Juliet Back', 'position': 'RB', 'rank': 2 ** 31 - 1}),
+        ])
+        response = client.post(
+            f'/api/prospects/import?league_id={sample_league["id"]}',
+            data=body,
+            content_type='application/x-ndjson'
+        )
+
+        data = response.get_json()
+        assert response.status_code == 201
+        assert data['inserted'] == 1
+        assert [sample['line'] for sample in data['error_samples']] == [1, 2, 3, 4]
+
+        body = 'name,position,rank\nKilo Back,RB,Infinity\nLima Back,RB,1e300\nMike Back,RB,' + str(10 ** 400) + '\n'
+        data = client.post(
+            f'/api/prospects/import?league_id={sample_league["id"]}&format=csv',
+            data=body
+        ).get_json()
+        assert data['inserted'] == 0
+        assert data['errors'] == 3
+
+    def test_import_inserts_in_chunks(self, client, sample_league, count_statements):
+        """Test rows are written with one bulk insert per chunk."""
+        body = 'name,position\n' + ''.join(f'Player {n},WR\n' for n in range(5))
+
+        with count_statements() as statements:
+            response = client.post(
+                f'/api/prospects/import?league_id={sample_league["id"]}&format=csv&chunk_size=2',
+                data=body
+            )
+
+        inserts = [statement for statement, _ in statements if statement.startswith('INSERT INTO prospect')]
+        assert response.get_json()['inserted'] == 5
+        assert len(inserts) == 3
+
+    def test_import_bumps_version_once(self, client, sample_league):
+        """Test an import is a single change in the league's history."""
+        league_id = sample_league['id']
+        version = client.get(f'/api/leagues/{league_id}').get_json()['version']
+
+        data = client.post(
+            f'/api/prospects/import?league_id={league_id}&format=csv',
+            data=CSV_BODY
+        ).get_json()
+
+        assert data['version'] == version + 1
+        changes = client.get(f'/api/leagues/{league_id}/changes?since={version}').get_json()
+        assert len(changes['prospects']) == 3
+
+    def test_import_writes_after_the_upload(self, client, sample_league, count_statements):
+        """Test nothing is written, and no write lock taken, until the whole body has arrived."""
+        body = ('name,position\n' + ''.join(f'Player {n},WR\n' for n in range(2000))).encode()
+
+        class Upload(io.BytesIO):
+            writes_before_end = None
+
+            def readinto(self, buffer):
+                read = super().readinto(buffer)
+                if self.tell() == len(body) and self.writes_before_end is None:
+                    self.writes_before_end = [s for s, _ in statements if not s.startswith('SELECT')]
+                return read
+
+        upload = Upload(body)
+        with count_statements() as statements:
+            response = client.post(
+                f'/api/prospects/import?league_id={sample_league["id"]}&format=csv&chunk_size=100',
+                input_stream=upload,
+                headers={'Content-Length': str(len(body))}
+            )
+
+        assert response.get_json()['inserted'] == 2000
+        assert upload.writes_before_end == []
+
+    def test_import_rejects_other_encodings(self, client, sample_league):
+        """Test a body that is not UTF-8 is rejected as a whole."""
+        league_id = sample_league['id']
+        version = client.get(f'/api/leagues/{league_id}').get_json()['version']
+        body = 'name,position\n' + ''.join(f'Player {n},WR\n' for n in range(5)) + 'Jos\xe9 Pe\xf1a,QB\n'
+
+        response = client.post(
+            f'/api/prospects/import?league_id={league_id}&format=csv&chunk_size=2',
+            data=body.encode('latin-1')
+        )
+
+        assert response.status_code == 400
+        assert client.get(f'/api/prospects?league_id={league_id}').get_json() == []
+        assert client.get(f'/api/leagues/{league_id}').get_json()['version'] == version
+
+    def test_import_requires_format(self, client, sample_league):
+        """Test an unknown body format is rejected."""
+        response = client.post(
+            f'/api/prospects/import?league_id={sample_league["id"]}',
+            data=CSV_BODY,
+            content_type='text/plain'
+        )
+
+        assert response.status_code == 400
+
+    def test_import_league_not_found(self, client):
+        """Test importing into a non-existent league."""
+        response = client.post('/api/prospects/import?league_id=9999&format=csv', data=CSV_BODY)
+
+        assert response.status_code == 404
@@ -0,0 +1,175 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models import db, Prospect
+from backend.search import ProspectIndex
+from backend.versioning import bump_league_version
+
+
+PROSPECTS = [
+    {'name': 'Justin Jefferson', 'position': 'WR', 'college': 'LSU'},
+    {'name': 'Jalen Hurts', 'position': 'QB', 'college': 'Oklahoma'},
+    {'name': 'Josh Allen', 'position': 'QB', 'college': 'Wyoming'},
+    {'name': 'Jordan Addison', 'position': 'WR', 'college': 'USC'},
+    {'name': 'Bijan Robinson', 'position': 'RB', 'college': 'Texas'},
+    {'name': 'Jaxon Smith-Njigba', 'position': 'WR', 'college': 'Ohio State'},
+    {'name': 'CJ Stroud', 'position': 'QB', 'college': 'Ohio State'},
+    {'name': "Ja'Marr Chase", 'position': 'WR', 'college': 'LSU'},
+    {'name': 'Chase Brown', 'position': 'RB', 'college': 'Illinois'},
+    {'name': 'Malik Núñez', 'position': 'TE', 'college': 'Jacksonville State'},
+]
+
+
+@pytest.fixture
+def catalog(client, sample_league):
+    """Create a small searchable catalog and return prospect ids by name."""
+    response = client.post('/api/prospects/bulk', json={
+        'league_id': sample_league['id'],
+        'prospects': PROSPECTS
+    })
+    return {prospect['name']: prospect['id'] for prospect in response.get_json()['prospects']}
+
+
+def search(client, league, query, **params):
+    params = ''.join(f'&{key}={value}' for key, value in params.items())
+    response = client.get(f'/api/prospects/search?league_id={league["id"]}&q={query}{params}')
+    assert response.status_code == 200
+    return [prospect['name'] for prospect in response.get_json()]
+
+
+class TestProspectSearch:
+    """Tests for ranked prospect search."""
+
+    def test_prefix_typeahead(self, client, sample_league, catalog):
+        """Test every keystroke of a name finds it, best match first."""
+        for end in range(1, len('Jalen')):
+            assert 'Jalen Hurts' in search(client, sample_league, 'Jalen'[:end])
+
+        assert search(client, sample_league, 'ja') == [
+            'Ja\'Marr Chase', 'Jalen Hurts', 'Jaxon Smith-Njigba', 'Malik Núñez'
+        ]
+
+    def test_name_beats_college(self, client, sample_league, catalog):
+        """Test a first name match ranks above a last name match."""
+        assert search(client, sample_league, 'chase') == ['Chase Brown', "Ja'Marr Chase"]
+        assert search(client, sample_league, 'oklahoma') == ['Jalen Hurts']
+
+    def test_tokens_across_fields(self, client, sample_league, catalog):
+        """Test every query word must match the name or the college."""
+        assert search(client, sample_league, 'ohio st') == ['CJ Stroud', 'Jaxon Smith-Njigba']
+        assert search(client, sample_league, 'stroud ohio') == ['CJ Stroud']
+        assert search(client, sample_league, 'j lsu') == ['Ja\'Marr Chase', 'Justin Jefferson']
+
+    def test_phrase_prefix(self, client, sample_league, catalog):
+        """Test a query that starts the full name outranks scattered matches."""
+        assert search(client, sample_league, 'josh a')[0] == 'Josh Allen'
+
+    def test_fuzzy(self, client, sample_league, catalog):
+        """Test misspelled names are found when nothing matches exactly."""
+        assert search(client, sample_league, 'jeferson') == ['Justin Jefferson']
+        assert search(client, sample_league, 'robinsen') == ['Bijan Robinson']
+
+    def test_accents_and_punctuation(self, client, sample_league, catalog):
+        """Test accents and apostrophes do not have to be typed."""
+        assert search(client, sample_league, 'nunez') == ['Malik Núñez']
+        assert search(client, sample_league, 'jamarr') == ["Ja'Marr Chase"]
+        assert search(client, sample_league, 'smith njigba') == ['Jaxon Smith-Njigba']
+
+    def test_filters_and_limit(self, client, sample_league, catalog):
+        """Test position filtering and the result limit."""
+        assert search(client, sample_league, 'j', position='QB') == ['Jalen Hurts', 'Josh Allen']
+        assert len(search(client, sample_league, 'j', limit=2)) == 2
+
+    def test_results_are_prospects(self, client, sample_league, catalog):
+        """Test results carry the prospect fields and a score."""
+        response = client.get(f'/api/prospects/search?league_id={sample_league["id"]}&q=hurts')
+
+        result = response.get_json()[0]
+        assert result['id'] == catalog['Jalen Hurts']
+        assert result['position'] == 'QB'
+        assert result['score'] > 0
+
+    def test_validation(self, client, sample_league):
+        """Test missing leagues and bad limits are rejected."""
+        assert client.get('/api/prospects/search?q=a').status_code == 400
+        assert client.get('/api/prospects/search?league_id=9999&q=a').status_code == 404
+        response = client.get(f'/api/prospects/search?league_id={sample_league["id"]}&q=a&limit=0')
+        assert response.status_code == 400
+
+    def test_empty_query(self, client, sample_league, catalog):
+        """Test a query without words returns nothing."""
+        assert search(client, sample_league, '%20-') == []
+
+
+class TestSearchIndexUpdates:
+    """Tests for keeping the search index in step with writes."""
+
+    def test_create_update_delete(self, client, sample_league, catalog):
+        """Test the index follows prospect writes."""
+        assert search(client, sample_league, 'kelce') == []
+
+        prospect = client.post('/api/prospects', json={
+            'name': 'Travis Kelce', 'position': 'TE', 'league_id': sample_league['id']
+        }).get_json()
+        assert search(client, sample_league, 'kelce') == ['Travis Kelce']
+
+        client.put(f'/api/prospects/{prospect["id"]}', json={'name': 'Jason Kelce'})
+        assert search(client, sample_league, 'travis') == []
+        assert search(client, sample_league, 'kelce') == ['Jason Kelce']
+
+        client.delete(f'/api/prospects/{prospect["id"]}')
+        assert search(client, sample_league, 'kelce') == []
+
+    def test_drafted_prospects_rank_lower(self, client, sample_league, catalog):
+        """Test drafted prospects sink below equally good available matches and can be filtered out."""
+        client.post('/api/draft/execute', json={
+            'prospect_id': catalog["Ja'Marr Chase"],
+            'team_id': sample_league['teams'][0]['id'],
+            'league_id': sample_league['id']
+        })
+
+        assert search(client, sample_league, 'ja') == [
+            'Jalen Hurts', 'Jaxon Smith-Njigba', "Ja'Marr Chase", 'Malik Núñez'
+        ]
+        assert "Ja'Marr Chase" not in search(client, sample_league, 'ja', is_drafted='false')
+
+    def test_import(self, client, sample_league, catalog):
+        """Test imported prospects are searchable."""
+        search(client, sample_league, 'a')
+        client.post(
+            f'/api/prospects/import?league_id={sample_league["id"]}&format=csv',
+            data='name,position,college\nPuka Nacua,WR,BYU\n'
+        )
+
+        assert search(client, sample_league, 'byu') == ['Puka Nacua']
+
+    def test_writes_from_other_workers(self, app, client, sample_league, catalog):
+        """Test rows written outside this process are picked up by version."""
+        search(client, sample_league, 'a')
+        version = bump_league_version(sample_league['id'])
+        db.session.execute(Prospect.__table__.insert(), [{
+            'name': 'Sam LaPorta', 'position': 'TE', 'college': 'Iowa', 'is_drafted': False,
+            'league_id': sample_league['id'], 'version': version
+        }])
+        db.session.commit()
+
+        assert search(client, sample_league, 'laporta') == ['Sam LaPorta']
+
+
+class TestProspectIndex:
+    """Tests for the in-memory index itself."""
+
+    def test_remove_cleans_up(self):
+        """Test removing every prospect leaves an empty index."""
+        index = ProspectIndex(None)
+        for prospect_id, prospect in enumerate(PROSPECTS, 1):
+            index.add(dict(prospect, id=prospect_id, is_drafted=False))
+        for prospect_id in range(1, len(PROSPECTS) + 1):
+            index.remove(prospect_id)
+
+        assert len(index) == 0
+        assert index.search('j', 10) == []
+        assert not index._vocabulary and not index._trigrams and not index._first
@@ -0,0 +1,149 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.simulation import Simulator, draft_scores
+
+
+@pytest.fixture
+def board(client, sample_league):
+    """Rank twenty prospects for the sample league and return their ids in rank order."""
+    response = client.post('/api/prospects/bulk', json={
+        'league_id': sample_league['id'],
+        'prospects': [
+            {'name': f'Prospect {rank}', 'position': ('QB', 'RB', 'WR', 'TE')[rank % 4], 'rank': rank}
+            for rank in range(1, 21)
+        ]
+    })
+    return [prospect['id'] for prospect in response.get_json()['prospects']]
+
+
+@pytest.fixture
+def inline_simulator(app):
+    """Run simulations in the test process."""
+    app.extensions['simulation'] = Simulator(max_workers=1, chunk_size=100)
+
+
+def simulate(client, league, team, **fields):
+    return client.post(f'/api/leagues/{league["id"]}/simulate', json=dict(fields, team_id=team['id']))
+
+
+def availability(response):
+    assert response.status_code == 200
+    return {prospect['prospect_id']: prospect['availability'] for prospect in response.get_json()['prospects']}
+
+
+@pytest.mark.usefixtures('inline_simulator')
+class TestSimulateDraft:
+    """Tests for mock-draft availability at a team's upcoming picks."""
+
+    def test_without_noise_follows_rank(self, client, sample_league, board):
+        """Test a noiseless draft takes prospects strictly in rank order."""
+        team = sample_league['teams'][0]
+
+        response = simulate(client, sample_league, team, noise=0, simulations=10)
+
+        assert [pick['pick_number'] for pick in response.get_json()['picks']] == [1, 8, 9]
+        result = availability(response)
+        assert [result[prospect_id] for prospect_id in board[6:9]] == [[1, 0, 0], [1, 1, 0], [1, 1, 1]]
+
+    def test_probabilities(self, client, sample_league, board):
+        """Test availability falls from pick to pick and with rank."""
+        result = availability(simulate(client, sample_league, sample_league['teams'][1], simulations=2000, seed=3))
+
+        for values in result.values():
+            assert all(0 <= later <= earlier <= 1 for earlier, later in zip(values, values[1:]))
+        assert result[board[0]][-1] < 0.01
+        assert result[board[-1]][-1] > 0.95
+        assert result[board[3]][0] < result[board[9]][0]
+
+    def test_seeded_runs_repeat(self, client, sample_league, board):
+        """Test the same seed gives the same answer."""
+        team = sample_league['teams'][2]
+
+        first = availability(simulate(client, sample_league, team, seed=11))
+        assert availability(simulate(client, sample_league, team, seed=11)) == first
+
+    def test_current_draft_state(self, client, sample_league, board):
+        """Test drafted prospects and traded picks are taken into account."""
+        team = sample_league['teams'][0]
+        client.post('/api/draft/execute', json={
+            'prospect_id': board[0], 'team_id': team['id'], 'league_id': sample_league['id']
+        })
+        second_pick = sample_league['draft_picks'][1]
+        client.post('/api/trades', json={
+            'from_team_id': second_pick['current_team_id'],
+            'to_team_id': team['id'],
+            'pick_ids': [second_pick['id']],
+            'league_id': sample_league['id']
+        })
+
+        response = simulate(client, sample_league, team, noise=0)
+
+        assert [pick['pick_number'] for pick in response.get_json()['picks']] == [2, 8, 9]
+        result = availability(response)
+        assert board[0] not in result
+        assert result[board[1]] == [1, 0, 0]
+
+    def test_limit_and_unranked(self, client, sample_league, board):
+        """Test the response lists the best ranked prospects first, unranked ones last."""
+        client.post('/api/prospects', json={'name': 'Walk-on', 'position': 'K', 'league_id': sample_league['id']})
+
+        response = simulate(client, sample_league, sample_league['teams'][0], limit=25)
+
+        prospects = response.get_json()['prospects']
+        assert [prospect['rank'] for prospect in prospects] == list(range(1, 21)) + [None]
+        response = simulate(client, sample_league, sample_league['teams'][0], limit=5)
+        assert len(response.get_json()['prospects']) == 5
+
+    def test_validation(self, client, sample_league, board):
+        """Test bad options, unknown leagues and teams from other leagues."""
+        team = sample_league['teams'][0]
+
+        assert client.post(f'/api/leagues/{sample_league["id"]}/simulate', json={}).status_code == 400
+        assert simulate(client, sample_league, team, simulations=0).status_code == 400
+        assert simulate(client, sample_league, team, simulations=10 ** 9).status_code == 400
+        assert simulate(client, sample_league, team, noise=-1).status_code == 400
+        assert simulate(client, sample_league, {'id': 9999}).status_code == 404
+        assert simulate(client, {'id': 9999}, team).status_code == 404
+
+    def test_no_upcoming_picks(self, client, sample_league, board):
+        """Test a team that has traded away its remaining picks."""
+        team = sample_league['teams'][0]
+        picks = [pick['id'] for pick in sample_league['draft_picks'] if pick['current_team_id'] == team['id']]
+        client.post('/api/trades', json={
+            'from_team_id': team['id'],
+            'to_team_id': sample_league['teams'][1]['id'],
+            'pick_ids': picks,
+            'league_id': sample_league['id']
+        })
+
+        assert simulate(client, sample_league, team).status_code == 400
+
+
+class TestSimulator:
+    """Tests for the simulation engine."""
+
+    def test_unranked_after_ranked(self):
+        """Test unranked prospects are scored after every ranked one."""
+        ranks, deviations = draft_scores([3, float('inf'), 1, float('inf')], 0.5)
+
+        assert ranks.tolist() == [3, 4, 1, 5]
+        assert deviations.tolist() == [4, 4.5, 3, 5]
+
+    def test_process_pool_matches_inline(self):
+        """Test chunks run in worker processes give the same result as in process."""
+        ranks, deviations = draft_scores(np.arange(1, 101), 0.2)
+        pooled = Simulator(max_workers=2, chunk_size=250)
+        try:
+            result = pooled.run(ranks, deviations, [0, 11, 12, 35], 1000, seed=5, timeout=60)
+        finally:
+            pooled.shutdown()
+
+        expected = Simulator(max_workers=1, chunk_size=250).run(ranks, deviations, [0, 11, 12, 35], 1000, seed=5)
+        assert np.array_equal(result, expected)
+        assert result.shape == (4, 100)
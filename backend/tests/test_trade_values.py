@@ -0,0 +1,180 @@
+import pytest
+import sys
+import os
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.trade_values import CHART_DECAY, CHART_TOP
+
+
+def value(pick_number):
+    return CHART_TOP * CHART_DECAY ** (pick_number - 1)
+
+
+def picks_of(league, team):
+    """Pick ids owned by a team, keyed by pick number."""
+    return {pick['pick_number']: pick['id'] for pick in league['draft_picks'] if pick['current_team_id'] == team['id']}
+
+
+def evaluate(client, league, trades, **fields):
+    return client.post('/api/trades/evaluate', json=dict(fields, league_id=league['id'], trades=trades))
+
+
+class TestValueChart:
+    """Tests for the per-pick value chart."""
+
+    def test_default_chart(self, client, sample_league):
+        """Test every pick of the league gets a value, best pick first."""
+        response = client.get(f'/api/trades/value-chart?league_id={sample_league["id"]}')
+
+        chart = response.get_json()
+        assert [entry['pick_number'] for entry in chart] == list(range(1, 13))
+        assert chart[0]['value'] == CHART_TOP
+        assert all(later['value'] < earlier['value'] for earlier, later in zip(chart, chart[1:]))
+
+    def test_unknown_league(self, client):
+        """Test the chart of a missing league."""
+        assert client.get('/api/trades/value-chart?league_id=9999').status_code == 404
+        assert client.get('/api/trades/value-chart').status_code == 400
+
+
+class TestEvaluateTrades:
+    """Tests for batch trade evaluation."""
+
+    def test_values_both_sides(self, client, sample_league):
+        """Test each side is valued from the chart and the difference favours the from team."""
+        team_a, team_b = sample_league['teams'][:2]
+        a_picks, b_picks = picks_of(sample_league, team_a), picks_of(sample_league, team_b)
+
+        response = evaluate(client, sample_league, [{
+            'from_team_id': team_a['id'],
+            'to_team_id': team_b['id'],
+            'pick_ids': [a_picks[1]],
+            'return_pick_ids': [b_picks[2], b_picks[7]]
+        }])
+
+        assert response.status_code == 200
+        result = response.get_json()[0]
+        assert result['from_value'] == round(value(1), 2)
+        assert result['to_value'] == round(value(2) + value(7), 2)
+        assert result['difference'] == round(value(2) + value(7) - value(1), 2)
+        assert result['feasible'] is True
+        assert result['fair'] is False
+
+    def test_fairness(self, client, sample_league):
+        """Test close trades are marked fair."""
+        team_a, team_b = sample_league['teams'][:2]
+
+        result = evaluate(client, sample_league, [{
+            'from_team_id': team_a['id'],
+            'to_team_id': team_b['id'],
+            'pick_ids': [picks_of(sample_league, team_a)[1]],
+            'return_pick_ids': [picks_of(sample_league, team_b)[2]]
+        }]).get_json()[0]
+
+        assert result['fair'] is True
+
+    def test_picks_named_by_number(self, client, sample_league):
+        """Test picks named by number are valued like the same picks named by id."""
+        team_a, team_b = sample_league['teams'][:2]
+        a_picks, b_picks = picks_of(sample_league, team_a), picks_of(sample_league, team_b)
+        trade = {'from_team_id': team_a['id'], 'to_team_id': team_b['id']}
+
+        by_id, by_number = evaluate(client, sample_league, [
+            dict(trade, pick_ids=[a_picks[1]], return_pick_ids=[b_picks[2], b_picks[7]]),
+            dict(trade, pick_numbers=[1], return_pick_ids=[b_picks[2]], return_pick_numbers=[7])
+        ]).get_json()
+
+        assert (by_number['from_value'], by_number['to_value']) == (by_id['from_value'], by_id['to_value'])
+
+    def test_infeasible_trades(self, client, sample_league, sample_prospects):
+        """Test picks that are not the giving team's, used or unknown are reported."""
+        team_a, team_b = sample_league['teams'][:2]
+        a_picks, b_picks = picks_of(sample_league, team_a), picks_of(sample_league, team_b)
+        client.post('/api/draft/execute', json={
+            'prospect_id': sample_prospects[0]['id'], 'team_id': team_a['id'], 'league_id': sample_league['id']
+        })
+
+        results = evaluate(client, sample_league, [
+            {'from_team_id': team_a['id'], 'to_team_id': team_b['id'], 'pick_ids': [b_picks[2]]},
+            {'from_team_id': team_a['id'], 'to_team_id': team_b['id'], 'pick_ids': [a_picks[1]]},
+            {'from_team_id': team_a['id'], 'to_team_id': team_b['id'], 'return_pick_ids': [99999]},
+            {'from_team_id': team_a['id'], 'to_team_id': team_b['id'], 'pick_ids': [a_picks[8]]},
+        ]).get_json()
+
+        assert [result['feasible'] for result in results] == [False, False, False, True]
+        assert results[0]['error'] == f'Pick {b_picks[2]} does not belong to team {team_a["id"]}'
+        assert results[1]['error'] == f'Pick {a_picks[1]} has already been used'
+        assert results[2]['error'] == 'Pick 99999 not found'
+        assert results[3]['error'] is None
+
+    def test_custom_chart(self, client, sample_league):
+        """Test a chart passed with the request, with later picks at its last value."""
+        team_a, team_b = sample_league['teams'][:2]
+
+        result = evaluate(client, sample_league, [{
+            'from_team_id': team_b['id'],
+            'to_team_id': team_a['id'],
+            'pick_ids': list(picks_of(sample_league, team_b).values())
+        }], chart=[10, 5]).get_json()[0]
+
+        assert result['from_value'] == 15
+
+    def test_future_picks_are_discounted(self, client, sample_league):
+        """Test picks in later seasons lose value for every year out."""
+        team_a, team_b = sample_league['teams'][:2]
+
+        result = evaluate(client, sample_league, [{
+            'from_team_id': team_a['id'],
+            'to_team_id': team_b['id'],
+            'future_picks': [{'pick_number': 1, 'years_out': 1}],
+            'return_future_picks': [{'pick_number': 1, 'years_out': 2}]
+        }]).get_json()[0]
+
+        assert result['from_value'] == 800
+        assert result['to_value'] == 640
+
+    def test_rank_packages(self, client, sample_league):
+        """Test every package between two teams can be ranked in one call."""
+        team_a, team_b = sample_league['teams'][:2]
+        a_picks = list(picks_of(sample_league, team_a).values())
+        b_picks = list(picks_of(sample_league, team_b).values())
+        packages = [
+            {'from_team_id': team_a['id'], 'to_team_id': team_b['id'],
+             'pick_ids': list(give), 'return_pick_ids': list(take)}
+            for size in (1, 2) for give in combinations(a_picks, size)
+            for other in (1, 2) for take in combinations(b_picks, other)
+        ]
+
+        results = evaluate(client, sample_league, packages, sort='fairness').get_json()
+
+        assert len(results) == len(packages) == 36
+        differences = [abs(result['difference']) for result in results]
+        assert differences == sorted(differences)
+        assert packages[results[0]['index']]['pick_ids']
+
+    def test_validation(self, client, sample_league):
+        """Test malformed requests are rejected."""
+        team_a, team_b = sample_league['teams'][:2]
+        trade = {'from_team_id': team_a['id'], 'to_team_id': team_b['id']}
+
+        assert client.post('/api/trades/evaluate', json={'league_id': sample_league['id']}).status_code == 400
+        assert evaluate(client, sample_league, []).status_code == 400
+        assert evaluate(client, sample_league, [dict(trade, to_team_id=team_a['id'])]).status_code == 400
+        assert evaluate(client, sample_league, [dict(trade, pick_ids='1')]).status_code == 400
+        assert evaluate(client, sample_league, [dict(trade, pick_ids=[1], return_pick_ids=[1])]).status_code == 400
+        assert evaluate(client, sample_league, [dict(trade, future_picks=[{'pick_number': 1}])]).status_code == 400
+        assert evaluate(client, sample_league, [dict(trade, from_team_id='a')]).status_code == 400
+        assert evaluate(client, sample_league, [dict(trade, pick_numbers=['1'])]).status_code == 400
+        assert evaluate(client, sample_league, [dict(trade, pick_numbers=[1], return_pick_numbers=[1])]).status_code == 400
+        assert evaluate(client, sample_league, [dict(trade, to_team_id=True)]).status_code == 400
+        assert evaluate(client, sample_league, [
+            dict(trade, future_picks=[{'pick_number': True, 'years_out': 1}])
+        ]).status_code == 400
+        assert evaluate(client, sample_league, [
+            dict(trade, return_future_picks=[{'pick_number': 3, 'years_out': True}])
+        ]).status_code == 400
+        assert evaluate(client, sample_league, [trade], chart=[]).status_code == 400
+        assert evaluate(client, sample_league, [trade], sort='value').status_code == 400
+        assert evaluate(client, {'id': 9999}, [trade]).status_code == 404
@@ -0,0 +1,140 @@
+import numpy as np
+
+# Default chart: pick 1 is worth CHART_TOP and every later pick CHART_DECAY
+# times the one before it, so a pick loses about a quarter of its value per
+# round of a 12-team draft.
+CHART_TOP = 1000.0
+CHART_DECAY = 0.975
+
+GIVEN_BY_FROM = 0
+GIVEN_BY_TO = 1
+
+
+def value_chart(num_picks, chart=None):
+    """Value of picks 1 to ``num_picks`` as an array indexed by ``pick_number - 1``.
+
+    ``chart`` lists values from pick 1 on; picks past its end are worth its
+    last value. Without one the default decay chart is used.
+    """
+    if chart is None:
+        return CHART_TOP * CHART_DECAY ** np.arange(max(num_picks, 0), dtype=np.float64)
+    chart = np.asarray(chart, dtype=np.float64)
+    if num_picks <= len(chart):
+        return chart[:max(num_picks, 0)]
+    return np.concatenate([chart, np.full(num_picks - len(chart), chart[-1])])
+
+
+def evaluate_trades(picks, chart, trades, future_discount, tolerance):
+    """Value both sides of every candidate trade against the league's picks.
+
+    ``picks`` are the league's serialized draft picks. Each trade has
+    ``from_team_id``, ``to_team_id``, the picks the from team gives as
+    ``pick_ids`` or ``pick_numbers``, the picks the to team gives as
+    ``return_pick_ids`` or ``return_pick_numbers`` and, for seasons after
+    this one, ``future_picks`` and ``return_future_picks`` given as
+    ``{'pick_number', 'years_out'}`` estimates that are discounted by
+    ``future_discount`` per year. Numbers reach the unstored picks of a
+    virtual pick grid, which have no id. A trade is fair when its sides
+    differ by at most ``tolerance`` of the larger one. Every pick reference
+    across all trades is valued and checked in one pass of array operations.
+    """
+    num_trades = len(trades)
+    indexes = {
+        'id': _pick_index([pick for pick in picks if pick['id'] is not None], 'id'),
+        'pick_number': _pick_index(picks, 'pick_number')
+    }
+
+    references = {'id': ([], [], [], []), 'pick_number': ([], [], [], [])}
+    future_index, future_sides, future_numbers, future_years = [], [], [], []
+    for index, trade in enumerate(trades):
+        for side, giver, prefix in ((GIVEN_BY_FROM, trade['from_team_id'], ''),
+                                    (GIVEN_BY_TO, trade['to_team_id'], 'return_')):
+            for key, field in (('id', 'pick_ids'), ('pick_number', 'pick_numbers')):
+                trade_index, sides, keys, givers = references[key]
+                for value in trade.get(prefix + field, ()):
+                    trade_index.append(index)
+                    sides.append(side)
+                    keys.append(value)
+                    givers.append(giver)
+        for side, key in ((GIVEN_BY_FROM, 'future_picks'), (GIVEN_BY_TO, 'return_future_picks')):
+            for future in trade.get(key, ()):
+                future_index.append(index)
+                future_sides.append(side)
+                future_numbers.append(future['pick_number'])
+                future_years.append(future['years_out'])
+
+    trade_index, sides, values, problems = [], [], [], []
+    for key, (ref_trades, ref_sides, keys, givers) in references.items():
+        ref_values, ref_problems = _lookup(indexes[key], np.array(keys, dtype=np.int64),
+                                           np.array(givers, dtype=np.int64), chart)
+        trade_index.append(np.array(ref_trades, dtype=np.int64))
+        sides.append(np.array(ref_sides, dtype=np.int64))
+        values.append(ref_values)
+        problems.append(ref_problems)
+    trade_index, sides = np.concatenate(trade_index), np.concatenate(sides)
+    values, problems = np.concatenate(values), np.concatenate(problems)
+
+    totals = np.bincount(trade_index * 2 + sides, weights=values, minlength=2 * num_trades)
+    if future_index:
+        future_numbers = np.clip(np.array(future_numbers, dtype=np.int64), 1, len(chart)) - 1
+        future_values = chart[future_numbers] * (1 - future_discount) ** np.array(future_years, dtype=np.float64)
+        totals = totals + np.bincount(
+            np.array(future_index, dtype=np.int64) * 2 + np.array(future_sides, dtype=np.int64),
+            weights=future_values, minlength=2 * num_trades
+        )
+    totals = totals.reshape(num_trades, 2)
+    infeasible = np.bincount(trade_index, weights=problems, minlength=num_trades) > 0
+
+    results = []
+    for index, trade in enumerate(trades):
+        given, received = totals[index]
+        results.append({
+            'index': index,
+            'from_team_id': trade['from_team_id'],
+            'to_team_id': trade['to_team_id'],
+            'from_value': round(float(given), 2),
+            'to_value': round(float(received), 2),
+            'difference': round(float(received - given), 2),
+            'fair': bool(abs(received - given) <= tolerance * max(given, received)),
+            'feasible': not bool(infeasible[index]),
+            'error': _first_problem(trade, indexes) if infeasible[index] else None
+        })
+    return results
+
+
+def _pick_index(picks, key):
+    """``picks`` as arrays of (key, pick number, owner, used), sorted by ``key`` for lookups."""
+    keys = np.array([pick[key] for pick in picks], dtype=np.int64)
+    order = np.argsort(keys)
+    return (
+        keys[order],
+        np.array([pick['pick_number'] for pick in picks], dtype=np.int64)[order],
+        np.array([pick['current_team_id'] or 0 for pick in picks], dtype=np.int64)[order],
+        np.array([pick['is_used'] for pick in picks], dtype=bool)[order]
+    )
+
+
+def _lookup(index, keys, givers, chart):
+    """Chart value of each referenced pick and whether the giver cannot trade it."""
+    index_keys, numbers, owners, used = index
+    if not len(index_keys):
+        return np.zeros(len(keys)), np.ones(len(keys), dtype=bool)
+    slots = np.minimum(np.searchsorted(index_keys, keys), len(index_keys) - 1)
+    found = index_keys[slots] == keys
+    values = np.where(found, chart[np.clip(numbers[slots] - 1, 0, len(chart) - 1)], 0)
+    return values, ~found | (owners[slots] != givers) | used[slots]
+
+
+def _first_problem(trade, indexes):
+    for prefix, giver in (('', trade['from_team_id']), ('return_', trade['to_team_id'])):
+        for key, field, label in (('id', 'pick_ids', 'Pick'), ('pick_number', 'pick_numbers', 'Pick number')):
+            index_keys, _, owners, used = indexes[key]
+            for value in trade.get(prefix + field, ()):
+                slot = np.searchsorted(index_keys, value)
+                if slot == len(index_keys) or index_keys[slot] != value:
+                    return f'{label} {value} not found'
+                if owners[slot] != giver:
+                    return f'{label} {value} does not belong to team {giver}'
+                if used[slot]:
+                    return f'{label} {value} has already been used'
+    return None
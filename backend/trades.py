@@ -1,20 +1,129 @@
-from flask import Blueprint, request, jsonify
-from .models import db, Trade, DraftPick
-import json
+from flask import Blueprint, current_app, request, jsonify
+from .models import db, League, Trade, TradePick, DraftPick
+from .draft_state import draft_states
+from .events import publish_event
+from .history import record_event
+from .pagination import fetch_page, page_response
+from .pick_grid import materialize_picks
+from .trade_values import evaluate_trades, value_chart
+from .versioning import league_conditional, record_changes, record_deletion
 from datetime import datetime
 
 trades_bp = Blueprint('trades', __name__)
 
 @trades_bp.route('', methods=['GET'])
+@league_conditional
 def get_trades():
     league_id = request.args.get('league_id', type=int)
     
     if league_id:
-        trades = Trade.query.filter_by(league_id=league_id).order_by(Trade.executed_at.desc()).all()
+        trades, next_cursor, error = fetch_page(Trade, [Trade.league_id == league_id], ['-executed_at', '-id'])
     else:
-        trades = Trade.query.all()
+        trades, next_cursor, error = fetch_page(Trade, [], ['id'])
     
-    return jsonify([trade.to_dict() for trade in trades]), 200
+    if error:
+        return jsonify({'error': error}), 400
+    return page_response(trades, next_cursor), 200
+
+@trades_bp.route('/value-chart', methods=['GET'])
+@league_conditional
+def get_value_chart():
+    league_id = request.args.get('league_id', type=int)
+    
+    if not league_id:
+        return jsonify({'error': 'league_id is required'}), 400
+    
+    state = draft_states().get(league_id)
+    if state is None:
+        return jsonify({'error': 'League not found'}), 404
+    
+    chart = value_chart(len(state), current_app.config['TRADE_VALUE_CHART'])
+    return jsonify([
+        {'pick_number': number, 'value': round(float(value), 2)}
+        for number, value in enumerate(chart, 1)
+    ]), 200
+
+@trades_bp.route('/evaluate', methods=['POST'])
+def evaluate_candidate_trades():
+    data = request.get_json()
+    
+    if not data or 'league_id' not in data or 'trades' not in data:
+        return jsonify({'error': 'league_id and trades are required'}), 400
+    
+    max_trades = current_app.config['TRADE_EVALUATE_MAX_TRADES']
+    trades = data['trades']
+    if not isinstance(trades, list) or not 1 <= len(trades) <= max_trades:
+        return jsonify({'error': f'trades must be an array of 1 to {max_trades} trades'}), 400
+    
+    for idx, trade in enumerate(trades):
+        error = _validate_candidate(trade)
+        if error:
+            return jsonify({'error': f'Trade {idx}: {error}'}), 400
+    
+    chart = data.get('chart', current_app.config['TRADE_VALUE_CHART'])
+    if chart is not None and (
+        not isinstance(chart, list) or not chart or
+        not all(isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0 for value in chart)
+    ):
+        return jsonify({'error': 'chart must be a non-empty array of non-negative values'}), 400
+    
+    sort = data.get('sort')
+    if sort not in (None, 'fairness', 'difference'):
+        return jsonify({'error': 'sort must be fairness or difference'}), 400
+    
+    state = draft_states().get(data['league_id'])
+    if state is None:
+        return jsonify({'error': 'League not found'}), 404
+    
+    results = evaluate_trades(
+        state.pick_list(),
+        value_chart(max(len(state), 1), chart),
+        trades,
+        current_app.config['FUTURE_PICK_DISCOUNT'],
+        current_app.config['TRADE_FAIRNESS_TOLERANCE']
+    )
+    if sort == 'fairness':
+        results.sort(key=lambda result: (not result['feasible'], abs(result['difference'])))
+    elif sort == 'difference':
+        results.sort(key=lambda result: (not result['feasible'], -result['difference']))
+    
+    return jsonify(results), 200
+
+def _validate_candidate(trade):
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+    
+    def is_id_list(value):
+        return isinstance(value, list) and all(is_int(item) for item in value)
+    
+    def is_future_list(value):
+        return isinstance(value, list) and all(
+            isinstance(item, dict) and
+            is_int(item.get('pick_number')) and item['pick_number'] >= 1 and
+            is_int(item.get('years_out')) and item['years_out'] >= 1
+            for item in value
+        )
+    
+    if not isinstance(trade, dict) or 'from_team_id' not in trade or 'to_team_id' not in trade:
+        return 'from_team_id and to_team_id are required'
+    if not is_int(trade['from_team_id']) or not is_int(trade['to_team_id']):
+        return 'from_team_id and to_team_id must be team ids'
+    if trade['from_team_id'] == trade['to_team_id']:
+        return 'Cannot trade with the same team'
+    for key in ('pick_ids', 'return_pick_ids'):
+        if not is_id_list(trade.get(key, [])):
+            return f'{key} must be an array of pick ids'
+    for key in ('pick_numbers', 'return_pick_numbers'):
+        if not is_id_list(trade.get(key, [])):
+            return f'{key} must be an array of pick numbers'
+    for key in ('future_picks', 'return_future_picks'):
+        if not is_future_list(trade.get(key, [])):
+            return f'{key} must be an array of {{pick_number, years_out}} with both at least 1'
+    pick_ids = trade.get('pick_ids', []) + trade.get('return_pick_ids', [])
+    pick_numbers = trade.get('pick_numbers', []) + trade.get('return_pick_numbers', [])
+    if len(set(pick_ids)) != len(pick_ids) or len(set(pick_numbers)) != len(pick_numbers):
+        return 'A pick is listed more than once'
+    return None
 
 @trades_bp.route('/<int:trade_id>', methods=['GET'])
 def get_trade(trade_id):
@@ -25,33 +134,55 @@ def get_trade(trade_id):
 def execute_trade():
     data = request.get_json()
     
-    if not data or 'from_team_id' not in data or 'to_team_id' not in data or 'pick_ids' not in data or 'league_id' not in data:
-        return jsonify({'error': 'from_team_id, to_team_id, pick_ids, and league_id are required'}), 400
+    if not data or 'from_team_id' not in data or 'to_team_id' not in data or 'league_id' not in data or \
+            ('pick_ids' not in data and 'pick_numbers' not in data):
+        return jsonify({'error': 'from_team_id, to_team_id, pick_ids or pick_numbers, and league_id are required'}), 400
     
-    from_team_id = data['from_team_id']
-    to_team_id = data['to_team_id']
-    pick_ids = data['pick_ids']
-    league_id = data['league_id']
+    result, status = trade_picks(
+        data['league_id'], data['from_team_id'], data['to_team_id'],
+        data.get('pick_ids', []), data.get('pick_numbers', [])
+    )
+    return jsonify(result), status
+
+def trade_picks(league_id, from_team_id, to_team_id, pick_ids, pick_numbers=()):
+    """Move unused picks from one team to another and record the trade.
     
+    Picks are named by ``pick_ids`` or ``pick_numbers``; the unstored picks
+    of a virtual pick grid have no id yet and are stored here first.
+    Returns a (response body, status code) pair.
+    """
     if from_team_id == to_team_id:
-        return jsonify({'error': 'Cannot trade with the same team'}), 400
+        return {'error': 'Cannot trade with the same team'}, 400
+    
+    if not isinstance(pick_ids, list) or not isinstance(pick_numbers, (list, tuple)) or \
+            not all(isinstance(item, int) and not isinstance(item, bool) for item in [*pick_ids, *pick_numbers]) or \
+            not pick_ids and not pick_numbers:
+        return {'error': 'pick_ids and pick_numbers must be arrays naming at least one pick'}, 400
     
-    if not isinstance(pick_ids, list) or len(pick_ids) == 0:
-        return jsonify({'error': 'pick_ids must be a non-empty array'}), 400
+    if len(set(pick_ids)) != len(pick_ids) or len(set(pick_numbers)) != len(pick_numbers):
+        return {'error': 'A pick is listed more than once'}, 400
+    
+    if pick_numbers:
+        league = db.session.get(League, league_id)
+        if league is not None and league.virtual_picks:
+            materialize_picks(league_id, league.total_picks, pick_numbers, 0, datetime.utcnow())
     
     picks = DraftPick.query.filter(
-        DraftPick.id.in_(pick_ids),
+        db.or_(DraftPick.id.in_(pick_ids), DraftPick.pick_number.in_(pick_numbers)),
         DraftPick.league_id == league_id
     ).all()
     
-    if len(picks) != len(pick_ids):
-        return jsonify({'error': 'Some picks not found'}), 404
+    if any(pick.id in pick_ids and pick.pick_number in pick_numbers for pick in picks):
+        return {'error': 'A pick is listed more than once'}, 400
+    
+    if len(picks) != len(pick_ids) + len(pick_numbers):
+        return {'error': 'Some picks not found'}, 404
     
     for pick in picks:
         if pick.current_team_id != from_team_id:
-            return jsonify({'error': f'Pick {pick.id} does not belong to team {from_team_id}'}), 400
+            return {'error': f'Pick {pick.id} does not belong to team {from_team_id}'}, 400
         if pick.is_used:
-            return jsonify({'error': f'Pick {pick.id} has already been used'}), 400
+            return {'error': f'Pick {pick.id} has already been used'}, 400
     
     for pick in picks:
         pick.current_team_id = to_team_id
@@ -60,22 +191,36 @@ def execute_trade():
     trade = Trade(
         from_team_id=from_team_id,
         to_team_id=to_team_id,
-        pick_ids=json.dumps(pick_ids),
-        league_id=league_id
+        league_id=league_id,
+        trade_picks=[TradePick(pick_id=pick.id) for pick in picks]
     )
     
     db.session.add(trade)
+    version = record_changes(league_id, trade, *picks)
+    record_event(league_id, 'trade', {
+        'picks': [[pick.id, to_team_id, None] for pick in picks],
+        'trade': [from_team_id, to_team_id]
+    })
     db.session.commit()
     
-    return jsonify({
+    draft_states().update(league_id, version, picks=[pick.to_dict() for pick in picks])
+    
+    publish_event(league_id, 'trade', {
+        'trade': trade.to_dict(),
+        'picks': [pick.to_dict() for pick in picks],
+        'version': version
+    })
+    
+    return {
         'message': 'Trade executed successfully',
         'trade': trade.to_dict(),
         'picks': [pick.to_dict() for pick in picks]
-    }), 201
+    }, 201
 
 @trades_bp.route('/<int:trade_id>', methods=['DELETE'])
 def delete_trade(trade_id):
     trade = Trade.query.get_or_404(trade_id)
     db.session.delete(trade)
+    record_deletion(trade.league_id, 'trades', trade.id)
     db.session.commit()
     return jsonify({'message': 'Trade deleted successfully'}), 200
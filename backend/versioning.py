@@ -0,0 +1,96 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+from flask import has_request_context, make_response, request
+from .models import db, League, Tombstone
+
+
+def bump_league_version(league_id):
+    """Atomically increment a league's version and return the new value."""
+    if has_request_context():
+        request.league_version = None
+    # Pending changes are flushed at commit together with the version stamp
+    # record_changes puts on them, rather than once before and once after.
+    with db.session.no_autoflush:
+        return db.session.execute(
+            db.update(League)
+            .where(League.id == league_id)
+            .values(version=League.version + 1, updated_at=datetime.utcnow())
+            .returning(League.version)
+        ).scalar()
+
+
+def record_changes(league_id, *rows):
+    """Bump the league version and stamp it on each created or modified row."""
+    version = bump_league_version(league_id)
+    for row in rows:
+        row.version = version
+    return version
+
+
+def record_deletion(league_id, entity_type, *entity_ids):
+    """Bump the league version and leave tombstones for the changes feed."""
+    version = bump_league_version(league_id)
+    for entity_id in entity_ids:
+        db.session.add(Tombstone(
+            league_id=league_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            version=version
+        ))
+    return version
+
+
+def get_league_version(league_id):
+    """Return the league's (version, created_at), or None for an unknown league.
+
+    The creation time tells a league apart from a later one that reuses its
+    id. The value is remembered for the rest of the request, so a view
+    behind ``league_conditional`` gets it without another query.
+    """
+    cached = getattr(request, 'league_version', None) if has_request_context() else None
+    if cached is not None and cached[0] == league_id:
+        return cached[1]
+    stamp = db.session.execute(
+        db.select(League.version, League.created_at).where(League.id == league_id)
+    ).first()
+    if has_request_context():
+        request.league_version = (league_id, stamp)
+    return stamp
+
+
+def league_etag(league_id, stamp):
+    # Every representation of a league changes with its version, but each URL
+    # (path and query string) is a different representation.
+    key = f'{stamp.created_at.isoformat()} {request.full_path}'
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return f'{league_id}.{stamp.version}.{digest}'
+
+
+def league_conditional(view):
+    """Answer If-None-Match from the league version before running the view.
+
+    The league comes from the ``league_id`` route argument or query
+    parameter. Requests without one are passed straight through.
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        league_id = kwargs.get('league_id') or request.args.get('league_id', type=int)
+        if not league_id:
+            return view(*args, **kwargs)
+
+        stamp = get_league_version(league_id)
+        if stamp is None:
+            return view(*args, **kwargs)
+
+        etag = league_etag(league_id, stamp)
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return wrapped